@@ -3,10 +3,11 @@ from sysbrokers.IB.client.ib_contracts_client import ibContractsClient
 from sysbrokers.IB.ib_instruments_data import ibFuturesInstrumentData
 from sysbrokers.IB.ib_connection import connectionIB
 
-from syscore.objects import missing_contract, missing_instrument
+from syscore.objects import missing_contract, missing_instrument, missing_data
 
 from sysdata.futures.contracts import futuresContractData
 from syscore.dateutils import manyTradingStartAndEndDateTimes
+from syscore.trading_hours_cache import tradingHoursCache
 
 from sysobjects.contract_dates_and_expiries import expiryDate
 from sysobjects.contracts import futuresContract
@@ -143,15 +144,13 @@ class ibFuturesContractData(futuresContractData):
 
 
     def is_contract_okay_to_trade(self, futures_contract: futuresContract) -> bool:
-        trading_hours = self.get_trading_hours_for_contract(futures_contract)
-        trading_hours_checker = manyTradingStartAndEndDateTimes(trading_hours)
+        trading_hours_checker = self.get_trading_hours_checker_for_contract(futures_contract)
 
         return trading_hours_checker.okay_to_trade_now()
 
 
     def less_than_one_hour_of_trading_leg_for_contract(self, contract_object: futuresContract) -> bool:
-        trading_hours = self.get_trading_hours_for_contract(contract_object)
-        trading_hours_checker = manyTradingStartAndEndDateTimes(trading_hours)
+        trading_hours_checker = self.get_trading_hours_checker_for_contract(contract_object)
 
         return trading_hours_checker.less_than_one_hour_left()
 
@@ -162,6 +161,35 @@ class ibFuturesContractData(futuresContractData):
         :param futures_contract:
         :return: list of paired date times
         """
+        trading_hours_checker = self.get_trading_hours_checker_for_contract(futures_contract)
+
+        return trading_hours_checker.as_list_of_tuples()
+
+    def get_trading_hours_checker_for_contract(self,
+                                               futures_contract: futuresContract) -> manyTradingStartAndEndDateTimes:
+        """
+        Trading hours are only fetched from IB and parsed once a day for each contract
+        """
+        trading_hours_checker = self.trading_hours_cache.get_trading_hours(futures_contract.key)
+        if trading_hours_checker is not missing_data:
+            return trading_hours_checker
+
+        trading_hours = self._get_trading_hours_for_contract_from_ib(futures_contract)
+        if trading_hours is missing_contract:
+            # don't cache, so we try again next time
+            return manyTradingStartAndEndDateTimes([])
+
+        return self.trading_hours_cache.add_trading_hours(futures_contract.key, trading_hours)
+
+    @property
+    def trading_hours_cache(self) -> tradingHoursCache:
+        cache = getattr(self, "_trading_hours_cache", None)
+        if cache is None:
+            cache = self._trading_hours_cache = tradingHoursCache()
+
+        return cache
+
+    def _get_trading_hours_for_contract_from_ib(self, futures_contract: futuresContract) -> list:
         new_log = futures_contract.log(self.log)
 
         contract_object_with_ib_data = self.get_contract_object_with_IB_data(futures_contract)
@@ -175,7 +203,7 @@ class ibFuturesContractData(futuresContractData):
 
         if trading_hours is missing_contract:
             new_log.msg("No IB expiry date found")
-            trading_hours = []
+            return missing_contract
 
         return trading_hours
 
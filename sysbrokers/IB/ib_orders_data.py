@@ -8,11 +8,13 @@ from sysbrokers.IB.ib_translate_broker_order_objects import (
     create_broker_order_from_trade_with_contract, ibBrokerOrder
 )
 from sysbrokers.IB.ib_connection import connectionIB
-from sysbrokers.IB.ib_translate_broker_order_objects import tradeWithContract, ibOrderCouldntCreateException
+from sysbrokers.IB.ib_translate_broker_order_objects import tradeWithContract, ibOrderCouldntCreateException, \
+    create_tempid
 from sysbrokers.IB.client.ib_orders_client import ibOrdersClient
 
 from syscore.objects import missing_order, failure, success, arg_not_supplied
 
+from sysexecution.fill_events import fillEvent, fillEventQueue, fillEventSource, listOfFillEvents
 from sysexecution.order_stacks.broker_order_stack import brokerOrderStackData, orderWithControls
 from sysexecution.orders.list_of_orders import listOfOrders
 from sysexecution.orders.broker_orders import brokerOrder
@@ -78,6 +80,32 @@ class ibOrderWithControls(orderWithControls):
         return broker_limit_price
 
 
+class ibFillEventSource(fillEventSource):
+    """
+    Publishes a fill event whenever IB tells us about an execution, or the commission for one
+
+    IB only calls us back when the connection is refreshed, so call ib_client.refresh() before draining queues
+    """
+    def __init__(self, ibclient: ibOrdersClient):
+        super().__init__()
+        ibclient.ib.execDetailsEvent += self.execution_handler
+        ibclient.ib.commissionReportEvent += self.commission_handler
+
+    def execution_handler(self, trade: ibTrade, fill):
+        self.publish(fill_event_from_ib_trade(trade))
+
+    def commission_handler(self, trade: ibTrade, fill, commission_report):
+        # commissions come after the execution, and we need them for the broker order
+        self.publish(fill_event_from_ib_trade(trade))
+
+
+def fill_event_from_ib_trade(trade: ibTrade) -> fillEvent:
+    ib_order = trade.order
+    broker_tempid = create_tempid(ib_order.account, ib_order.clientId, ib_order.orderId)
+
+    return fillEvent(broker_tempid=broker_tempid, broker_permid=ib_order.permId)
+
+
 class ibOrdersData(brokerOrderStackData):
     def __init__(self, ibconnection: connectionIB, log=logtoscreen(
             "ibFuturesContractPriceData")):
@@ -101,6 +129,26 @@ class ibOrdersData(brokerOrderStackData):
 
         return client
 
+    @property
+    def fill_event_queue(self) -> fillEventQueue:
+        queue = getattr(self, "_fill_event_queue", None)
+        if queue is None:
+            # we only start listening the first time we're asked
+            queue = self._fill_event_queue = fillEventQueue()
+            ibFillEventSource(self.ib_client).subscribe(queue)
+
+        return queue
+
+    def get_new_fill_events(self) -> listOfFillEvents:
+        queue = self.fill_event_queue
+        # IB calls us back with any executions we haven't heard about yet
+        self.ib_client.refresh()
+
+        return queue.drain()
+
+    def put_back_fill_events(self, list_of_fill_events: listOfFillEvents) -> listOfFillEvents:
+        return self.fill_event_queue.put_back(list_of_fill_events)
+
     @property
     def traded_object_store(self) -> dict:
         store = getattr(self, '_traded_object_store', None)
@@ -308,33 +356,55 @@ class ibOrdersData(brokerOrderStackData):
 
         :return: brokerOrder coming from broker
         """
+        list_of_matched_control_orders = self.match_list_of_db_broker_orders_to_control_orders_from_brokers(
+            [broker_order_to_match])
+
+        return list_of_matched_control_orders[0]
+
+    def match_list_of_db_broker_orders_to_orders_from_brokers(
+            self, list_of_broker_orders_to_match: listOfOrders) -> list:
+        list_of_matched_control_orders = self.match_list_of_db_broker_orders_to_control_orders_from_brokers(
+            list_of_broker_orders_to_match)
+        list_of_broker_orders = [
+            missing_order if matched_control_order is missing_order else matched_control_order.order
+            for matched_control_order in list_of_matched_control_orders]
+
+        return list_of_broker_orders
+
+    def match_list_of_db_broker_orders_to_control_orders_from_brokers(
+            self, list_of_broker_orders_to_match: listOfOrders) -> list:
+        """
+        We only ask the broker for its orders once, however many orders we are matching
+
+        :return: list of ibOrderWithControls, with missing_order where we can't match
+        """
 
         # check stored orders first
         dict_of_stored_control_orders = self._get_dict_of_control_orders_from_storage()
-        matched_control_order = match_control_order_from_dict(
-            dict_of_stored_control_orders, broker_order_to_match
-        )
-        if matched_control_order is not missing_order:
-            return matched_control_order
+        dict_of_broker_control_orders_by_account = {}
 
-        # try getting from broker
-        # match on temp id and clientid
-        account_id = broker_order_to_match.broker_account
-        dict_of_broker_control_orders = self._get_dict_of_broker_control_orders(
-            account_id=account_id
-        )
-        matched_control_order = match_control_order_from_dict(
-            dict_of_broker_control_orders, broker_order_to_match
-        )
-        if matched_control_order is not missing_order:
-            return matched_control_order
+        list_of_matched_control_orders = []
+        for broker_order_to_match in list_of_broker_orders_to_match:
+            matched_control_order = match_control_order_from_dict(
+                dict_of_stored_control_orders, broker_order_to_match
+            )
+            if matched_control_order is missing_order:
+                # try getting from broker
+                account_id = broker_order_to_match.broker_account
+                dict_of_broker_control_orders = dict_of_broker_control_orders_by_account.get(account_id, None)
+                if dict_of_broker_control_orders is None:
+                    dict_of_broker_control_orders = self._get_dict_of_broker_control_orders(
+                        account_id=account_id
+                    )
+                    dict_of_broker_control_orders_by_account[account_id] = dict_of_broker_control_orders
 
-        # Match on permid
-        matched_control_order = match_control_order_on_permid(
-            dict_of_broker_control_orders, broker_order_to_match
-        )
+                matched_control_order = match_control_order_from_broker_orders(
+                    dict_of_broker_control_orders, broker_order_to_match
+                )
 
-        return matched_control_order
+            list_of_matched_control_orders.append(matched_control_order)
+
+        return list_of_matched_control_orders
 
     def cancel_order_on_stack(self, broker_order: brokerOrder):
 
@@ -439,6 +509,25 @@ def add_trade_info_to_broker_order(
     return new_broker_order
 
 
+def match_control_order_from_broker_orders(
+        dict_of_broker_control_orders: dict,
+        broker_order_to_match: brokerOrder):
+
+    # match on temp id and clientid
+    matched_control_order = match_control_order_from_dict(
+        dict_of_broker_control_orders, broker_order_to_match
+    )
+    if matched_control_order is not missing_order:
+        return matched_control_order
+
+    # Match on permid
+    matched_control_order = match_control_order_on_permid(
+        dict_of_broker_control_orders, broker_order_to_match
+    )
+
+    return matched_control_order
+
+
 def match_control_order_on_permid(
         dict_of_broker_control_orders: dict,
         broker_order_to_match: brokerOrder):
@@ -77,24 +77,26 @@ def parse_phrase(phrase: str, adjustment_hours: int=0, additional_adjust: int=0)
     return original_time + adjustment
 
 
+# Doesn't deal with DST. We will be conservative and only trade 1 hour
+# after and 1 hour before
+# confusingly, IB seem to have changed their time zone codes in 2020
+TIME_DIFFERENCE_HOURS_FOR_TIME_ZONE = {
+    "CST (Central Standard Time)": 6,
+    "MET (Middle Europe Time)": -1,
+    "EST (Eastern Standard Time)": 5,
+    "JST (Japan Standard Time)": -8,
+    "US/Eastern": 5,
+    "MET": -1,
+    "EST": 5,
+    "JST": -8,
+    "Japan": -8,
+    "US/Central": 6,
+    "": 0
+}
+
+
 def get_time_difference(time_zone_id: str) -> int:
-    # Doesn't deal with DST. We will be conservative and only trade 1 hour
-    # after and 1 hour before
-    # confusingly, IB seem to have changed their time zone codes in 2020
-    time_diff_dict = {
-        "CST (Central Standard Time)": 6,
-        "MET (Middle Europe Time)": -1,
-        "EST (Eastern Standard Time)": 5,
-        "JST (Japan Standard Time)": -8,
-        "US/Eastern": 5,
-        "MET": -1,
-        "EST": 5,
-        "JST": -8,
-        "Japan": -8,
-        "US/Central": 6,
-        "": 0
-    }
-    diff_hours = time_diff_dict.get(time_zone_id, None)
+    diff_hours = TIME_DIFFERENCE_HOURS_FOR_TIME_ZONE.get(time_zone_id, None)
     if diff_hours is None:
         raise Exception("Time zone '%s' not found!" % time_zone_id)
 
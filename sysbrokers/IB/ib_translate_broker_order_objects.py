@@ -191,13 +191,17 @@ def create_broker_order_from_trade_with_contract(trade_with_contract_from_ib: tr
 
 
 def create_tempid_from_broker_details(broker_order_from_trade_object: ibBrokerOrder) -> str:
-    tempid = "%s/%s/%s" % (
+    tempid = create_tempid(
         broker_order_from_trade_object.broker_account,
         broker_order_from_trade_object.broker_clientid,
         broker_order_from_trade_object.broker_tempid,
     )
     return tempid
 
+
+def create_tempid(account: str, clientid: int, orderid: int) -> str:
+    return "%s/%s/%s" % (account, clientid, orderid)
+
 def extract_totals_from_fill_data(list_of_fills):
     """
     Sum up info over fills
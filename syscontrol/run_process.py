@@ -17,6 +17,9 @@ We kick them all off in the crontab at a specific time (midnight is easiest), bu
 - how do I mark myself as FINISHED for a subsequent process to know (in database)
 
 """
+import datetime
+import threading
+
 from sysproduction.data.control_process import dataControlProcess, diagControlProcess
 from sysobjects.production.process_control import process_no_run, process_stop, process_running
 from syscontrol.timer_functions import _get_list_of_timer_functions
@@ -56,6 +59,8 @@ class processToRun(object):
         diag_process = diagControlProcess(self.data)
         self.diag_process = diag_process
         self._logged_wait_messages = False
+        self._wake_up_event = threading.Event()
+        self._time_of_last_stop_check = None
 
     def main_loop(self):
         result_of_starting = self._start_or_wait()
@@ -65,25 +70,12 @@ class processToRun(object):
         self._run_on_start()
 
         if DEBUG:
-            is_running = True
-            while is_running:
-                we_should_stop = self._check_for_stop()
-                if we_should_stop:
-                    is_running = False
-                    break
-                self._do()
-
+            self._run_scheduled_methods_until_stopped()
             self._finish()
 
         else:
             try:
-                is_running = True
-                while is_running:
-                    we_should_stop = self._check_for_stop()
-                    if we_should_stop:
-                        is_running = False
-                        break
-                    self._do()
+                self._run_scheduled_methods_until_stopped()
 
             except Exception as e:
                 self.log.critical(str(e))
@@ -93,6 +85,14 @@ class processToRun(object):
 
         return success
 
+    def _run_scheduled_methods_until_stopped(self):
+        while True:
+            we_should_stop = self._check_for_stop_if_due()
+            if we_should_stop:
+                break
+            self._do()
+            self._wait_until_next_method_due()
+
     def _start_or_wait(self):
         waiting = True
         while waiting:
@@ -104,6 +104,64 @@ class processToRun(object):
             if not okay_to_wait:
                 return failure
 
+            # we've just checked process control, so no need to again until the poll interval is up
+            self._time_of_last_stop_check = datetime.datetime.now()
+            self._wait_until(self._time_of_next_stop_check())
+
+    def wake_up(self):
+        """
+        Stop waiting and check process control now, eg because something has changed
+        Safe to call from another thread
+        """
+        self._wake_up_event.set()
+
+    def _wait_until_next_method_due(self):
+        wake_up_time = self._time_of_next_stop_check()
+        time_of_next_run = self._list_of_timer_functions.time_of_next_run()
+        if time_of_next_run is not None:
+            wake_up_time = min(wake_up_time, time_of_next_run)
+
+        self._wait_until(wake_up_time)
+
+    def _wait_until(self, wake_up_time: datetime.datetime):
+        seconds_to_wait = (wake_up_time - datetime.datetime.now()).total_seconds()
+        if seconds_to_wait <= 0:
+            return None
+
+        woken_up = self._wake_up_event.wait(seconds_to_wait)
+        if woken_up:
+            self._wake_up_event.clear()
+            # force a stop check next time round
+            self._time_of_last_stop_check = None
+
+    def _check_for_stop_if_due(self) -> bool:
+        # this one is cheap, so always check
+        if self._check_if_all_methods_finished():
+            return self._check_for_stop()
+
+        if datetime.datetime.now() < self._time_of_next_stop_check():
+            return False
+
+        self._time_of_last_stop_check = datetime.datetime.now()
+
+        return self._check_for_stop()
+
+    def _time_of_next_stop_check(self) -> datetime.datetime:
+        if self._time_of_last_stop_check is None:
+            return datetime.datetime.now()
+
+        return self._time_of_last_stop_check + datetime.timedelta(
+            seconds=self.poll_interval_seconds)
+
+    @property
+    def poll_interval_seconds(self) -> float:
+        poll_interval_seconds = getattr(self, "_poll_interval_seconds", None)
+        if poll_interval_seconds is None:
+            poll_interval_seconds = self.diag_process.get_poll_interval_seconds(self.process_name)
+            self._poll_interval_seconds = poll_interval_seconds
+
+        return poll_interval_seconds
+
     def _is_okay_to_start(self):
         """
         - is my process marked as NO OPEN in process control  (check database): WAIT
@@ -282,12 +340,21 @@ class processToRun(object):
         return self.diag_process.is_it_time_to_stop(self.process_name)
 
     def _finish(self):
+        self._log_scheduling_lag()
         self._list_of_timer_functions.last_run()
         self._finish_control_process()
         self.data.close()
 
         return None
 
+    def _log_scheduling_lag(self):
+        for timer_class in self._list_of_timer_functions:
+            if timer_class.run_on_completion_only:
+                continue
+            self.log.msg(
+                "%s worst scheduling lag %.1f seconds" %
+                (timer_class.name, timer_class.max_scheduling_lag_seconds))
+
     def _finish_control_process(self):
         result_of_finish = self.data_control.finish_process(self.process_name)
 
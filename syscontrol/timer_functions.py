@@ -1,4 +1,5 @@
 import datetime
+import heapq
 
 from sysproduction.data.control_process import diagControlProcess, dataControlProcess
 from syslogdiag.log import logtoscreen
@@ -44,8 +45,56 @@ def _get_list_of_timer_functions(
 
 class listOfTimerFunctions(list):
     def check_and_run(self):
+        """
+        Run the functions that are due, in the order they became due
+
+        A heap of next run times means we only look at the functions we need to run
+        """
+        schedule = self._schedule
+        time_now = datetime.datetime.now()
+        due_entries = []
+        while len(schedule) > 0 and schedule[0][0] <= time_now:
+            due_entries.append(heapq.heappop(schedule))
+
+        for scheduled_time, idx in due_entries:
+            timer_class = self[idx]
+            # functions which were due before we started would report a huge lag
+            scheduled_time = max(scheduled_time, self._schedule_start)
+            timer_class.check_and_run(scheduled_time=scheduled_time)
+            self._add_to_schedule(idx)
+
         for timer_class in self:
-            timer_class.check_and_run()
+            timer_class.log_heartbeat_if_required()
+
+    def time_of_next_run(self):
+        """
+        :return: datetime when the next function is due, or None if nothing else will run
+        """
+        schedule = self._schedule
+        if len(schedule) == 0:
+            return None
+
+        return schedule[0][0]
+
+    @property
+    def _schedule(self) -> list:
+        schedule = getattr(self, "_schedule_heap", None)
+        if schedule is None:
+            self._schedule_heap = []
+            self._schedule_start = datetime.datetime.now()
+            for idx in range(len(self)):
+                self._add_to_schedule(idx)
+            schedule = self._schedule_heap
+
+        return schedule
+
+    def _add_to_schedule(self, idx: int):
+        time_of_next_run = self[idx].time_of_next_run()
+        if time_of_next_run is None:
+            # finished, or only runs on completion
+            return None
+
+        heapq.heappush(self._schedule_heap, (time_of_next_run, idx))
 
     def all_finished(self):
         if len(self) == 0:
@@ -120,15 +169,19 @@ class timerClassWithFunction(object):
     def run_on_completion_only(self):
         return self._run_on_completion_only
 
-    def check_and_run(self, last_run=False):
+    def check_and_run(self, last_run=False, scheduled_time=None):
         """
 
+        :param scheduled_time: when we expected to run, to measure scheduling lag
         :return: None
         """
         okay_to_run = self.check_if_okay_to_run(last_run=last_run)
         if not okay_to_run:
             return None
 
+        if scheduled_time is not None:
+            self.update_scheduling_lag(scheduled_time)
+
         self.log_run_start_method()
         self.update_on_start_run()
         self.run_function()
@@ -170,6 +223,24 @@ class timerClassWithFunction(object):
         else:
             return False
 
+    def time_of_next_run(self):
+        """
+        :return: datetime, or None if we won't run again before completion
+        """
+        if self.run_on_completion_only or self.completed_max_runs():
+            return None
+
+        return self.when_last_run() + datetime.timedelta(minutes=self.frequency_minutes)
+
+    def update_scheduling_lag(self, scheduled_time: datetime.datetime):
+        lag = datetime.datetime.now() - scheduled_time
+        lag_seconds = max(lag.total_seconds(), 0.0)
+        self._max_scheduling_lag_seconds = max(self.max_scheduling_lag_seconds, lag_seconds)
+
+    @property
+    def max_scheduling_lag_seconds(self) -> float:
+        return getattr(self, "_max_scheduling_lag_seconds", 0.0)
+
     def minutes_until_next_run(self) -> float:
         time_since_run = self.minutes_since_last_run()
         minutes_between_runs = self.frequency_minutes
@@ -187,12 +258,13 @@ class timerClassWithFunction(object):
 
     def log_heartbeat(self):
         self.log.msg(
-            "%s still alive, done %d of %d executions every %d minutes"
+            "%s still alive, done %d of %d executions every %d minutes, worst scheduling lag %.1f seconds"
             % (
                 self.name,
                 self._actual_executions,
                 self._max_executions,
                 self.frequency_minutes,
+                self.max_scheduling_lag_seconds,
             ),
             type=self.name,
         )
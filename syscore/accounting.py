@@ -4,6 +4,7 @@ Suite of things to work out p&l, and statistics thereof
 """
 
 from copy import copy, deepcopy
+from functools import wraps
 
 import pandas as pd
 from pandas.tseries.offsets import BDay
@@ -300,6 +301,24 @@ def get_positions_from_forecasts(
     return positions
 
 
+def memoised_stat(stat_method):
+    """
+    Decorator for account curve statistics which take no arguments; the value
+    is calculated once per curve and then cached
+    """
+
+    @wraps(stat_method)
+    def wrapper(self):
+        stats_cache = self._stats_cache
+        stat_name = stat_method.__name__
+        if stat_name not in stats_cache:
+            stats_cache[stat_name] = stat_method(self)
+
+        return stats_cache[stat_name]
+
+    return wrapper
+
+
 def percent(accurve):
     """
     Takes any account curve object
@@ -309,6 +328,9 @@ def percent(accurve):
     pass
 
 
+RESAMPLE_RULE_FOR_FREQUENCY = dict(D="1B", W="W", M="MS", Y="A")
+
+
 class accountCurveSingleElementOneFreq(pd.Series):
     """
     A single account curve for one asset (instrument / trading rule variation, ...)
@@ -363,6 +385,7 @@ class accountCurveSingleElementOneFreq(pd.Series):
         setattr(self, "_returns_df", returns_df)
         setattr(self, "weighted_flag", weighted_flag)
         setattr(self, "capital", capital)
+        setattr(self, "_stats_cache", {})
 
     def as_df(self):
         print("Deprecated accountCurve.as_df use .as_ts() please")
@@ -419,22 +442,27 @@ class accountCurveSingleElementOneFreq(pd.Series):
             setattr(self, "_curve", curve)
             return curve
 
+    @memoised_stat
     def mean(self):
         return float(self.as_ts().mean())
 
+    @memoised_stat
     def std(self):
         return float(self.as_ts().std())
 
+    @memoised_stat
     def ann_mean(self):
         avg = self.mean()
 
         return avg * self._returns_scalar
 
+    @memoised_stat
     def ann_std(self):
         period_std = self.std()
 
         return period_std * self._vol_scalar
 
+    @memoised_stat
     def sharpe(self):
         mean_return = self.ann_mean()
         vol = self.ann_std()
@@ -444,30 +472,37 @@ class accountCurveSingleElementOneFreq(pd.Series):
             sharpe = np.nan
         return sharpe
 
+    @memoised_stat
     def drawdown(self):
         x = self.curve()
         return drawdown(x)
 
+    @memoised_stat
     def avg_drawdown(self):
         dd = self.drawdown()
         return np.nanmean(dd.values)
 
+    @memoised_stat
     def worst_drawdown(self):
         dd = self.drawdown()
         return np.nanmin(dd.values)
 
+    @memoised_stat
     def time_in_drawdown(self):
         dd = self.drawdown()
         dd = [z for z in dd.values if not np.isnan(z)]
         in_dd = float(len([z for z in dd if z < 0]))
         return in_dd / float(len(dd))
 
+    @memoised_stat
     def calmar(self):
         return self.ann_mean() / -self.worst_drawdown()
 
+    @memoised_stat
     def avg_return_to_drawdown(self):
         return self.ann_mean() / -self.avg_drawdown()
 
+    @memoised_stat
     def sortino(self):
         period_stddev = np.std(self.losses())
 
@@ -481,43 +516,55 @@ class accountCurveSingleElementOneFreq(pd.Series):
 
         return sortino
 
+    @memoised_stat
     def vals(self):
         x = [z for z in self.values if not np.isnan(z)]
         return x
 
+    @memoised_stat
     def min(self):
 
         return np.nanmin(self.vals())
 
+    @memoised_stat
     def max(self):
         return np.max(self.vals())
 
+    @memoised_stat
     def median(self):
         return np.median(self.vals())
 
+    @memoised_stat
     def skew(self):
         return skew(self.vals())
 
+    @memoised_stat
     def losses(self):
         x = self.vals()
         return [z for z in x if z < 0]
 
+    @memoised_stat
     def gains(self):
         x = self.vals()
         return [z for z in x if z > 0]
 
+    @memoised_stat
     def avg_loss(self):
         return np.mean(self.losses())
 
+    @memoised_stat
     def avg_gain(self):
         return np.mean(self.gains())
 
+    @memoised_stat
     def gaintolossratio(self):
         return self.avg_gain() / -self.avg_loss()
 
+    @memoised_stat
     def profitfactor(self):
         return sum(self.gains()) / -sum(self.losses())
 
+    @memoised_stat
     def hitrate(self):
         no_gains = float(len(self.gains()))
         no_losses = float(len(self.losses()))
@@ -527,6 +574,7 @@ class accountCurveSingleElementOneFreq(pd.Series):
         y = self.as_ts().rolling(window, min_periods=4, center=True).std().to_frame()
         return y * self._vol_scalar
 
+    @memoised_stat
     def t_test(self):
         return ttest_1samp(self.vals(), 0.0)
 
@@ -605,54 +653,50 @@ class accountCurveSingleElement(accountCurveSingleElementOneFreq):
         :param weighted_flag: Is this account curve of weighted returns?
         :type weighted_flag: bool
 
+        The daily, weekly, monthly and annual curves are only built when
+        first used
 
         """
         # We often want to use
         daily_returns = returns_df.resample("1B").sum()
-        weekly_returns = returns_df.resample("W").sum()
-        monthly_returns = returns_df.resample("MS").sum()
-        annual_returns = returns_df.resample("A").sum()
 
         super().__init__(
             daily_returns, capital, frequency="D", weighted_flag=weighted_flag
         )
 
-        setattr(
-            self,
-            "daily",
-            accountCurveSingleElementOneFreq(
-                daily_returns,
-                capital,
-                frequency="D",
-                weighted_flag=weighted_flag),
-        )
-        setattr(
-            self,
-            "weekly",
-            accountCurveSingleElementOneFreq(
-                weekly_returns,
-                capital,
-                frequency="W",
-                weighted_flag=weighted_flag),
-        )
-        setattr(
-            self,
-            "monthly",
-            accountCurveSingleElementOneFreq(
-                monthly_returns,
-                capital,
-                frequency="M",
-                weighted_flag=weighted_flag),
-        )
-        setattr(
-            self,
-            "annual",
-            accountCurveSingleElementOneFreq(
-                annual_returns,
-                capital,
-                frequency="Y",
-                weighted_flag=weighted_flag),
-        )
+        setattr(self, "_original_returns_df", returns_df)
+        setattr(self, "_curves_by_frequency", {})
+
+    @property
+    def daily(self):
+        return self._curve_for_frequency("D")
+
+    @property
+    def weekly(self):
+        return self._curve_for_frequency("W")
+
+    @property
+    def monthly(self):
+        return self._curve_for_frequency("M")
+
+    @property
+    def annual(self):
+        return self._curve_for_frequency("Y")
+
+    def _curve_for_frequency(self, frequency):
+        curves_by_frequency = self._curves_by_frequency
+        if frequency not in curves_by_frequency:
+            resample_rule = RESAMPLE_RULE_FOR_FREQUENCY[frequency]
+            returns_this_freq = self._original_returns_df.resample(
+                resample_rule).sum()
+            curves_by_frequency[frequency] = accountCurveSingleElementOneFreq(
+                returns_this_freq,
+                self.capital,
+                frequency=frequency,
+                weighted_flag=self.weighted_flag,
+            )
+
+        return curves_by_frequency[frequency]
 
     def __repr__(self):
         return (
@@ -698,22 +742,36 @@ class accountCurveSingle(accountCurveSingleElement):
 
         super().__init__(net_returns, capital, weighted_flag=weighted_flag)
 
+        # curves are built when first used
         setattr(
             self,
-            "net",
-            accountCurveSingleElement(
-                net_returns, capital, weighted_flag=weighted_flag
-            ),
+            "_returns_by_curve_type",
+            dict(net=net_returns, gross=gross_returns, costs=costs),
         )
-        setattr(
-            self,
-            "gross",
-            accountCurveSingleElement(
-                gross_returns, capital, weighted_flag=weighted_flag
-            ),
-        )
-        setattr(self, "costs", accountCurveSingleElement(
-            costs, capital, weighted_flag=weighted_flag), )
+        setattr(self, "_curves_by_curve_type", {})
+
+    @property
+    def net(self):
+        return self._curve_for_curve_type("net")
+
+    @property
+    def gross(self):
+        return self._curve_for_curve_type("gross")
+
+    @property
+    def costs(self):
+        return self._curve_for_curve_type("costs")
+
+    def _curve_for_curve_type(self, curve_type):
+        curves_by_curve_type = self._curves_by_curve_type
+        if curve_type not in curves_by_curve_type:
+            curves_by_curve_type[curve_type] = accountCurveSingleElement(
+                self._returns_by_curve_type[curve_type],
+                self.capital,
+                weighted_flag=self.weighted_flag,
+            )
+
+        return curves_by_curve_type[curve_type]
 
     def __repr__(self):
         return (
@@ -1093,6 +1151,335 @@ def calc_costs(returns_data, cash_costs, SR_cost, ann_risk):
     return (costs_base_ccy, costs_instr_ccy)
 
 
+def pandl_with_data_for_panel(
+    price,
+    positions=None,
+    delayfill=True,
+    roundpositions=False,
+    get_daily_returns_volatility=None,
+    forecast=None,
+    fx=None,
+    daily_risk_capital=None,
+    value_of_price_point=1.0,
+):
+    """
+    Vectorised version of pandl_with_data for many instruments or trading
+    rules at once. Doesn't support trades, only positions or forecasts.
+
+    Everything is a TxN pd.DataFrame with the same index and columns as price
+    (one column per instrument or rule); each column gives the same answer as
+    calling pandl_with_data with that column alone.
+
+    :param price: price for each column
+    :type price: TxN pd.DataFrame
+
+    :param positions: positions, aligned to price
+    :type positions: TxN pd.DataFrame or None
+
+    :param get_daily_returns_volatility: volatility, aligned to price
+    :type get_daily_returns_volatility: TxN pd.DataFrame or None
+
+    :param forecast: forecasts, aligned to price
+    :type forecast: TxN pd.DataFrame or None
+
+    :param fx: fx rates, aligned to price
+    :type fx: TxN pd.DataFrame or None
+
+    :param value_of_price_point: value of one unit movement in price
+    :type value_of_price_point: float or pd.Series (one value per column)
+
+    :returns: 6- Tuple as pandl_with_data, but TxN pd.DataFrames
+    """
+
+    if fx is None:
+        use_fx = pd.DataFrame(1.0, index=price.index, columns=price.columns)
+    else:
+        use_fx = fx
+
+    if positions is None:
+        if get_daily_returns_volatility is None:
+            get_daily_returns_volatility = robust_vol_calc(price.diff())
+        positions = get_positions_from_forecasts(
+            price,
+            get_daily_returns_volatility,
+            forecast,
+            use_fx,
+            value_of_price_point,
+            daily_risk_capital,
+        )
+
+    if roundpositions:
+        use_positions = positions.round()
+    else:
+        use_positions = copy(positions)
+
+    if delayfill:
+        use_positions = use_positions.shift(1)
+
+    cum_trades = use_positions.ffill()
+    trades_to_use = cum_trades.diff()
+
+    price_returns = price.ffill().diff()
+
+    instr_ccy_returns = cum_trades.shift(
+        1) * price_returns * value_of_price_point
+
+    instr_ccy_returns = instr_ccy_returns.cumsum().ffill().diff()
+    base_ccy_returns = instr_ccy_returns * use_fx
+
+    return (
+        cum_trades,
+        trades_to_use,
+        instr_ccy_returns,
+        base_ccy_returns,
+        use_fx,
+        value_of_price_point,
+    )
+
+
+def calc_costs_for_panel(returns_data, cash_costs, SR_cost, ann_risk, in_range=None):
+    """
+    Vectorised version of calc_costs, for data from pandl_with_data_for_panel
+
+    :param returns_data: returns data
+    :type returns_data: 6 tuple returned by pandl_with_data_for_panel
+
+    :param cash_costs: 3 tuple of cash costs for each column, or None
+    :type cash_costs: dict of 3 tuples (keys are columns) or None
+
+    :param SR_cost: Cost in annualised Sharpe Ratio units for each column
+    :type SR_cost: dict of floats (keys are columns) or None
+
+    If a column has both, use SR_cost; if neither, costs are zero
+
+    :param ann_risk: Capital at risk on annualised basis
+    :type ann_risk: Tx1 pd.Series
+
+    :param in_range: where each column has data; costs outside this are ignored
+    :type in_range: TxN pd.DataFrame of bool, or None
+
+    :returns : 2 tuple of TxN pd.DataFrame. Minus numbers are losses
+    """
+
+    (
+        cum_trades,
+        trades_to_use,
+        instr_ccy_returns,
+        base_ccy_returns,
+        use_fx,
+        value_of_price_point,
+    ) = returns_data
+
+    if SR_cost is None:
+        SR_cost = {}
+    if cash_costs is None:
+        cash_costs = {}
+
+    costs_instr_ccy = pd.DataFrame(
+        0.0, index=use_fx.index, columns=use_fx.columns)
+
+    for column in use_fx.columns:
+        column_SR_cost = SR_cost.get(column, None)
+        column_cash_costs = cash_costs.get(column, None)
+
+        if column_SR_cost is not None:
+            ann_cost = -column_SR_cost * ann_risk
+            costs_instr_ccy[column] = ann_cost / BUSINESS_DAYS_IN_YEAR
+
+        elif column_cash_costs is not None:
+            costs_instr_ccy[column] = _cash_costs_for_column(
+                trades_to_use[column],
+                column_cash_costs,
+                _value_for_column(value_of_price_point, column),
+            )
+
+    if in_range is not None:
+        costs_instr_ccy = costs_instr_ccy.where(in_range)
+
+    costs_instr_ccy = costs_instr_ccy.cumsum().ffill().diff()
+    costs_instr_ccy[costs_instr_ccy.isna()] = 0.0
+
+    costs_base_ccy = costs_instr_ccy * use_fx.ffill()
+    costs_base_ccy[costs_base_ccy.isna()] = 0.0
+
+    return (costs_base_ccy, costs_instr_ccy)
+
+
+def _cash_costs_for_column(trades_to_use, cash_costs, value_of_price_point):
+    (
+        value_total_per_block,
+        value_of_pertrade_commission,
+        percentage_cost,
+    ) = cash_costs
+
+    trades_in_blocks = trades_to_use.abs()
+    costs_blocks = -trades_in_blocks * value_total_per_block
+
+    value_of_trades = trades_in_blocks * value_of_price_point
+    costs_percentage = percentage_cost * value_of_trades
+
+    traded = trades_to_use > 0
+    if traded.any():
+        costs_pertrade = pd.Series(np.nan, index=trades_to_use.index)
+        costs_pertrade[traded] = value_of_pertrade_commission
+    else:
+        costs_pertrade = pd.Series(0.0, index=trades_to_use.index)
+
+    return costs_blocks + costs_percentage + costs_pertrade
+
+
+def _value_for_column(value_or_series, column):
+    if isinstance(value_or_series, pd.Series):
+        return value_or_series[column]
+
+    return value_or_series
+
+
+def account_curves_from_panel(
+    price,
+    positions=None,
+    forecast=None,
+    get_daily_returns_volatility=None,
+    fx=None,
+    value_of_price_point=1.0,
+    SR_cost=None,
+    cash_costs=None,
+    capital=None,
+    ann_risk_target=None,
+    delayfill=True,
+    roundpositions=False,
+    index_dict=None,
+):
+    """
+    Create many unweighted account curves in one vectorised pass; equivalent to
+    calling accountCurve for each column.
+
+    All data are TxN pd.DataFrames, aligned to price, with one column per curve.
+    If the columns come from series with different indices (eg instruments),
+    pass their original indices in index_dict; each must be a contiguous slice
+    of price.index and anything outside it will be ignored.
+
+    :param SR_cost: dict of float or None, keys are columns
+    :param cash_costs: dict of 3 tuples or None, keys are columns
+    :param capital: Capital at risk (must not be a time series)
+    :type capital: None, float, int
+
+    :param index_dict: original index of each column
+    :type index_dict: None or dict of pd.Index
+
+    :returns: dict of accountCurve, keys are columns
+    """
+
+    (base_capital, ann_risk, daily_risk_capital) = resolve_capital(
+        price, capital, ann_risk_target
+    )
+
+    if index_dict is None:
+        in_range = None
+    else:
+        in_range = _in_range_for_index_dict(price, index_dict)
+
+    returns_data = pandl_with_data_for_panel(
+        price,
+        positions=positions,
+        delayfill=delayfill,
+        roundpositions=roundpositions,
+        get_daily_returns_volatility=get_daily_returns_volatility,
+        forecast=forecast,
+        fx=fx,
+        daily_risk_capital=daily_risk_capital,
+        value_of_price_point=value_of_price_point,
+    )
+
+    (costs_base_ccy, costs_instr_ccy) = calc_costs_for_panel(
+        returns_data, cash_costs, SR_cost, ann_risk, in_range=in_range
+    )
+
+    account_curves = dict(
+        [
+            (
+                column,
+                _account_curve_from_panel_column(
+                    returns_data,
+                    costs_base_ccy,
+                    costs_instr_ccy,
+                    base_capital,
+                    column,
+                    index_dict,
+                ),
+            )
+            for column in price.columns
+        ]
+    )
+
+    return account_curves
+
+
+def _in_range_for_index_dict(price, index_dict):
+    dates = price.index.values[:, np.newaxis]
+    first_dates = np.array(
+        [index_dict[column][0] for column in price.columns], dtype=dates.dtype
+    )
+    last_dates = np.array(
+        [index_dict[column][-1] for column in price.columns], dtype=dates.dtype
+    )
+    in_range = (dates >= first_dates) & (dates <= last_dates)
+
+    return pd.DataFrame(in_range, index=price.index, columns=price.columns)
+
+
+def _account_curve_from_panel_column(
+    returns_data,
+    costs_base_ccy,
+    costs_instr_ccy,
+    base_capital,
+    column,
+    index_dict,
+):
+    def _column_of(data):
+        column_data = data[column]
+        if index_dict is not None:
+            column_data = column_data.reindex(index_dict[column])
+
+        return column_data.rename(None)
+
+    (
+        cum_trades,
+        trades_to_use,
+        instr_ccy_returns,
+        base_ccy_returns,
+        use_fx,
+        value_of_price_point,
+    ) = returns_data
+
+    column_instr_ccy_returns = _column_of(instr_ccy_returns)
+    column_costs_instr_ccy = _column_of(costs_instr_ccy)
+
+    column_returns_data = (
+        _column_of(cum_trades),
+        _column_of(trades_to_use),
+        column_instr_ccy_returns,
+        _column_of(base_ccy_returns),
+        _column_of(use_fx),
+        _value_for_column(value_of_price_point, column),
+    )
+
+    unweighted_instr_ccy_pandl = dict(
+        gross=column_instr_ccy_returns,
+        costs=column_costs_instr_ccy,
+        net=column_instr_ccy_returns + column_costs_instr_ccy,
+    )
+
+    pre_calc_data = (
+        column_returns_data,
+        base_capital,
+        _column_of(costs_base_ccy),
+        unweighted_instr_ccy_pandl,
+    )
+
+    return accountCurve(pre_calc_data=pre_calc_data)
+
+
 def resolve_capital(ts_to_scale_to, capital=None, ann_risk_target=None):
     """
     Resolve and setup capital
@@ -1373,26 +1760,29 @@ class statsDict(dict):
 
         column_names = acgroup_for_type.asset_columns
 
-        def _get_stat_from_acobject(acobject, stat_method, freq, percent):
-
+        def _get_freq_obj(acobject, freq, percent):
             freq_obj = getattr(acobject, freq)
             if percent:
                 freq_obj = freq_obj.percent()
 
-            stat_method_function = getattr(freq_obj, stat_method)
-
-            return stat_method_function()
+            return freq_obj
 
-        dict_values = [
-            (
-                col_name,
-                _get_stat_from_acobject(
-                    acgroup_for_type[col_name], stat_method, freq, percent
-                ),
-            )
+        freq_obj_list = [
+            _get_freq_obj(acgroup_for_type[col_name], freq, percent)
             for col_name in column_names
         ]
 
+        if stat_method in VECTORISED_STATS and len(freq_obj_list) > 0:
+            # all columns at once
+            stat_values = _vectorised_stat_for_freq_obj_list(
+                freq_obj_list, stat_method)
+        else:
+            stat_values = [
+                getattr(freq_obj, stat_method)() for freq_obj in freq_obj_list
+            ]
+
+        dict_values = list(zip(column_names, stat_values))
+
         super().__init__(dict_values)
 
         # We need to augment this with time weightings, in case they are needed
@@ -1502,6 +1892,166 @@ class statsDict(dict):
         return pvalue
 
 
+def _vectorised_stat_for_freq_obj_list(freq_obj_list, stat_method):
+    """
+    Calculate a statistic for many curves of the same frequency at once;
+    gives the same answer as calling the method on each curve
+
+    :param freq_obj_list: list of accountCurveSingleElementOneFreq
+    :param stat_method: str, in VECTORISED_STATS
+    :return: list of float
+    """
+    returns_frame = pd.concat(
+        [freq_obj.as_ts() for freq_obj in freq_obj_list], axis=1)
+    returns_frame.columns = range(len(freq_obj_list))
+
+    # Anything outside a curves own index was added by concat; not real data
+    dates = returns_frame.index.values[:, np.newaxis]
+    first_dates = np.array(
+        [freq_obj.index[0] for freq_obj in freq_obj_list], dtype=dates.dtype
+    )
+    last_dates = np.array(
+        [freq_obj.index[-1] for freq_obj in freq_obj_list], dtype=dates.dtype
+    )
+    in_range = (dates >= first_dates) & (dates <= last_dates)
+
+    stat_calculator = _vectorisedStats(
+        returns_frame,
+        in_range,
+        returns_scalar=freq_obj_list[0]._returns_scalar,
+        vol_scalar=freq_obj_list[0]._vol_scalar,
+    )
+
+    stat_values = getattr(stat_calculator, stat_method)()
+
+    return [float(value) for value in stat_values]
+
+
+class _vectorisedStats(object):
+    """
+    Statistics of accountCurveSingleElementOneFreq, for all columns of a frame
+    Each method returns an np.array with one value per column
+    """
+
+    def __init__(self, returns_frame, in_range, returns_scalar, vol_scalar):
+        self._returns_frame = returns_frame
+        self._in_range = in_range
+        self._returns_scalar = returns_scalar
+        self._vol_scalar = vol_scalar
+
+    def mean(self):
+        return self._returns_frame.mean().values
+
+    def std(self):
+        return self._returns_frame.std().values
+
+    def ann_mean(self):
+        return self.mean() * self._returns_scalar
+
+    def ann_std(self):
+        return self.std() * self._vol_scalar
+
+    def sharpe(self):
+        return _divide_nan_if_zero(self.ann_mean(), self.ann_std())
+
+    def min(self):
+        return self._returns_frame.min().values
+
+    def max(self):
+        return self._returns_frame.max().values
+
+    def median(self):
+        return self._returns_frame.median().values
+
+    def skew(self):
+        # biased estimate, as scipy.stats.skew
+        demeaned = self._returns_frame - self._returns_frame.mean()
+        m2 = (demeaned ** 2).mean().values
+        m3 = (demeaned ** 3).mean().values
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(m2 == 0, np.nan, m3 / m2 ** 1.5)
+
+    def _losses(self):
+        return self._returns_frame.where(self._returns_frame < 0)
+
+    def _gains(self):
+        return self._returns_frame.where(self._returns_frame > 0)
+
+    def avg_loss(self):
+        return self._losses().mean().values
+
+    def avg_gain(self):
+        return self._gains().mean().values
+
+    def gaintolossratio(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.avg_gain() / -self.avg_loss()
+
+    def profitfactor(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._gains().sum().values / - \
+                self._losses().sum().values
+
+    def hitrate(self):
+        no_gains = self._gains().count().values.astype(float)
+        no_losses = self._losses().count().values.astype(float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return no_gains / (no_losses + no_gains)
+
+    def sortino(self):
+        # population std dev, as np.std
+        period_stddev = self._losses().std(ddof=0).values
+        ann_stdev = period_stddev * self._vol_scalar
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.ann_mean() / ann_stdev
+
+    def t_stat(self):
+        count = self._returns_frame.count().values
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.mean() / (self.std() / np.sqrt(count))
+
+    def p_value(self):
+        count = self._returns_frame.count().values
+        return 2.0 * stats.t.sf(np.abs(self.t_stat()), count - 1)
+
+    def _drawdown(self):
+        curve = self._returns_frame.cumsum().ffill()
+        drawdowns = curve - curve.expanding(min_periods=1).max()
+
+        return drawdowns.where(self._in_range)
+
+    def avg_drawdown(self):
+        return self._drawdown().mean().values
+
+    def worst_drawdown(self):
+        return self._drawdown().min().values
+
+    def time_in_drawdown(self):
+        drawdowns = self._drawdown()
+        in_dd = (drawdowns < 0).sum().values.astype(float)
+
+        return in_dd / drawdowns.count().values.astype(float)
+
+    def calmar(self):
+        return self.ann_mean() / -self.worst_drawdown()
+
+    def avg_return_to_drawdown(self):
+        return self.ann_mean() / -self.avg_drawdown()
+
+
+def _divide_nan_if_zero(numerator, denominator):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator == 0, np.nan, numerator / denominator)
+
+
+VECTORISED_STATS = [
+    method_name
+    for method_name in dir(_vectorisedStats)
+    if not method_name.startswith("_")
+]
+
+
 class accountCurveGroup(accountCurveSingleElement):
     def __init__(
             self,
@@ -5,7 +5,6 @@ Basic building blocks of trading rules, like volatility measurement and
 crossovers
 
 """
-from copy import copy
 import warnings
 
 import numpy as np
@@ -126,7 +125,7 @@ def robust_vol_calc(
     and a volfloor based on lowest vol over recent history
 
     :param x: data
-    :type x: Tx1 pd.Series
+    :type x: Tx1 pd.Series, or TxN pd.DataFrame (each column is treated separately)
 
     :param days: Number of days in lookback (*default* 35)
     :type days: int
@@ -168,12 +167,11 @@ def robust_vol_calc(
 
         # set this to zero for the first value then propagate forward, ensures
         # we always have a value
-        vol_min.at[vol_min.index[0]] = 0.0
+        vol_min.iloc[0] = 0.0
         vol_min = vol_min.ffill()
 
         # apply the vol floor
-        vol_with_min = pd.concat([vol, vol_min], axis=1)
-        vol_floored = vol_with_min.max(axis=1, skipna=False)
+        vol_floored = _apply_vol_floor(vol, vol_min)
     else:
         vol_floored = vol
 
@@ -188,6 +186,20 @@ def robust_vol_calc(
     return vol_backfilled
 
 
+def _apply_vol_floor(vol, vol_min):
+    if isinstance(vol, pd.DataFrame):
+        # np.maximum propagates nans, same as max(skipna=False) on a series
+        vol_floored = pd.DataFrame(
+            np.maximum(vol.values, vol_min.values),
+            index=vol.index,
+            columns=vol.columns)
+    else:
+        vol_with_min = pd.concat([vol, vol_min], axis=1)
+        vol_floored = vol_with_min.max(axis=1, skipna=False)
+
+    return vol_floored
+
+
 def forecast_scalar(
         cs_forecasts,
         window=250000,
@@ -216,19 +228,25 @@ def forecast_scalar(
             "average_absolute_forecast not defined in system defaults file")
 
     # Remove zeros/nans
-    copy_cs_forecasts = copy(cs_forecasts)
-    copy_cs_forecasts[copy_cs_forecasts == 0.0] = np.nan
+    cs_forecasts_no_zeros = cs_forecasts.where(cs_forecasts != 0.0)
 
     # Take CS average first
     # we do this before we get the final TS average otherwise get jumps in
     # scalar when new markets introduced
-    if copy_cs_forecasts.shape[1] == 1:
-        x = copy_cs_forecasts.abs().iloc[:, 0]
+    if cs_forecasts_no_zeros.shape[1] == 1:
+        x = cs_forecasts_no_zeros.abs().iloc[:, 0]
     else:
-        x = copy_cs_forecasts.ffill().abs().median(axis=1)
+        abs_forecasts = cs_forecasts_no_zeros.ffill().abs()
+        x = pd.Series(
+            _median_of_each_row_ignoring_nan(abs_forecasts.values),
+            index=abs_forecasts.index)
 
     # now the TS
-    avg_abs_value = x.rolling(window=window, min_periods=min_periods).mean()
+    if window >= len(x):
+        # same answer as the rolling mean, but doesn't need to track a window
+        avg_abs_value = x.expanding(min_periods=min_periods).mean()
+    else:
+        avg_abs_value = x.rolling(window=window, min_periods=min_periods).mean()
     scaling_factor = target_abs_forecast / avg_abs_value
 
     if backfill:
@@ -237,6 +255,92 @@ def forecast_scalar(
     return scaling_factor
 
 
+def rolling_skew_and_kurtosis(returns: pd.DataFrame, lookback_days: int = 365):
+    """
+    Rolling skew and kurtosis of every column, over the last lookback_days calendar days
+
+    Gives the same answers as returns.rolling("365D").skew() and .kurt(), but both come
+    from one set of moment sums, and each window's sums are the difference of two
+    cumulative sums rather than being recalculated
+
+    :param returns: TxN pd.DataFrame, with a sorted datetime index; nans are ignored
+    :param lookback_days: int
+    :return: tuple of TxN pd.DataFrame: skew, kurtosis
+    """
+    values = returns.values.astype(float)
+    not_nan = ~np.isnan(values)
+
+    # skew and kurtosis don't change if we shift each column, and data with a mean
+    # near zero keeps the power sums accurate
+    count_all = not_nan.sum(axis=0)
+    column_means = np.nansum(values, axis=0) / np.maximum(count_all, 1)
+    values = np.where(not_nan, values - column_means, 0.0)
+
+    dates = returns.index.values
+    window_start = np.searchsorted(
+        dates, dates - np.timedelta64(lookback_days, "D"), side="right"
+    )
+
+    def _sums_over_each_window(x):
+        cumulative = np.vstack([np.zeros((1, x.shape[1])), np.cumsum(x, axis=0)])
+        return cumulative[1:] - cumulative[window_start]
+
+    n = _sums_over_each_window(not_nan.astype(float))
+    values_squared = values * values
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = _sums_over_each_window(values) / n
+        mean_of_squares = _sums_over_each_window(values_squared) / n
+        mean_of_cubes = _sums_over_each_window(values_squared * values) / n
+        mean_of_fourths = _sums_over_each_window(values_squared * values_squared) / n
+
+        # central moments
+        mean_squared = mean * mean
+        m2 = mean_of_squares - mean_squared
+        m3 = mean_of_cubes - mean * (3 * mean_of_squares - 2 * mean_squared)
+        m4 = (
+            mean_of_fourths
+            - mean * (4 * mean_of_cubes - mean * (6 * mean_of_squares - 3 * mean_squared))
+        )
+        m2[m2 <= 0] = np.nan
+        m2_squared = m2 * m2
+
+        # sample adjusted, as pandas
+        skew = np.sqrt(n * (n - 1)) / (n - 2) * m3 / (m2 * np.sqrt(m2))
+        kurtosis = (n - 1) / ((n - 2) * (n - 3)) * \
+            ((n + 1) * m4 / m2_squared - 3 * (n - 1))
+
+    skew[n < 3] = np.nan
+    kurtosis[n < 4] = np.nan
+
+    skew = pd.DataFrame(skew, index=returns.index, columns=returns.columns)
+    kurtosis = pd.DataFrame(kurtosis, index=returns.index, columns=returns.columns)
+
+    return skew, kurtosis
+
+
+def _median_of_each_row_ignoring_nan(values: np.array) -> np.array:
+    """
+    Same as pd.DataFrame.median(axis=1), but much quicker when there are many columns
+
+    >>> _median_of_each_row_ignoring_nan(np.array([[1.0, np.nan, 3.0, 2.0], [np.nan, 4.0, 1.0, np.nan], [np.nan]*4]))
+    array([2. , 2.5, nan])
+    """
+    # nans are sorted to the end of each row
+    sorted_values = np.sort(values, axis=1)
+    count_not_nan = np.sum(~np.isnan(values), axis=1)
+
+    rows = np.arange(sorted_values.shape[0])
+    lower_middle = np.maximum((count_not_nan - 1) // 2, 0)
+    upper_middle = count_not_nan // 2
+    upper_middle[count_not_nan == 0] = 0
+
+    median = (sorted_values[rows, lower_middle] +
+              sorted_values[rows, upper_middle]) / 2.0
+    median[count_not_nan == 0] = np.nan
+
+    return median
+
+
 def apply_buffer_single_period(
     last_position, optimal_position, top_pos, bot_pos, trade_to_edge
 ):
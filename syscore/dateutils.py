@@ -425,6 +425,7 @@ class tradingStartAndEndDateTimes(object):
 class manyTradingStartAndEndDateTimes(list):
     def __init__(self, list_of_trading_hours):
         """
+        Periods are sorted by start time, and shouldn't overlap (IB gives us at most one per day)
 
         :param list_of_trading_hours: list of tuples, both datetime, first is start and second is end
         """
@@ -434,30 +435,64 @@ class manyTradingStartAndEndDateTimes(list):
             this_period = tradingStartAndEndDateTimes(hour_tuple)
             list_of_start_and_end_objects.append(this_period)
 
+        list_of_start_and_end_objects.sort(key=lambda period: period.start_time)
+
         super().__init__(list_of_start_and_end_objects)
 
+        # so we can binary search
+        self._start_times = np.array(
+            [period.start_time for period in self], dtype="datetime64[ns]")
+        self._end_times = np.array(
+            [period.end_time for period in self], dtype="datetime64[ns]")
 
-    def okay_to_trade_now(self):
-        for check_period in self:
-            if check_period.okay_to_trade_now():
-                # okay to trade if it's okay to trade on some date
-                return True
-        return False
+    def as_list_of_tuples(self) -> list:
+        return [(period.start_time, period.end_time) for period in self]
 
-    def less_than_one_hour_left(self):
-        for check_period in self:
-            if check_period.okay_to_trade_now():
-                # market is open, but for how long?
-                if check_period.less_than_one_hour_left():
-                    return True
-                else:
-                    return False
-            else:
-                # move on to next period
-                continue
+    def okay_to_trade_now(self) -> bool:
+        return self.okay_to_trade_at(datetime.datetime.now())
+
+    def okay_to_trade_at(self, when: datetime.datetime) -> bool:
+        return self._index_of_open_period_at(when) is not missing_data
+
+    def minutes_to_close(self, when: datetime.datetime = None) -> float:
+        """
+        Minutes until the end of the period we are trading in, or zero if the market is closed
+
+        >>> hours = manyTradingStartAndEndDateTimes([
+        ...     (datetime.datetime(2021, 3, 2, 9), datetime.datetime(2021, 3, 2, 17)),
+        ...     (datetime.datetime(2021, 3, 1, 9), datetime.datetime(2021, 3, 1, 17))])
+        >>> hours.minutes_to_close(datetime.datetime(2021, 3, 2, 16, 15))
+        45.0
+        >>> hours.minutes_to_close(datetime.datetime(2021, 3, 1, 18))
+        0
+        """
+        if when is None:
+            when = datetime.datetime.now()
+
+        period_index = self._index_of_open_period_at(when)
+        if period_index is missing_data:
+            # market closed
+            return 0
+
+        time_left = self[period_index].end_time - when
 
+        return time_left.total_seconds() / 60.0
+
+    def less_than_one_hour_left(self) -> bool:
         # market closed, we treat that as 'less than one hour left'
-        return True
+        return self.minutes_to_close() < MINUTES_PER_HOUR
+
+    def _index_of_open_period_at(self, when: datetime.datetime):
+        # the last period starting at or before when is the only one that can be open
+        when = np.datetime64(when, "ns")
+        period_index = np.searchsorted(self._start_times, when, side="right") - 1
+        if period_index < 0:
+            return missing_data
+
+        if when > self._end_times[period_index]:
+            return missing_data
+
+        return int(period_index)
 
 
 SHORT_DATE_PATTERN = "%m/%d %H:%M:%S"
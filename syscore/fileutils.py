@@ -3,6 +3,7 @@ import datetime
 import time
 import os
 import sys
+import tempfile
 
 from syscore.dateutils import SECONDS_PER_DAY
 
@@ -233,6 +234,36 @@ def get_file_or_folder_age_in_days(full_filename_with_ext):
     return age_days
 
 
+def atomic_write_text(filename: str, text: str):
+    """
+    Write text to filename so that readers, including those in other processes, never see half a file
+    """
+    temp_filename = temp_filename_in_same_directory(filename)
+    try:
+        with open(temp_filename, "w") as temp_file:
+            temp_file.write(text)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        remove_file_if_exists(temp_filename)
+        raise
+
+
+def temp_filename_in_same_directory(filename: str) -> str:
+    # same directory, so the rename is on the same filesystem and is atomic
+    directory, name = os.path.split(filename)
+    file_descriptor, temp_filename = tempfile.mkstemp(
+        prefix=".%s." % name, suffix=".tmp", dir=directory)
+    os.close(file_descriptor)
+
+    return temp_filename
+
+
+def remove_file_if_exists(filename: str):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
 
 def html_table(file, lol: list):
   file.write('<table>')
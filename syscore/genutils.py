@@ -8,6 +8,7 @@ import sys
 import numpy as np
 import datetime
 import functools
+from concurrent.futures import ProcessPoolExecutor
 
 
 class not_required_flag(object):
@@ -205,7 +206,7 @@ class progressBar(object):
         self.current_iter = 0
         self.suffix = suffix
         self.range_to_iter = range_to_iter
-        self.range_per_block = range_to_iter / np.float(toolbar_width)
+        self.range_per_block = range_to_iter / float(toolbar_width)
         self.display_bar()
         self._how_many_blocks_displayed = -1  # will always display first time
         self._show_each_time = show_each_time
@@ -254,6 +255,22 @@ class progressBar(object):
         sys.stdout.write("\n")
 
 
+def map_in_process_pool(function, list_of_args, max_workers=1):
+    """
+    Returns [function(args) for args in list_of_args], using a pool of processes if max_workers > 1
+
+    function and args have to be picklable
+    """
+    max_workers = min(max_workers, len(list_of_args))
+    if max_workers <= 1:
+        return [function(args) for args in list_of_args]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(function, list_of_args))
+
+    return results
+
+
 class quickTimer(object):
     def __init__(self, seconds=60):
         self._started = datetime.datetime.now()
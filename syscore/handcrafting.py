@@ -179,9 +179,10 @@ def three_asset_corr_matrix(labelled_correlations):
 def optimise_for_corr_matrix(corr_matrix):
     ## arbitrary
     mean_list = [.05]*3
-    std = [.1]*3
+    stdev_list = [.1]*3
+    sigma = sigma_from_corr_and_std(stdev_list, corr_matrix)
 
-    return optimise_using_correlation(mean_list, corr_matrix, std)
+    return optimise(sigma, mean_list)
 
 
 def apply_min_weight(average_weights):
@@ -0,0 +1,207 @@
+"""
+Incremental backups of time series to .csv files
+
+For every file we keep a high water mark: the last index value written, how many rows and bytes that was,
+and a hash of the content. If the first rows of the new data hash to the same value, only the new rows
+are appended; otherwise the whole file is rewritten to a temporary file, which is then renamed over the
+original so readers never see half a file.
+
+High water marks for all the files in one directory live in a single .json state file in that directory,
+so each directory should only be backed up by one thread at a time.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from syscore.fileutils import atomic_write_text, temp_filename_in_same_directory, remove_file_if_exists
+from syscore.objects import missing_data
+from syscore.pdutils import DEFAULT_DATE_FORMAT
+
+STATE_FILENAME = "_backup_state.json"
+
+UNCHANGED = "unchanged"
+APPENDED = "appended"
+REWRITTEN = "rewritten"
+
+
+class incrementalCsvBackup(object):
+    def __init__(self, directory: str,
+                 index_label: str = "DATETIME",
+                 date_format: str = DEFAULT_DATE_FORMAT):
+        """
+        :param directory: resolved (absolute) directory the .csv files are written to
+        """
+        self._directory = directory
+        self._index_label = index_label
+        self._date_format = date_format
+        self._state = _read_state(self._state_filename)
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def write(self, key: str, data: pd.DataFrame) -> str:
+        """
+        Back up data to key.csv, writing as little as possible
+
+        :return: one of UNCHANGED, APPENDED, REWRITTEN
+        """
+        filename = self.filename_for_key(key)
+        row_hashes = _row_hashes(data)
+        high_water_mark = self._state.get(key, missing_data)
+
+        rows_already_written = _rows_already_written(
+            filename, data, row_hashes, high_water_mark)
+
+        if rows_already_written == len(data.index):
+            return UNCHANGED
+
+        if rows_already_written is missing_data:
+            self._rewrite(filename, data)
+            action = REWRITTEN
+        else:
+            self._append(filename, data.iloc[rows_already_written:])
+            action = APPENDED
+
+        self._state[key] = _high_water_mark(filename, data, row_hashes)
+
+        return action
+
+    def forget(self, key: str):
+        """
+        Next write for key will rewrite the whole file
+        """
+        self._state.pop(key, None)
+
+    def save_state(self):
+        atomic_write_text(
+            self._state_filename, json.dumps(self._state, indent=1, sort_keys=True))
+
+    def filename_for_key(self, key: str) -> str:
+        return os.path.join(self.directory, "%s.csv" % key)
+
+    @property
+    def _state_filename(self) -> str:
+        return os.path.join(self._directory, STATE_FILENAME)
+
+    def _rewrite(self, filename: str, data: pd.DataFrame):
+        temp_filename = temp_filename_in_same_directory(filename)
+        try:
+            data.to_csv(temp_filename, index_label=self._index_label,
+                        date_format=self._date_format)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            remove_file_if_exists(temp_filename)
+            raise
+
+    def _append(self, filename: str, new_data: pd.DataFrame):
+        # if we fail part way the file size won't match the high water mark, so it will be
+        # rewritten next time
+        new_data.to_csv(filename, mode="a", header=False,
+                        date_format=self._date_format)
+
+
+def write_parquet_backup(filename: str, data: pd.DataFrame, compression: str = "gzip"):
+    """
+    Compressed columnar copy of data; needs pyarrow or fastparquet to be installed
+
+    Parquet files can't be appended to, so this always writes the whole file, atomically
+    """
+    temp_filename = temp_filename_in_same_directory(filename)
+    try:
+        data.to_parquet(temp_filename, compression=compression)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        remove_file_if_exists(temp_filename)
+        raise
+
+
+def parquet_engine_available() -> bool:
+    for module_name in ["pyarrow", "fastparquet"]:
+        try:
+            __import__(module_name)
+            return True
+        except ImportError:
+            pass
+
+    return False
+
+
+def _rows_already_written(filename: str, data: pd.DataFrame,
+                          row_hashes, high_water_mark):
+    """
+    How many of the rows in data are already in the file, or missing_data if it has to be rewritten
+    """
+    if high_water_mark is missing_data:
+        return missing_data
+
+    row_count = high_water_mark["row_count"]
+    if row_count > len(data.index):
+        return missing_data
+
+    if not os.path.exists(filename):
+        return missing_data
+
+    if os.path.getsize(filename) != high_water_mark["file_size"]:
+        # changed by something else, or we failed part way through an append
+        return missing_data
+
+    if _columns_and_types(data) != high_water_mark["columns"]:
+        return missing_data
+
+    if row_count > 0:
+        if _index_value_as_str(data.index[row_count - 1]) != high_water_mark["last_index"]:
+            return missing_data
+
+    if _hash_of_rows(row_hashes[:row_count]) != high_water_mark["content_hash"]:
+        return missing_data
+
+    return row_count
+
+
+def _high_water_mark(filename: str, data: pd.DataFrame, row_hashes) -> dict:
+    if len(data.index) == 0:
+        last_index = ""
+    else:
+        last_index = _index_value_as_str(data.index[-1])
+
+    return dict(
+        last_index=last_index,
+        row_count=len(data.index),
+        content_hash=_hash_of_rows(row_hashes),
+        file_size=os.path.getsize(filename),
+        columns=_columns_and_types(data),
+        written=datetime.datetime.now().strftime(DEFAULT_DATE_FORMAT),
+    )
+
+
+def _row_hashes(data: pd.DataFrame):
+    return pd.util.hash_pandas_object(data, index=True).values
+
+
+def _hash_of_rows(row_hashes) -> str:
+    return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+
+def _columns_and_types(data: pd.DataFrame) -> list:
+    return [[str(column), str(dtype)] for column, dtype in data.dtypes.items()]
+
+
+def _index_value_as_str(index_value) -> str:
+    if isinstance(index_value, (datetime.datetime, pd.Timestamp)):
+        return index_value.strftime(DEFAULT_DATE_FORMAT)
+
+    return str(index_value)
+
+
+def _read_state(state_filename: str) -> dict:
+    try:
+        with open(state_filename, "r") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        # missing or corrupt, so everything gets rewritten
+        return {}
@@ -1,5 +1,6 @@
 ## Merge series together
 from copy import copy
+import numpy as np
 import pandas as pd
 import datetime
 
@@ -67,7 +68,8 @@ class mergingDataWithStatus(object):
 
 def merge_newer_data(
     old_data, new_data,
-        check_for_spike=True, column_to_check=arg_not_supplied
+        check_for_spike=True, column_to_check=arg_not_supplied,
+        spike_check_state=arg_not_supplied
 ):
     """
     Merge new data, with old data. Any new data that is older than the newest old data will be ignored
@@ -78,6 +80,7 @@ def merge_newer_data(
     :param new_data: pd.Series or DataFrame
     :param check_for_spike: bool
     :param column_to_check: column name to check for spike
+    :param spike_check_state: spikeCheckState for old_data, so only new rows are checked; updated in place
 
     :return:  pd.Series or DataFrame
     """
@@ -89,6 +92,7 @@ def merge_newer_data(
         merged_data_with_status = spike_check_merged_data(
            merged_data_with_status,
             column_to_check=column_to_check,
+            spike_check_state=spike_check_state
         )
         if merged_data_with_status.spike_present:
             return spike_in_data
@@ -143,7 +147,14 @@ def _merge_newer_data_no_checks_if_both_old_and_new(old_data, new_data)-> mergin
 
 def spike_check_merged_data(
         merged_data_with_status: mergingDataWithStatus,
-        column_to_check=arg_not_supplied) -> mergingDataWithStatus:
+        column_to_check=arg_not_supplied,
+        spike_check_state: "spikeCheckState" = arg_not_supplied) -> mergingDataWithStatus:
+    """
+    Adds the date of the first spike (or no_spike) to merged_data_with_status
+
+    If a spikeCheckState is passed, and it matches the end of the old data, only the new rows are processed.
+    The state is updated to the end of the merged data if there is no spike.
+    """
 
     merge_status = merged_data_with_status.status
     merged_data = merged_data_with_status.merged_data
@@ -158,9 +169,17 @@ def spike_check_merged_data(
     else:
         first_date_in_new_data = merged_data_with_status.first_date
 
-    spike_date = _first_spike_in_data(
-        merged_data, first_date_in_new_data, column_to_check=column_to_check
-    )
+    if spike_check_state is arg_not_supplied:
+        spike_date = _first_spike_in_data(
+            merged_data, first_date_in_new_data, column_to_check=column_to_check
+        )
+    else:
+        spike_date = _first_spike_in_data_updating_state(
+            merged_data,
+            spike_check_state=spike_check_state,
+            first_date_in_new_data=first_date_in_new_data,
+            column_to_check=column_to_check,
+        )
 
     merged_data_with_status.add_spike_date(spike_date)
 
@@ -185,6 +204,38 @@ def _first_spike_in_data(
 
     return first_spike
 
+def _first_spike_in_data_updating_state(
+    merged_data,
+    spike_check_state: "spikeCheckState",
+    first_date_in_new_data=None,
+    column_to_check=arg_not_supplied,
+):
+    data_to_check = _get_data_to_check(merged_data, column_to_check=column_to_check)
+    rows_in_old_data = _rows_in_old_data(data_to_check, first_date_in_new_data)
+
+    if spike_check_state.matches_end_of_old_data(data_to_check, rows_in_old_data):
+        # only need to look at the new rows
+        change_in_avg_units_to_check, new_state = _calculate_change_in_avg_units_for_new_rows(
+            data_to_check, spike_check_state=spike_check_state, rows_in_old_data=rows_in_old_data)
+    else:
+        change_in_avg_units, new_state = _calculate_change_in_avg_units_and_state(data_to_check)
+        change_in_avg_units_to_check = _get_change_in_avg_units_to_check(
+            change_in_avg_units, first_date_in_new_data=first_date_in_new_data)
+
+    first_spike = _check_for_spikes_in_change_in_avg_units(change_in_avg_units_to_check)
+
+    if first_spike is no_spike:
+        # merged data will be written, so the state now describes it
+        spike_check_state.update_from(new_state)
+
+    return first_spike
+
+def _rows_in_old_data(data_to_check: pd.Series, first_date_in_new_data=None) -> int:
+    if first_date_in_new_data is None:
+        return 0
+
+    return int(data_to_check.index.searchsorted(first_date_in_new_data))
+
 def _get_data_to_check(merged_data, column_to_check = arg_not_supplied):
     col_list = getattr(merged_data, "columns", None)
     if col_list is None:
@@ -197,7 +248,18 @@ def _get_data_to_check(merged_data, column_to_check = arg_not_supplied):
 
     return data_to_check
 
+# hard to know what span to use here as could be daily, intraday or a
+# mixture
+SPIKE_CHECK_EWM_SPAN = 500
+
 def _calculate_change_in_avg_units(data_to_check: pd.Series) -> pd.Series:
+    abs_change_pd, avg_abs_change = _abs_change_and_avg_abs_change(data_to_check)
+
+    change_in_avg_units = abs_change_pd / avg_abs_change
+
+    return change_in_avg_units
+
+def _abs_change_and_avg_abs_change(data_to_check: pd.Series) -> (pd.Series, pd.Series):
 
     # Calculate the average change per day
     change_pd = average_change_per_day(data_to_check)
@@ -205,30 +267,202 @@ def _calculate_change_in_avg_units(data_to_check: pd.Series) -> pd.Series:
     # absolute is what matters
     abs_change_pd = change_pd.abs()
 
-    # hard to know what span to use here as could be daily, intraday or a
-    # mixture
-    avg_abs_change = abs_change_pd.ewm(span=500).mean()
+    avg_abs_change = abs_change_pd.ewm(span=SPIKE_CHECK_EWM_SPAN).mean()
+
+    return abs_change_pd, avg_abs_change
 
+def _calculate_change_in_avg_units_and_state(data_to_check: pd.Series) -> (pd.Series, "spikeCheckState"):
+    abs_change_pd, avg_abs_change = _abs_change_and_avg_abs_change(data_to_check)
     change_in_avg_units = abs_change_pd / avg_abs_change
 
-    return change_in_avg_units
+    # the ewm sum of 1 for every observation is exactly the weight pandas gives the
+    # current average, so we can carry on from where pandas left off
+    is_observation = abs_change_pd.notna()
+    if is_observation.any():
+        observations_only = pd.Series(1.0, index=abs_change_pd.index).where(is_observation)
+        old_weight = observations_only.ewm(span=SPIKE_CHECK_EWM_SPAN).sum().values[-1]
+        avg_abs_change_at_end = avg_abs_change.values[-1]
+    else:
+        old_weight = 1.0
+        avg_abs_change_at_end = np.nan
+
+    state = spikeCheckState()
+    state.set_state(
+        row_count=len(data_to_check),
+        last_date=data_to_check.index[-1] if len(data_to_check) > 0 else None,
+        last_value=data_to_check.values[-1] if len(data_to_check) > 0 else np.nan,
+        avg_abs_change=avg_abs_change_at_end,
+        old_weight=old_weight,
+        observation_count=int(is_observation.sum()),
+    )
+
+    return change_in_avg_units, state
+
+def _calculate_change_in_avg_units_for_new_rows(data_to_check: pd.Series,
+                                                spike_check_state: "spikeCheckState",
+                                                rows_in_old_data: int) -> (pd.Series, "spikeCheckState"):
+    new_data = data_to_check[rows_in_old_data:]
+
+    index_including_last_old_row = np.concatenate(
+        [np.array([spike_check_state.last_date], dtype=new_data.index.values.dtype),
+         new_data.index.values])
+    values_including_last_old_row = np.concatenate(
+        [[spike_check_state.last_value], new_data.values.astype(float)])
+
+    abs_change = np.abs(_average_change_per_day_as_array(
+        index_including_last_old_row, values_including_last_old_row))
+
+    new_state = copy(spike_check_state)
+    avg_abs_change = new_state.add_abs_changes(abs_change)
+    new_state.set_last_row(row_count=len(data_to_check),
+                           last_date=new_data.index[-1],
+                           last_value=new_data.values[-1])
+
+    change_in_avg_units = pd.Series(abs_change / avg_abs_change, index=new_data.index)
+
+    return change_in_avg_units, new_state
 
 def average_change_per_day(data_to_check: pd.Series) -> pd.Series:
-    data_diff = data_to_check.diff()[1:]
-    index_diff = data_to_check.index[1:] - data_to_check.index[:-1]
-    index_diff_days = [
-        diff.total_seconds() /
-        SECONDS_PER_DAY for diff in index_diff]
-
-    change_per_day = [
-        diff / (diff_days ** 0.5)
-        for diff, diff_days in zip(data_diff.values, index_diff_days)
-    ]
+    change_per_day = _average_change_per_day_as_array(
+        data_to_check.index.values, data_to_check.values.astype(float))
 
     change_pd = pd.Series(change_per_day, index=data_to_check.index[1:])
 
     return change_pd
 
+def _average_change_per_day_as_array(index_values: np.array, values: np.array) -> np.array:
+    data_diff = np.diff(values)
+    index_diff_seconds = np.diff(index_values) / np.timedelta64(1, "s")
+    index_diff_days = index_diff_seconds / SECONDS_PER_DAY
+
+    change_per_day = data_diff / (index_diff_days ** 0.5)
+
+    return change_per_day
+
+
+class spikeCheckState(object):
+    """
+    The exponentially weighted average absolute change per day at the end of a price series, and the last
+     row of that series.
+
+    Passing this to the spike check means only new rows need to be processed, rather than the whole
+     history. It's only used if it matches the end of the old data, otherwise everything is recalculated.
+    The results are identical to a full recalculation.
+    """
+    def __init__(self):
+        self.set_state()
+
+    def set_state(self, row_count: int = 0, last_date=None, last_value: float = np.nan,
+                  avg_abs_change: float = np.nan, old_weight: float = 1.0,
+                  observation_count: int = 0):
+        self._row_count = row_count
+        self._last_date = last_date
+        self._last_value = last_value
+        self._avg_abs_change = avg_abs_change
+        self._old_weight = old_weight
+        self._observation_count = observation_count
+
+    def set_last_row(self, row_count: int, last_date, last_value: float):
+        self._row_count = row_count
+        self._last_date = last_date
+        self._last_value = last_value
+
+    def update_from(self, other_state: "spikeCheckState"):
+        self.__dict__.update(other_state.__dict__)
+
+    def as_dict(self) -> dict:
+        return dict(
+            row_count=int(self._row_count),
+            last_date=self._last_date,
+            last_value=float(self._last_value),
+            avg_abs_change=float(self._avg_abs_change),
+            old_weight=float(self._old_weight),
+            observation_count=int(self._observation_count),
+        )
+
+    @classmethod
+    def from_dict(spikeCheckState, state_dict: dict):
+        spike_check_state = spikeCheckState()
+        spike_check_state.set_state(
+            row_count=int(state_dict["row_count"]),
+            last_date=state_dict["last_date"],
+            last_value=float(state_dict["last_value"]),
+            avg_abs_change=float(state_dict["avg_abs_change"]),
+            old_weight=float(state_dict["old_weight"]),
+            observation_count=int(state_dict["observation_count"]),
+        )
+
+        return spike_check_state
+
+    @property
+    def empty(self) -> bool:
+        return self._row_count == 0
+
+    @property
+    def last_date(self):
+        return self._last_date
+
+    @property
+    def last_value(self) -> float:
+        return self._last_value
+
+    @property
+    def avg_abs_change(self) -> float:
+        return self._avg_abs_change
+
+    def matches_end_of_old_data(self, data_to_check: pd.Series, rows_in_old_data: int) -> bool:
+        if self.empty:
+            return False
+        if rows_in_old_data != self._row_count:
+            return False
+
+        last_old_row = rows_in_old_data - 1
+        if data_to_check.index[last_old_row] != self.last_date:
+            return False
+
+        old_value = data_to_check.values[last_old_row]
+        if np.isnan(old_value) and np.isnan(self.last_value):
+            return True
+
+        return old_value == self.last_value
+
+    def add_abs_changes(self, abs_change: np.array) -> np.array:
+        """
+        Same recursion as pandas ewm(span=SPIKE_CHECK_EWM_SPAN, adjust=True).mean(), carrying on from the
+         current state
+
+        :return: the average after each change
+        """
+        alpha = 1.0 / (1.0 + (SPIKE_CHECK_EWM_SPAN - 1) / 2.0)
+        old_weight_factor = 1.0 - alpha
+
+        weighted = self._avg_abs_change
+        old_weight = self._old_weight
+        observation_count = self._observation_count
+
+        avg_abs_change = np.empty(len(abs_change))
+        for i, current in enumerate(abs_change):
+            is_observation = current == current
+            observation_count += is_observation
+            if weighted == weighted:
+                old_weight *= old_weight_factor
+                if is_observation:
+                    # avoid numerical errors on constant series
+                    if weighted != current:
+                        weighted = old_weight * weighted + current
+                        weighted /= old_weight + 1.0
+                    old_weight += 1.0
+            elif is_observation:
+                weighted = current
+
+            avg_abs_change[i] = weighted if observation_count >= 1 else np.nan
+
+        self._avg_abs_change = weighted
+        self._old_weight = old_weight
+        self._observation_count = observation_count
+
+        return avg_abs_change
+
 
 def _get_change_in_avg_units_to_check(change_in_avg_units: pd.Series, first_date_in_new_data = None):
     if first_date_in_new_data is None:
@@ -10,14 +10,15 @@ import datetime
 from copy import copy
 import random
 
-from syscore.correlations import boring_corr_matrix, get_avg_corr
+from syscore.algos import mean_estimator, vol_estimator
+from syscore.correlations import boring_corr_matrix, get_avg_corr, correlation_single_period
 from syscore.dateutils import (
     generate_fitting_dates,
     BUSINESS_DAYS_IN_YEAR,
     WEEKS_IN_YEAR,
     MONTHS_IN_YEAR,
 )
-from syscore.genutils import str2Bool, progressBar
+from syscore.genutils import str2Bool, progressBar, map_in_process_pool
 from syscore.pdutils import df_from_list, must_have_item
 from syscore.objects import resolve_function
 from syslogdiag.log import logtoscreen
@@ -50,6 +51,8 @@ class GenericOptimiser(object):
         pool_gross_returns=False,
         use_pooled_costs=False,
         use_pooled_turnover=None,  # not used
+        warm_start=False,
+        max_workers=1,
         **passed_params
     ):
         """
@@ -94,6 +97,12 @@ class GenericOptimiser(object):
         :param apply_cost_weight: Should we adjust our weightings to reflect costs?
         :type apply_cost_weight: bool
 
+        :param warm_start: Start each optimisation from the weights for the previous period, rather than equal weights
+        :type warm_start: bool
+
+        :param max_workers: If more than 1, and periods can be optimised independently (no warm start), use a pool of processes
+        :type max_workers: int
+
         :param *_estimate_params: dicts of **kwargs to pass to moments estimation, and optimisation functions
 
         :returns: pd.DataFrame of weights
@@ -115,6 +124,7 @@ class GenericOptimiser(object):
             **passed_params)
 
         cleaning = str2Bool(cleaning)
+        warm_start = str2Bool(warm_start)
         optimise_params = copy(passed_params)
 
         # annualisation
@@ -157,6 +167,8 @@ class GenericOptimiser(object):
         setattr(self, "rollyears", rollyears)
         setattr(self, "cleaning", cleaning)
         setattr(self, "apply_cost_weight", apply_cost_weight)
+        setattr(self, "warm_start", warm_start)
+        setattr(self, "max_workers", int(max_workers))
 
     def set_up_data(
         self,
@@ -265,8 +277,6 @@ class GenericOptimiser(object):
         log = self.log
         date_method = self.date_method
         rollyears = self.rollyears
-        optimiser = self.optimiser
-        cleaning = self.cleaning
         apply_cost_weight = self.apply_cost_weight
 
         data = getattr(self, "data", None)
@@ -279,24 +289,21 @@ class GenericOptimiser(object):
         )
         setattr(self, "fit_dates", fit_dates)
 
-        # Now for each time period, estimate weights
-        # create a list of weight vectors
-        weight_list = []
+        # Moments for each period, worked out as we go rather than from scratch each time
+        moments_list = self.moments_for_each_period(data, fit_dates)
 
         # create a class object for each period
-        opt_results = []
-
-        progress = progressBar(len(fit_dates), "Optimising")
-
-        for fit_period in fit_dates:
-            # Do the optimisation for one period, using a particular optimiser
-            # instance
-            results_this_period = optSinglePeriod(
-                self, data, fit_period, optimiser, cleaning
-            )
-
-            opt_results.append(results_this_period)
+        # with a warm start each period depends on the last one, so they can't be done in parallel
+        if self.warm_start or self.max_workers <= 1:
+            opt_results = self._optimise_periods_in_turn(
+                data, fit_dates, moments_list)
+        else:
+            opt_results = self._optimise_periods_in_parallel(
+                data, fit_dates, moments_list)
 
+        # Now for each time period, create a list of weight vectors
+        weight_list = []
+        for fit_period, results_this_period in zip(fit_dates, opt_results):
             weights = results_this_period.weights
 
             # We adjust dates slightly to ensure no overlaps
@@ -309,7 +316,6 @@ class GenericOptimiser(object):
             weight_row = pd.DataFrame(
                 [weights] * 2, index=dindex, columns=data.columns)
             weight_list.append(weight_row)
-            progress.iterate()
 
         # Stack everything up
         raw_weight_df = pd.concat(weight_list, axis=0)
@@ -328,6 +334,68 @@ class GenericOptimiser(object):
         setattr(self, "weights", weight_df)
         setattr(self, "raw_weights", raw_weight_df)
 
+    def moments_for_each_period(self, data, fit_dates):
+        """
+        If the moments estimator can work from running sums, get the moments for each fitting period by
+        adding and removing rows from the last period, rather than going over all the data again
+
+        :returns: list, with moments or None (work them out from the data) for each period
+        """
+        moments_estimator = self.optimiser.moments_estimator
+        if not moments_estimator.can_use_running_sums() or not data.index.is_monotonic_increasing:
+            return [None] * len(fit_dates)
+
+        running_sums = runningMomentSums(data)
+        moments_list = []
+        for fit_period in fit_dates:
+            if fit_period.no_data:
+                moments_list.append(None)
+                continue
+
+            # same rows as data[fit_period.fit_start: fit_period.fit_end]
+            start_row = data.index.searchsorted(fit_period.fit_start, side="left")
+            end_row = data.index.searchsorted(fit_period.fit_end, side="right")
+            running_sums.move_to(start_row, end_row)
+
+            moments_list.append(
+                moments_estimator.moments_from_running_sums(running_sums))
+
+        return moments_list
+
+    def _optimise_periods_in_turn(self, data, fit_dates, moments_list):
+        progress = progressBar(len(fit_dates), "Optimising")
+        opt_results = []
+        start_weights = None
+        for fit_period, moments in zip(fit_dates, moments_list):
+            # Do the optimisation for one period, using a particular optimiser
+            # instance
+            results_this_period = optSinglePeriod(
+                self, data, fit_period, self.optimiser, self.cleaning,
+                moments=moments, start_weights=start_weights
+            )
+            opt_results.append(results_this_period)
+
+            if self.warm_start and not fit_period.no_data:
+                start_weights = results_this_period.weights
+
+            progress.iterate()
+
+        return opt_results
+
+    def _optimise_periods_in_parallel(self, data, fit_dates, moments_list):
+        self.log.terse(
+            "Optimising %d periods with up to %d processes" %
+            (len(fit_dates), self.max_workers))
+
+        # only send each process the data it needs
+        list_of_args = [
+            (_data_for_fit_period(data, fit_period), fit_period, self.optimiser, self.cleaning, moments)
+            for fit_period, moments in zip(fit_dates, moments_list)
+        ]
+
+        return map_in_process_pool(
+            _optimise_single_period, list_of_args, max_workers=self.max_workers)
+
     def display_warnings(
         self,
         cost_multiplier,
@@ -389,6 +457,22 @@ class GenericOptimiser(object):
         return None
 
 
+def _data_for_fit_period(data, fit_period):
+    first_date = min(fit_period.fit_start, fit_period.period_start)
+    last_date = max(fit_period.fit_end, fit_period.period_end)
+
+    return data[first_date:last_date]
+
+
+def _optimise_single_period(args):
+    (data, fit_period, optimiser, cleaning, moments) = args
+
+    # otherwise every process would draw the same bootstraps
+    random.seed()
+
+    return optSinglePeriod(None, data, fit_period, optimiser, cleaning, moments=moments)
+
+
 # Mini function to copy costs across
 def _fit_cost_to_gross_frame(
         cost_to_fit,
@@ -691,6 +775,126 @@ class momentsEstimator(object):
         )
         return ans
 
+    def can_use_running_sums(self):
+        """
+        Running sums only give the same answers as the simple (not exponentially weighted) estimators
+
+        :returns: bool
+        """
+        estimators = [
+            (self.mean_estimate_func, self.mean_estimate_params, mean_estimator),
+            (self.vol_estimate_func, self.vol_estimate_params, vol_estimator),
+            (self.corr_estimate_func, self.corr_estimate_params, correlation_single_period),
+        ]
+        for (estimate_func, estimate_params, simple_estimator) in estimators:
+            if estimate_func is not simple_estimator:
+                return False
+            if str2Bool(estimate_params.get("using_exponent", True)):
+                return False
+
+        return True
+
+    def moments_from_running_sums(self, running_sums):
+        """
+        Same as self.moments(data_for_estimate), if running_sums are over data_for_estimate
+        and self.can_use_running_sums()
+        """
+        mean_min_periods = self.mean_estimate_params.get("min_periods", 20)
+        vol_min_periods = self.vol_estimate_params.get("min_periods", 20)
+        corr_min_periods = self.corr_estimate_params.get("min_periods", 20)
+
+        mean_list = list(running_sums.means(mean_min_periods) * self.annualisation)
+        corrmatrix = running_sums.correlation(corr_min_periods)
+        stdev_list = list(running_sums.vols(vol_min_periods) * (self.annualisation ** 0.5))
+
+        return (mean_list, corrmatrix, stdev_list)
+
+
+class runningMomentSums(object):
+    def __init__(self, data):
+        """
+        Sums over rows of data, which we can get means, vols and (pairwise complete) correlations from
+
+        Rows are added to the end and removed from the start as we move from one fitting period to the next,
+        so an expanding or rolling window doesn't need to go over all the data again
+
+        :param data: returns
+        :type data: pd.DataFrame TxN
+        """
+        values = data.values.astype(float)
+        self._not_nan = (~np.isnan(values)).astype(float)
+        self._values = np.nan_to_num(values)
+        self._start_row = 0
+        self._end_row = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        asset_count = self._values.shape[1]
+        # element [i, j] is over rows where both i and j have data
+        self._count = np.zeros((asset_count, asset_count))
+        self._sum = np.zeros((asset_count, asset_count))  # of i
+        self._sum_sq = np.zeros((asset_count, asset_count))  # of i squared
+        self._sum_product = np.zeros((asset_count, asset_count))  # of i times j
+
+    def move_to(self, start_row, end_row):
+        """
+        Sums will be over rows start_row up to, not including, end_row
+        """
+        if start_row < self._start_row or end_row < self._end_row or start_row > self._end_row:
+            # can't get there by adding and removing rows, start again
+            self._reset_sums()
+            self._start_row = start_row
+            self._end_row = start_row
+
+        self._change_sums(self._end_row, end_row, 1.0)
+        self._change_sums(self._start_row, start_row, -1.0)
+
+        self._start_row = start_row
+        self._end_row = end_row
+
+    def _change_sums(self, first_row, last_row, sign):
+        if last_row <= first_row:
+            return None
+
+        values = self._values[first_row:last_row]
+        not_nan = self._not_nan[first_row:last_row]
+
+        self._count += sign * not_nan.T.dot(not_nan)
+        self._sum += sign * values.T.dot(not_nan)
+        self._sum_sq += sign * (values ** 2).T.dot(not_nan)
+        self._sum_product += sign * values.T.dot(values)
+
+    def means(self, min_periods):
+        count = np.diag(self._count)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.diag(self._sum) / count
+        means[count < max(min_periods, 1)] = np.nan
+
+        return means
+
+    def vols(self, min_periods):
+        count = np.diag(self._count)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.diag(self._sum) / count
+            variance = np.diag(self._sum_sq) / count - means ** 2
+        vols = np.sqrt(np.clip(variance, 0.0, None))
+        vols[count < max(min_periods, 1)] = np.nan
+
+        return vols
+
+    def correlation(self, min_periods):
+        count = self._count
+        with np.errstate(divide="ignore", invalid="ignore"):
+            covariance = self._sum_product - self._sum * self._sum.T / count
+            sum_sq_deviation = np.clip(
+                self._sum_sq - self._sum ** 2 / count, 0.0, None)
+            divisor = np.sqrt(sum_sq_deviation * sum_sq_deviation.T)
+            corrmatrix = covariance / divisor
+
+        corrmatrix[(count < max(min_periods, 1)) | (divisor == 0.0)] = np.nan
+
+        return corrmatrix
+
 
 class optimiserWithParams(object):
     def __init__(self, method, optimise_params, moments_estimator):
@@ -728,9 +932,11 @@ class optimiserWithParams(object):
 
         setattr(self, "moments_estimator", moments_estimator)
 
-    def call(self, optimise_data, cleaning, must_haves):
-
-        params = self.params
+    def call(self, optimise_data, cleaning, must_haves, **period_kwargs):
+        """
+        :param period_kwargs: moments already worked out for optimise_data, start_weights
+        """
+        params = dict(self.params, **period_kwargs)
         return self.opt_func(
             optimise_data,
             self.moments_estimator,
@@ -740,7 +946,7 @@ class optimiserWithParams(object):
 
 
 class optSinglePeriod(object):
-    def __init__(self, parent, data, fit_period, optimiser, cleaning):
+    def __init__(self, parent, data, fit_period, optimiser, cleaning, moments=None, start_weights=None):
 
         if cleaning:
             # Generate 'must have' from the period we need
@@ -769,7 +975,8 @@ class optSinglePeriod(object):
             subset_fitting_data = data[fit_period.fit_start: fit_period.fit_end]
 
             (weights, diag) = optimiser.call(
-                subset_fitting_data, cleaning, must_haves)
+                subset_fitting_data, cleaning, must_haves,
+                moments=moments, start_weights=start_weights)
 
         ##
         setattr(self, "diag", diag)
@@ -784,6 +991,8 @@ def opt_shrinkage(
     shrinkage_SR=0.9,
     shrinkage_corr=0.5,
     equalise_vols=False,
+    moments=None,
+    start_weights=None,
     **ignored_args
 ):
     """
@@ -804,6 +1013,12 @@ def opt_shrinkage(
     :param shrinkage_corr: Shrinkage factor to use with correlations. 1.0 = full shrinkage
     :type shrinkage_corr: float
 
+    :param moments: (mean_list, corrmatrix, stdev_list) for period_subset_data if already worked out
+    :type moments: tuple
+
+    :param start_weights: Weights to start the optimiser at
+    :type start_weights: list of float
+
     Other arguments are kept so we can use **kwargs with other optimisation functions
 
     *_params passed through to data estimation functions
@@ -813,7 +1028,7 @@ def opt_shrinkage(
     """
 
     # subset_data will be stacked up list, need to average
-    rawmoments = moments_estimator.moments(period_subset_data)
+    rawmoments = _get_moments(period_subset_data, moments_estimator, moments)
     (mean_list, corrmatrix, stdev_list) = copy(rawmoments)
 
     # equalise vols first
@@ -829,7 +1044,7 @@ def opt_shrinkage(
     # get sigma matrix back
     sigma = sigma_from_corr_and_std(stdev_list, corrmatrix)
 
-    unclean_weights = optimise(sigma, mean_list)
+    unclean_weights = optimise(sigma, mean_list, start_weights=start_weights)
 
     if cleaning:
         weights = clean_weights(unclean_weights, must_haves)
@@ -847,6 +1062,13 @@ def opt_shrinkage(
     return (weights, diag)
 
 
+def _get_moments(period_subset_data, moments_estimator, moments=None):
+    if moments is None:
+        return moments_estimator.moments(period_subset_data)
+
+    return moments
+
+
 def shrink_corr(corrmatrix, shrinkage_corr):
     """
     >>> sigma=np.array([[1.0,0.0,0.5], [0.0, 1.0, 0.75],[0.5, 0.75, 1.0]])
@@ -908,6 +1130,7 @@ def handcraft(
     must_haves,
     equalise_SR=False,
     equalise_vols=True,
+    moments=None,
     **ignored_args
 ):
     """
@@ -943,7 +1166,7 @@ def handcraft(
 
     """
 
-    rawmoments = moments_estimator.moments(period_subset_data)
+    rawmoments = _get_moments(period_subset_data, moments_estimator, moments)
     (mean_list, corrmatrix, stdev_list) = copy(rawmoments)
 
     # equalise vols first
@@ -991,6 +1214,8 @@ def markosolver(
     must_haves,
     equalise_SR=False,
     equalise_vols=True,
+    moments=None,
+    start_weights=None,
     **ignored_args
 ):
     """
@@ -1017,6 +1242,12 @@ def markosolver(
     :param equalise_vols: Set all vols equal before optimising (makes more stable)
     :type equalise_vols: bool
 
+    :param moments: (mean_list, corrmatrix, stdev_list) for period_subset_data if already worked out
+    :type moments: tuple
+
+    :param start_weights: Weights to start the optimiser at
+    :type start_weights: list of float
+
     Other arguments are kept so we can use **kwargs with other optimisation functions
 
     *_params passed through to data estimation functions
@@ -1026,7 +1257,7 @@ def markosolver(
 
     """
 
-    rawmoments = moments_estimator.moments(period_subset_data)
+    rawmoments = _get_moments(period_subset_data, moments_estimator, moments)
     (mean_list, corrmatrix, stdev_list) = copy(rawmoments)
 
     # equalise vols first
@@ -1040,7 +1271,7 @@ def markosolver(
 
     sigma = sigma_from_corr_and_std(stdev_list, corrmatrix)
 
-    unclean_weights = optimise(sigma, mean_list)
+    unclean_weights = optimise(sigma, mean_list, start_weights=start_weights)
 
     if cleaning:
         weights = clean_weights(unclean_weights, must_haves)
@@ -1107,6 +1338,7 @@ def bootstrap_portfolio(
     must_haves,
     monte_runs=100,
     bootstrap_length=50,
+    moments=None,
     **other_opt_args
 ):
     """
@@ -1133,6 +1365,8 @@ def bootstrap_portfolio(
     :param bootstrap_length: Number of periods in each bootstrap
     :type bootstrap_length: int
 
+    :param moments: Not used, as each bootstrap has different data
+
     *_params passed through to data estimation functions
 
     **other_opt_args passed to single period optimiser
@@ -216,7 +216,10 @@ def fix_sigma(sigma):
     return sigma
 
 
-def optimise(sigma, mean_list):
+def optimise(sigma, mean_list, start_weights=None):
+    """
+    :param start_weights: weights to start the optimiser at, eg from the last time we optimised. Default equal weights
+    """
 
     # will replace nans with big negatives
     mean_list = fix_mus(mean_list)
@@ -226,7 +229,7 @@ def optimise(sigma, mean_list):
 
     mus = np.array(mean_list, ndmin=2).transpose()
     number_assets = sigma.shape[1]
-    start_weights = [1.0 / number_assets] * number_assets
+    start_weights = feasible_start_weights(start_weights, number_assets)
 
     # Constraints - positive weights, adding to 1.0
     bounds = [(0.0, 1.0)] * number_assets
@@ -250,6 +253,30 @@ def optimise(sigma, mean_list):
     return weights
 
 
+def feasible_start_weights(start_weights, number_assets):
+    """
+    Weights between zero and one which add up to one, to start the optimiser from
+
+    >>> feasible_start_weights(None, 4)
+    [0.25, 0.25, 0.25, 0.25]
+    >>> feasible_start_weights([0.5, np.nan, 1.5], 3)
+    [0.25, 0.0, 0.75]
+    >>> feasible_start_weights([np.nan, np.nan], 2)
+    [0.5, 0.5]
+    """
+    equal_weights = [1.0 / number_assets] * number_assets
+    if start_weights is None or len(start_weights) != number_assets:
+        return equal_weights
+
+    start_weights = np.nan_to_num(np.array(start_weights, dtype=float))
+    start_weights = np.clip(start_weights, 0.0, None)
+    total_weight = start_weights.sum()
+    if total_weight <= 0.0:
+        return equal_weights
+
+    return list(start_weights / total_weight)
+
+
 def sigma_from_corr_and_std(stdev_list, corrmatrix):
     sigma = np.diag(stdev_list).dot(corrmatrix).dot(np.diag(stdev_list))
     return sigma
@@ -387,6 +387,26 @@ def how_many_years_of_data_in_pd_series(data_series):
     return date_difference_years
 
 
+def index_is_contiguous_slice_of(own_index, panel_index):
+    """
+    Is own_index exactly panel_index between its first and last entries?
+
+    If it is, then a calculation done on a column of a panel (eg diff, ewm,
+    ffill) will be the same as doing it on the original series
+
+    :param own_index: pd.Index
+    :param panel_index: pd.Index, a superset of own_index
+    :return: bool
+    """
+    if len(own_index) == 0:
+        return False
+
+    start = panel_index.get_loc(own_index[0])
+    end = panel_index.get_loc(own_index[-1])
+
+    return panel_index[start: end + 1].equals(own_index)
+
+
 def check_df_equals(x, y):
     try:
         pd.testing.assert_frame_equal(x, y)
@@ -0,0 +1,82 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+
+from syscore.accounting import accountCurve, account_curves_from_panel
+
+
+def _random_walk(dt_range, seed):
+    rng = np.random.RandomState(seed)
+    return pd.Series(100.0 + rng.normal(size=len(dt_range)).cumsum(), dt_range)
+
+
+class Test(unittest.TestCase):
+    def test_panel_matches_single_curves(self):
+        dt_range = pd.bdate_range(start="2010-01-01", periods=300)
+        price = _random_walk(dt_range, 1)
+        forecasts = pd.concat(
+            [_random_walk(dt_range, seed) - 100.0 for seed in [2, 3]], axis=1
+        )
+        forecasts.columns = ["rule1", "rule2"]
+        SR_cost = dict(rule1=0.01, rule2=0.05)
+
+        price_panel = pd.concat([price, price], axis=1)
+        price_panel.columns = forecasts.columns
+
+        panel_curves = account_curves_from_panel(
+            price_panel, forecast=forecasts, capital=100.0, SR_cost=SR_cost
+        )
+
+        for rule_name in forecasts.columns:
+            single_curve = accountCurve(
+                price,
+                forecast=forecasts[rule_name],
+                capital=100.0,
+                SR_cost=SR_cost[rule_name],
+            )
+            for curve_type in ["gross", "net", "costs"]:
+                pd.testing.assert_series_equal(
+                    getattr(single_curve, curve_type).as_ts(),
+                    getattr(panel_curves[rule_name], curve_type).as_ts(),
+                    check_names=False,
+                )
+
+    def test_panel_with_different_indices(self):
+        dt_range = pd.bdate_range(start="2010-01-01", periods=300)
+        prices = dict(A=_random_walk(dt_range, 1),
+                      B=_random_walk(dt_range[50:250], 2))
+        positions = dict(A=_random_walk(dt_range, 3) - 100.0,
+                         B=_random_walk(dt_range[50:250], 4) - 100.0)
+        cash_costs = dict(A=(5.0, 1.0, 0.0), B=(2.0, 0.0, 0.001))
+
+        price_panel = pd.concat([prices["A"], prices["B"]], axis=1)
+        price_panel.columns = ["A", "B"]
+        positions_panel = pd.concat([positions["A"], positions["B"]], axis=1)
+        positions_panel.columns = ["A", "B"]
+
+        panel_curves = account_curves_from_panel(
+            price_panel,
+            positions=positions_panel,
+            value_of_price_point=pd.Series(dict(A=10.0, B=20.0)),
+            cash_costs=cash_costs,
+            index_dict=dict(A=prices["A"].index, B=prices["B"].index),
+        )
+
+        for code, value_of_price_point in [("A", 10.0), ("B", 20.0)]:
+            single_curve = accountCurve(
+                prices[code],
+                positions=positions[code],
+                value_of_price_point=value_of_price_point,
+                cash_costs=cash_costs[code],
+            )
+            for curve_type in ["gross", "net", "costs"]:
+                pd.testing.assert_series_equal(
+                    getattr(single_curve, curve_type).as_ts(),
+                    getattr(panel_curves[code], curve_type).as_ts(),
+                    check_names=False,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
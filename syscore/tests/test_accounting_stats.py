@@ -0,0 +1,48 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+
+from syscore.accounting import accountCurveGroup, accountCurveSingle, VECTORISED_STATS
+
+
+def _random_returns(dt_range, seed):
+    rng = np.random.RandomState(seed)
+    return pd.Series(rng.normal(size=len(dt_range)), dt_range)
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        dt_range = pd.bdate_range(start="2010-01-01", periods=600)
+        curves = []
+        for seed, dates in [(1, dt_range), (2, dt_range[100:500])]:
+            returns = _random_returns(dates, seed)
+            costs = pd.Series(-0.01, dates)
+            curves.append(accountCurveSingle(
+                returns, returns + costs, costs, capital=100.0))
+        self.group = accountCurveGroup(curves, ["A", "B"])
+
+    def test_vectorised_stats_match_single_curves(self):
+        for freq in ["daily", "weekly", "monthly"]:
+            for stat_method in VECTORISED_STATS:
+                stats = self.group.get_stats(stat_method, freq=freq)
+                for asset_name in ["A", "B"]:
+                    freq_curve = getattr(
+                        self.group.net[asset_name], freq).percent()
+                    expected = getattr(freq_curve, stat_method)()
+                    self.assertTrue(
+                        np.isclose(expected, stats[asset_name], equal_nan=True),
+                        "%s %s %s" % (freq, stat_method, asset_name),
+                    )
+
+    def test_frequency_curves_are_lazy(self):
+        returns = _random_returns(pd.bdate_range(start="2010-01-01", periods=100), 3)
+        curve = accountCurveSingle(returns, returns, returns * 0.0, capital=100.0)
+        self.assertEqual(len(curve._curves_by_curve_type), 0)
+        weekly = curve.gross.weekly
+        self.assertIs(weekly, curve.gross.weekly)
+        self.assertEqual(list(curve.gross._curves_by_frequency.keys()), ["W"])
+
+
+if __name__ == "__main__":
+    unittest.main()
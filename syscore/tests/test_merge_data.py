@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from syscore.merge_data import (
+    merge_newer_data,
+    merge_newer_data_no_checks,
+    spike_check_merged_data,
+    spikeCheckState,
+    spike_in_data,
+    no_spike,
+    average_change_per_day,
+    _calculate_change_in_avg_units,
+    _calculate_change_in_avg_units_for_new_rows,
+)
+
+
+def _mixed_frequency_prices(rows: int, seed: int = 0) -> pd.Series:
+    # daily and hourly data interleaved, with the odd missing price
+    rng = np.random.default_rng(seed)
+    daily = pd.date_range("2015-01-01 23:00", periods=rows // 2, freq="B")
+    hourly = pd.date_range("2015-01-01 14:00", periods=rows // 2, freq="H")
+    index = daily.union(hourly)
+    prices = 100 + np.cumsum(rng.normal(size=len(index)))
+    prices[rng.integers(0, len(index), size=10)] = np.nan
+
+    return pd.Series(prices, index=index)
+
+
+class TestSpikeCheck(unittest.TestCase):
+    def test_average_change_per_day(self):
+        prices = _mixed_frequency_prices(200)
+        index_diff_days = [
+            diff.total_seconds() / 86400 for diff in prices.index[1:] - prices.index[:-1]
+        ]
+        expected = prices.diff()[1:].values / np.array(index_diff_days) ** 0.5
+
+        np.testing.assert_array_equal(
+            average_change_per_day(prices).values, expected)
+
+    def test_incremental_state_matches_full_recalculation(self):
+        prices = _mixed_frequency_prices(3000)
+        full_change_in_avg_units = _calculate_change_in_avg_units(prices)
+
+        spike_check_state = spikeCheckState()
+        existing = prices[:1000]
+        merge_newer_data(existing[:0], existing, spike_check_state=spike_check_state)
+        for end in range(1010, len(prices), 250):
+            new_data = prices[:end]
+            merged = merge_newer_data_no_checks(existing, new_data)
+            spike_check_merged_data(merged, spike_check_state=spike_check_state)
+            self.assertIs(merged.date_of_spike, no_spike)
+            existing = merged.merged_data
+
+        self.assertEqual(spike_check_state.last_date, existing.index[-1])
+        expected_avg = (
+            average_change_per_day(existing).abs().ewm(span=500).mean().values[-1])
+        self.assertEqual(spike_check_state.avg_abs_change, expected_avg)
+
+        incremental_change_in_avg_units, _ = _calculate_change_in_avg_units_for_new_rows(
+            prices, spike_check_state=spike_check_state, rows_in_old_data=len(existing))
+        np.testing.assert_array_equal(
+            incremental_change_in_avg_units.values,
+            full_change_in_avg_units[incremental_change_in_avg_units.index].values)
+
+    def test_incremental_spike_date_matches_full_recalculation(self):
+        prices = _mixed_frequency_prices(2000, seed=1)
+        prices.iloc[1500] = prices.iloc[1499] + 500.0
+        old_data = prices[:1400]
+        new_data = prices[1400:]
+
+        spike_check_state = spikeCheckState()
+        merge_newer_data(old_data[:0], old_data, spike_check_state=spike_check_state)
+
+        full = spike_check_merged_data(merge_newer_data_no_checks(old_data, new_data))
+        incremental = spike_check_merged_data(
+            merge_newer_data_no_checks(old_data, new_data),
+            spike_check_state=spike_check_state,
+        )
+
+        self.assertEqual(full.date_of_spike, prices.index[1500])
+        self.assertEqual(incremental.date_of_spike, full.date_of_spike)
+
+        # state isn't moved on when the merged data is rejected
+        self.assertEqual(spike_check_state.last_date, old_data.index[-1])
+        self.assertIs(
+            merge_newer_data(old_data, new_data, spike_check_state=spike_check_state),
+            spike_in_data,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from syscore.dateutils import generate_fitting_dates
+from syscore.optimisation import momentsEstimator, runningMomentSums
+from syscore.optimisation_utils import optimise
+
+SIMPLE_ESTIMATE_PARAMS = dict(
+    correlation_estimate=dict(
+        func="syscore.correlations.correlation_single_period",
+        using_exponent=False,
+        min_periods=20,
+    ),
+    mean_estimate=dict(
+        func="syscore.algos.mean_estimator",
+        using_exponent=False,
+        min_periods=20),
+    vol_estimate=dict(
+        func="syscore.algos.vol_estimator",
+        using_exponent=False,
+        min_periods=20),
+)
+
+
+def _returns_with_missing_data():
+    np.random.seed(42)
+    index = pd.date_range("2000-01-07", periods=52 * 12, freq="W")
+    data = pd.DataFrame(
+        np.random.normal(0.001, 0.02, size=(len(index), 3)),
+        index=index,
+        columns=["a", "b", "c"],
+    )
+    # one asset starts late, another has gaps
+    data.iloc[:200, 2] = np.nan
+    data.iloc[50:60, 1] = np.nan
+
+    return data
+
+
+class TestRunningMomentSums(unittest.TestCase):
+    def setUp(self):
+        self.data = _returns_with_missing_data()
+        self.moments_estimator = momentsEstimator(
+            SIMPLE_ESTIMATE_PARAMS, annualisation=52)
+
+    def assert_same_moments_as_estimator(self, date_method):
+        data = self.data
+        running_sums = runningMomentSums(data)
+        for fit_period in generate_fitting_dates(
+                data, date_method, rollyears=3):
+            if fit_period.no_data:
+                continue
+            running_sums.move_to(
+                data.index.searchsorted(fit_period.fit_start, side="left"),
+                data.index.searchsorted(fit_period.fit_end, side="right"),
+            )
+            expected = self.moments_estimator.moments(
+                data[fit_period.fit_start: fit_period.fit_end])
+            result = self.moments_estimator.moments_from_running_sums(
+                running_sums)
+
+            for expected_moment, moment in zip(expected, result):
+                np.testing.assert_allclose(
+                    np.array(moment, dtype=float),
+                    np.array(expected_moment, dtype=float),
+                    rtol=1e-10,
+                    atol=1e-12,
+                )
+
+    def test_expanding(self):
+        self.assertTrue(self.moments_estimator.can_use_running_sums())
+        self.assert_same_moments_as_estimator("expanding")
+
+    def test_rolling(self):
+        self.assert_same_moments_as_estimator("rolling")
+
+    def test_exponential_estimates_not_supported(self):
+        params = dict(SIMPLE_ESTIMATE_PARAMS)
+        params["vol_estimate"] = dict(
+            func="syscore.algos.vol_estimator", using_exponent=True)
+        self.assertFalse(momentsEstimator(params).can_use_running_sums())
+
+
+class TestWarmStart(unittest.TestCase):
+    def test_same_weights_from_any_start(self):
+        sigma = np.array([[0.04, 0.01, 0.0], [0.01, 0.09, 0.02], [0.0, 0.02, 0.0625]])
+        mean_list = [0.1, 0.12, 0.08]
+
+        cold_weights = optimise(sigma, mean_list)
+        warm_weights = optimise(
+            sigma, mean_list, start_weights=[0.6, 0.3, np.nan])
+
+        # the optimiser stops when the Sharpe Ratio stops improving, not the weights
+        np.testing.assert_allclose(warm_weights, cold_weights, atol=1e-2)
+        self.assertAlmostEqual(sum(warm_weights), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+
+from syscore.algos import rolling_skew_and_kurtosis
+
+
+class Test(unittest.TestCase):
+    def test_matches_pandas_rolling(self):
+        dt_range = pd.bdate_range(start="2010-01-01", periods=1000)
+        rng = np.random.RandomState(1)
+        returns = pd.DataFrame(
+            rng.standard_t(4, size=(len(dt_range), 3)) * 0.01 + 0.001,
+            index=dt_range,
+            columns=["a", "b", "c"],
+        )
+        # late start, gaps, and nothing at all
+        returns.iloc[:300, 1] = np.nan
+        returns.iloc[500:510, 0] = np.nan
+        returns["c"] = np.nan
+
+        skew, kurtosis = rolling_skew_and_kurtosis(returns, lookback_days=365)
+
+        pd.testing.assert_frame_equal(skew, returns.rolling("365D").skew())
+        pd.testing.assert_frame_equal(kurtosis, returns.rolling("365D").kurt())
+
+
+if __name__ == "__main__":
+    unittest.main()
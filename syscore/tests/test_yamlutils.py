@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+
+from syscore.objects import missing_data
+from syscore.yamlutils import cachedYamlFile, read_yaml_file
+
+
+class TestCachedYamlFile(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tempdir.name, "config.yaml")
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write_file(self, text, mtime_ns):
+        with open(self.filename, "w") as file:
+            file.write(text)
+        os.utime(self.filename, ns=(mtime_ns, mtime_ns))
+
+    def test_reparsed_only_when_file_changes(self):
+        self.write_file("a: 1\nb:\n  c: 2\n", mtime_ns=10 ** 18)
+        cached_file = cachedYamlFile(self.filename)
+        self.assertEqual(cached_file.get("a"), 1)
+
+        parsed = cached_file._parsed_contents
+        self.assertEqual(cached_file.get("b"), dict(c=2))
+        self.assertIs(cached_file._parsed_contents, parsed)
+
+        self.write_file("a: 3\n", mtime_ns=2 * 10 ** 18)
+        self.assertEqual(cached_file.get("a"), 3)
+        self.assertIs(cached_file.get("b"), missing_data)
+
+    def test_callers_get_copies(self):
+        self.write_file("b:\n  c: 2\n", mtime_ns=10 ** 18)
+        cached_file = cachedYamlFile(self.filename)
+
+        cached_file.get("b")["c"] = 99
+        cached_file.contents()["b"]["c"] = 99
+        self.assertEqual(cached_file.get("b"), dict(c=2))
+
+    def test_missing_file(self):
+        cached_file = cachedYamlFile(self.filename)
+        self.assertIs(cached_file.contents(), missing_data)
+        self.assertEqual(cached_file.get("a", 5), 5)
+        self.assertRaises(FileNotFoundError, read_yaml_file, self.filename)
+
+
+if __name__ == "__main__":
+    unittest.main()
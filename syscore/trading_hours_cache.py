@@ -0,0 +1,129 @@
+"""
+Trading hours for each contract, kept for the rest of the day once we have them
+
+Getting trading hours means a round trip to the broker and parsing what comes back, and we check them for every
+order we trade. So the parsed hours are kept in memory, and also written to a local .json file so that other
+processes, or this one after a restart, don't have to ask the broker again. Only hours added today are used.
+"""
+
+import datetime
+import json
+import os
+
+from syscore.dateutils import manyTradingStartAndEndDateTimes
+from syscore.fileutils import get_filename_for_package, atomic_write_text
+from syscore.objects import missing_data, arg_not_supplied
+from sysdata.config.private_config import get_private_then_default_key_value
+
+DATE_KEY_FORMAT = "%Y%m%d"
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class tradingHoursCache(object):
+    def __init__(self, filename: str = arg_not_supplied):
+        if filename is arg_not_supplied:
+            filename = get_filename_for_package(
+                get_private_then_default_key_value("trading_hours_cache_file"))
+
+        self._filename = filename
+        self._trading_hours_by_key = {}
+        self._file_modified_time = missing_data
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def get_trading_hours(self, key: str) -> manyTradingStartAndEndDateTimes:
+        """
+        :return: manyTradingStartAndEndDateTimes, or missing_data if we don't have them for today
+        """
+        trading_hours = self._get_trading_hours_from_memory(key)
+        if trading_hours is missing_data and self._file_has_changed():
+            # perhaps another process has added them
+            self._read_file()
+            trading_hours = self._get_trading_hours_from_memory(key)
+
+        return trading_hours
+
+    def add_trading_hours(self, key: str, list_of_trading_hours: list) -> manyTradingStartAndEndDateTimes:
+        trading_hours = manyTradingStartAndEndDateTimes(list_of_trading_hours)
+        self._trading_hours_by_key[key] = (_today_as_key(), trading_hours)
+        self._write_file()
+
+        return trading_hours
+
+    def _get_trading_hours_from_memory(self, key: str) -> manyTradingStartAndEndDateTimes:
+        date_key, trading_hours = self._trading_hours_by_key.get(key, (None, missing_data))
+        if date_key != _today_as_key():
+            return missing_data
+
+        return trading_hours
+
+    def _file_has_changed(self) -> bool:
+        return _modified_time(self.filename) != self._file_modified_time
+
+    def _read_file(self):
+        self._file_modified_time = _modified_time(self.filename)
+        for key, (date_key, trading_hours) in _read_trading_hours_file(self.filename).items():
+            date_key_in_memory, _ = self._trading_hours_by_key.get(key, ("", missing_data))
+            # date keys sort in date order; anything newer in the file replaces what we have
+            if date_key > date_key_in_memory:
+                self._trading_hours_by_key[key] = (date_key, trading_hours)
+
+    def _write_file(self):
+        # pick up anything other processes have added first, so we don't lose it
+        if self._file_has_changed():
+            self._read_file()
+
+        today = _today_as_key()
+        file_contents = dict([
+            (key, dict(date=date_key, hours=_trading_hours_as_list_of_str(trading_hours)))
+            for key, (date_key, trading_hours) in self._trading_hours_by_key.items()
+            if date_key == today
+        ])
+
+        try:
+            atomic_write_text(self.filename, json.dumps(file_contents, indent=1, sort_keys=True))
+        except OSError:
+            # we still have them in memory
+            return None
+
+        self._file_modified_time = _modified_time(self.filename)
+
+
+def _read_trading_hours_file(filename: str) -> dict:
+    try:
+        with open(filename, "r") as cache_file:
+            file_contents = json.load(cache_file)
+    except (OSError, ValueError):
+        # missing or corrupt, so we'll get them from the broker again
+        return {}
+
+    trading_hours_by_key = {}
+    for key, entry in file_contents.items():
+        try:
+            list_of_trading_hours = [
+                (datetime.datetime.strptime(start, TIME_FORMAT),
+                 datetime.datetime.strptime(end, TIME_FORMAT))
+                for start, end in entry["hours"]]
+            trading_hours_by_key[key] = (entry["date"], manyTradingStartAndEndDateTimes(list_of_trading_hours))
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    return trading_hours_by_key
+
+
+def _trading_hours_as_list_of_str(trading_hours: manyTradingStartAndEndDateTimes) -> list:
+    return [(start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT))
+            for start, end in trading_hours.as_list_of_tuples()]
+
+
+def _today_as_key() -> str:
+    return datetime.date.today().strftime(DATE_KEY_FORMAT)
+
+
+def _modified_time(filename: str):
+    try:
+        return os.path.getmtime(filename)
+    except OSError:
+        return missing_data
@@ -0,0 +1,115 @@
+"""
+Process wide cache of parsed .yaml files
+
+Config files are read on almost every key lookup, so we parse each file once, using the C loader if it
+is installed, and only parse again if the file is modified.
+
+Callers get a copy, so they can do what they like with it without changing what anyone else sees.
+"""
+import os
+import threading
+from copy import deepcopy
+
+import yaml
+
+from syscore.objects import missing_data
+
+# C loader is much faster, but only available if pyyaml was built with libyaml
+YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+class cachedYamlFile(object):
+    def __init__(self, filename: str):
+        self._filename = filename
+        self._lock = threading.Lock()
+        self._file_signature = None
+        self._parsed_contents = missing_data
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    def contents(self):
+        """
+        :return: copy of parsed contents, or missing_data if there is no file
+        """
+        parsed_contents = self._parsed_contents_checking_for_changes()
+        if parsed_contents is missing_data:
+            return missing_data
+
+        return deepcopy(parsed_contents)
+
+    def get(self, key_name, default=missing_data):
+        """
+        :return: copy of the value for key_name in the top level dict, or default
+        """
+        parsed_contents = self._parsed_contents_checking_for_changes()
+        if not isinstance(parsed_contents, dict):
+            return default
+
+        # don't copy the default, it might be a sentinel like missing_data
+        if key_name not in parsed_contents:
+            return default
+
+        return deepcopy(parsed_contents[key_name])
+
+    def keys(self) -> list:
+        parsed_contents = self._parsed_contents_checking_for_changes()
+        if not isinstance(parsed_contents, dict):
+            return []
+
+        return list(parsed_contents.keys())
+
+    def _parsed_contents_checking_for_changes(self):
+        file_signature = self._current_file_signature()
+        with self._lock:
+            if file_signature != self._file_signature:
+                self._parsed_contents = self._parse_file(file_signature)
+                self._file_signature = file_signature
+
+            return self._parsed_contents
+
+    def _current_file_signature(self):
+        try:
+            file_stat = os.stat(self.filename)
+        except OSError:
+            return None
+
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+
+    def _parse_file(self, file_signature):
+        if file_signature is None:
+            return missing_data
+
+        with open(self.filename) as file_to_parse:
+            parsed_contents = yaml.load(file_to_parse, Loader=YAML_LOADER)
+
+        return parsed_contents
+
+
+_cached_yaml_files = {}
+_cached_yaml_files_lock = threading.Lock()
+
+
+def get_cached_yaml_file(filename: str) -> cachedYamlFile:
+    with _cached_yaml_files_lock:
+        cached_file = _cached_yaml_files.get(filename, None)
+        if cached_file is None:
+            cached_file = cachedYamlFile(filename)
+            _cached_yaml_files[filename] = cached_file
+
+    return cached_file
+
+
+def read_yaml_file(filename: str):
+    """
+    Parsed contents of a .yaml file, parsed once per process unless the file changes
+
+    :param filename: full filename
+    :return: copy of parsed contents
+    """
+    yaml_contents = get_cached_yaml_file(filename).contents()
+    if yaml_contents is missing_data:
+        raise FileNotFoundError("Can't find .yaml file %s" % filename)
+
+    return yaml_contents
@@ -37,6 +37,9 @@ class arcticFuturesAdjustedPricesData(futuresAdjustedPricesData):
     def get_list_of_instruments(self) -> list:
         return self.arctic.get_keynames()
 
+    def get_last_date_of_adjusted_prices(self, instrument_code: str):
+        return self.arctic.get_last_index(instrument_code)
+
     def _get_adjusted_prices_without_checking(self, instrument_code: str) -> futuresAdjustedPrices:
         data = self.arctic.read(instrument_code)
 
@@ -1,5 +1,7 @@
 import pandas as pd
 from arctic import Arctic
+from arctic.exceptions import NoDataFoundException
+from syscore.objects import missing_data
 from sysdata.mongodb.mongo_connection import mongoDb
 
 """
@@ -9,6 +11,9 @@ This connection won't fail if mongo missing, but will hang
 
 """
 
+# stored in the arctic metadata when we write, so we can find it without reading the data
+LAST_INDEX_METADATA_KEY = "last_index"
+
 
 class articData(object):
     """
@@ -52,10 +57,44 @@ class articData(object):
         return pd.DataFrame(item.data)
 
     def write(self, ident: str, data: pd.DataFrame):
-        self.library.write(ident, data)
+        self.library.write(ident, data, metadata=_metadata_for_data(data))
+
+    def get_last_index(self, ident: str):
+        """
+        Last index value (normally a datetime) of the data for ident, or missing_data if there is no data
+
+        Data written before we saved metadata has to be read
+        """
+        try:
+            metadata = self.library.read_metadata(ident).metadata
+        except NoDataFoundException:
+            return missing_data
+
+        if metadata is None or LAST_INDEX_METADATA_KEY not in metadata:
+            data = self.read(ident)
+            if len(data.index) == 0:
+                return missing_data
+            return data.index[-1]
+
+        last_index = metadata[LAST_INDEX_METADATA_KEY]
+        if last_index is None:
+            return missing_data
+
+        return pd.Timestamp(last_index)
 
     def get_keynames(self) -> list:
         return self.library.list_symbols()
 
     def delete(self, ident: str):
-        self.library.delete(ident)
\ No newline at end of file
+        self.library.delete(ident)
+
+
+def _metadata_for_data(data) -> dict:
+    if len(data.index) == 0:
+        return {LAST_INDEX_METADATA_KEY: None}
+
+    if not isinstance(data.index, pd.DatetimeIndex):
+        # can't be stored as is, so get_last_index will read the data
+        return {}
+
+    return {LAST_INDEX_METADATA_KEY: data.index[-1].to_pydatetime()}
@@ -4,6 +4,7 @@ Read and write data from mongodb for individual futures contracts
 """
 
 from sysdata.arctic.arctic_connection import articData
+from sysdata.mongodb.mongo_spike_check_state import mongoSpikeCheckStateData
 from sysdata.futures.futures_per_contract_prices import futuresContractPriceData, listOfFuturesContracts
 from sysobjects.futures_per_contract_prices import futuresContractPrices
 from sysobjects.contracts import futuresContract, get_code_and_id_from_contract_key
@@ -26,6 +27,7 @@ class arcticFuturesContractPriceData(futuresContractPriceData):
         super().__init__(log=log)
 
         self._arctic_connection = articData(CONTRACT_COLLECTION, mongo_db=mongo_db)
+        self._spike_check_state_data = mongoSpikeCheckStateData(mongo_db=mongo_db)
 
     def __repr__(self):
         return "simData connection for individual futures contracts prices, arctic %s/%s @ %s " % (
@@ -74,6 +76,16 @@ class arcticFuturesContractPriceData(futuresContractPriceData):
                      (len(futures_price_data),
                       str(futures_contract_object.key), str(self)))
 
+    def _get_spike_check_state_dict_for_contract_object(self, futures_contract_object: futuresContract):
+        return self._spike_check_state_data.get_state_dict_for_contract(futures_contract_object)
+
+    def _write_spike_check_state_dict_for_contract_object(
+            self, futures_contract_object: futuresContract, state_dict: dict):
+        self._spike_check_state_data.write_state_dict_for_contract(futures_contract_object, state_dict)
+
+    def _delete_spike_check_state_dict_for_contract_object(self, futures_contract_object: futuresContract):
+        self._spike_check_state_data.delete_state_dict_for_contract(futures_contract_object)
+
     def get_contracts_with_price_data(self) -> listOfFuturesContracts:
         """
 
@@ -30,6 +30,9 @@ class arcticFxPricesData(fxPricesData):
     def get_list_of_fxcodes(self) -> list:
         return self.arctic.get_keynames()
 
+    def get_last_date_of_fx_prices(self, code: str):
+        return self.arctic.get_last_index(code)
+
     def _get_fx_prices_without_checking(self, currency_code: str) -> fxPrices:
 
         fx_data = self.arctic.read(currency_code)
@@ -15,9 +15,10 @@ from copy import copy
 
 import yaml
 from syscore.fileutils import get_filename_for_package
-from systems.defaults import get_system_defaults
+from syscore.yamlutils import read_yaml_file
+from systems.defaults import get_default_config_key_value, get_list_of_default_config_keys
 from syslogdiag.log import logtoscreen
-from syscore.objects import get_methods
+from syscore.objects import get_methods, missing_data
 
 RESERVED_NAMES = ["log", "_elements"]
 
@@ -82,9 +83,7 @@ class Config(object):
         elif isinstance(config_item, str):
             # must be a file YAML'able, from which we load the
             filename = get_filename_for_package(config_item)
-            with open(filename) as file_to_parse:
-                dict_to_parse = yaml.load(
-                    file_to_parse, Loader=yaml.FullLoader)
+            dict_to_parse = read_yaml_file(filename)
 
             self._create_config_from_dict(dict_to_parse)
 
@@ -177,7 +176,7 @@ class Config(object):
         self.log.msg("Adding config defaults")
 
         existing_elements = self._elements
-        default_elements = list(get_system_defaults().keys())
+        default_elements = get_list_of_default_config_keys()
 
         new_elements = list(set(existing_elements + default_elements))
         [self.element_fill_with_defaults(element_name)
@@ -194,7 +193,7 @@ class Config(object):
         """
 
         config_item = getattr(self, element_name, None)
-        default_item = get_system_defaults().get(element_name, None)
+        default_item = _get_default_config_item(element_name, None)
 
         if config_item is None:
             if default_item is None:
@@ -225,7 +224,7 @@ class Config(object):
         """
         config_dict = copy(getattr(self, element_name, dict()))
 
-        default_dict = get_system_defaults().get(element_name, dict())
+        default_dict = _get_default_config_item(element_name, dict())
         required = default_dict.keys()
 
         for dict_key in required:
@@ -257,7 +256,7 @@ class Config(object):
         element_in_config = copy(getattr(self, element_name, dict()))
         nested_config_dict = element_in_config.get(dict_name, dict())
 
-        element_in_default = get_system_defaults().get(element_name, dict())
+        element_in_default = _get_default_config_item(element_name, dict())
         nested_default_dict = element_in_default.get(dict_name, dict())
 
         required = nested_default_dict.keys()
@@ -289,6 +288,14 @@ class Config(object):
             yaml.dump(config_to_save, file)
 
 
+def _get_default_config_item(element_name, default):
+    default_item = get_default_config_key_value(element_name)
+    if default_item is missing_data:
+        return default
+
+    return default_item
+
+
 if __name__ == "__main__":
     import doctest
 
@@ -1,6 +1,6 @@
-import yaml
 from syscore.fileutils import get_filename_for_package, get_resolved_pathname
 from syscore.objects import missing_data, arg_not_supplied
+from syscore.yamlutils import get_cached_yaml_file
 from systems.defaults import (
     get_default_config_key_value,
     get_system_defaults,
@@ -11,11 +11,13 @@ PRIVATE_CONFIG_FILE = get_filename_for_package("private.private_config.yaml")
 
 def get_private_config():
     try:
-        with open(PRIVATE_CONFIG_FILE) as file_to_parse:
-            config_dict = yaml.load(file_to_parse, Loader=yaml.FullLoader)
+        config_dict = get_cached_yaml_file(PRIVATE_CONFIG_FILE).contents()
     except BaseException:
         config_dict = {}
 
+    if config_dict is missing_data:
+        config_dict = {}
+
     return config_dict
 
 
@@ -23,8 +25,9 @@ def get_private_config_key_value(
     key_name, private_config_dict=arg_not_supplied, raise_error=False
 ):
     if private_config_dict is arg_not_supplied:
-        private_config_dict = get_private_config()
-    key_value = private_config_dict.get(key_name, missing_data)
+        key_value = _get_key_value_from_private_config_file(key_name)
+    else:
+        key_value = private_config_dict.get(key_name, missing_data)
 
     if key_value is missing_data and raise_error:
         raise KeyError(
@@ -35,6 +38,16 @@ def get_private_config_key_value(
     return key_value
 
 
+def _get_key_value_from_private_config_file(key_name):
+    # avoids copying the whole dict just to get one value
+    try:
+        key_value = get_cached_yaml_file(PRIVATE_CONFIG_FILE).get(key_name, missing_data)
+    except BaseException:
+        key_value = missing_data
+
+    return key_value
+
+
 def get_private_then_default_key_value(
     key_name,
     system_defaults_dict=arg_not_supplied,
@@ -1,13 +1,16 @@
 from copy import copy
+from typing import TYPE_CHECKING
 
-from sysbrokers.IB.ib_connection import connectionIB
 from syscore.objects import arg_not_supplied, get_class_name
 from syscore.text import camel_case_split
-from sysdata.mongodb.mongo_connection import mongoDb
-from sysdata.mongodb.mongo_log import logToMongod
 from syslogdiag.log import logger
 
-from sysdata.mongodb.mongo_IB_client_id import mongoIbBrokerClientIdData
+# Broker and database modules (ib_insync, pymongo, arctic) are slow to import and not needed for
+# simulation from .csv files, so they are only imported when a connection is actually needed
+if TYPE_CHECKING:
+    from sysbrokers.IB.ib_connection import connectionIB
+    from sysdata.mongodb.mongo_connection import mongoDb
+
 
 class dataBlob(object):
     def __init__(
@@ -15,8 +18,8 @@ class dataBlob(object):
         class_list: list=arg_not_supplied,
         log_name: str="",
         csv_data_paths: dict=arg_not_supplied,
-        ib_conn: connectionIB=arg_not_supplied,
-        mongo_db: mongoDb=arg_not_supplied,
+        ib_conn: "connectionIB"=arg_not_supplied,
+        mongo_db: "mongoDb"=arg_not_supplied,
         log: logger=arg_not_supplied,
         keep_original_prefix: bool=False,
     ):
@@ -239,6 +242,8 @@ class dataBlob(object):
     def ib_conn(self):
         ib_conn = getattr(self, "_ib_conn", arg_not_supplied)
         if ib_conn is arg_not_supplied:
+            from sysbrokers.IB.ib_connection import connectionIB
+            from sysdata.mongodb.mongo_IB_client_id import mongoIbBrokerClientIdData
 
             ## default to tracking ID through mongo change if required
             self.add_class_object(mongoIbBrokerClientIdData)
@@ -252,6 +257,8 @@ class dataBlob(object):
     def mongo_db(self):
         mongo_db = getattr(self, "_mongo_db", arg_not_supplied)
         if mongo_db is arg_not_supplied:
+            from sysdata.mongodb.mongo_connection import mongoDb
+
             mongo_db = mongoDb()
             self._mongo_db = mongo_db
 
@@ -265,6 +272,8 @@ class dataBlob(object):
     def log(self):
         log = getattr(self, "_log", arg_not_supplied)
         if log is arg_not_supplied:
+            from sysdata.mongodb.mongo_log import logToMongod
+
             log = logToMongod(self.log_name, mongo_db=self.mongo_db, data = self)
             log.set_logging_level("on")
             self._log = log
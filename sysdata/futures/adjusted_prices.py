@@ -6,6 +6,7 @@ Adjusted prices:
 
 """
 
+from syscore.objects import missing_data
 from sysdata.base_data import baseData
 from sysobjects.adjusted_prices import futuresAdjustedPrices
 
@@ -35,6 +36,14 @@ class futuresAdjustedPricesData(baseData):
     def __getitem__(self, instrument_code: str) -> futuresAdjustedPrices:
         return self.get_adjusted_prices(instrument_code)
 
+    def get_last_date_of_adjusted_prices(self, instrument_code: str):
+        ## override if this can be done without reading all the prices
+        adjusted_prices = self.get_adjusted_prices(instrument_code)
+        if len(adjusted_prices) == 0:
+            return missing_data
+
+        return adjusted_prices.index[-1]
+
     def delete_adjusted_prices(self, instrument_code: str, are_you_sure: bool=False):
         if are_you_sure:
             if self.is_code_in_data(instrument_code):
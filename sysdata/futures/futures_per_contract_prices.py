@@ -1,5 +1,6 @@
 from sysdata.base_data import baseData
-from syscore.merge_data import spike_in_data
+from syscore.merge_data import spike_in_data, spikeCheckState
+from syscore.objects import missing_data
 
 from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from sysobjects.contract_dates_and_expiries import listOfContractDateStr
@@ -25,6 +26,7 @@ class futuresContractPriceData(baseData):
 
     def __init__(self, log=logtoscreen("futuresContractPriceData")):
         super().__init__(log=log)
+        self._spike_check_states = {}
 
     def __repr__(self):
         return "Individual futures contract price data - DO NOT USE"
@@ -136,6 +138,23 @@ class futuresContractPriceData(baseData):
             return futuresContractPrices.create_empty()
 
 
+    def get_dict_of_prices_for_list_of_contracts(self, list_of_contracts: listOfFuturesContracts) -> dict:
+        """
+        get prices for several contracts, only checking once which contracts we have data for
+
+        :param list_of_contracts:  listOfFuturesContracts
+        :return: dict, keys are contract keys
+        """
+        list_of_contracts_with_price_data = self.get_contracts_with_price_data()
+        dict_of_prices = dict([
+            (contract_object.key,
+             self._get_prices_for_contract_object_no_checking(contract_object)
+             if contract_object in list_of_contracts_with_price_data
+             else futuresContractPrices.create_empty())
+            for contract_object in list_of_contracts])
+
+        return dict_of_prices
+
     def get_prices_at_frequency_for_contract_object(
             self, contract_object: futuresContract, freq: str="D"):
         """
@@ -204,7 +223,8 @@ class futuresContractPriceData(baseData):
         old_prices = self.get_prices_for_contract_object(
             contract_object)
         merged_prices = old_prices.add_rows_to_existing_data(
-            new_futures_per_contract_prices, check_for_spike=check_for_spike
+            new_futures_per_contract_prices, check_for_spike=check_for_spike,
+            spike_check_state=self._get_spike_check_state(contract_object)
         )
 
         if merged_prices is spike_in_data:
@@ -231,12 +251,40 @@ class futuresContractPriceData(baseData):
         self.write_prices_for_contract_object(
             contract_object, merged_prices, ignore_duplication=True
         )
+        if check_for_spike:
+            self._write_spike_check_state(contract_object)
 
         new_log.msg("Added %d additional rows of data" % rows_added)
 
         return rows_added
 
 
+    def _get_spike_check_state(self, contract_object: futuresContract) -> spikeCheckState:
+        # We update the same contract more than once (once per frequency), so keep the spike check
+        # state from the last update; it's ignored if the stored prices have changed in the meantime
+        spike_check_state = self._spike_check_states.get(contract_object.key, None)
+        if spike_check_state is None:
+            spike_check_state = self._get_stored_spike_check_state(contract_object)
+            self._spike_check_states[contract_object.key] = spike_check_state
+
+        return spike_check_state
+
+    def _get_stored_spike_check_state(self, contract_object: futuresContract) -> spikeCheckState:
+        state_dict = self._get_spike_check_state_dict_for_contract_object(contract_object)
+        if state_dict is missing_data:
+            return spikeCheckState()
+
+        return spikeCheckState.from_dict(state_dict)
+
+    def _delete_spike_check_state(self, contract_object: futuresContract):
+        self._spike_check_states.pop(contract_object.key, None)
+        self._delete_spike_check_state_dict_for_contract_object(contract_object)
+
+    def _write_spike_check_state(self, contract_object: futuresContract):
+        spike_check_state = self._get_spike_check_state(contract_object)
+        self._write_spike_check_state_dict_for_contract_object(
+            contract_object, spike_check_state.as_dict())
+
     def delete_prices_for_contract_object(
         self, futures_contract_object: futuresContract, areyousure=False
     ):
@@ -254,6 +302,7 @@ class futuresContractPriceData(baseData):
             self._delete_prices_for_contract_object_with_no_checks_be_careful(
                 futures_contract_object
             )
+            self._delete_spike_check_state(futures_contract_object)
         else:
             log = futures_contract_object.log(self.log)
             log.warn("Tried to delete non existent contract")
@@ -282,6 +331,17 @@ class futuresContractPriceData(baseData):
     ):
         raise NotImplementedError(BASE_CLASS_ERROR)
 
+    def _get_spike_check_state_dict_for_contract_object(self, futures_contract_object: futuresContract):
+        # by default the state isn't stored, so it's only kept for the life of this object
+        return missing_data
+
+    def _write_spike_check_state_dict_for_contract_object(
+            self, futures_contract_object: futuresContract, state_dict: dict):
+        pass
+
+    def _delete_spike_check_state_dict_for_contract_object(self, futures_contract_object: futuresContract):
+        pass
+
     def _write_prices_for_contract_object_no_checking(
         self, futures_contract_object: futuresContract, futures_price_data: futuresContractPrices
     ):
@@ -4,7 +4,9 @@ Spot fx prices
 
 import pandas as pd
 import datetime
+from functools import lru_cache
 
+from syscore.objects import missing_data
 from sysdata.base_data import baseData
 from syscore.merge_data import spike_in_data
 
@@ -12,12 +14,17 @@ from sysobjects.spot_fx_prices import fxPrices, get_fx_tuple_from_code, DEFAULT_
 from sysdata.config.private_config import get_private_then_default_key_value
 
 
-DEFAULT_DATES = pd.date_range(
-    start=datetime.datetime(1970, 1, 1), freq="B", end=datetime.datetime.now()
-)
-DEFAULT_RATE_SERIES = pd.Series(
-    [1.0] * len(DEFAULT_DATES),
-    index=DEFAULT_DATES)
+# Building this takes ~0.1 seconds, so we don't do it on import
+@lru_cache(maxsize=1)
+def get_default_rate_series() -> pd.Series:
+    default_dates = pd.date_range(
+        start=datetime.datetime(1970, 1, 1), freq="B", end=datetime.datetime.now()
+    )
+    default_rate_series = pd.Series(
+        [1.0] * len(default_dates),
+        index=default_dates)
+
+    return default_rate_series
 
 USE_CHILD_CLASS_ERROR = "You need to use a child class of fxPricesData"
 
@@ -51,7 +58,7 @@ class fxPricesData(baseData):
 
         if currency1 == currency2:
             # Trivial, just a bunch of 1's
-            fx_data = DEFAULT_RATE_SERIES
+            fx_data = get_default_rate_series()
 
         elif currency2 == DEFAULT_CURRENCY:
             # We ought to have data
@@ -226,6 +233,14 @@ class fxPricesData(baseData):
     def get_list_of_fxcodes(self):
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
 
+    def get_last_date_of_fx_prices(self, code: str):
+        ## override if this can be done without reading all the prices
+        fx_prices = self._get_fx_prices(code)
+        if len(fx_prices) == 0:
+            return missing_data
+
+        return fx_prices.index[-1]
+
     def _add_fx_prices_without_checking_for_existing_entry(
             self, code, fx_price_data):
         raise NotImplementedError(USE_CHILD_CLASS_ERROR)
@@ -82,7 +82,10 @@ class mongoDb():
     But requires adding a collection with mongoConnection before useful
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, mongo_client=arg_not_supplied, **kwargs):
+        """
+        :param mongo_client: pass a stand in such as mongomock.MongoClient() to test without a database
+        """
 
         database_name, host, port = mongo_defaults(**kwargs)
 
@@ -90,7 +93,10 @@ class mongoDb():
         self.host = host
         self.port = port
 
-        client = mongo_client_factory.get_mongo_client(host, port)
+        if mongo_client is arg_not_supplied:
+            client = mongo_client_factory.get_mongo_client(host, port)
+        else:
+            client = mongo_client
         db = client[database_name]
 
         self.client = client
@@ -179,6 +185,17 @@ class mongoConnection(object):
                 name=joint_indexname,
             )
 
+    def create_compound_index(self, list_of_index_names: list, order=ASCENDING):
+        # not unique; for speeding up queries rather than identifying records
+        joint_indexname = "_".join(list_of_index_names)
+        if self.check_for_index(joint_indexname):
+            pass
+        else:
+            self.collection.create_index(
+                [(indexname, order) for indexname in list_of_index_names],
+                name=joint_indexname,
+            )
+
 def mongo_clean_ints(dict_to_clean):
     """
     Mongo doesn't like ints
@@ -1,9 +1,12 @@
 
+import re
+
 CONTRACT_COLLECTION = "futures_contracts"
+CONTRACT_KEY = "contract_key"
 
 from syscore.objects import arg_not_supplied
 from sysdata.futures.contracts import futuresContractData
-from sysobjects.contracts import  contract_key_from_code_and_id, futuresContract, get_code_and_id_from_contract_key, key_contains_instrument_code, listOfFuturesContracts
+from sysobjects.contracts import  contract_key_from_code_and_id, futuresContract, get_code_and_id_from_contract_key, listOfFuturesContracts
 from syslogdiag.log import logtoscreen
 from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey, missing_data
 
@@ -19,7 +22,7 @@ class mongoFuturesContractData(futuresContractData):
             "mongoFuturesContractData")):
 
         super().__init__(log=log)
-        mongo_data = mongoDataWithSingleKey(CONTRACT_COLLECTION, "contract_key", mongo_db = mongo_db)
+        mongo_data = mongoDataWithSingleKey(CONTRACT_COLLECTION, CONTRACT_KEY, mongo_db = mongo_db)
         self._mongo_data = mongo_data
 
 
@@ -38,18 +41,20 @@ class mongoFuturesContractData(futuresContractData):
         return self.mongo_data.get_list_of_keys()
 
     def get_all_contract_objects_for_instrument_code(self, instrument_code: str) -> listOfFuturesContracts:
+        custom_dict = _custom_dict_for_instrument_code(instrument_code)
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(custom_dict)
 
-        list_of_keys = self._get_all_contract_keys_for_instrument_code(instrument_code)
-        list_of_objects = [self._get_contract_data_from_key_without_checking(key) for key in list_of_keys]
+        list_of_objects = []
+        for result_dict in list_of_result_dicts:
+            result_dict.pop(CONTRACT_KEY)
+            list_of_objects.append(futuresContract.create_from_dict(result_dict))
         list_of_futures_contracts = listOfFuturesContracts(list_of_objects)
 
         return list_of_futures_contracts
 
     def _get_all_contract_keys_for_instrument_code(self, instrument_code:str) -> list:
-        list_of_all_contract_keys = self.get_list_of_all_contract_keys()
-        list_of_relevant_keys = [contract_key
-                                 for contract_key in list_of_all_contract_keys
-                                 if key_contains_instrument_code(contract_key, instrument_code)]
+        custom_dict = _custom_dict_for_instrument_code(instrument_code)
+        list_of_relevant_keys = self.mongo_data.get_list_of_keys_for_custom_dict(custom_dict)
 
         return list_of_relevant_keys
 
@@ -92,3 +97,8 @@ class mongoFuturesContractData(futuresContractData):
         contract_object_as_dict = contract_object.as_dict()
         key = contract_object.key
         self.mongo_data.add_data(key, contract_object_as_dict, allow_overwrite=True)
+
+
+def _custom_dict_for_instrument_code(instrument_code: str) -> dict:
+    # keys are instrument_code/contract_id, so this can use the index on the key
+    return {CONTRACT_KEY: {"$regex": "^%s/" % re.escape(instrument_code)}}
@@ -34,6 +34,13 @@ class mongoDataWithSingleKey(object):
             ## no big deal
 
 
+    def create_compound_index(self, list_of_key_names: list):
+        try:
+            self._mongo.create_compound_index(list_of_key_names)
+        except:
+            pass
+            ## no big deal, queries will just be slower
+
     def __repr__(self):
         return self.name
 
@@ -104,6 +111,13 @@ class mongoDataWithSingleKey(object):
 
         return dict_list
 
+    def get_list_of_keys_for_custom_dict(self, custom_dict: dict) -> list:
+        key_name = self.key_name
+        cursor = self._mongo.collection.find(custom_dict, {key_name: 1})
+        key_list = [db_entry[key_name] for db_entry in cursor]
+
+        return key_list
+
     def key_is_in_data(self, key):
         result = self.get_result_dict_for_key(key)
         if result is missing_data:
@@ -163,6 +177,14 @@ class mongoDataWithMultipleKeys(object):
 
         self._mongo = mongo_object
 
+    def create_multikey_index(self, key_name1: str, key_name2: str):
+        # this won't create the index if it already exists
+        try:
+            self._mongo.create_multikey_index(key_name1, key_name2)
+        except:
+            pass
+            ## no big deal, eg old style records without the keys
+
 
     def __repr__(self):
         return self.name
@@ -240,6 +262,27 @@ class mongoDataWithMultipleKeys(object):
 
         self._mongo.collection.update_one(dict_of_keys, {"$set":cleaned_data_dict})
 
+    def increment_data(self, dict_of_keys: dict, dict_of_increments: dict) -> bool:
+        """
+        Add to values in the record matching dict_of_keys, in one atomic update
+
+        :return: False if no record matched
+        """
+        result = self._mongo.collection.update_one(dict_of_keys, {"$inc": dict_of_increments})
+
+        return result.matched_count > 0
+
+    def update_data_taking_maximum(self, dict_of_keys: dict, dict_of_maximums: dict, data_dict: dict = arg_not_supplied):
+        """
+        Replace values in the record matching dict_of_keys only where they'd increase, and set any in data_dict,
+         in one atomic update. The record is created if it doesn't exist
+        """
+        update = {"$max": dict_of_maximums}
+        if data_dict is not arg_not_supplied:
+            update["$set"] = data_dict
+
+        self._mongo.collection.update_one(dict_of_keys, update, upsert=True)
+
     def _add_new_cleaned_dict(self, dict_of_keys: dict, cleaned_data_dict: dict):
         dict_with_both_keys_and_data= {}
         dict_with_both_keys_and_data.update(cleaned_data_dict)
@@ -1,4 +1,5 @@
 import datetime
+import re
 
 from syscore.objects import success, missing_order, missing_data, arg_not_supplied
 from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey
@@ -7,6 +8,7 @@ from sysexecution.orders.base_orders import Order
 from sysexecution.orders.instrument_orders import instrumentOrder
 from sysexecution.orders.contract_orders import contractOrder
 from sysexecution.orders.broker_orders import brokerOrder
+from sysexecution.orders.list_of_orders import listOfOrders
 
 from syslogdiag.log import logtoscreen
 from sysdata.production.historic_orders import (
@@ -21,6 +23,11 @@ from sysobjects.production.tradeable_object import instrumentStrategy , \
 
 ORDER_ID_STORE_KEY = "_ORDER_ID_STORE_KEY"
 
+# Stored alongside each order so we can index and filter on them; not part of the order itself
+INSTRUMENT_CODE_FIELD = "instrument_code"
+STRATEGY_NAME_FIELD = "strategy_name"
+FILL_DATETIME_FIELD = "fill_datetime"
+
 
 class mongoGenericHistoricOrdersData(genericOrdersData):
     """
@@ -48,6 +55,8 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
         # super().__init__()
         collection_name = self._collection_name()
         self._mongo_data = mongoDataWithSingleKey(collection_name, "order_id", mongo_db=mongo_db)
+        self._mongo_data.create_compound_index([FILL_DATETIME_FIELD, INSTRUMENT_CODE_FIELD, STRATEGY_NAME_FIELD])
+        self._mongo_data.create_compound_index([INSTRUMENT_CODE_FIELD, STRATEGY_NAME_FIELD, FILL_DATETIME_FIELD])
 
         super().__init__(log = log)
 
@@ -75,7 +84,7 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
 
     def _add_order_to_data_no_checking(self, order: Order):
         # Duplicates will be overriden, so be careful
-        mongo_record = order.as_dict()
+        mongo_record = _mongo_record_from_order(order)
 
         self.mongo_data.add_data(order.order_id, mongo_record, allow_overwrite=True)
 
@@ -85,6 +94,44 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
         if result_dict is missing_data:
             return missing_order
 
+        order = self._order_from_result_dict(result_dict)
+
+        return order
+
+    def get_list_of_orders_with_orderids(self, list_of_order_ids: list) -> listOfOrders:
+        custom_dict = dict(order_id={"$in": list(list_of_order_ids)})
+        list_of_orders = self._get_list_of_orders_for_custom_dict(custom_dict)
+
+        # same order as requested
+        orders_by_id = dict([(order.order_id, order) for order in list_of_orders])
+        list_of_orders = [orders_by_id[order_id] for order_id in list_of_order_ids
+                          if order_id in orders_by_id]
+
+        return listOfOrders(list_of_orders)
+
+    def get_list_of_orders_in_date_range(
+            self,
+            period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied,
+            instrument_code: str = arg_not_supplied,
+            strategy_name: str = arg_not_supplied) -> listOfOrders:
+
+        custom_dict = _date_range_query(period_start, period_end)
+        custom_dict.update(_instrument_and_strategy_query(instrument_code=instrument_code,
+                                                          strategy_name=strategy_name))
+
+        return self._get_list_of_orders_for_custom_dict(custom_dict)
+
+    def _get_list_of_orders_for_custom_dict(self, custom_dict: dict) -> listOfOrders:
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(custom_dict)
+        list_of_orders = [self._order_from_result_dict(result_dict) for result_dict in list_of_result_dicts]
+
+        return listOfOrders(list_of_orders)
+
+    def _order_from_result_dict(self, result_dict: dict) -> Order:
+        result_dict.pop(INSTRUMENT_CODE_FIELD, None)
+        result_dict.pop(STRATEGY_NAME_FIELD, None)
+
         order_class = self._order_class()
         order = order_class.from_dict(result_dict)
 
@@ -95,7 +142,7 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
         self.mongo_data.delete_data_without_any_warning(order_id)
 
     def update_order_with_orderid(self, order_id, order):
-        mongo_record = order.as_dict()
+        mongo_record = _mongo_record_from_order(order)
         self.mongo_data.add_data(order_id, mongo_record)
 
     def get_list_of_order_ids(self) -> list:
@@ -108,14 +155,8 @@ class mongoGenericHistoricOrdersData(genericOrdersData):
             period_start: datetime.datetime,
             period_end: datetime.datetime=arg_not_supplied) -> list:
 
-        if period_end is arg_not_supplied:
-            period_end = datetime.datetime.now()
-
-        find_dict =\
-            dict(fill_datetime={"$gte": period_start, "$lt": period_end})
-
-        list_of_order_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(find_dict)
-        order_ids = [order_dict['order_id'] for order_dict in list_of_order_dicts]
+        find_dict = _date_range_query(period_start, period_end)
+        order_ids = self.mongo_data.get_list_of_keys_for_custom_dict(find_dict)
 
         return order_ids
 
@@ -133,24 +174,14 @@ class mongoStrategyHistoricOrdersData(
 
 
     def get_list_of_order_ids_for_instrument_strategy(self, instrument_strategy: instrumentStrategy) -> list:
+        custom_dict = _instrument_strategy_query(instrument_strategy)
 
-        old_list_of_order_id = self._get_list_of_order_ids_for_instrument_strategy_specify_key(instrument_strategy,
-                                                                                           "old_key")
-        new_list_of_order_id = self._get_list_of_order_ids_for_instrument_strategy_specify_key(instrument_strategy,
-                                                                                           "key")
-
-        return old_list_of_order_id + new_list_of_order_id
-
-    def _get_list_of_order_ids_for_instrument_strategy_specify_key(self, instrument_strategy: instrumentStrategy,
-                                                                   keyfield: str) -> list:
-
-        object_key = getattr(instrument_strategy, keyfield)
-        custom_dict = dict(key = object_key)
-        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(custom_dict)
+        return self.mongo_data.get_list_of_keys_for_custom_dict(custom_dict)
 
-        list_of_order_id = [result["order_id"] for result in list_of_result_dicts]
+    def get_list_of_orders_for_instrument_strategy(self, instrument_strategy: instrumentStrategy) -> listOfOrders:
+        custom_dict = _instrument_strategy_query(instrument_strategy)
 
-        return list_of_order_id
+        return self._get_list_of_orders_for_custom_dict(custom_dict)
 
 
 class mongoContractHistoricOrdersData(
@@ -181,24 +212,82 @@ class mongoBrokerHistoricOrdersData(
 
     def get_list_of_order_ids_for_instrument_and_contract_str(self, instrument_code: str,
                                                               contract_str: str) -> list:
-        order_id_list = self.get_list_of_order_ids()
-        key_list = [self.mongo_data.get_result_dict_for_key(order_id)['key'] for order_id in order_id_list]
-        contract_strategies = [futuresContractStrategy.from_key(key) for key in key_list]
-
-        def _contains_both(futures_contract_strategy: futuresContractStrategy, instrument_code: str,
-                                                              contract_str: str):
-            list_of_date_str = futures_contract_strategy.contract_date.list_of_date_str
-            if futures_contract_strategy.instrument_code == instrument_code and\
-                contract_str in list_of_date_str:
-                return True
-            else:
-                return False
+        custom_dict = _instrument_and_strategy_query(instrument_code=instrument_code)
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(custom_dict)
+
+        # spread orders have more than one contract in the key, so we check these here
+        order_ids = [result_dict["order_id"] for result_dict in list_of_result_dicts
+                     if contract_str in futuresContractStrategy.from_key(
+                         result_dict["key"]).contract_date.list_of_date_str]
+
+        return order_ids
+
+    def get_list_of_orders_for_instrument_code(self, instrument_code: str) -> listOfOrders:
+        custom_dict = _instrument_and_strategy_query(instrument_code=instrument_code)
+
+        return self._get_list_of_orders_for_custom_dict(custom_dict)
+
+
+def _mongo_record_from_order(order: Order) -> dict:
+    mongo_record = order.as_dict()
+    mongo_record[INSTRUMENT_CODE_FIELD] = order.instrument_code
+    mongo_record[STRATEGY_NAME_FIELD] = order.strategy_name
+
+    return mongo_record
+
 
-        order_ids = [orderid for orderid, futures_contract_strategy in zip(order_id_list,
-                                                                           contract_strategies)
-                     if _contains_both(futures_contract_strategy,
-                                       instrument_code=instrument_code,
-                                       contract_str=contract_str)]
+def _date_range_query(period_start: datetime.datetime,
+                      period_end: datetime.datetime = arg_not_supplied) -> dict:
+    if period_end is arg_not_supplied:
+        period_end = datetime.datetime.now()
 
+    return {FILL_DATETIME_FIELD: {"$gte": period_start, "$lt": period_end}}
 
-        return order_ids
\ No newline at end of file
+
+def _instrument_strategy_query(instrument_strategy: instrumentStrategy) -> dict:
+    return _instrument_and_strategy_query(instrument_code=instrument_strategy.instrument_code,
+                                          strategy_name=instrument_strategy.strategy_name)
+
+
+def _instrument_and_strategy_query(instrument_code: str = arg_not_supplied,
+                                   strategy_name: str = arg_not_supplied) -> dict:
+    indexed_query = {}
+    if instrument_code is not arg_not_supplied:
+        indexed_query[INSTRUMENT_CODE_FIELD] = instrument_code
+    if strategy_name is not arg_not_supplied:
+        indexed_query[STRATEGY_NAME_FIELD] = strategy_name
+
+    if len(indexed_query) == 0:
+        return {}
+
+    # orders written before we stored these fields only have them in the key
+    legacy_query = {INSTRUMENT_CODE_FIELD: {"$exists": False},
+                    "key": {"$regex": _key_regex(instrument_code=instrument_code,
+                                                 strategy_name=strategy_name)}}
+
+    return {"$or": [indexed_query, legacy_query]}
+
+
+def _key_regex(instrument_code: str = arg_not_supplied,
+               strategy_name: str = arg_not_supplied) -> str:
+    """
+    Keys are strategy/instrument/contract, or strategy/instrument or 'strategy instrument' for instrument orders
+
+    >>> import re
+    >>> [bool(re.match(_key_regex(instrument_code="US10"), key)) for key in ["a/US10/20200300", "a US10", "a/US10", "a/US10Y"]]
+    [True, True, True, False]
+    >>> bool(re.match(_key_regex(instrument_code="US10", strategy_name="b"), "a/US10/20200300"))
+    False
+    """
+    any_part = "[^/ ]*"
+    if strategy_name is arg_not_supplied:
+        strategy_regex = any_part
+    else:
+        strategy_regex = re.escape(strategy_name)
+
+    if instrument_code is arg_not_supplied:
+        instrument_regex = any_part
+    else:
+        instrument_regex = re.escape(instrument_code)
+
+    return "^%s[/ ]%s(/|$)" % (strategy_regex, instrument_regex)
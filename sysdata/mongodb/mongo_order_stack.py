@@ -4,6 +4,7 @@ from syslogdiag.log import logtoscreen
 
 from sysexecution.order_stacks.order_stack import orderStackData, missing_order
 from sysexecution.orders.base_orders import Order
+from sysexecution.orders.list_of_orders import listOfOrders
 from sysexecution.orders.instrument_orders import instrumentOrder
 from sysexecution.order_stacks.instrument_order_stack import instrumentOrderStackData
 from sysexecution.orders.contract_orders import contractOrder
@@ -55,6 +56,25 @@ class mongoOrderStackData(orderStackData):
         return order
 
 
+    def get_list_of_orders_from_order_id_list(self, list_of_order_ids) -> listOfOrders:
+        # one query rather than one for each order
+        list_of_order_ids = [int(order_id) for order_id in list_of_order_ids]
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(
+            {"order_id": {"$in": list_of_order_ids}})
+        order_class = self._order_class()
+        orders_by_id = dict([(result_dict["order_id"], order_class.from_dict(result_dict))
+                             for result_dict in list_of_result_dicts])
+
+        return listOfOrders([orders_by_id.get(order_id, missing_order)
+                             for order_id in list_of_order_ids])
+
+    def get_list_of_order_ids(self, exclude_inactive_orders: bool=True) -> list:
+        if not exclude_inactive_orders:
+            return self._get_list_of_all_order_ids()
+
+        # the order id store doesn't have an active flag, so won't be included
+        return self.mongo_data.get_list_of_keys_for_custom_dict({"active": True})
+
     def _get_list_of_all_order_ids(self) -> list:
         order_ids = self.mongo_data.get_list_of_keys()
         order_ids.pop(order_ids.index(ORDER_ID_STORE_KEY))
@@ -126,3 +146,10 @@ class mongoBrokerOrderStackData(mongoOrderStackData, brokerOrderStackData):
     def _order_class(self):
         return brokerOrder
 
+    def get_list_of_orders_with_broker_tempids(self, list_of_broker_tempids: list) -> listOfOrders:
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(
+            {"broker_tempid": {"$in": list(list_of_broker_tempids)}, "active": True})
+
+        return listOfOrders([brokerOrder.from_dict(result_dict)
+                             for result_dict in list_of_result_dicts])
+
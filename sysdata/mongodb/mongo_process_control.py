@@ -1,4 +1,4 @@
-from sysobjects.production.process_control import controlProcess
+from sysobjects.production.process_control import controlProcess, dictOfControlProcesses
 from sysdata.production.process_control_data import controlProcessData
 from syscore.objects import missing_data, arg_not_supplied
 
@@ -34,6 +34,15 @@ class mongoControlProcessData(controlProcessData):
     def get_list_of_process_names(self):
         return self.mongo_data.get_list_of_keys()
 
+    def get_dict_of_control_processes(self) -> dictOfControlProcesses:
+        # one read, rather than one for each process
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict({})
+        key_name = self.mongo_data.key_name
+        output_dict = dict([(result_dict.pop(key_name), controlProcess.from_dict(result_dict))
+                            for result_dict in list_of_result_dicts])
+
+        return dictOfControlProcesses(output_dict)
+
     def _get_control_for_process_name_without_default(self, process_name):
         result_dict = self.mongo_data.get_result_dict_for_key_without_key_value(process_name)
         if result_dict is missing_data:
@@ -0,0 +1,36 @@
+from syscore.objects import arg_not_supplied
+from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey
+from sysobjects.contracts import futuresContract
+
+SPIKE_CHECK_STATE_COLLECTION = "futures_contract_prices_spike_check_state"
+SPIKE_CHECK_STATE_KEY = "contract"
+
+
+class mongoSpikeCheckStateData(object):
+    """
+    Read and write the spike check state (see syscore.merge_data.spikeCheckState) for each futures contract,
+     so the state for the stored prices survives between processes
+
+    Stored prices are one merged series per contract, so there is one state per contract
+    """
+
+    def __init__(self, mongo_db=arg_not_supplied):
+        self._mongo_data = mongoDataWithSingleKey(
+            SPIKE_CHECK_STATE_COLLECTION, SPIKE_CHECK_STATE_KEY, mongo_db=mongo_db)
+
+    def __repr__(self):
+        return "mongoSpikeCheckStateData %s" % str(self.mongo_data)
+
+    @property
+    def mongo_data(self):
+        return self._mongo_data
+
+    def get_state_dict_for_contract(self, contract_object: futuresContract):
+        return self.mongo_data.get_result_dict_for_key_without_key_value(contract_object.key)
+
+    def write_state_dict_for_contract(self, contract_object: futuresContract, state_dict: dict):
+        self.mongo_data.add_data(contract_object.key, state_dict, allow_overwrite=True)
+
+    def delete_state_dict_for_contract(self, contract_object: futuresContract):
+        if self.mongo_data.key_is_in_data(contract_object.key):
+            self.mongo_data.delete_data_without_any_warning(contract_object.key)
@@ -46,6 +46,32 @@ class mongoListOfEntriesData(listOfEntriesData):
 
         return dict_list
 
+    def _get_list_of_args_dict_and_current_entries(self) -> list:
+        ## one read for the whole collection, rather than one for each set of args
+        dict_list = self.mongo_data.get_list_of_all_dicts()
+        list_of_args_dict_and_current_entries = []
+        for dict_entry in dict_list:
+            data_class = dict_entry.pop(DATA_CLASS_KEY)
+            series_as_list_of_dicts = listOfEntriesAsListOfDicts(dict_entry.pop(ENTRY_SERIES_KEY))
+            current_entry = classStrWithListOfEntriesAsListOfDicts(data_class,
+                                                                   series_as_list_of_dicts).final_entry()
+            list_of_args_dict_and_current_entries.append((dict_entry, current_entry))
+
+        return list_of_args_dict_and_current_entries
+
+    def _get_list_of_args_dict_and_series(self) -> list:
+        ## one read for the whole collection, rather than one for each set of args
+        dict_list = self.mongo_data.get_list_of_all_dicts()
+        list_of_args_dict_and_series = []
+        for dict_entry in dict_list:
+            data_class = dict_entry.pop(DATA_CLASS_KEY)
+            series_as_list_of_dicts = listOfEntriesAsListOfDicts(dict_entry.pop(ENTRY_SERIES_KEY))
+            entry_series = classStrWithListOfEntriesAsListOfDicts(data_class,
+                                                                  series_as_list_of_dicts).as_list_of_entries()
+            list_of_args_dict_and_series.append((dict_entry, entry_series))
+
+        return list_of_args_dict_and_series
+
     def _get_series_dict_with_data_class_for_args_dict(self, args_dict: dict) ->classStrWithListOfEntriesAsListOfDicts:
 
         result_dict = self.mongo_data.get_result_dict_for_dict_keys(args_dict)
@@ -1,3 +1,5 @@
+import datetime
+
 from syscore.objects import missing_data
 from sysdata.production.trade_limits import (
     tradeLimitData, listOfInstrumentStrategyKeyAndDays, instrumentStrategyKeyAndDays
@@ -16,6 +18,9 @@ LEGACY_INSTRUMENT_KEY = 'instrument_code'
 PERIOD_KEY = 'period_days'
 INSTRUMENT_STRATEGY_KEY = 'instrument_strategy_key'
 
+TRADES_SINCE_LAST_RESET_KEY = 'trades_since_last_reset'
+LAST_RESET_TIME_KEY = 'last_reset_time'
+
 class mongoTradeLimitData(tradeLimitData):
     """
     Read and write data class to get override state data
@@ -26,6 +31,7 @@ class mongoTradeLimitData(tradeLimitData):
     def __init__(self, mongo_db=None, log=logtoscreen("mongoTradeLimitData")):
         super().__init__(log=log)
         self._mongo_data = mongoDataWithMultipleKeys(LIMIT_STATUS_COLLECTION, mongo_db=mongo_db)
+        self._mongo_data.create_multikey_index(INSTRUMENT_STRATEGY_KEY, PERIOD_KEY)
 
     @property
     def mongo_data(self):
@@ -36,6 +42,33 @@ class mongoTradeLimitData(tradeLimitData):
             "Data connection for trade limit data, mongodb %s" % (str(self.mongo_data))
 
 
+    def _get_trade_limits_as_dicts_for_instrument_strategies(
+            self, list_of_instrument_strategies: list) -> list:
+
+        new_style_query = {INSTRUMENT_STRATEGY_KEY: {
+            "$in": [instrument_strategy.key for instrument_strategy in list_of_instrument_strategies]}}
+        old_style_queries = [{LEGACY_INSTRUMENT_KEY: instrument_strategy.instrument_code,
+                              LEGACY_STRATEGY_KEY: instrument_strategy.strategy_name}
+                             for instrument_strategy in list_of_instrument_strategies]
+
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dicts_for_dict_keys(
+            {"$or": [new_style_query] + old_style_queries})
+
+        return _new_style_preferred_over_old_style(list_of_result_dicts)
+
+    def _add_to_stored_trades_since_last_reset_if_possible(
+            self, instrument_strategy: instrumentStrategy, period_days: int, trade: int) -> bool:
+
+        # only matches new style records which won't reset next time they are read
+        earliest_reset_time_without_reset_due = datetime.datetime.now() - datetime.timedelta(days=period_days)
+        dict_of_keys = {INSTRUMENT_STRATEGY_KEY: instrument_strategy.key,
+                        PERIOD_KEY: period_days,
+                        LAST_RESET_TIME_KEY: {"$gte": earliest_reset_time_without_reset_due}}
+        if trade < 0:
+            dict_of_keys[TRADES_SINCE_LAST_RESET_KEY] = {"$gte": -trade}
+
+        return self.mongo_data.increment_data(dict_of_keys, {TRADES_SINCE_LAST_RESET_KEY: trade})
+
     def _get_trade_limit_as_dict_or_missing_data(
         self, instrument_strategy: instrumentStrategy, period_days: int) -> dict:
 
@@ -116,3 +149,19 @@ def _from_trade_limit_dict_to_required_dict(trade_limit_dict: dict) -> dict:
     trade_limit_dict[INSTRUMENT_STRATEGY_KEY] = instrument_strategy.key
 
     return trade_limit_dict
+
+
+def _new_style_preferred_over_old_style(list_of_result_dicts: list) -> list:
+    # old style records are only deleted when the new style record is written, so we could have both
+    old_style_dicts = [result_dict for result_dict in list_of_result_dicts
+                       if INSTRUMENT_STRATEGY_KEY not in result_dict.keys()]
+    new_style_dicts = [result_dict for result_dict in list_of_result_dicts
+                       if INSTRUMENT_STRATEGY_KEY in result_dict.keys()]
+
+    trade_limit_dicts_by_key = {}
+    for result_dict in old_style_dicts + new_style_dicts:
+        trade_limit_dict = _from_trade_limit_dict_to_required_dict(result_dict)
+        key = (trade_limit_dict[INSTRUMENT_STRATEGY_KEY], trade_limit_dict[PERIOD_KEY])
+        trade_limit_dicts_by_key[key] = trade_limit_dict
+
+    return list(trade_limit_dicts_by_key.values())
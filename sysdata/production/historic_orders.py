@@ -17,6 +17,8 @@ Doesn't have to reconcile with positions!
 from copy import copy
 import datetime
 
+import pandas as pd
+
 from syscore.objects import arg_not_supplied, missing_order
 
 from sysdata.base_data import baseData
@@ -69,6 +71,42 @@ class genericOrdersData(baseData):
 
         raise NotImplementedError
 
+    def get_orders_in_date_range_as_df(
+            self,
+            period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied,
+            instrument_code: str = arg_not_supplied,
+            strategy_name: str = arg_not_supplied) -> pd.DataFrame:
+
+        list_of_orders = self.get_list_of_orders_in_date_range(period_start, period_end=period_end,
+                                                               instrument_code=instrument_code,
+                                                               strategy_name=strategy_name)
+
+        return list_of_orders.as_pd()
+
+    def get_list_of_orders_in_date_range(
+            self,
+            period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied,
+            instrument_code: str = arg_not_supplied,
+            strategy_name: str = arg_not_supplied) -> listOfOrders:
+        # override with a single query if the data supports it
+        order_ids = self.get_list_of_order_ids_in_date_range(period_start, period_end=period_end)
+        list_of_orders = self.get_list_of_orders_with_orderids(order_ids)
+        if instrument_code is not arg_not_supplied:
+            list_of_orders = [order for order in list_of_orders if order.instrument_code == instrument_code]
+        if strategy_name is not arg_not_supplied:
+            list_of_orders = [order for order in list_of_orders if order.strategy_name == strategy_name]
+
+        return listOfOrders(list_of_orders)
+
+    def get_list_of_orders_with_orderids(self, list_of_order_ids: list) -> listOfOrders:
+        # override with a single query if the data supports it
+        list_of_orders = [self.get_order_with_orderid(order_id) for order_id in list_of_order_ids]
+        list_of_orders = [order for order in list_of_orders if order is not missing_order]
+
+        return listOfOrders(list_of_orders)
+
 
 
 
@@ -131,6 +169,25 @@ class brokerHistoricOrdersData(contractHistoricOrdersData):
 
         return list_of_fills
 
+    def get_dict_of_fills_history_for_instrument(self, instrument_code: str) -> dict:
+        """
+        Fills for every contract in an instrument, read with a single query rather than one per contract
+
+        :param instrument_code: str
+        :return: dict, keys are contract_str, values are listOfFills
+        """
+        list_of_orders = self.get_list_of_orders_for_instrument_code(instrument_code)
+        dict_of_fills = {}
+        for order in list_of_orders:
+            for contract_str in order.contract_date.list_of_date_str:
+                fill = single_fill_from_broker_order(order, contract_str)
+                dict_of_fills.setdefault(contract_str, []).append(fill)
+
+        dict_of_fills = dict([(contract_str, listOfFills(list_of_fills))
+                              for contract_str, list_of_fills in dict_of_fills.items()])
+
+        return dict_of_fills
+
     def get_fill_from_order_id(self, orderid, contract_str: str):
         order = self.get_order_with_orderid(orderid)
         fill = single_fill_from_broker_order(order, contract_str)
@@ -143,4 +200,5 @@ class brokerHistoricOrdersData(contractHistoricOrdersData):
                                                               contract_str: str) -> list:
         raise NotImplementedError
 
-
+    def get_list_of_orders_for_instrument_code(self, instrument_code: str) -> listOfOrders:
+        raise NotImplementedError
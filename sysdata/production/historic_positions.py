@@ -106,14 +106,12 @@ class strategyPositionData(listOfEntriesData):
         self, ignore_zero_positions: bool=True
     ) -> listOfInstrumentStrategies:
 
-        list_of_instrument_strategies = self.get_list_of_instrument_strategies()
-
         if ignore_zero_positions:
-            list_of_instrument_strategies = [instrument_strategy for
-                                             instrument_strategy in list_of_instrument_strategies
-                if self.get_current_position_for_instrument_strategy_object(instrument_strategy)!=0]
-
-            list_of_instrument_strategies = listOfInstrumentStrategies(list_of_instrument_strategies)
+            list_of_positions = self.get_all_current_positions_as_list_with_instrument_objects()
+            list_of_instrument_strategies = listOfInstrumentStrategies(
+                [position.instrument_strategy for position in list_of_positions])
+        else:
+            list_of_instrument_strategies = self.get_list_of_instrument_strategies()
 
         return list_of_instrument_strategies
 
@@ -156,14 +154,15 @@ class strategyPositionData(listOfEntriesData):
         :return: listOfInstrumentStrategyPositions
         """
 
-        list_of_instrument_strategies = self.get_list_of_instrument_strategies()
         current_positions = []
-        for instrument_strategy in list_of_instrument_strategies:
-            position = self.get_current_position_for_instrument_strategy_object(instrument_strategy)
+        for args_dict, position_entry in self._get_list_of_args_dict_and_current_entries():
+            if position_entry is missing_data:
+                continue
+            position = position_entry.position
             if position==0:
                 continue
             position_object = instrumentStrategyPosition(
-                position, instrument_strategy
+                position, instrumentStrategy.from_dict(args_dict)
             )
             current_positions.append(position_object)
 
@@ -177,6 +176,14 @@ class strategyPositionData(listOfEntriesData):
         return (
             self.get_all_current_positions_as_list_with_instrument_objects().as_pd_df())
 
+    def get_dict_of_position_df_for_all_instrument_strategies(self) -> dict:
+        ## keys are instrumentStrategy, with one read rather than one for each
+        dict_of_position_df = dict([
+            (instrumentStrategy.from_dict(args_dict), position_series.as_pd_df())
+            for args_dict, position_series in self._get_list_of_args_dict_and_series()])
+
+        return dict_of_position_df
+
     def get_list_of_instrument_strategies(self) -> listOfInstrumentStrategies:
         all_positions_dict = self._get_list_of_args_dict()
         list_of_instrument_strategies = []
@@ -261,6 +268,14 @@ class contractPositionData(listOfEntriesData):
         )
         return current_position_entry
 
+    def get_dict_of_position_df_for_all_contracts(self) -> dict:
+        ## keys are contract keys, with one read rather than one for each contract
+        dict_of_position_df = dict([
+            (self._contract_given_contractid(args_dict[CONTRACTID_KEY]).key, position_series.as_pd_df())
+            for args_dict, position_series in self._get_list_of_args_dict_and_series()])
+
+        return dict_of_position_df
+
     def update_position_for_contract_object(
         self, contract_object, position, date=arg_not_supplied
     ):
@@ -316,13 +331,15 @@ class contractPositionData(listOfEntriesData):
     def get_all_current_positions_as_list_with_contract_objects(self):
         # excludes zeros
 
-        list_of_contracts = self.get_list_of_contracts() ## includes zeros
         current_positions = []
-        for contract in list_of_contracts:
-            position = self.get_current_position_for_contract_object(contract)
+        for args_dict, position_entry in self._get_list_of_args_dict_and_current_entries():
+            if position_entry is missing_data:
+                continue
+            position = position_entry.position
             if position == 0:
                 continue
 
+            contract = self._contract_given_contractid(args_dict[CONTRACTID_KEY])
             position_object = contractPosition(
                 position, contract)
             current_positions.append(position_object)
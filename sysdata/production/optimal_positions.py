@@ -60,13 +60,14 @@ class optimalPositionData(listOfEntriesData):
         return list_of_instrument_strategies_with_positions
 
     def get_list_of_optimal_positions(self) -> listOfOptimalPositionsAcrossInstrumentStrategies:
-        list_of_instrument_strategies = (
-            self.get_list_of_instrument_strategies_with_optimal_position()
-        )
+        list_of_optimal_positions_and_instrument_strategies = [
+            instrumentStrategyAndOptimalPosition(instrumentStrategy.from_dict(args_dict), optimal_position)
+            for args_dict, optimal_position in self._get_list_of_args_dict_and_current_entries()
+        ]
 
-        list_of_optimal_positions_and_instrument_strategies = \
-            self.get_list_of_optimal_positions_given_list_of_instrument_strategies(
-                list_of_instrument_strategies)
+        list_of_optimal_positions_and_instrument_strategies = listOfOptimalPositionsAcrossInstrumentStrategies(
+            list_of_optimal_positions_and_instrument_strategies
+        )
 
         return list_of_optimal_positions_and_instrument_strategies
 
@@ -40,6 +40,14 @@ class classStrWithListOfEntriesAsListOfDicts(object):
     def entry_list_as_plain_list(self):
         return self.list_of_entries_as_list_of_dicts.as_plain_list()
 
+    def final_entry(self):
+        ## Only the last entry is turned into an object, which is a lot quicker for a long series
+        final_entry_as_list_of_dicts = self.list_of_entries_as_list_of_dicts.final_entry_as_list_of_dicts()
+        final_entry_series = classStrWithListOfEntriesAsListOfDicts(self.class_of_entry_list_as_str,
+                                                                    final_entry_as_list_of_dicts).as_list_of_entries()
+
+        return final_entry_series.final_entry()
+
 class listOfEntriesData(baseData):
     """
     base data class for list of entries
@@ -150,6 +158,24 @@ class listOfEntriesData(baseData):
 
         return current_entry
 
+    def _get_list_of_args_dict_and_current_entries(self) -> list:
+        ## list of tuples (args_dict, current entry); inherit to do this with one read
+        list_of_args_dict = self._get_list_of_args_dict()
+        list_of_args_dict_and_current_entries = [
+            (args_dict, self._get_current_entry_for_args_dict(args_dict))
+            for args_dict in list_of_args_dict]
+
+        return list_of_args_dict_and_current_entries
+
+    def _get_list_of_args_dict_and_series(self) -> list:
+        ## list of tuples (args_dict, entry series); inherit to do this with one read
+        list_of_args_dict = self._get_list_of_args_dict()
+        list_of_args_dict_and_series = [
+            (args_dict, self._get_series_for_args_dict(args_dict))
+            for args_dict in list_of_args_dict]
+
+        return list_of_args_dict_and_series
+
     def _get_series_for_args_dict(self, args_dict) -> listOfEntries:
         class_with_series_as_list_of_dicts = self._get_series_dict_and_class_for_args_dict(
             args_dict)
@@ -5,6 +5,7 @@ We want to limit the number of trades we expect to do in a given period (usually
 Limits per contract don't make sense, but it makes sense to limit (a) the number of times a given instrument
    within a strategy can be traded and (b) the number of times an instrument can be traded, period.
 """
+import datetime
 from dataclasses import dataclass
 from syscore.objects import missing_data
 from sysdata.base_data import baseData
@@ -13,6 +14,9 @@ from sysobjects.production.trade_limits import tradeLimit, listOfTradeLimits
 
 from sysobjects.production.tradeable_object import instrumentStrategy
 
+# Limits can be changed or reset by other processes (eg interactive_controls), so we re-read any limits we read
+#   longer ago than this. Trades added or removed by this process are applied to what we've read straight away.
+MAX_AGE_OF_TRADE_LIMIT_SNAPSHOT = datetime.timedelta(seconds=60)
 
 
 @dataclass
@@ -34,9 +38,42 @@ class listOfInstrumentStrategyKeyAndDays(list):
 
 
 
+class snapshotOfTradeLimits(object):
+    """
+    Trade limits for each instrument strategy, as last read by this process
+    """
+
+    def __init__(self):
+        self._limits = {}
+        self._read_times = {}
+
+    def is_current(self, instrument_strategy: instrumentStrategy) -> bool:
+        read_time = self._read_times.get(instrument_strategy.key, None)
+        if read_time is None:
+            return False
+
+        return datetime.datetime.now() - read_time < MAX_AGE_OF_TRADE_LIMIT_SNAPSHOT
+
+    def get_limits(self, instrument_strategy: instrumentStrategy) -> list:
+        return self._limits[instrument_strategy.key]
+
+    def add_limits(self, instrument_strategy: instrumentStrategy, list_of_trade_limits: list):
+        self._limits[instrument_strategy.key] = list_of_trade_limits
+        self._read_times[instrument_strategy.key] = datetime.datetime.now()
+
+    def clear(self, instrument_strategy: instrumentStrategy):
+        self._limits.pop(instrument_strategy.key, None)
+        self._read_times.pop(instrument_strategy.key, None)
+
+
 class tradeLimitData(baseData):
     def __init__(self, log=logtoscreen("Overrides")):
         super().__init__(log=log)
+        self._snapshot = snapshotOfTradeLimits()
+
+    @property
+    def snapshot(self) -> snapshotOfTradeLimits:
+        return self._snapshot
 
     def no_limit(self, instrument_strategy: instrumentStrategy, period_days: int) -> tradeLimit:
         return tradeLimit(
@@ -57,53 +94,63 @@ class tradeLimitData(baseData):
         return possible_trade
 
     def add_trade(self, instrument_strategy: instrumentStrategy, trade: int):
-        combined_list = self._get_list_of_all_relevant_trade_limits(
-            instrument_strategy
-        )
-        combined_list.add_trade(trade)
-        self._update_list_of_trade_limits(combined_list)
+        self._add_to_trades_since_last_reset(instrument_strategy, int(abs(trade)))
 
     def remove_trade(self, instrument_strategy: instrumentStrategy, trade: int):
+        self._add_to_trades_since_last_reset(instrument_strategy, -int(abs(trade)))
+
+    def _add_to_trades_since_last_reset(self, instrument_strategy: instrumentStrategy, trade: int):
+        # trade is negative if we're removing
         combined_list = self._get_list_of_all_relevant_trade_limits(
             instrument_strategy
         )
-        combined_list.remove_trade(trade)
-        self._update_list_of_trade_limits(combined_list)
+        for trade_limit in combined_list:
+            self._add_to_trades_since_last_reset_for_trade_limit(trade_limit, trade)
 
-    def _get_list_of_all_relevant_trade_limits(
-            self, instrument_strategy: instrumentStrategy):
-        instrument_trade_limits = self._get_trade_limits_for_instrument(
-            instrument_strategy.instrument_code)
-        strategy_instrument_trade_limits = \
-            self._get_trade_limits_for_instrument_strategy(instrument_strategy)
+    def _add_to_trades_since_last_reset_for_trade_limit(self, trade_limit: tradeLimit, trade: int):
+        added = self._add_to_stored_trades_since_last_reset_if_possible(
+            trade_limit.instrument_strategy, trade_limit.period_days, trade)
 
-        combined_list = listOfTradeLimits(instrument_trade_limits+ strategy_instrument_trade_limits)
+        if added:
+            # keep what we've read in line with what is stored
+            _add_or_remove_trade(trade_limit, trade)
+            return
 
-        return combined_list
+        # a reset is due, or the count would go below zero, or the data doesn't support it
+        stored_trade_limit = self._get_trade_limit_object(
+            trade_limit.instrument_strategy, trade_limit.period_days)
+        _add_or_remove_trade(stored_trade_limit, trade)
+        self._update_trade_limit_object(stored_trade_limit)
 
-    def _get_trade_limits_for_instrument(self, instrument_code:str) -> list:
-        instrument_strategy = instrument_strategy_for_instrument_only(instrument_code)
+        self.snapshot.clear(trade_limit.instrument_strategy)
 
-        return self._get_trade_limits_for_instrument_strategy(
-            instrument_strategy
-        )
+    def _get_list_of_all_relevant_trade_limits(
+            self, instrument_strategy: instrumentStrategy) -> listOfTradeLimits:
+        list_of_instrument_strategies = _instrument_and_instrument_strategy(instrument_strategy)
+        self._update_snapshot_if_required(list_of_instrument_strategies)
 
-    def _get_trade_limits_for_instrument_strategy(
-        self, instrument_strategy: instrumentStrategy
-    ) -> list:
-        all_keys = self._get_all_limit_keys()
-        relevant_keys = all_keys.for_given_instrument_strategy(instrument_strategy)
-        trade_limits = [self._get_trade_limit_object_from_isd_key(isd_key) for isd_key in relevant_keys]
+        combined_list = []
+        for relevant_instrument_strategy in list_of_instrument_strategies:
+            combined_list = combined_list + self.snapshot.get_limits(relevant_instrument_strategy)
 
-        return trade_limits
+        return listOfTradeLimits(combined_list)
 
-    def _update_list_of_trade_limits(self, list_of_trade_limits: list):
-        result = [
-            self._update_trade_limit_object(trade_limit_object)
-            for trade_limit_object in list_of_trade_limits
-        ]
+    def _update_snapshot_if_required(self, list_of_instrument_strategies: list):
+        list_to_read = [instrument_strategy for instrument_strategy in list_of_instrument_strategies
+                        if not self.snapshot.is_current(instrument_strategy)]
+        if len(list_to_read) == 0:
+            return
 
-        return result
+        list_of_trade_limit_dicts = self._get_trade_limits_as_dicts_for_instrument_strategies(
+            list_to_read)
+        list_of_trade_limits = [tradeLimit.from_dict(trade_limit_dict)
+                                for trade_limit_dict in list_of_trade_limit_dicts]
+
+        for instrument_strategy in list_to_read:
+            trade_limits_for_instrument_strategy = [
+                trade_limit for trade_limit in list_of_trade_limits
+                if trade_limit.instrument_strategy.key == instrument_strategy.key]
+            self.snapshot.add_limits(instrument_strategy, trade_limits_for_instrument_strategy)
 
     def update_instrument_limit_with_new_limit(
         self, instrument_code: str, period_days: int, new_limit: int
@@ -124,6 +171,7 @@ class tradeLimitData(baseData):
         )
         trade_limit.update_limit(new_limit)
         self._update_trade_limit_object(trade_limit)
+        self.snapshot.clear(instrument_strategy)
 
     def reset_instrument_limit(self, instrument_code:str, period_days: int):
         instrument_strategy = instrument_strategy_for_instrument_only(instrument_code)
@@ -136,6 +184,7 @@ class tradeLimitData(baseData):
 
         trade_limit.reset()
         self._update_trade_limit_object(trade_limit)
+        self.snapshot.clear(instrument_strategy)
 
     def get_all_limits(self):
         all_keys = self._get_all_limit_keys()
@@ -172,6 +221,31 @@ class tradeLimitData(baseData):
         trade_limit_as_dict = trade_limit_object.as_dict()
         self._update_trade_limit_as_dict(trade_limit_as_dict)
 
+    def _get_trade_limits_as_dicts_for_instrument_strategies(
+            self, list_of_instrument_strategies: list) -> list:
+        # override with a single query if the data supports it
+        all_keys = self._get_all_limit_keys()
+        list_of_trade_limit_dicts = []
+        for instrument_strategy in list_of_instrument_strategies:
+            relevant_keys = all_keys.for_given_instrument_strategy(instrument_strategy)
+            for isd_key in relevant_keys:
+                trade_limit_as_dict = self._get_trade_limit_as_dict_or_missing_data(
+                    instrument_strategy, isd_key.period_days)
+                if trade_limit_as_dict is not missing_data:
+                    list_of_trade_limit_dicts.append(trade_limit_as_dict)
+
+        return list_of_trade_limit_dicts
+
+    def _add_to_stored_trades_since_last_reset_if_possible(
+            self, instrument_strategy: instrumentStrategy, period_days: int, trade: int) -> bool:
+        """
+        Add trade (negative if removing) to the stored trades since last reset in one atomic update, as long as a
+        reset isn't due and the result isn't below zero.
+
+        :return: False if not done, in which case we read, modify and write the limit instead
+        """
+        return False
+
     def _get_trade_limit_as_dict_or_missing_data(
         self, instrument_strategy: instrumentStrategy, period_days: int
     ) -> dict:
@@ -188,3 +262,18 @@ class tradeLimitData(baseData):
 
 def instrument_strategy_for_instrument_only(instrument_code) -> instrumentStrategy:
     return instrumentStrategy(strategy_name="", instrument_code=instrument_code)
+
+
+def _instrument_and_instrument_strategy(instrument_strategy: instrumentStrategy) -> list:
+    instrument_only = instrument_strategy_for_instrument_only(instrument_strategy.instrument_code)
+    if instrument_only.key == instrument_strategy.key:
+        return [instrument_strategy]
+
+    return [instrument_only, instrument_strategy]
+
+
+def _add_or_remove_trade(trade_limit: tradeLimit, trade: int):
+    if trade >= 0:
+        trade_limit.add_trade(trade)
+    else:
+        trade_limit.remove_trade(trade)
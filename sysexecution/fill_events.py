@@ -0,0 +1,125 @@
+"""
+Fill events tell us which broker orders have new fills, so the stack handler only has to look at those
+orders rather than sweeping the whole order stack
+
+Events are put on a queue by whatever is listening to the broker (which may be on another thread), and
+taken off in batches by the stack handler. Several events for the same order are coalesced, since we always
+read the latest total fill for an order rather than applying each execution on its own.
+"""
+
+from collections import namedtuple
+import threading
+
+fillEvent = namedtuple("fillEvent", ["broker_tempid", "broker_permid"])
+
+# events we can't process yet, eg because the order isn't on the stack yet, are put back this many times
+MAX_RETRIES_FOR_FILL_EVENT = 20
+
+
+class listOfFillEvents(list):
+    @property
+    def list_of_broker_tempids(self) -> list:
+        return [fill_event.broker_tempid for fill_event in self]
+
+
+class fillEventQueue(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending_events = {}
+        self._retries = {}
+        self._retries_for_drained_events = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pending_events)
+
+    def put(self, fill_event: fillEvent):
+        with self._lock:
+            # a later event for the same order replaces the earlier one, but keeps its place in the queue
+            self._pending_events[fill_event.broker_tempid] = fill_event
+
+    def drain(self) -> listOfFillEvents:
+        """
+        Take everything off the queue, one event per order
+
+        >>> queue = fillEventQueue()
+        >>> queue.put(fillEvent("DU1/1/10", 0))
+        >>> queue.put(fillEvent("DU1/1/11", 0))
+        >>> queue.put(fillEvent("DU1/1/10", 555))
+        >>> queue.drain()
+        [fillEvent(broker_tempid='DU1/1/10', broker_permid=555), fillEvent(broker_tempid='DU1/1/11', broker_permid=0)]
+        >>> queue.drain()
+        []
+        """
+        with self._lock:
+            pending_events = self._pending_events
+            self._pending_events = {}
+            # anything that isn't put back has been dealt with, so we forget about it
+            self._retries_for_drained_events = self._retries
+            self._retries = {}
+
+        return listOfFillEvents(pending_events.values())
+
+    def put_back(self, list_of_fill_events: listOfFillEvents,
+                 max_retries: int = MAX_RETRIES_FOR_FILL_EVENT) -> listOfFillEvents:
+        """
+        Put drained events we couldn't process yet back on the queue, to try again after the next drain
+
+        A newer event for the same order that's arrived in the meantime is kept instead
+
+        :return: listOfFillEvents that have been put back too often, and have been given up on
+        """
+        list_of_given_up_events = listOfFillEvents()
+        with self._lock:
+            for fill_event in list_of_fill_events:
+                broker_tempid = fill_event.broker_tempid
+                retries = self._retries_for_drained_events.get(broker_tempid, 0) + 1
+                if retries > max_retries:
+                    list_of_given_up_events.append(fill_event)
+                    continue
+
+                self._retries[broker_tempid] = retries
+                self._pending_events.setdefault(broker_tempid, fill_event)
+
+        return list_of_given_up_events
+
+
+class fillEventSource(object):
+    """
+    Publishes fill events to every queue subscribed to it
+
+    Broker specific sources inherit from this and call publish when the broker tells them about an execution
+    """
+
+    def __init__(self):
+        self._list_of_queues = []
+
+    def subscribe(self, queue: fillEventQueue):
+        self._list_of_queues.append(queue)
+
+    def publish(self, fill_event: fillEvent):
+        for queue in self._list_of_queues:
+            queue.put(fill_event)
+
+
+class replayableFillEventSource(fillEventSource):
+    """
+    Keeps every event it publishes so they can be published again; used for testing the fills pipeline
+    without a broker
+    """
+
+    def __init__(self, list_of_fill_events: list = ()):
+        super().__init__()
+        self._recorded_events = listOfFillEvents(list_of_fill_events)
+
+    @property
+    def recorded_events(self) -> listOfFillEvents:
+        return self._recorded_events
+
+    def publish(self, fill_event: fillEvent):
+        self._recorded_events.append(fill_event)
+        super().publish(fill_event)
+
+    def replay(self):
+        for fill_event in self.recorded_events:
+            super().publish(fill_event)
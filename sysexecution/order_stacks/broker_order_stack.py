@@ -1,8 +1,10 @@
 import datetime
 
-from syscore.objects import missing_order, fill_exceeds_trade
+from syscore.objects import missing_order, fill_exceeds_trade, missing_data
+from sysexecution.fill_events import listOfFillEvents
 from sysexecution.order_stacks.order_stack import orderStackData
 from sysexecution.orders.broker_orders import brokerOrder
+from sysexecution.orders.list_of_orders import listOfOrders
 
 from sysexecution.tick_data import tickerObject
 
@@ -34,6 +36,33 @@ class brokerOrderStackData(orderStackData):
 
         return missing_order
 
+    def get_list_of_orders_with_broker_tempids(self, list_of_broker_tempids: list) -> listOfOrders:
+        """
+        Active orders with any of the broker tempids, in no particular order
+        """
+        set_of_broker_tempids = set(list_of_broker_tempids)
+        list_of_orders = self.get_list_of_orders_from_order_id_list(
+            self.get_list_of_order_ids())
+        matching_orders = [order for order in list_of_orders
+                           if order.broker_tempid in set_of_broker_tempids]
+
+        return listOfOrders(matching_orders)
+
+    def get_new_fill_events(self) -> listOfFillEvents:
+        """
+        Orders that have been filled since we last asked, if the broker can tell us as fills happen
+
+        :return: listOfFillEvents, or missing_data if we have to check every order instead
+        """
+        return missing_data
+
+    def put_back_fill_events(self, list_of_fill_events: listOfFillEvents) -> listOfFillEvents:
+        """
+        Fill events we couldn't process yet, to be returned again by get_new_fill_events
+
+        :return: listOfFillEvents we've given up on
+        """
+        return list_of_fill_events
 
     def get_order_with_id_from_stack(self, order_id: int) -> brokerOrder:
         # probably will be overriden in data implementation
@@ -4,14 +4,16 @@ from syscore.objects import (
     fill_exceeds_trade,
     no_children,
     no_parent,
-    missing_order
-
+    missing_order,
+    missing_data
 )
 
 from sysexecution.stack_handler.completed_orders import stackHandlerForCompletions
 
 from sysproduction.data.broker import dataBroker
 
+from sysexecution.fill_events import listOfFillEvents
+
 from sysexecution.orders.contract_orders import contractOrder
 from sysexecution.orders.instrument_orders import instrumentOrder
 from sysexecution.orders.broker_orders import brokerOrder
@@ -23,46 +25,131 @@ from sysproduction.data.positions import updatePositions
 class stackHandlerForFills(stackHandlerForCompletions):
     def process_fills_stack(self):
         """
-        Run a regular sweep across the stack
-        Doing various things
+        Apply new fills from the broker to the broker stack, and pass them up the stack
+
+        If the broker tells us about fills as they happen we only look at orders with new fills;
+        otherwise we sweep across the whole stack
 
         :return: success
         """
 
+        list_of_fill_events = self.get_new_fill_events()
+        if list_of_fill_events is missing_data:
+            self.sweep_fills_across_stack()
+        else:
+            self.pass_fills_from_fill_events_to_broker_stack(list_of_fill_events)
+
+    def get_new_fill_events(self) -> listOfFillEvents:
+        data_broker = dataBroker(self.data)
+        list_of_fill_events = data_broker.get_new_fill_events()
+        if list_of_fill_events is missing_data:
+            return missing_data
+
+        if not getattr(self, "_swept_fills_since_listening", False):
+            # we could have missed fills before we started listening, or given up on some events
+            self._swept_fills_since_listening = True
+            return missing_data
+
+        return list_of_fill_events
+
+    def put_back_fill_events_to_try_again(self, list_of_fill_events: listOfFillEvents):
+        if len(list_of_fill_events) == 0:
+            return None
+
+        data_broker = dataBroker(self.data)
+        list_of_given_up_events = data_broker.put_back_fill_events(list_of_fill_events)
+        if len(list_of_given_up_events) == 0:
+            return None
+
+        self.log.warn(
+            "Couldn't apply fills for broker orders %s after several tries, will check every order next time" %
+            str(list_of_given_up_events.list_of_broker_tempids))
+        self._swept_fills_since_listening = False
+
+    def sweep_fills_across_stack(self):
         self.pass_fills_from_broker_to_broker_stack()
         self.pass_fills_from_broker_up_to_contract()
         self.pass_fills_from_contract_up_to_instrument()
 
+    def pass_fills_from_fill_events_to_broker_stack(self, list_of_fill_events: listOfFillEvents):
+        if len(list_of_fill_events) == 0:
+            return None
+
+        list_of_db_broker_orders = self.broker_stack.get_list_of_orders_with_broker_tempids(
+            list_of_fill_events.list_of_broker_tempids)
+
+        list_of_orders_not_filled = self.apply_broker_fills_to_list_of_db_broker_orders(
+            list_of_db_broker_orders)
+
+        # Events for orders that aren't on the stack yet, or that we couldn't fill yet, are tried again
+        # later. Fills for orders we never know about, eg manual trades, are eventually given up on
+        set_of_broker_tempids_found = set(
+            [db_broker_order.broker_tempid for db_broker_order in list_of_db_broker_orders])
+        set_of_broker_tempids_not_filled = set(
+            [db_broker_order.broker_tempid for db_broker_order in list_of_orders_not_filled])
+        list_of_fill_events_to_try_again = listOfFillEvents([
+            fill_event for fill_event in list_of_fill_events
+            if fill_event.broker_tempid not in set_of_broker_tempids_found
+            or fill_event.broker_tempid in set_of_broker_tempids_not_filled])
+
+        self.put_back_fill_events_to_try_again(list_of_fill_events_to_try_again)
+
     def pass_fills_from_broker_to_broker_stack(self):
         list_of_broker_order_ids = self.broker_stack.get_list_of_order_ids()
-        for broker_order_id in list_of_broker_order_ids:
-            self.apply_broker_fill_from_broker_to_broker_database(broker_order_id)
+        list_of_db_broker_orders = self.broker_stack.get_list_of_orders_from_order_id_list(
+            list_of_broker_order_ids)
+
+        self.apply_broker_fills_to_list_of_db_broker_orders(list_of_db_broker_orders)
+
+    def apply_broker_fills_to_list_of_db_broker_orders(self, list_of_db_broker_orders: listOfOrders) -> listOfOrders:
+        """
+        Match the orders with the broker in one go, then pass the fills up the stack once for each parent
+
+        :return: listOfOrders, the database orders we couldn't apply fills to
+        """
+        list_of_db_broker_orders = [
+            db_broker_order for db_broker_order in list_of_db_broker_orders
+            if db_broker_order is not missing_order
+            # No point, and we don't log or we'd be spamming like crazy
+            and not db_broker_order.fill_equals_desired_trade()
+        ]
+        if len(list_of_db_broker_orders) == 0:
+            return listOfOrders([])
+
+        data_broker = dataBroker(self.data)
+        list_of_matched_broker_orders = data_broker.match_list_of_db_broker_orders_to_orders_from_brokers(
+            listOfOrders(list_of_db_broker_orders))
+
+        list_of_contract_order_ids = []
+        list_of_orders_not_filled = []
+        for db_broker_order, matched_broker_order in zip(list_of_db_broker_orders,
+                                                         list_of_matched_broker_orders):
+            if matched_broker_order is missing_order:
+                log = db_broker_order.log_with_attributes(self.log)
+                log.warn(
+                    "Order in database %s does not match any broker orders: can't fill" %
+                    db_broker_order)
+                list_of_orders_not_filled.append(db_broker_order)
+                continue
+
+            fills_applied = self.apply_broker_order_fills_to_broker_stack(
+                db_broker_order.order_id, matched_broker_order)
+            if fills_applied:
+                list_of_contract_order_ids.append(db_broker_order.parent)
+            else:
+                list_of_orders_not_filled.append(db_broker_order)
+
+        self.apply_broker_fills_to_list_of_contract_orders(list_of_contract_order_ids)
+
+        return listOfOrders(list_of_orders_not_filled)
 
     def apply_broker_fill_from_broker_to_broker_database(self, broker_order_id: int):
 
         db_broker_order = self.broker_stack.get_order_with_id_from_stack(
             broker_order_id
         )
-        if db_broker_order is missing_order:
-            return None
 
-        if db_broker_order.fill_equals_desired_trade():
-            # No point
-            # We don't log or we'd be spamming like crazy
-            return None
-
-        data_broker = dataBroker(self.data)
-        matched_broker_order = data_broker.match_db_broker_order_to_order_from_brokers(
-            db_broker_order)
-
-        if matched_broker_order is missing_order:
-            log = db_broker_order.log_with_attributes(self.log)
-            log.warn(
-                "Order in database %s does not match any broker orders: can't fill" %
-                db_broker_order)
-            return None
-
-        self.apply_broker_order_fills_to_database(matched_broker_order)
+        self.apply_broker_fills_to_list_of_db_broker_orders(listOfOrders([db_broker_order]))
 
     def apply_broker_order_fills_to_database(self, broker_order: brokerOrder):
 
@@ -72,6 +159,17 @@ class stackHandlerForFills(stackHandlerForCompletions):
         data_broker = dataBroker(self.data)
         broker_order = data_broker.calculate_total_commission_for_broker_order(broker_order)
 
+        fills_applied = self.apply_broker_order_fills_to_broker_stack(broker_order_id, broker_order)
+        if not fills_applied:
+            return None
+
+        contract_order_id = broker_order.parent
+
+        # pass broker fills upwards
+        self.apply_broker_fills_to_contract_order(contract_order_id)
+
+    def apply_broker_order_fills_to_broker_stack(self, broker_order_id: int,
+                                                 broker_order: brokerOrder) -> bool:
         # This will add commissions, fills, etc
         result = self.broker_stack.add_execution_details_from_matched_broker_order(
             broker_order_id, broker_order)
@@ -80,13 +178,9 @@ class stackHandlerForFills(stackHandlerForCompletions):
             self.log.warn(
                 "Fill for exceeds trade for %s, ignoring fill... (hopefully will go away)" %
                 (broker_order))
-            return None
-
-        contract_order_id = broker_order.parent
-
-        # pass broker fills upwards
-        self.apply_broker_fills_to_contract_order(contract_order_id)
+            return False
 
+        return True
 
     def pass_fills_from_broker_up_to_contract(self):
         list_of_contract_order_ids = self.contract_stack.get_list_of_order_ids()
@@ -94,8 +188,27 @@ class stackHandlerForFills(stackHandlerForCompletions):
             # this function is in 'core' since it's used elsewhere
             self.apply_broker_fills_to_contract_order(contract_order_id)
 
+    def apply_broker_fills_to_list_of_contract_orders(self, list_of_contract_order_ids: list):
+        """
+        Each contract order, and then each of their parents, is only updated once
+        however many of its children were filled
+        """
+        list_of_contract_order_ids = unique_list_of_order_ids(list_of_contract_order_ids)
+        for contract_order_id in list_of_contract_order_ids:
+            self.apply_broker_fills_to_contract_order(contract_order_id, pass_fill_up=False)
+
+        list_of_instrument_order_ids = [
+            self.get_instrument_order_id_to_fill_for_contract_order(contract_order_id)
+            for contract_order_id in list_of_contract_order_ids]
+        list_of_instrument_order_ids = unique_list_of_order_ids([
+            instrument_order_id for instrument_order_id in list_of_instrument_order_ids
+            if instrument_order_id is not no_parent])
 
-    def apply_broker_fills_to_contract_order(self, contract_order_id: int):
+        for instrument_order_id in list_of_instrument_order_ids:
+            self.apply_contract_fills_for_instrument_order(instrument_order_id)
+
+    def apply_broker_fills_to_contract_order(self, contract_order_id: int,
+                                             pass_fill_up: bool = True):
         contract_order_before_fill = self.contract_stack.get_order_with_id_from_stack(
             contract_order_id
         )
@@ -121,7 +234,8 @@ class stackHandlerForFills(stackHandlerForCompletions):
         self.apply_fills_to_contract_order(contract_order_before_fill=contract_order_before_fill,
                                            filled_price=average_fill_price,
                                            filled_qty=total_filled_qty,
-                                           fill_datetime=final_fill_datetime)
+                                           fill_datetime=final_fill_datetime,
+                                           pass_fill_up=pass_fill_up)
 
 
     def apply_contract_order_fill_to_database(self, contract_order: contractOrder):
@@ -139,7 +253,8 @@ class stackHandlerForFills(stackHandlerForCompletions):
     def apply_fills_to_contract_order(self, contract_order_before_fill: contractOrder,
                                              filled_qty: tradeQuantity,
                                       filled_price: float,
-                                      fill_datetime: datetime.datetime):
+                                      fill_datetime: datetime.datetime,
+                                      pass_fill_up: bool = True):
 
         contract_order_id = contract_order_before_fill.order_id
         self.contract_stack.change_fill_quantity_for_order(
@@ -157,8 +272,9 @@ class stackHandlerForFills(stackHandlerForCompletions):
         self.apply_position_change_to_stored_contract_positions(
             contract_order_before_fill, filled_qty)
 
-        ## We now pass it up to the next level
-        self.apply_contract_fill_to_instrument_order(contract_order_id)
+        ## We now pass it up to the next level, unless we're doing a batch of orders
+        if pass_fill_up:
+            self.apply_contract_fill_to_instrument_order(contract_order_id)
 
 
     def apply_position_change_to_stored_contract_positions(
@@ -183,16 +299,25 @@ class stackHandlerForFills(stackHandlerForCompletions):
             contract_order_before_fill, new_fills)
 
     def apply_contract_fill_to_instrument_order(self, contract_order_id: int):
+        instrument_order_id = self.get_instrument_order_id_to_fill_for_contract_order(contract_order_id)
+        if instrument_order_id is no_parent:
+            return None
+
+        self.apply_contract_fills_for_instrument_order(instrument_order_id=instrument_order_id)
 
+    def get_instrument_order_id_to_fill_for_contract_order(self, contract_order_id: int) -> int:
+        """
+        :return: parent instrument order id, or no_parent if there is no fill to pass up
+        """
         contract_order = self.contract_stack.get_order_with_id_from_stack(
             contract_order_id
         )
         if contract_order is missing_order:
-            return None
+            return no_parent
 
         if contract_order.fill_equals_zero():
             # Nothing to do here
-            return None
+            return no_parent
 
         instrument_order_id = contract_order.parent
         if instrument_order_id is no_parent:
@@ -201,9 +326,8 @@ class stackHandlerForFills(stackHandlerForCompletions):
                 "No parent for contract order %s %d"
                 % (str(contract_order), contract_order_id)
             )
-            return None
 
-        self.apply_contract_fills_for_instrument_order(instrument_order_id=instrument_order_id)
+        return instrument_order_id
 
     def apply_contract_fills_for_instrument_order(self, instrument_order_id: int):
 
@@ -367,6 +491,11 @@ class stackHandlerForFills(stackHandlerForCompletions):
             original_instrument_order, new_fill)
 
 
+def unique_list_of_order_ids(list_of_order_ids: list) -> list:
+    # keeps the original order
+    return list(dict.fromkeys(list_of_order_ids))
+
+
 def check_to_see_if_distributed_order(instrument_order: instrumentOrder,
                                       contract_orders: listOfOrders) -> bool:
 
@@ -43,9 +43,9 @@ class stackHandler(
         self.log.msg("Trying to cancel all broker orders")
         self.cancel_and_confirm_all_broker_orders(log_critical_on_timeout=True)
 
-        # Next, process fills
+        # Next, process fills; we look at every order in case we missed a fill event
         self.log.msg("Processing fills")
-        self.process_fills_stack()
+        self.sweep_fills_across_stack()
 
         # and then completions
         # need special flag for completions, since we also need to 'complete' partially filled orders
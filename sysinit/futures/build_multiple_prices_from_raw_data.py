@@ -2,275 +2,230 @@ from collections import namedtuple
 
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
 
 from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
 from sysobjects.dict_of_named_futures_per_contract_prices import price_name, forward_name, carry_name, \
     contract_name_from_column_name
 
-missing_row = object()
+# column number for a contract we have no prices for
+NO_CONTRACT_COLUMN = -1
 
-@dataclass
-class rollCalendarWithRollIndex:
-    roll_calendar: None
-    rolling_row_index: int = 1
-    already_added_data: bool = False
+# to avoid overlaps, a roll period starts this long after the last roll
+START_OF_ROLL_PERIOD_OFFSET = pd.DateOffset(seconds=1)
 
-    def iterate_roll(self):
-        self.rolling_row_index = self.rolling_row_index + 1
+contractColumnsForRollPeriods = namedtuple("contractColumnsForRollPeriods",
+                                           ["current_column", "next_column", "carry_column", "period_used"])
 
-    def not_end_of_calendar(self):
-        return self.rolling_row_index < len(self.roll_calendar.index)
 
-    def data_now_added(self):
-        self.already_added_data = True
+class alignedContractPrices(object):
+    def __init__(self, dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices):
+        """
+        Closing prices for every contract in one array, dates x contracts, so we can pick out the
+        price for any contract on any date with index arithmetic
 
+        :param dict_of_futures_contract_closing_prices: keys are date_str
+        """
+        contract_date_str_list = list(dict_of_futures_contract_closing_prices.keys())
+        all_prices = [dict_of_futures_contract_closing_prices[contract_date_str]
+                      for contract_date_str in contract_date_str_list]
 
-rollDateInfo = namedtuple("rollDateInfo", [
-                            "last_roll_date", "next_roll_date",
-                          "start_of_roll_period", "end_of_roll_period","roll_calendar_with_roll_index"
-])
-contractAndPriceInfo = namedtuple("ccontractAndPriceInfo",
-                                  ['current_contract', 'next_contract', 'carry_contract',
-                               'current_contract_str', 'next_contract_str', 'carry_contract_str',
-                                   "dict_of_futures_contract_closing_prices"])
-
-
-def create_multiple_price_stack_from_raw_data(
-    roll_calendar, dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices
-):
-    """
-    # NO TYPE CHECK FOR ROLL_CALENDAR AS WOULD CAUSE CIRCULAR IMPORT
-
-    :param roll_calendar: rollCalendar
-    :param dict_of_futures_closing_contract_prices: dictFuturesContractPrices with only one column, keys are date_str
-
-    :return: pd.DataFrame with the 6 columns PRICE, CARRY, FORWARD, PRICE_CONTRACT, CARRY_CONTRACT, FORWARD_CONTRACT
-    """
-
-
-    all_price_data_stack = []
-    roll_calendar_with_roll_index = rollCalendarWithRollIndex(roll_calendar)
-    while roll_calendar_with_roll_index.not_end_of_calendar():
-        all_price_data = _get_price_data_between_rolls(roll_calendar_with_roll_index,
-                                                       dict_of_futures_contract_closing_prices)
-        if all_price_data is missing_row:
-            pass
-        else:
-            all_price_data_stack.append(all_price_data)
-            roll_calendar_with_roll_index.data_now_added()
-
-        roll_calendar_with_roll_index.iterate_roll()
-
-    # end of loop
-    all_price_data_stack = pd.concat(all_price_data_stack, axis=0)
-
-    return all_price_data_stack
-
-
-def _get_price_data_between_rolls(roll_calendar_with_roll_index: rollCalendarWithRollIndex,
-                                  dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices):
-
-    # consider consolidating input args
-
-    roll_date_info = _calc_roll_date_info(roll_calendar_with_roll_index)
-    contract_date_info = _calc_contract_date_info(roll_date_info, dict_of_futures_contract_closing_prices)
-
-    invalid = _invalid_current_contract(contract_date_info)
-
-    if invalid:
-        # missing, this is okay if we haven't started properly yet
-        if not roll_calendar_with_roll_index.already_added_data:
-            print(
-                "Missing contracts at start of roll calendar not in price data, ignoring"
-            )
-            return missing_row
+        if len(all_prices) == 0:
+            index = pd.DatetimeIndex([])
         else:
-            raise Exception(
-                "Missing contracts in middle of roll calendar %s, not in price data!" %
-                str(roll_date_info.next_roll_date))
-
-    all_price_data = _calculate_price_data_from_current_next_carry_data(
-                                                                        roll_date_info,
-                                                                        contract_date_info)
-
-
-    return all_price_data
-
-
-def _calc_roll_date_info(roll_calendar_with_roll_index: rollCalendarWithRollIndex) ->rollDateInfo:
-    # Between these dates is where we are populating prices
-    roll_calendar = roll_calendar_with_roll_index.roll_calendar
-    rolling_row_index = roll_calendar_with_roll_index.rolling_row_index
-
-    last_roll_date = roll_calendar.index[rolling_row_index - 1]
-    next_roll_date = roll_calendar.index[rolling_row_index]
+            index = pd.Index(np.unique(np.concatenate(
+                [prices.index.values for prices in all_prices])))
 
-    end_of_roll_period = next_roll_date
-    start_of_roll_period = last_roll_date + pd.DateOffset(
-        seconds=1
-    )  # to avoid overlaps
+        values = np.full((len(index), len(all_prices)), np.nan)
+        # a contract has a row on a date even if the price is nan
+        has_row = np.zeros((len(index), len(all_prices)), dtype=bool)
+        for column_number, prices in enumerate(all_prices):
+            row_numbers = index.searchsorted(prices.index)
+            values[row_numbers, column_number] = prices.values
+            has_row[row_numbers, column_number] = True
 
-    roll_date_info = rollDateInfo(last_roll_date, next_roll_date,
-                                  start_of_roll_period, end_of_roll_period,
-                                  roll_calendar_with_roll_index)
+        self._index = index
+        self._values = values
+        self._has_row = has_row
+        self._column_numbers = dict(
+            (contract_date_str, column_number)
+            for column_number, contract_date_str in enumerate(contract_date_str_list))
 
-    return roll_date_info
+    @property
+    def index(self) -> pd.Index:
+        return self._index
 
+    def column_number(self, contract_date_str: str) -> int:
+        return self._column_numbers.get(contract_date_str, NO_CONTRACT_COLUMN)
 
+    def prices(self, row_numbers: np.array, column_numbers: np.array) -> np.array:
+        """
+        Price on each row for the matching column; nan where the column is NO_CONTRACT_COLUMN
+        """
+        prices = self._values[row_numbers, column_numbers]
+        prices[column_numbers == NO_CONTRACT_COLUMN] = np.nan
 
-def _calc_contract_date_info(
-                             roll_date_info: rollDateInfo,
-                            dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices)\
-                            -> contractAndPriceInfo:
+        return prices
 
-    roll_calendar = roll_date_info.roll_calendar_with_roll_index.roll_calendar
+    def has_row(self, row_numbers: np.array, column_numbers: np.array) -> np.array:
+        has_row = self._has_row[row_numbers, column_numbers]
+        has_row[column_numbers == NO_CONTRACT_COLUMN] = False
 
-    contracts_now = roll_calendar.loc[roll_date_info.next_roll_date, :]
-    current_contract = contracts_now.current_contract
-    next_contract = contracts_now.next_contract
-    carry_contract = contracts_now.carry_contract
+        return has_row
 
-    current_contract_str = str(current_contract)
-    next_contract_str = str(next_contract)
-    carry_contract_str = str(carry_contract)
 
-    contract_date_info = contractAndPriceInfo(current_contract, next_contract, carry_contract,
-                                              current_contract_str, next_contract_str, carry_contract_str,
-                                              dict_of_futures_contract_closing_prices)
-
-    return contract_date_info
-
-
-def _invalid_current_contract(contract_date_info: contractAndPriceInfo
-                              ) -> bool:
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    contract_keys = dict_of_futures_contract_closing_prices.keys()
+def create_multiple_price_stack_from_raw_data(
+    roll_calendar, dict_of_futures_contract_closing_prices: dictFuturesContractFinalPrices
+):
+    """
+    # NO TYPE CHECK FOR ROLL_CALENDAR AS WOULD CAUSE CIRCULAR IMPORT
 
-    if (contract_date_info.current_contract_str not in contract_keys):
-        return True
-    else:
-        return False
+    Each period between rolls in the roll calendar uses the current, next and carry contracts from the row
+    at the end of the period. Rather than slicing each contract for each period, all the prices are
+    aligned into one array and picked out in one go.
 
+    :param roll_calendar: rollCalendar
+    :param dict_of_futures_closing_contract_prices: dictFuturesContractPrices with only one column, keys are date_str
 
-def  _calculate_price_data_from_current_next_carry_data(
-                                                        roll_date_info: rollDateInfo,
-                                                        contract_date_info: contractAndPriceInfo):
+    :return: pd.DataFrame with the 6 columns PRICE, CARRY, FORWARD, PRICE_CONTRACT, CARRY_CONTRACT, FORWARD_CONTRACT
+    """
 
+    aligned_prices = alignedContractPrices(dict_of_futures_contract_closing_prices)
+    contract_columns = _contract_columns_for_roll_periods(roll_calendar, aligned_prices)
 
-    set_of_price_data = _get_current_next_carry_data(
-                                                     roll_date_info,
-                                                     contract_date_info)
+    (row_numbers, roll_row_numbers) = _rows_and_roll_periods_with_data(roll_calendar, aligned_prices,
+                                                                       contract_columns)
 
-    all_price_data = _build_all_price_data(set_of_price_data, contract_date_info)
+    all_price_data = _build_all_price_data(roll_calendar, aligned_prices, contract_columns,
+                                           row_numbers, roll_row_numbers)
 
     return all_price_data
 
 
-def _get_current_next_carry_data(
-
-                                roll_date_info: rollDateInfo,
-                                 contract_date_info: contractAndPriceInfo
-                                 ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    current_price_data = dict_of_futures_contract_closing_prices[
-                             contract_date_info.current_contract_str
-                         ][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
-
-    carry_price_data = _get_carry_price_data(contract_date_info,
-                                             current_price_data,
-                                             roll_date_info)
-
-    next_price_data = _get_next_price_data(contract_date_info,
-                         current_price_data,
-                        roll_date_info
-                         )
-
-    return current_price_data, next_price_data, carry_price_data
-
-
-def _get_next_price_data(contract_date_info: contractAndPriceInfo,
-                         current_price_data: pd.Series,
-                         roll_date_info: rollDateInfo
-                         ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    contract_keys = dict_of_futures_contract_closing_prices.keys()
-    next_contract_str = contract_date_info.next_contract_str
-
-    if next_contract_str not in contract_keys:
-
-        if _last_row_in_roll_calendar(roll_date_info):
-            # Last entry, this is fine
-            print(
-                "Next contract %s missing in last row of roll calendar - this is okay" %
-                next_contract_str)
-            next_price_data = pd.Series(np.nan, current_price_data.index)
-            next_price_data.iloc[:] = np.nan
-        else:
-            raise Exception(
-                "Missing contract %s in middle of roll calendar on %s"
-                % (next_contract_str, str(roll_date_info.next_roll_date))
-            )
-    else:
-        next_price_data = dict_of_futures_contract_closing_prices[
-                              next_contract_str
-                          ][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
-
-    return  next_price_data
-
-def _get_carry_price_data(contract_date_info: contractAndPriceInfo,
-                         current_price_data: pd.Series,
-                         roll_date_info: rollDateInfo
-                         ):
-    dict_of_futures_contract_closing_prices = contract_date_info.dict_of_futures_contract_closing_prices
-    contract_keys = dict_of_futures_contract_closing_prices.keys()
-    carry_contract_str = contract_date_info.carry_contract_str
-
-    if carry_contract_str not in contract_keys:
-
-        if _last_row_in_roll_calendar(roll_date_info):
-            # Last entry, this is fine
-            print(
-                "Carry contract %s missing in last row of roll calendar - this is okay" %
-                carry_contract_str)
-            carry_price_data = pd.Series(np.nan, current_price_data.index)
-            carry_price_data.iloc[:] = np.nan
-        else:
-            raise Exception(
-                "Missing contract %s in middle of roll calendar on %s"
-                % (carry_contract_str, str(roll_date_info.next_roll_date))
-            )
-    else:
-        carry_price_data =    dict_of_futures_contract_closing_prices[
-        carry_contract_str][roll_date_info.start_of_roll_period:roll_date_info.end_of_roll_period]
-
-
-    return  carry_price_data
-
+def _contract_columns_for_roll_periods(roll_calendar,
+                                       aligned_prices: alignedContractPrices) -> contractColumnsForRollPeriods:
+    """
+    For each row in the roll calendar, which contract columns we use for the period ending on that roll date
 
-def _last_row_in_roll_calendar(roll_date_info: rollDateInfo):
-    roll_calendar_with_roll_index = roll_date_info.roll_calendar_with_roll_index
-    if \
-    roll_calendar_with_roll_index.rolling_row_index == len(roll_calendar_with_roll_index.roll_calendar.index) - 1:
-        return True
-    else:
-        return False
+    Missing contracts are okay at the start of the roll calendar, or for next and carry contracts in the last row
+    """
+    roll_count = len(roll_calendar.index)
+    current_column = np.full(roll_count, NO_CONTRACT_COLUMN)
+    next_column = np.full(roll_count, NO_CONTRACT_COLUMN)
+    carry_column = np.full(roll_count, NO_CONTRACT_COLUMN)
+    period_used = np.zeros(roll_count, dtype=bool)
+
+    already_added_data = False
+    for roll_row_number in range(1, roll_count):
+        next_roll_date = roll_calendar.index[roll_row_number]
+        last_row = roll_row_number == roll_count - 1
+
+        current_column[roll_row_number] = aligned_prices.column_number(
+            str(roll_calendar.current_contract.iloc[roll_row_number]))
+        if current_column[roll_row_number] == NO_CONTRACT_COLUMN:
+            # missing, this is okay if we haven't started properly yet
+            if not already_added_data:
+                print(
+                    "Missing contracts at start of roll calendar not in price data, ignoring"
+                )
+                continue
+            else:
+                raise Exception(
+                    "Missing contracts in middle of roll calendar %s, not in price data!" %
+                    str(next_roll_date))
+
+        carry_column[roll_row_number] = _column_number_for_next_or_carry_contract(
+            aligned_prices, str(roll_calendar.carry_contract.iloc[roll_row_number]),
+            "Carry", next_roll_date, last_row)
+        next_column[roll_row_number] = _column_number_for_next_or_carry_contract(
+            aligned_prices, str(roll_calendar.next_contract.iloc[roll_row_number]),
+            "Next", next_roll_date, last_row)
+
+        period_used[roll_row_number] = True
+        already_added_data = True
+
+    return contractColumnsForRollPeriods(current_column, next_column, carry_column, period_used)
+
+
+def _column_number_for_next_or_carry_contract(aligned_prices: alignedContractPrices,
+                                              contract_date_str: str,
+                                              description: str,
+                                              next_roll_date,
+                                              last_row: bool) -> int:
+    column_number = aligned_prices.column_number(contract_date_str)
+    if column_number != NO_CONTRACT_COLUMN:
+        return column_number
+
+    if last_row:
+        # Last entry, this is fine
+        print(
+            "%s contract %s missing in last row of roll calendar - this is okay" %
+            (description, contract_date_str))
+        return NO_CONTRACT_COLUMN
+
+    raise Exception(
+        "Missing contract %s in middle of roll calendar on %s"
+        % (contract_date_str, str(next_roll_date))
+    )
 
 
-def _build_all_price_data(set_of_price_data, contract_date_info):
+def _rows_and_roll_periods_with_data(roll_calendar,
+                                     aligned_prices: alignedContractPrices,
+                                     contract_columns: contractColumnsForRollPeriods):
+    """
+    Rows of aligned prices where the current, next or carry contract for that roll period has a price,
+    and the roll calendar row at the end of the period each one belongs to
 
-    current_price_data, next_price_data, carry_price_data = set_of_price_data
-    all_price_data = pd.concat(
-        [current_price_data, next_price_data, carry_price_data], axis=1
+    :return: tuple of np.array
+    """
+    roll_dates = roll_calendar.index
+    index = aligned_prices.index
+
+    # period ending on roll_dates[n] covers last roll + offset, up to and including roll_dates[n]
+    roll_row_numbers = roll_dates.searchsorted(index, side="left")
+    in_calendar = (roll_row_numbers >= 1) & (roll_row_numbers < len(roll_dates))
+
+    row_numbers = np.arange(len(index))[in_calendar]
+    roll_row_numbers = roll_row_numbers[in_calendar]
+
+    start_of_roll_periods = roll_dates[roll_row_numbers - 1] + START_OF_ROLL_PERIOD_OFFSET
+    after_start = np.asarray(index[row_numbers] >= start_of_roll_periods)
+    period_used = contract_columns.period_used[roll_row_numbers]
+
+    row_numbers = row_numbers[after_start & period_used]
+    roll_row_numbers = roll_row_numbers[after_start & period_used]
+
+    has_any_price = np.zeros(len(row_numbers), dtype=bool)
+    for column_numbers_by_roll in [contract_columns.current_column,
+                                   contract_columns.next_column,
+                                   contract_columns.carry_column]:
+        has_any_price = has_any_price | aligned_prices.has_row(
+            row_numbers, column_numbers_by_roll[roll_row_numbers])
+
+    return row_numbers[has_any_price], roll_row_numbers[has_any_price]
+
+
+def _build_all_price_data(roll_calendar,
+                          aligned_prices: alignedContractPrices,
+                          contract_columns: contractColumnsForRollPeriods,
+                          row_numbers: np.array,
+                          roll_row_numbers: np.array) -> pd.DataFrame:
+
+    all_price_data = pd.DataFrame(
+        {
+            price_name: aligned_prices.prices(row_numbers,
+                                              contract_columns.current_column[roll_row_numbers]),
+            forward_name: aligned_prices.prices(row_numbers,
+                                                contract_columns.next_column[roll_row_numbers]),
+            carry_name: aligned_prices.prices(row_numbers,
+                                              contract_columns.carry_column[roll_row_numbers]),
+            contract_name_from_column_name(price_name):
+                roll_calendar.current_contract.values[roll_row_numbers],
+            contract_name_from_column_name(forward_name):
+                roll_calendar.next_contract.values[roll_row_numbers],
+            contract_name_from_column_name(carry_name):
+                roll_calendar.carry_contract.values[roll_row_numbers],
+        },
+        index=aligned_prices.index[row_numbers],
     )
-    all_price_data.columns = [
-        price_name,
-        forward_name,
-        carry_name,
-    ]
 
-    all_price_data[contract_name_from_column_name(price_name)] = contract_date_info.current_contract
-    all_price_data[contract_name_from_column_name(forward_name)] = contract_date_info.next_contract
-    all_price_data[contract_name_from_column_name(carry_name)] = contract_date_info.carry_contract
-
-    return all_price_data
\ No newline at end of file
+    return all_price_data
@@ -148,11 +148,59 @@ def _get_new_row_of_roll_calendar(current_contract: contractWithRollParametersAn
     return next_contract, new_row
 
 
-localRowData = namedtuple("localRowData", ['current_row',
-                                                     'prev_row',
-                                                     'next_row',
-                                                     'first_row_in_data'])
-_last_row = object()
+localRowData = namedtuple("localRowData", ['roll_date',
+                                           'date_to_avoid',
+                                           'current_contract',
+                                           'next_contract',
+                                           'carry_contract',
+                                           'carry_contract_in_next_row'])
+
+ONE_DAY = np.timedelta64(1, "D")
+
+
+class _datesWithPrices(object):
+    def __init__(self, dict_of_futures_contract_prices: dictFuturesContractFinalPrices):
+        """
+        Sorted arrays of the dates on which contracts have prices, worked out once for each contract
+        and once for each combination of contracts that have to be matched on a roll date
+
+        :param dict_of_futures_contract_prices: dict of futuresContractPrices, keys contract date eg yyyymmdd
+        """
+        self._prices = dict_of_futures_contract_prices
+        self._dates_for_contract = {}
+        self._matching_dates = {}
+
+    def has_contract(self, contract_date_str: str) -> bool:
+        return contract_date_str in self._prices
+
+    def matching_dates(self, list_of_contract_date_str: list) -> np.array:
+        """
+        Dates on which all the contracts have prices
+
+        Raises KeyError if we don't have prices for one of the contracts
+
+        :return: sorted np.array of datetime64
+        """
+        key = tuple(list_of_contract_date_str)
+        matching_dates = self._matching_dates.get(key, None)
+        if matching_dates is None:
+            matching_dates = self._dates_for_single_contract(list_of_contract_date_str[0])
+            for contract_date_str in list_of_contract_date_str[1:]:
+                matching_dates = np.intersect1d(matching_dates,
+                                                self._dates_for_single_contract(contract_date_str),
+                                                assume_unique=True)
+            self._matching_dates[key] = matching_dates
+
+        return matching_dates
+
+    def _dates_for_single_contract(self, contract_date_str: str) -> np.array:
+        dates = self._dates_for_contract.get(contract_date_str, None)
+        if dates is None:
+            prices = self._prices[contract_date_str]
+            dates = np.unique(prices.index.values[~np.isnan(prices.values)])
+            self._dates_for_contract[contract_date_str] = dates
+
+        return dates
 
 
 def adjust_to_price_series(approx_calendar: pd.DataFrame,
@@ -168,17 +216,11 @@ def adjust_to_price_series(approx_calendar: pd.DataFrame,
     """
 
     adjusted_roll_calendar_as_list = _listOfRollCalendarRows()
-    idx_of_last_row_in_data = len(approx_calendar.index) - 1
-
-    for row_number in range(len(approx_calendar.index)):
-        local_row_data = _get_local_data_for_row_number(approx_calendar,
-                                                        row_number,
-                                                        idx_of_last_row_in_data)
-        if local_row_data is _last_row:
-            break
+    dates_with_prices = _datesWithPrices(dict_of_futures_contract_prices)
 
+    for local_row_data in _get_local_data_for_all_rows(approx_calendar):
         adjusted_row = _adjust_row_of_approx_roll_calendar(local_row_data,
-                                                           dict_of_futures_contract_prices)
+                                                           dates_with_prices)
 
         if adjusted_row is _bad_row:
             have_some_data_already = len(adjusted_roll_calendar_as_list)>0
@@ -197,52 +239,45 @@ def adjust_to_price_series(approx_calendar: pd.DataFrame,
     return new_calendar
 
 
-def _get_local_data_for_row_number(approx_calendar: pd.DataFrame,
-                             row_number: int,
-                             idx_of_last_row_in_data:int)\
-                            -> localRowData:
-
-    last_row_in_data = row_number == idx_of_last_row_in_data
-    if last_row_in_data:
-        return _last_row
-
-    first_row_in_data = row_number == 0
-
-    approx_row = approx_calendar.iloc[row_number, :]
-    if not first_row_in_data:
-        prev_approx_row = approx_calendar.iloc[row_number - 1,]
-    else:
-        prev_approx_row = _bad_row
-
-    next_approx_row = approx_calendar.iloc[row_number + 1, :]
-
-    local_row_data = localRowData(approx_row, prev_approx_row, next_approx_row,
-                                             first_row_in_data
-                                             )
-
-    return local_row_data
+def _get_local_data_for_all_rows(approx_calendar: pd.DataFrame) -> list:
+    """
+    Everything we need for each row except the last, taken from the calendar in one go
+    """
+    roll_dates = list(approx_calendar.index)
+    current_contracts = list(approx_calendar.current_contract)
+    next_contracts = list(approx_calendar.next_contract)
+    carry_contracts = list(approx_calendar.carry_contract)
 
+    # This is needed to avoid double rolls
+    dates_to_avoid = [None] + roll_dates[:-1]
+
+    all_local_row_data = [
+        localRowData(roll_dates[row_number],
+                     dates_to_avoid[row_number],
+                     current_contracts[row_number],
+                     next_contracts[row_number],
+                     carry_contracts[row_number],
+                     carry_contracts[row_number + 1])
+        for row_number in range(len(roll_dates) - 1)
+    ]
 
-setOfPrices = namedtuple("setOfPrices", ["current_prices",
-    "next_prices",
-    "carry_prices"])
-_no_carry_prices = object()
+    return all_local_row_data
 
 
 def _adjust_row_of_approx_roll_calendar(local_row_data: localRowData,
-                                        dict_of_futures_contract_prices: dictFuturesContractFinalPrices):
+                                        dates_with_prices: _datesWithPrices):
 
-    roll_date, date_to_avoid = _get_roll_date_and_date_to_avoid(local_row_data)
-    set_of_prices = _get_set_of_prices(local_row_data, dict_of_futures_contract_prices)
-    if set_of_prices is _bad_row:
+    contracts_to_match = _contracts_to_match(local_row_data, dates_with_prices)
+    if contracts_to_match is _bad_row:
         _print_roll_date_error(local_row_data)
         return  _bad_row
-    try:
 
+    valid_dates = dates_with_prices.matching_dates(contracts_to_match)
+    try:
         adjusted_roll_date = _find_best_matching_roll_date(
-            roll_date,
-            set_of_prices,
-            avoid_date=date_to_avoid,
+            local_row_data.roll_date,
+            valid_dates,
+            avoid_date=local_row_data.date_to_avoid,
         )
     except LookupError:
         _print_roll_date_error(local_row_data)
@@ -254,86 +289,39 @@ def _adjust_row_of_approx_roll_calendar(local_row_data: localRowData,
     return adjusted_row
 
 
-def _get_roll_date_and_date_to_avoid(local_row_data: localRowData):
-    # This is needed to avoid double rolls
-    approx_row = local_row_data.current_row
-    prev_approx_row = local_row_data.prev_row
-    first_row_in_data = local_row_data.first_row_in_data
-
-    roll_date = approx_row.name
-    if not first_row_in_data:
-        date_to_avoid = prev_approx_row.name
-    else:
-        date_to_avoid = None
-
-    return roll_date, date_to_avoid
-
-
-def _get_set_of_prices(local_row_data: localRowData,
-                       dict_of_futures_contract_prices: dictFuturesContractFinalPrices) \
-                        ->setOfPrices:
-
-    approx_row = local_row_data.current_row
+def _contracts_to_match(local_row_data: localRowData,
+                        dates_with_prices: _datesWithPrices) -> list:
 
-    current_contract = str(approx_row.current_contract)
-    next_contract = str(approx_row.next_contract)
-
-    try:
-        current_prices = dict_of_futures_contract_prices[current_contract]
-    except KeyError:
+    current_contract = str(local_row_data.current_contract)
+    if not dates_with_prices.has_contract(current_contract):
         return _bad_row
 
-    next_prices = dict_of_futures_contract_prices[next_contract]
-
-    carry_contract, carry_prices = _get_carry_contract_and_prices(local_row_data,
-                                                                                 dict_of_futures_contract_prices)
-    set_of_prices = setOfPrices(current_prices, next_prices, carry_prices)
-
-    return set_of_prices
-
-
-def _get_carry_contract_and_prices(local_row_data, dict_of_futures_contract_prices):
-    next_approx_row = local_row_data.next_row
+    contracts_to_match = [current_contract, str(local_row_data.next_contract)]
 
     carry_comes_afterwards = _does_carry_come_after_current_contract(local_row_data)
+    if not carry_comes_afterwards:
+        contracts_to_match.append(str(local_row_data.carry_contract_in_next_row))
 
-    if carry_comes_afterwards:
-        carry_prices = _no_carry_prices
-        carry_contract = _no_carry_prices
-    else:
-        carry_contract = str(next_approx_row.carry_contract)
-        carry_prices = dict_of_futures_contract_prices[carry_contract]
-
-    return carry_contract, carry_prices
+    return contracts_to_match
 
 
 def _does_carry_come_after_current_contract(local_row_data: localRowData)->bool:
-    approx_row = local_row_data.current_row
-
-    current_contract = approx_row.current_contract
-    current_carry_contract = approx_row.carry_contract
-
-    carry_comes_afterwards = current_carry_contract > current_contract
+    carry_comes_afterwards = local_row_data.carry_contract > local_row_data.current_contract
 
     return carry_comes_afterwards
 
 
 def _print_roll_date_error(local_row_data: localRowData):
-    approx_row =local_row_data.current_row
-    current_contract = approx_row.current_contract
-    next_contract = approx_row.next_contract
-    carry_contract = approx_row.carry_contract
-
     print(
         "Couldn't find matching roll date for contracts %s, %s and %s"
-        % (current_contract, next_contract, carry_contract)
+        % (local_row_data.current_contract, local_row_data.next_contract, local_row_data.carry_contract)
     )
     print("OK if happens at the end or beginning of a roll calendar, otherwise problematic")
 
 
 def _find_best_matching_roll_date(
     roll_date,
-    set_of_prices: setOfPrices,
+    valid_dates: np.array,
     avoid_date=None
 ):
     """
@@ -341,15 +329,17 @@ def _find_best_matching_roll_date(
     If avoid_date is passed, get the next date after that
 
     :param roll_date: datetime.datetime
-    :param set_of_prices:
+    :param valid_dates: sorted np.array of datetime64, dates when we have matching prices
     :param avoid_date: datetime.datetime or None
 
     :return: datetime.datetime or
     """
 
-    # Get the list of dates for which a roll is possible
-    paired_prices = _required_paired_prices(set_of_prices)
-    valid_dates = _valid_dates_from_paired_prices(paired_prices, avoid_date)
+    if avoid_date is not None:
+        # Remove matching dates before avoid dates
+        first_date_after_avoid = valid_dates.searchsorted(
+            pd.Timestamp(avoid_date).to_datetime64(), side="right")
+        valid_dates = valid_dates[first_date_after_avoid:]
 
     if len(valid_dates) == 0:
         # no matching prices
@@ -361,87 +351,53 @@ def _find_best_matching_roll_date(
     return adjusted_date
 
 
-def _required_paired_prices(set_of_prices: setOfPrices)\
-                            -> pd.DataFrame:
-
-    no_carry_exists = set_of_prices.carry_prices is _no_carry_prices
-    if no_carry_exists:
-        paired_prices = pd.concat([set_of_prices.current_prices,
-                                   set_of_prices.next_prices], axis=1)
-    else:
-        paired_prices = pd.concat(
-            [set_of_prices.current_prices,
-             set_of_prices.next_prices,
-             set_of_prices.carry_prices], axis=1)
-
-    return paired_prices
-
-
-def _valid_dates_from_paired_prices(paired_prices: pd.DataFrame,
-                                    avoid_date):
-    paired_prices_matching = _matching_prices_from_paired_prices(paired_prices)
-    valid_dates = _valid_dates_from_matching_prices(paired_prices_matching, avoid_date)
-
-    return valid_dates
-
-
-def _matching_prices_from_paired_prices(paired_prices):
-    paired_prices_check_match = paired_prices.apply(
-        lambda xlist: not any(np.isnan(xlist)), axis=1
-    )
-    paired_prices_matching = paired_prices_check_match[paired_prices_check_match]
-
-    return paired_prices_matching
-
-
-def _valid_dates_from_matching_prices(paired_prices_matching, avoid_date):
-    valid_dates = paired_prices_matching.index
-    valid_dates.sort_values()
-
-    if avoid_date is not None:
-        # Remove matching dates before avoid dates
-        valid_dates = valid_dates[valid_dates > avoid_date]
+def _find_closest_valid_date_to_approx_roll_date(valid_dates: np.array, roll_date):
+    """
+    Closest in whole days (rounded down), the earliest if there is a tie
 
-    return valid_dates
+    >>> valid_dates = pd.to_datetime(["2020-01-01", "2020-01-03 12:00", "2020-01-07"]).values
+    >>> _find_closest_valid_date_to_approx_roll_date(valid_dates, pd.Timestamp("2020-01-05"))
+    Timestamp('2020-01-03 12:00:00')
+    >>> _find_closest_valid_date_to_approx_roll_date(valid_dates, pd.Timestamp("2020-01-06"))
+    Timestamp('2020-01-07 00:00:00')
+    """
+    roll_date = pd.Timestamp(roll_date).to_datetime64()
 
+    # days from roll date go up with each date, so only the dates either side of it can be closest
+    first_date_on_or_after_roll = valid_dates.searchsorted(roll_date, side="left")
+    if first_date_on_or_after_roll == 0:
+        return pd.Timestamp(valid_dates[0])
 
-def _find_closest_valid_date_to_approx_roll_date(valid_dates, roll_date):
+    days_before_roll = -((valid_dates[first_date_on_or_after_roll - 1] - roll_date) // ONE_DAY)
+    if first_date_on_or_after_roll < len(valid_dates):
+        days_after_roll = (valid_dates[first_date_on_or_after_roll] - roll_date) // ONE_DAY
+        if days_after_roll < days_before_roll:
+            return pd.Timestamp(valid_dates[first_date_on_or_after_roll])
 
-    distance_to_roll = valid_dates - roll_date
-    distance_to_roll_days = [
-        abs(distance_item.days) for distance_item in distance_to_roll
-    ]
-    closest_date_index = distance_to_roll_days.index(
-        min(distance_to_roll_days))
-    adjusted_date = valid_dates[closest_date_index]
+    # earliest date the same number of days before
+    closest_date_index = valid_dates.searchsorted(roll_date - days_before_roll * ONE_DAY, side="left")
 
-    return adjusted_date
+    return pd.Timestamp(valid_dates[closest_date_index])
 
 
 def _get_adjusted_row(local_row_data: localRowData,
       adjusted_roll_date) -> _rollCalendarRow:
 
-    approx_row = local_row_data.current_row
-    current_carry_contract = approx_row.carry_contract
-    current_contract = approx_row.current_contract
-    next_contract = approx_row.next_contract
-
     adjusted_row = _rollCalendarRow(adjusted_roll_date,
-                                    current_contract,
-                                    next_contract,
-                                    current_carry_contract)
+                                    local_row_data.current_contract,
+                                    local_row_data.next_contract,
+                                    local_row_data.carry_contract)
 
     return adjusted_row
 
 
 def    _print_data_at_start_not_valid_flag(local_row_data: localRowData):
-    approx_row = local_row_data.current_row
-    print("Couldn't get good data for roll date %s but at start so truncating" % str(approx_row.name))
+    print("Couldn't get good data for roll date %s but at start so truncating" % str(local_row_data.roll_date))
 
 
 def _print_adjustment_message(local_row_data: localRowData, adjusted_row: _rollCalendarRow):
     print("Changed date from %s to %s for row with contracts %s" %
-          (str(local_row_data.current_row.name),
+          (str(local_row_data.roll_date),
            str(adjusted_row.roll_date),
            str(adjusted_row.items())))
 
@@ -1,20 +1,75 @@
+import datetime
+
+from syscore.objects import missing_data
 from sysdata.base_data import baseData
 from syslogdiag.log import logtoscreen
 
+LAST_EMAIL_SENT = "last_email_sent"
+LAST_WARNING_SENT = "last_warning_sent"
+
+
+class emailRateLimitState(dict):
+    """
+    When we last sent an email, and last warned that we'd stop sending emails, for each subject
+
+    Kept together so we can read and write it in one go, however many emails we're sending. We also
+     keep track of which subjects have changed, so only those are written
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._changed_subjects = set()
+
+    @property
+    def changed_subjects(self) -> list:
+        return list(self._changed_subjects)
+
+    def mark_changes_as_saved(self):
+        self._changed_subjects = set()
+
+    def time_last_email_sent(self, subject: str) -> datetime.datetime:
+        return self.get(subject, {}).get(LAST_EMAIL_SENT, missing_data)
+
+    def time_last_warning_sent(self, subject: str) -> datetime.datetime:
+        return self.get(subject, {}).get(LAST_WARNING_SENT, missing_data)
+
+    def record_email_sent(self, subject: str, when: datetime.datetime = None):
+        self.record_date_for_type(subject, LAST_EMAIL_SENT, when)
+
+    def record_warning_sent(self, subject: str, when: datetime.datetime = None):
+        self.record_date_for_type(subject, LAST_WARNING_SENT, when)
+
+    def record_date_for_type(self, subject: str, type: str, when: datetime.datetime = None):
+        if when is None:
+            when = datetime.datetime.now()
+        self.setdefault(subject, {})[type] = when
+        self._changed_subjects.add(subject)
+
+
 class emailControlData(baseData):
     def __init__(self, log=logtoscreen("email-control-data")):
         super().__init__(log=log)
 
     def get_time_last_email_sent_with_this_subject(self, subject):
-        raise NotImplementedError
+        return self.get_rate_limit_state().time_last_email_sent(subject)
 
     def record_date_of_email_send(self, subject):
-        raise NotImplementedError
+        rate_limit_state = self.get_rate_limit_state()
+        rate_limit_state.record_email_sent(subject)
+        self.save_rate_limit_state(rate_limit_state)
 
     def get_time_last_warning_email_sent_with_this_subject(self, subject):
-        raise NotImplementedError
+        return self.get_rate_limit_state().time_last_warning_sent(subject)
 
     def record_date_of_email_warning_send(self, subject):
+        rate_limit_state = self.get_rate_limit_state()
+        rate_limit_state.record_warning_sent(subject)
+        self.save_rate_limit_state(rate_limit_state)
+
+    def get_rate_limit_state(self) -> emailRateLimitState:
+        raise NotImplementedError
+
+    def save_rate_limit_state(self, rate_limit_state: emailRateLimitState):
         raise NotImplementedError
 
     def store_message(self, body, subject):
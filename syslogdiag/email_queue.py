@@ -0,0 +1,253 @@
+"""
+Emails are put on a queue and sent by a background thread over one SMTP connection, so a slow mail server
+doesn't hold up the process that wants to tell us something
+
+Messages with the same subject which arrive within email_coalesce_seconds of the first one are sent as a single
+email. Anything still on the queue is sent when the process exits.
+
+Apart from reports, we only send one email a day for each subject. After that messages are stored in the database
+instead, and we send one warning a day to say so. The rate limit state is read and written once for each batch.
+"""
+
+import atexit
+import datetime
+import threading
+import time
+
+from syscore.dateutils import SECONDS_PER_DAY
+from syscore.objects import arg_not_supplied, missing_data
+from sysdata.config.private_config import get_private_then_default_key_value
+from syslogdiag.email_control import emailControlData, emailRateLimitState
+from syslogdiag.emailing import emailConnection, compose_mail_msg
+from syslogdiag.log import logtoscreen, logger
+
+# how often the worker looks for emails that are ready to send
+POLL_SECONDS = 1.0
+
+
+class queuedEmail(object):
+    def __init__(self, subject: str, email_is_report: bool = False):
+        self._subject = subject
+        self._email_is_report = email_is_report
+        self._list_of_bodies = []
+        self._first_queued = datetime.datetime.now()
+
+    @property
+    def subject(self) -> str:
+        return self._subject
+
+    @property
+    def email_is_report(self) -> bool:
+        return self._email_is_report
+
+    @property
+    def list_of_bodies(self) -> list:
+        return self._list_of_bodies
+
+    @property
+    def first_queued(self) -> datetime.datetime:
+        return self._first_queued
+
+    def add_body(self, body: str):
+        self._list_of_bodies.append(body)
+
+    @property
+    def body(self) -> str:
+        if len(self.list_of_bodies) == 1:
+            return self.list_of_bodies[0]
+
+        return ("%d messages with this subject\n\n" % len(self.list_of_bodies)) + \
+            "\n\n-----\n\n".join(self.list_of_bodies)
+
+
+class emailQueue(object):
+    def __init__(self, email_control_data: emailControlData,
+                 log: logger = logtoscreen("emailQueue"),
+                 coalesce_seconds: float = arg_not_supplied,
+                 email_details: tuple = None):
+        """
+        :param email_details: as returned by get_email_details; by default we use the private config
+        """
+        if coalesce_seconds is arg_not_supplied:
+            coalesce_seconds = get_private_then_default_key_value("email_coalesce_seconds")
+
+        self._email_control_data = email_control_data
+        self._log = log
+        self._coalesce_seconds = coalesce_seconds
+        self._email_details = email_details
+
+        self._queue_lock = threading.Lock()
+        # only one thread sends at a time, and owns the connection while it does
+        self._send_lock = threading.Lock()
+        self._queued_emails_by_subject = {}
+        self._connection = None
+        self._worker = None
+
+    @property
+    def log(self):
+        return self._log
+
+    @property
+    def email_control_data(self) -> emailControlData:
+        return self._email_control_data
+
+    def __len__(self):
+        with self._queue_lock:
+            return len(self._queued_emails_by_subject)
+
+    def put(self, body: str, subject: str, email_is_report: bool = False):
+        with self._queue_lock:
+            queued_email = self._queued_emails_by_subject.get(subject, None)
+            if queued_email is None:
+                queued_email = self._queued_emails_by_subject[subject] = queuedEmail(
+                    subject, email_is_report=email_is_report)
+            queued_email.add_body(body)
+
+        self._start_worker_if_not_running()
+
+    def flush(self):
+        """
+        Send everything on the queue now, however recently it was added
+        """
+        self.send_emails_that_are_due(send_everything=True)
+
+    def close(self):
+        self.flush()
+        with self._send_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def send_emails_that_are_due(self, send_everything: bool = False):
+        with self._send_lock:
+            list_of_queued_emails = self._take_emails_that_are_due(send_everything=send_everything)
+            if len(list_of_queued_emails) == 0:
+                return None
+
+            try:
+                send_list_of_queued_emails(self.email_control_data, self.connection,
+                                           list_of_queued_emails, log=self.log)
+            except Exception as e:
+                # we mustn't kill the worker, or nothing else will be sent
+                self.log.warn("Problem %s sending queued emails %s" % (
+                    str(e), str([queued_email.subject for queued_email in list_of_queued_emails])))
+
+    @property
+    def connection(self) -> emailConnection:
+        if self._connection is None:
+            self._connection = emailConnection(self._email_details)
+
+        return self._connection
+
+    def _take_emails_that_are_due(self, send_everything: bool = False) -> list:
+        coalesce_until = datetime.datetime.now() - datetime.timedelta(seconds=self._coalesce_seconds)
+        with self._queue_lock:
+            list_of_subjects_due = [
+                subject for subject, queued_email in self._queued_emails_by_subject.items()
+                if send_everything or queued_email.first_queued <= coalesce_until]
+
+            return [self._queued_emails_by_subject.pop(subject) for subject in list_of_subjects_due]
+
+    def _start_worker_if_not_running(self):
+        with self._queue_lock:
+            if self._worker is not None:
+                return None
+            self._worker = threading.Thread(target=self._worker_loop, name="emailQueue", daemon=True)
+
+        self._worker.start()
+
+    def _worker_loop(self):
+        while True:
+            time.sleep(POLL_SECONDS)
+            self.send_emails_that_are_due()
+
+
+def send_list_of_queued_emails(email_control_data: emailControlData,
+                               connection: emailConnection,
+                               list_of_queued_emails: list,
+                               log: logger = logtoscreen("emailQueue")):
+    rate_limit_state = email_control_data.get_rate_limit_state()
+    for queued_email in list_of_queued_emails:
+        send_queued_email_or_store(email_control_data, connection, queued_email,
+                                   rate_limit_state=rate_limit_state, log=log)
+
+    email_control_data.save_rate_limit_state(rate_limit_state)
+
+
+def send_queued_email_or_store(email_control_data: emailControlData,
+                               connection: emailConnection,
+                               queued_email: queuedEmail,
+                               rate_limit_state: emailRateLimitState,
+                               log: logger = logtoscreen("emailQueue")):
+    subject = queued_email.subject
+    if queued_email.email_is_report or not sent_in_last_day(rate_limit_state.time_last_email_sent(subject)):
+        sent = send_email_and_record_date(connection, queued_email.body, subject,
+                                          rate_limit_state=rate_limit_state, log=log)
+        if not sent:
+            store_queued_email(email_control_data, queued_email)
+        return None
+
+    # won't send an email to avoid clogging up the inbox
+    # but might send one more to tell the user to check the logs of stored
+    # emails
+    if not sent_in_last_day(rate_limit_state.time_last_warning_sent(subject)):
+        body = "To reduce email load, won't send any more emails with this subject today. Use interactive_controls, retrieve emails to see stored messages"
+        send_email_and_record_date(connection, body, subject,
+                                   rate_limit_state=rate_limit_state, log=log)
+        rate_limit_state.record_warning_sent(subject)
+
+    store_queued_email(email_control_data, queued_email)
+
+
+def send_email_and_record_date(connection: emailConnection, body: str, subject: str,
+                               rate_limit_state: emailRateLimitState,
+                               log: logger = logtoscreen("emailQueue")) -> bool:
+    try:
+        connection.send_msg(compose_mail_msg(body, subject))
+    except Exception as e:
+        # problem sending emails will store instead
+        log.msg("Problem %s sending email subject %s, will store message instead" % (str(e), subject))
+        connection.close()
+        return False
+
+    rate_limit_state.record_email_sent(subject)
+    log.msg("Sent email subject %s" % subject)
+
+    return True
+
+
+def store_queued_email(email_control_data: emailControlData, queued_email: queuedEmail):
+    if queued_email.email_is_report:
+        # can't store reports
+        return None
+
+    for body in queued_email.list_of_bodies:
+        email_control_data.store_message(body, queued_email.subject)
+
+
+def sent_in_last_day(last_time_email_sent: datetime.datetime) -> bool:
+    if last_time_email_sent is missing_data:
+        return False
+
+    elapsed_time = datetime.datetime.now() - last_time_email_sent
+
+    # okay to send one email per day, per subject
+    return elapsed_time.total_seconds() <= SECONDS_PER_DAY
+
+
+_email_queue_for_this_process = None
+_email_queue_lock = threading.Lock()
+
+
+def get_email_queue_for_this_process(email_control_data: emailControlData,
+                                     log: logger = logtoscreen("emailQueue")) -> emailQueue:
+    """
+    Every email from this process goes through the same queue, and so the same connection
+    """
+    global _email_queue_for_this_process
+    with _email_queue_lock:
+        if _email_queue_for_this_process is None:
+            _email_queue_for_this_process = emailQueue(email_control_data, log=log)
+            atexit.register(_email_queue_for_this_process.close)
+
+        return _email_queue_for_this_process
@@ -29,13 +29,19 @@ def send_mail_msg(body, subject):
 
     """
 
+    msg = compose_mail_msg(body, subject)
+
+    _send_msg(msg)
+
+
+def compose_mail_msg(body, subject):
     # Create a text/plain message
     msg = MIMEMultipart()
 
     msg["Subject"] = subject
     msg.attach(MIMEText(body, "plain"))
 
-    _send_msg(msg)
+    return msg
 
 
 def send_mail_pdfs(preamble, filelist, subject):
@@ -68,24 +74,72 @@ def _send_msg(msg):
 
     """
 
-    email_server, email_address, email_pwd, email_to, email_port = get_email_details()
+    connection = emailConnection()
+    try:
+        connection.send_msg(msg)
+    finally:
+        connection.close()
+
 
-    me = email_address
-    you = email_to
-    msg["From"] = me
-    msg["To"] = you
+class emailConnection(object):
+    """
+    A connection to our SMTP server which is kept open for as many messages as we want to send
 
-    # Send the message via our own SMTP server, but don't include the
-    # envelope header.
-    s = smtplib.SMTP(email_server, email_port)
-    # add tls for those using yahoo or gmail. 
-    try:
-        s.starttls()
-    except:
-        pass
-    s.login(email_address, email_pwd)
-    s.sendmail(me, [you], msg.as_string())
-    s.quit()
+    If the server has closed it since the last message, we open it again
+    """
+
+    def __init__(self, email_details: tuple = None):
+        if email_details is None:
+            email_details = get_email_details()
+
+        self._email_details = email_details
+        self._smtp = None
+
+    def send_msg(self, msg):
+        email_server, email_address, email_pwd, email_to, email_port = self._email_details
+
+        me = email_address
+        you = email_to
+        msg["From"] = me
+        msg["To"] = you
+
+        try:
+            self._connected_smtp().sendmail(me, [you], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # probably timed out since we last used it
+            self._smtp = None
+            self._connected_smtp().sendmail(me, [you], msg.as_string())
+
+    def close(self):
+        smtp = self._smtp
+        self._smtp = None
+        if smtp is None:
+            return None
+        try:
+            smtp.quit()
+        except smtplib.SMTPException:
+            pass
+
+    def _connected_smtp(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            self._smtp = self._connect()
+
+        return self._smtp
+
+    def _connect(self) -> smtplib.SMTP:
+        email_server, email_address, email_pwd, email_to, email_port = self._email_details
+
+        # Send the message via our own SMTP server, but don't include the
+        # envelope header.
+        s = smtplib.SMTP(email_server, email_port)
+        # add tls for those using yahoo or gmail.
+        try:
+            s.starttls()
+        except:
+            pass
+        s.login(email_address, email_pwd)
+
+        return s
 
 
 def get_email_details():
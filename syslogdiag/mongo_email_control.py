@@ -1,19 +1,23 @@
 import datetime
 from syscore.dateutils import datetime_to_long, long_to_datetime
-from syscore.objects import missing_data
-from syslogdiag.email_control import emailControlData
+from syscore.objects import missing_data, existingData
+from syslogdiag.email_control import emailControlData, emailRateLimitState, LAST_EMAIL_SENT, LAST_WARNING_SENT
 from sysdata.mongodb.mongo_generic import mongoDataWithMultipleKeys
 
 from syslogdiag.log import logtoscreen
 
 EMAIL_CONTROL_COLLECTION = "EMAIL_CONTROL"
-LAST_EMAIL_SENT = "last_email_sent"
-LAST_WARNING_SENT = "last_warning_sent"
+RATE_LIMIT_STATE = "rate_limit_state"
 STORED_MSG = "stored_message"
 SUBJECT_KEY = 'subject'
 BODY_KEY = 'body'
 TYPE_KEY = 'type'
 DATE_KEY = 'datetime'
+SUBJECTS_KEY = 'subjects'
+
+# dates are stored to the nearest 100 microseconds
+STORED_MSG_RESOLUTION_MICROSECONDS = 100
+MAX_ATTEMPTS_TO_STORE_MSG = 100
 
 class mongoEmailControlData(emailControlData):
     def __init__(
@@ -32,50 +36,70 @@ class mongoEmailControlData(emailControlData):
     def mongo_data(self):
         return self._mongo_data
 
-    def get_time_last_email_sent_with_this_subject(self, subject):
-        result_as_datetime = self._get_time_last_email_of_type_sent_with_this_subject(
-            subject, LAST_EMAIL_SENT)
-
-        return result_as_datetime
-
-    def get_time_last_warning_email_sent_with_this_subject(self, subject):
-        result_as_datetime = self._get_time_last_email_of_type_sent_with_this_subject(
-            subject, LAST_WARNING_SENT)
-
-        return result_as_datetime
-
-    def _get_time_last_email_of_type_sent_with_this_subject(
-            self, subject, type):
-        result_dict = self.mongo_data.get_result_dict_for_dict_keys({TYPE_KEY: type, SUBJECT_KEY: subject})
+    def get_rate_limit_state(self) -> emailRateLimitState:
+        result_dict = self.mongo_data.get_result_dict_for_dict_keys({TYPE_KEY: RATE_LIMIT_STATE})
         if result_dict is missing_data:
-            return missing_data
-
-        result = result_dict[DATE_KEY]
-        result_as_datetime = long_to_datetime(result)
-
-        return result_as_datetime
-
-    def record_date_of_email_send(self, subject):
-
-        self._record_date_of_email_type_send(subject, type=LAST_EMAIL_SENT)
-
-    def record_date_of_email_warning_send(self, subject):
-        self._record_date_of_email_type_send(subject, type=LAST_WARNING_SENT)
-
-    def _record_date_of_email_type_send(self, subject, type):
-        datetime_now = datetime_to_long(datetime.datetime.now())
-        data_dict = {DATE_KEY: datetime_now}
-        dict_of_keys = {SUBJECT_KEY: subject, TYPE_KEY: type}
-
-        self.mongo_data.add_data(dict_of_keys=dict_of_keys, data_dict=data_dict, allow_overwrite=True)
-
+            return self._move_old_style_rate_limit_entries_into_single_entry()
+
+        rate_limit_state = emailRateLimitState()
+        for subject_dict in result_dict.get(SUBJECTS_KEY, {}).values():
+            subject = subject_dict.pop(SUBJECT_KEY)
+            rate_limit_state[subject] = dict([
+                (type, long_to_datetime(date_as_long))
+                for type, date_as_long in subject_dict.items()])
+
+        return rate_limit_state
+
+    def save_rate_limit_state(self, rate_limit_state: emailRateLimitState):
+        # Other processes save at the same time, so we only write the subjects that have changed,
+        # and a date can only move forward, in one atomic update
+        subject_names = {}
+        latest_dates = {}
+        for subject in rate_limit_state.changed_subjects:
+            field_name_prefix = _field_name_prefix_for_subject(subject)
+            subject_names[field_name_prefix + SUBJECT_KEY] = subject
+            for type, date in rate_limit_state[subject].items():
+                latest_dates[field_name_prefix + type] = datetime_to_long(date)
+
+        if len(latest_dates) == 0:
+            return None
+
+        self.mongo_data.update_data_taking_maximum(dict_of_keys={TYPE_KEY: RATE_LIMIT_STATE},
+                                                   dict_of_maximums=latest_dates,
+                                                   data_dict=subject_names)
+        rate_limit_state.mark_changes_as_saved()
+
+    def _move_old_style_rate_limit_entries_into_single_entry(self) -> emailRateLimitState:
+        # we used to have one entry for each subject and type
+        old_style_keys = {TYPE_KEY: {"$in": [LAST_EMAIL_SENT, LAST_WARNING_SENT]}}
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dicts_for_dict_keys(old_style_keys)
+
+        rate_limit_state = emailRateLimitState()
+        for result_dict in list_of_result_dicts:
+            rate_limit_state.record_date_for_type(result_dict[SUBJECT_KEY], result_dict[TYPE_KEY],
+                                                  long_to_datetime(result_dict[DATE_KEY]))
+
+        self.save_rate_limit_state(rate_limit_state)
+        self.mongo_data.delete_data_without_any_warning(old_style_keys)
+
+        return rate_limit_state
 
     def store_message(self, body, subject):
-        datetime_now = datetime_to_long(datetime.datetime.now())
+        datetime_now = datetime.datetime.now()
         data_dict ={BODY_KEY: body}
-        dict_of_keys = {SUBJECT_KEY:subject, TYPE_KEY:STORED_MSG, DATE_KEY:datetime_now}
 
-        self.mongo_data.add_data(dict_of_keys=dict_of_keys, data_dict=data_dict)
+        # messages with the same subject can be stored in quick succession, eg several
+        # in one batch, so move on to the next date we can store if we have to
+        for attempt in range(MAX_ATTEMPTS_TO_STORE_MSG):
+            datetime_to_store = datetime_now + datetime.timedelta(microseconds=STORED_MSG_RESOLUTION_MICROSECONDS * attempt)
+            dict_of_keys = {SUBJECT_KEY:subject, TYPE_KEY:STORED_MSG, DATE_KEY:datetime_to_long(datetime_to_store)}
+            try:
+                self.mongo_data.add_data(dict_of_keys=dict_of_keys, data_dict=data_dict)
+                return None
+            except existingData:
+                continue
+
+        raise existingData("Couldn't store message with subject %s" % subject)
 
     def get_stored_messages(self):
         dict_of_keys = {TYPE_KEY: STORED_MSG}
@@ -90,3 +114,8 @@ class mongoEmailControlData(emailControlData):
     def delete_stored_messages(self):
         # everything
         self.mongo_data.delete_data_without_any_warning({TYPE_KEY: STORED_MSG})
+
+
+def _field_name_prefix_for_subject(subject: str) -> str:
+    # subjects can have characters that mongo doesn't allow in field names, so we encode them
+    return "%s.%s." % (SUBJECTS_KEY, subject.encode("utf-8").hex())
@@ -0,0 +1,124 @@
+"""
+A local SMTP server which accepts any login and keeps the messages it receives rather than sending them on
+
+Use it for testing, or to see what production would email without filling an inbox:
+
+    sink = localSmtpSink()
+    sink.start()
+    # ... set email_server: 127.0.0.1 and email_port: sink.port in private config
+    sink.messages
+    sink.stop()
+"""
+
+import email
+import socketserver
+import threading
+
+
+class localSmtpSink(object):
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param port: 0 picks a free port; see .port once started
+        """
+        self._host = host
+        self._port = port
+        self._server = None
+        self._lock = threading.Lock()
+        self._messages = []
+        self._connection_count = 0
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def messages(self) -> list:
+        """
+        :return: list of email.message.Message, in the order received
+        """
+        with self._lock:
+            return list(self._messages)
+
+    @property
+    def connection_count(self) -> int:
+        with self._lock:
+            return self._connection_count
+
+    def start(self):
+        sink = self
+
+        class _handler(_smtpSinkHandler):
+            def record_connection(self):
+                with sink._lock:
+                    sink._connection_count += 1
+
+            def record_message(self, message_text: str):
+                with sink._lock:
+                    sink._messages.append(email.message_from_string(message_text))
+
+        self._server = _threadedTCPServer((self._host, self._port), _handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self._server is None:
+            return None
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+
+class _threadedTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _smtpSinkHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.record_connection()
+        self._reply("220 localhost smtp sink")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", errors="replace").strip()
+            verb = command.split(" ")[0].upper()
+
+            if verb == "EHLO":
+                self._reply("250-localhost")
+                self._reply("250 AUTH PLAIN LOGIN")
+            elif verb == "AUTH":
+                self._reply("235 authenticated")
+            elif verb == "DATA":
+                self._reply("354 end data with <CR><LF>.<CR><LF>")
+                self.record_message(self._read_data())
+                self._reply("250 ok")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            elif verb in ["HELO", "MAIL", "RCPT", "RSET", "NOOP"]:
+                self._reply("250 ok")
+            else:
+                # includes STARTTLS
+                self._reply("502 not implemented")
+
+    def _read_data(self) -> str:
+        list_of_lines = []
+        while True:
+            line = self.rfile.readline().decode("utf-8", errors="replace")
+            if line.rstrip("\r\n") == "." or not line:
+                break
+            if line.startswith(".."):
+                # dot stuffing
+                line = line[1:]
+            list_of_lines.append(line)
+
+        return "".join(list_of_lines)
+
+    def _reply(self, text: str):
+        self.wfile.write((text + "\r\n").encode("utf-8"))
+
+    def record_connection(self):
+        raise NotImplementedError
+
+    def record_message(self, message_text: str):
+        raise NotImplementedError
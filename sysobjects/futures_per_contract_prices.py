@@ -4,6 +4,7 @@ import datetime
 from syscore.merge_data import spike_in_data
 from syscore.pdutils import sumup_business_days_over_pd_series_without_double_counting_of_closing_data
 from syscore.merge_data import merge_newer_data, full_merge_of_existing_data
+from syscore.objects import arg_not_supplied
 
 PRICE_DATA_COLUMNS = sorted(["OPEN", "HIGH", "LOW", "FINAL", "VOLUME"])
 FINAL_COLUMN = "FINAL"
@@ -112,13 +113,15 @@ class futuresContractPrices(pd.DataFrame):
         return  new_data
 
     def add_rows_to_existing_data(
-        self, new_futures_per_contract_prices, check_for_spike=True
+        self, new_futures_per_contract_prices, check_for_spike=True,
+            spike_check_state=arg_not_supplied
     ):
         """
         Merges self with new data.
         Only newer data will be added
 
         :param new_futures_per_contract_prices: another futures per contract prices object
+        :param spike_check_state: spikeCheckState for self, updated in place
 
         :return: merged futures_per_contract object
         """
@@ -128,6 +131,7 @@ class futuresContractPrices(pd.DataFrame):
             new_futures_per_contract_prices,
             check_for_spike=check_for_spike,
             column_to_check=FINAL_COLUMN,
+            spike_check_state=spike_check_state
         )
 
         if merged_futures_prices is spike_in_data:
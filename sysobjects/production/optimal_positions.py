@@ -155,10 +155,12 @@ class listOfOptimalPositionsAcrossInstrumentStrategies(list):
     def add_positions(self, position_list:  listOfInstrumentStrategyPositions)  \
             -> listOfOptimalAndCurrentPositionsAcrossInstrumentStrategies:
 
+        position_objects_by_key = position_list.position_objects_by_key()
         list_of_optimal_and_current = []
         for opt_pos_object in self:
             instrument_strategy = opt_pos_object.instrument_strategy
-            relevant_position_item = position_list.position_object_for_instrument_strategy(instrument_strategy)
+            relevant_position_item = position_objects_by_key.get(
+                instrument_strategy.key, instrumentStrategyPosition(0, instrument_strategy))
             new_object = instrumentStrategyWithOptimalAndCurrentPosition(
                 opt_pos_object, relevant_position_item
             )
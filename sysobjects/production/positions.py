@@ -1,6 +1,5 @@
 import pandas as pd
 
-from syscore.genutils import get_unique_list
 from sysobjects.contracts import futuresContract
 from sysobjects.instruments import futuresInstrument
 from sysobjects.production.tradeable_object import instrumentStrategy
@@ -97,22 +96,19 @@ class listOfPositions(list):
         """
         Return list of tradeable objects where there is a break between self and other
 
-        Does this by making both elements unique, then comparing item by item
+        Does this by lining up the positions by key in one data frame, with zeros where a position is missing
 
         :return:
         """
 
-        list_of_my_tradeable_objects = [position.tradeable_object for position in self]
-        list_of_other_tradeable_objects = [
-            position.tradeable_object for position in other_list_of_positions]
-        joint_list_of_tradeable_objects = get_unique_list(
-            list_of_my_tradeable_objects + list_of_other_tradeable_objects)
-        breaks = []
-        for tradeable_object in joint_list_of_tradeable_objects:
-            break_here = self.is_break_for_tradeable_object(
-                other_list_of_positions, tradeable_object)
-            if break_here:
-                breaks.append(tradeable_object)
+        aligned_positions = pd.concat(
+            [self.positions_as_series_by_key(), other_list_of_positions.positions_as_series_by_key()],
+            axis=1, sort=False).fillna(0)
+        break_keys = aligned_positions.index[aligned_positions.iloc[:, 0] != aligned_positions.iloc[:, 1]]
+
+        tradeable_objects_by_key = other_list_of_positions.tradeable_objects_by_key()
+        tradeable_objects_by_key.update(self.tradeable_objects_by_key())
+        breaks = [tradeable_objects_by_key[key] for key in break_keys]
 
         return breaks
 
@@ -130,6 +126,27 @@ class listOfPositions(list):
         else:
             return True
 
+    def positions_as_series_by_key(self) -> pd.Series:
+        # if a tradeable object is in the list more than once, the first position is used
+        positions = pd.Series([position.position for position in self],
+                              index=[position.tradeable_object.key for position in self],
+                              dtype=float)
+
+        return positions[~positions.index.duplicated(keep="first")]
+
+    def tradeable_objects_by_key(self) -> dict:
+        return self._first_by_key([position.tradeable_object for position in self])
+
+    def position_objects_by_key(self) -> dict:
+        return self._first_by_key(self)
+
+    def _first_by_key(self, list_of_items: list) -> dict:
+        items_by_key = {}
+        for position, item in zip(self, list_of_items):
+            items_by_key.setdefault(position.tradeable_object.key, item)
+
+        return items_by_key
+
     def position_for_object(self, tradeable_object):
         try:
             position_object_idx = self.index(tradeable_object)
@@ -314,28 +331,13 @@ def sum_for_instrument(list_of_positions) -> listOfInstrumentPositions:
     :return: listOfInstrumentPositions
     """
 
-    unique_list_of_instruments = list(
-        set([position.instrument_code for position in list_of_positions])
-    )
-    summed_positions = []
-    for instrument_code in unique_list_of_instruments:
-        position_object = _position_for_code_in_list(list_of_positions, instrument_code)
-        summed_positions.append(position_object)
+    positions = pd.Series([position.position for position in list_of_positions],
+                          index=[position.instrument_code for position in list_of_positions],
+                          dtype=object)
+    summed_positions = positions.groupby(level=0, sort=False).sum()
 
     list_of_instrument_position_object = listOfInstrumentPositions(
-        summed_positions)
+        [instrumentPosition(position, instrument_code)
+         for instrument_code, position in summed_positions.items()])
 
     return list_of_instrument_position_object
-
-
-def _position_for_code_in_list(list_of_positions, instrument_code: str) -> instrumentPosition:
-    positions_this_code = [
-        position.position
-        for position in list_of_positions
-        if position.instrument_code == instrument_code
-    ]
-    position_object = instrumentPosition(
-        sum(positions_this_code), instrument_code)
-
-    return position_object
-
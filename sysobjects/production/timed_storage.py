@@ -164,6 +164,22 @@ class listOfEntriesAsListOfDicts(list):
     def as_plain_list(self):
         return list(self)
 
+    def final_entry_as_list_of_dicts(self):
+        """
+        Same ordering as listOfEntries.final_entry; if dates are equal the last one added wins
+
+        >>> listOfEntriesAsListOfDicts([dict(date=2, x=1), dict(date=3, x=2), dict(date=3, x=3), dict(date=1, x=4)]).final_entry_as_list_of_dicts()
+        [{'date': 3, 'x': 3}]
+        >>> listOfEntriesAsListOfDicts([]).final_entry_as_list_of_dicts()
+        []
+        """
+        if len(self) == 0:
+            return listOfEntriesAsListOfDicts([])
+
+        final_entry_as_dict = sorted(self, key=lambda entry_as_dict: entry_as_dict[DATE_KEY_NAME])[-1]
+
+        return listOfEntriesAsListOfDicts([final_entry_as_dict])
+
 class listOfEntries(list):
     """
     A list of timedEntry
@@ -121,10 +121,13 @@ class tradeLimit(object):
             return False
 
     def add_trade(self, trade_to_add: int):
+        # otherwise a reset when we next look would wipe out this trade
+        self._reset_if_reset_due()
         abs_trade_to_add = int(abs(trade_to_add))
         self._trades_since_last_reset = self._trades_since_last_reset + abs_trade_to_add
 
     def remove_trade(self, trade_to_remove: int):
+        self._reset_if_reset_due()
         abs_trade_to_remove = int(abs(trade_to_remove))
         self._trades_since_last_reset = max(
             self._trades_since_last_reset - abs_trade_to_remove, 0
@@ -1,6 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-from syscore.objects import missing_data
-from syscore.pdutils import check_df_equals, check_ts_equals
+from syscore.objects import missing_data, arg_not_supplied
+from syscore.fileutils import get_resolved_pathname
+from syscore.incremental_backup import incrementalCsvBackup, write_parquet_backup, parquet_engine_available, \
+    UNCHANGED
 from sysdata.config.private_config import get_private_then_default_key_value
 
 from sysobjects.production.tradeable_object import instrumentStrategy
@@ -57,21 +61,51 @@ class backupArcticToCsv:
         log = self.data.log
 
         log.msg("Dumping from arctic, mongo to .csv files")
-        backup_fx_to_csv(backup_data)
-        backup_futures_contract_prices_to_csv(backup_data)
-        backup_multiple_to_csv(backup_data)
-        backup_adj_to_csv(backup_data)
-        backup_strategy_position_data(backup_data)
-        backup_contract_position_data(backup_data)
-        backup_historical_orders(backup_data)
-        backup_capital(backup_data)
-        backup_contract_data(backup_data)
-        backup_instrument_data(backup_data)
-        backup_optimal_positions(backup_data)
-        backup_roll_state_data(backup_data)
+        warn_if_parquet_backup_not_possible(self.data)
+        list_of_backup_functions = [
+            backup_fx_to_csv,
+            backup_futures_contract_prices_to_csv,
+            backup_multiple_to_csv,
+            backup_adj_to_csv,
+            backup_strategy_position_data,
+            backup_contract_position_data,
+            backup_historical_orders,
+            backup_capital,
+            backup_contract_data,
+            backup_instrument_data,
+            backup_optimal_positions,
+            backup_roll_state_data,
+        ]
+        run_backup_functions_in_pool(backup_data, list_of_backup_functions)
         log.msg("Copying to backup directory")
         backup_csv_dump(self.data)
 
+
+def run_backup_functions_in_pool(data: dataBlob, list_of_backup_functions: list):
+    # each function writes to its own directories, so they can run at the same time
+    max_workers = get_private_then_default_key_value("backup_max_workers")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = dict(
+            (executor.submit(backup_function, data), backup_function.__name__)
+            for backup_function in list_of_backup_functions
+        )
+
+    for future, function_name in futures.items():
+        try:
+            future.result()
+        except Exception as e:
+            data.log.critical("Backup %s failed: %s" % (function_name, str(e)))
+
+
+def warn_if_parquet_backup_not_possible(data: dataBlob):
+    parquet_dump_dir = get_private_then_default_key_value("parquet_backup_directory", raise_error=False)
+    if parquet_dump_dir is missing_data:
+        return
+    if not parquet_engine_available():
+        data.log.warn(
+            "parquet_backup_directory is set, but neither pyarrow or fastparquet is installed: only backing up to .csv")
+
+
 def get_csv_dump_dir():
     return get_private_then_default_key_value("csv_backup_directory")
 
@@ -133,119 +167,159 @@ def get_data_and_create_csv_directories(logname):
 # Think about how to check for duplicates (data frame equals?)
 
 
-# Futures contract data
+# Prices from arctic are backed up incrementally: see syscore.incremental_backup
 def backup_futures_contract_prices_to_csv(data):
+    csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_contract_price.datapath)
     instrument_list = (
         data.arctic_futures_contract_price.get_list_of_instrument_codes_with_price_data()
     )
-    for instrument_code in instrument_list:
-        backup_futures_contract_prices_for_instrument_to_csv(data, instrument_code)
+    try:
+        for instrument_code in instrument_list:
+            backup_futures_contract_prices_for_instrument_to_csv(data, instrument_code,
+                                                                 csv_backup=csv_backup)
+    finally:
+        csv_backup.save_state()
+
+
+def backup_futures_contract_prices_for_instrument_to_csv(data: dataBlob, instrument_code: str,
+                                                         csv_backup: incrementalCsvBackup = arg_not_supplied):
+    save_state = csv_backup is arg_not_supplied
+    if save_state:
+        csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_contract_price.datapath)
 
-def backup_futures_contract_prices_for_instrument_to_csv(data: dataBlob, instrument_code: str):
     list_of_contracts = data.arctic_futures_contract_price.contracts_with_price_data_for_instrument_code(
         instrument_code)
 
     for contract in list_of_contracts:
         arctic_data = data.arctic_futures_contract_price.get_prices_for_contract_object(contract)
+        key = "%s_%s" % (contract.instrument_code, contract.date_str)
+        backup_prices_incrementally(data, csv_backup, key, pd.DataFrame(arctic_data),
+                                    description="prices for %s" % str(contract))
 
-        csv_data = data.csv_futures_contract_price.get_prices_for_contract_object(contract)
-
-        if check_df_equals(arctic_data, csv_data):
-            # No updated needed, move on
-            print("No update needed")
-        else:
-            # Write backup
-            try:
-                data.csv_futures_contract_price.write_prices_for_contract_object(
-                    contract, arctic_data, ignore_duplication=True, )
-                data.log.msg(
-                    "Written backup .csv of prices for %s"
-                    % (contract)
-                )
-            except BaseException:
-                data.log.warn(
-                    "Problem writing .csv of prices for %s %s"
-                    % (contract)
-                )
+    if save_state:
+        csv_backup.save_state()
 
 
 # fx
 def backup_fx_to_csv(data):
+    csv_backup = incremental_csv_backup_for_dataset(data.csv_fx_prices.datapath)
     fx_codes = data.arctic_fx_prices.get_list_of_fxcodes()
-    for fx_code in fx_codes:
-        arctic_data = data.arctic_fx_prices.get_fx_prices(fx_code)
-        csv_data = data.csv_fx_prices.get_fx_prices(fx_code)
-        if check_ts_equals(arctic_data, csv_data):
-            print("No updated needed")
-        else:
-            # Write backup
-            try:
-                data.csv_fx_prices.add_fx_prices(
-                    fx_code, arctic_data, ignore_duplication=True
-                )
-                data.log.msg("Written .csv backup for %s" % fx_code)
-            except BaseException:
-                data.log.warn("Problem writing .csv backup for %s" % fx_code)
+    try:
+        for fx_code in fx_codes:
+            arctic_data = data.arctic_fx_prices.get_fx_prices(fx_code)
+            backup_prices_incrementally(data, csv_backup, fx_code,
+                                        pd.DataFrame(dict(PRICE=arctic_data)),
+                                        description="fx prices for %s" % fx_code)
+    finally:
+        csv_backup.save_state()
 
 
 def backup_multiple_to_csv(data):
+    csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_multiple_prices.datapath)
     instrument_list = data.arctic_futures_multiple_prices.get_list_of_instruments()
-    for instrument_code in instrument_list:
-        backup_multiple_to_csv_for_instrument(data, instrument_code)
+    try:
+        for instrument_code in instrument_list:
+            backup_multiple_to_csv_for_instrument(data, instrument_code, csv_backup=csv_backup)
+    finally:
+        csv_backup.save_state()
+
+
+def backup_multiple_to_csv_for_instrument(data, instrument_code: str,
+                                          csv_backup: incrementalCsvBackup = arg_not_supplied):
+    save_state = csv_backup is arg_not_supplied
+    if save_state:
+        csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_multiple_prices.datapath)
 
-def backup_multiple_to_csv_for_instrument(data, instrument_code: str):
     arctic_data = data.arctic_futures_multiple_prices.get_multiple_prices(
         instrument_code
     )
-    csv_data = data.csv_futures_multiple_prices.get_multiple_prices(
-        instrument_code)
+    backup_prices_incrementally(data, csv_backup, instrument_code, pd.DataFrame(arctic_data),
+                                description="multiple prices for %s" % instrument_code)
 
-    if check_df_equals(arctic_data, csv_data):
-        print("No update needed")
-        pass
-    else:
-        try:
-            data.csv_futures_multiple_prices.add_multiple_prices(
-                instrument_code, arctic_data, ignore_duplication=True
-            )
-            data.log.msg(
-                "Written .csv backup multiple prices for %s" %
-                instrument_code)
-        except BaseException:
-            data.log.warn(
-                "Problem writing .csv backup multiple prices for %s"
-                % instrument_code
-            )
+    if save_state:
+        csv_backup.save_state()
 
 
 def backup_adj_to_csv(data):
+    csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_adjusted_prices.datapath)
     instrument_list = data.arctic_futures_adjusted_prices.get_list_of_instruments()
-    for instrument_code in instrument_list:
-        backup_adj_to_csv_for_instrument(data, instrument_code)
+    try:
+        for instrument_code in instrument_list:
+            backup_adj_to_csv_for_instrument(data, instrument_code, csv_backup=csv_backup)
+    finally:
+        csv_backup.save_state()
+
+
+def backup_adj_to_csv_for_instrument(data: dataBlob, instrument_code: str,
+                                     csv_backup: incrementalCsvBackup = arg_not_supplied):
+    save_state = csv_backup is arg_not_supplied
+    if save_state:
+        csv_backup = incremental_csv_backup_for_dataset(data.csv_futures_adjusted_prices.datapath)
 
-def backup_adj_to_csv_for_instrument(data: dataBlob, instrument_code: str):
     arctic_data = data.arctic_futures_adjusted_prices.get_adjusted_prices(
         instrument_code
     )
-    csv_data = data.csv_futures_adjusted_prices.get_adjusted_prices(
-        instrument_code)
+    backup_prices_incrementally(data, csv_backup, instrument_code,
+                                pd.DataFrame(dict(price=arctic_data)),
+                                description="adjusted prices for %s" % instrument_code)
+
+    if save_state:
+        csv_backup.save_state()
 
-    if check_ts_equals(arctic_data, csv_data):
-        print("No update needed")
-        pass
+
+def incremental_csv_backup_for_dataset(datapath: str) -> incrementalCsvBackup:
+    return incrementalCsvBackup(get_resolved_pathname(datapath))
+
+
+def backup_prices_incrementally(data: dataBlob, csv_backup: incrementalCsvBackup,
+                                key: str, prices: pd.DataFrame, description: str):
+    try:
+        action = csv_backup.write(key, prices)
+    except BaseException:
+        csv_backup.forget(key)
+        data.log.warn("Problem writing .csv backup of %s" % description)
+        return
+
+    if action == UNCHANGED:
+        data.log.msg("No update needed for .csv backup of %s" % description)
     else:
-        try:
-            data.csv_futures_adjusted_prices.add_adjusted_prices(
-                instrument_code, arctic_data, ignore_duplication=True
-            )
-            data.log.msg(
-                "Written .csv backup for adjusted prices %s" %
-                instrument_code)
-        except BaseException:
-            data.log.warn(
-                "Problem writing .csv backup for adjusted prices %s"
-                % instrument_code
-            )
+        data.log.msg("Written .csv backup of %s (%s)" % (description, action))
+
+    backup_prices_to_parquet(data, csv_backup, key, prices,
+                             description=description, csv_changed=action != UNCHANGED)
+
+
+def backup_prices_to_parquet(data: dataBlob, csv_backup: incrementalCsvBackup,
+                             key: str, prices: pd.DataFrame, description: str,
+                             csv_changed: bool = True):
+    parquet_directory = get_parquet_dump_dir_for_dataset(csv_backup.directory)
+    if parquet_directory is missing_data:
+        return
+
+    filename = os.path.join(parquet_directory, "%s.parquet" % key)
+    if not csv_changed and os.path.exists(filename):
+        return
+
+    try:
+        write_parquet_backup(filename, prices)
+    except BaseException as e:
+        data.log.warn("Problem writing .parquet backup of %s: %s" % (description, str(e)))
+
+
+def get_parquet_dump_dir_for_dataset(csv_dataset_directory: str):
+    """
+    Optional; if parquet_backup_directory is in the private config we also write compressed .parquet copies of
+    the prices, in the same subdirectories as the .csv files
+    """
+    parquet_dump_dir = get_private_then_default_key_value("parquet_backup_directory", raise_error=False)
+    if parquet_dump_dir is missing_data or not parquet_engine_available():
+        return missing_data
+
+    dataset_name = os.path.basename(os.path.normpath(csv_dataset_directory))
+    parquet_directory = os.path.join(get_resolved_pathname(parquet_dump_dir), dataset_name)
+    os.makedirs(parquet_directory, exist_ok=True)
+
+    return parquet_directory
 
 
 def backup_contract_position_data(data):
@@ -12,6 +12,7 @@ from syscore.objects import missing_data, arg_not_supplied, missing_order, missi
 
 from sysdata.data_blob import dataBlob
 
+from sysexecution.fill_events import listOfFillEvents
 from sysexecution.orders.broker_orders import brokerOrder
 from sysexecution.orders.list_of_orders import listOfOrders
 from sysexecution.tick_data import dataFrameOfRecentTicks
@@ -352,6 +353,37 @@ class dataBroker(object):
 
         return matched_order
 
+    def match_list_of_db_broker_orders_to_orders_from_brokers(
+            self, list_of_broker_orders_to_match: listOfOrders) -> list:
+        """
+
+        :return: list of brokerOrder coming from broker, with missing_order where there is no match
+        """
+        list_of_matched_orders = (
+            self.data.broker_orders.match_list_of_db_broker_orders_to_orders_from_brokers(
+                list_of_broker_orders_to_match
+            )
+        )
+
+        list_of_matched_orders = [
+            self.calculate_total_commission_for_broker_order(matched_order)
+            for matched_order in list_of_matched_orders
+        ]
+
+        return list_of_matched_orders
+
+    def get_new_fill_events(self) -> listOfFillEvents:
+        """
+        :return: listOfFillEvents, or missing_data if the broker can't tell us about fills as they happen
+        """
+        return self.data.broker_orders.get_new_fill_events()
+
+    def put_back_fill_events(self, list_of_fill_events: listOfFillEvents) -> listOfFillEvents:
+        """
+        :return: listOfFillEvents that have been tried too often, and given up on
+        """
+        return self.data.broker_orders.put_back_fill_events(list_of_fill_events)
+
     def cancel_order_given_control_object(self, broker_order_with_controls: orderWithControls):
         self.data.broker_orders._cancel_order_given_control_object(
             broker_order_with_controls
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from syscore.objects import missing_data
 import datetime
 
@@ -7,17 +8,141 @@ from sysdata.arctic.arctic_futures_per_contract_prices import arcticFuturesContr
 from sysdata.arctic.arctic_multiple_prices import arcticFuturesMultiplePricesData
 from sysdata.mongodb.mongo_roll_data import mongoRollParametersData
 from sysdata.mongodb.mongo_futures_contracts import mongoFuturesContractData
+from sysdata.mongodb.mongo_roll_state_storage import mongoRollStateData
+from sysdata.futures.contracts import ContractNotFound
 
 from sysobjects.contract_dates_and_expiries import contractDate
 from sysobjects.rolls import contractDateWithRollParameters
 from sysobjects.dict_of_named_futures_per_contract_prices import setOfNamedContracts
-from sysobjects.contracts import futuresContract
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
+from sysobjects.production.roll_state import RollState
 
 from sysproduction.data.prices import get_valid_instrument_code_from_user, diagPrices
 from sysdata.data_blob import dataBlob
 
 missing_expiry = datetime.datetime(1900, 1, 1)
 
+# Contracts and roll parameters can be changed by other processes, so we re-read anything older than this
+MAX_AGE_OF_CONTRACT_CACHE = datetime.timedelta(minutes=30)
+
+
+def get_futures_contract_cache(data: dataBlob) -> "futuresContractCache":
+    """
+    Returns the futuresContractCache stored on the data blob, creating it if needed
+
+    :param data: data Blob
+    :return: futuresContractCache
+    """
+    contract_cache = getattr(data, "futures_contract_cache", None)
+    if contract_cache is None:
+        contract_cache = futuresContractCache(data)
+        data.futures_contract_cache = contract_cache
+
+    return contract_cache
+
+
+class futuresContractCache(object):
+    """
+    Read through cache of futures contract meta data, keyed on instrument code and contract date
+
+    All the contracts for an instrument are read in one go the first time any of them is needed, and the
+    roll parameters and roll state are kept alongside. Writing a contract through updateContracts, or a roll
+    state through updatePositions, clears the instrument.
+
+    Roll state can be changed interactively by another process, so the cached roll state is only for reports
+    and diagnostics; anything that trades on it should use diagPositions.get_roll_state, which reads it fresh
+    """
+
+    def __init__(self, data: dataBlob):
+        data.add_class_list([mongoRollParametersData, mongoFuturesContractData, mongoRollStateData])
+        self._data = data
+        self._contracts = {}
+        self._expiry_dates = {}
+        self._roll_parameters = {}
+        self._roll_states = {}
+        self._read_times = {}
+
+    @property
+    def data(self) -> dataBlob:
+        return self._data
+
+    def is_contract_in_data(self, instrument_code: str, contract_date_str: str) -> bool:
+        return contract_date_str in self._contracts_for_instrument(instrument_code)
+
+    def get_contract_object(self, instrument_code: str, contract_date_str: str) -> futuresContract:
+        contracts = self._contracts_for_instrument(instrument_code)
+        if contract_date_str not in contracts:
+            # could have been added since we read the instrument
+            self.clear(instrument_code)
+            contracts = self._contracts_for_instrument(instrument_code)
+            if contract_date_str not in contracts:
+                raise ContractNotFound("Contract %s/%s not found" % (instrument_code, contract_date_str))
+
+        # callers often modify contracts before writing them back
+        return deepcopy(contracts[contract_date_str])
+
+    def get_all_contract_objects_for_instrument_code(self, instrument_code: str) -> listOfFuturesContracts:
+        contracts = self._contracts_for_instrument(instrument_code)
+
+        return listOfFuturesContracts(deepcopy(list(contracts.values())))
+
+    def get_expiry_date(self, instrument_code: str, contract_date_str: str) -> datetime.datetime:
+        expiry_dates = self._expiry_dates_for_instrument(instrument_code)
+        if contract_date_str not in expiry_dates:
+            return self.get_contract_object(instrument_code, contract_date_str).expiry_date
+
+        return expiry_dates[contract_date_str]
+
+    def get_roll_parameters(self, instrument_code: str):
+        self._read_instrument_if_required(instrument_code)
+        roll_parameters = self._roll_parameters.get(instrument_code, None)
+        if roll_parameters is None:
+            roll_parameters = self.data.db_roll_parameters.get_roll_parameters(instrument_code)
+            self._roll_parameters[instrument_code] = roll_parameters
+
+        return roll_parameters
+
+    def get_roll_state(self, instrument_code: str) -> RollState:
+        self._read_instrument_if_required(instrument_code)
+        roll_state = self._roll_states.get(instrument_code, None)
+        if roll_state is None:
+            roll_state = self.data.db_roll_state.get_roll_state(instrument_code)
+            self._roll_states[instrument_code] = roll_state
+
+        return roll_state
+
+    def clear(self, instrument_code: str):
+        self._contracts.pop(instrument_code, None)
+        self._expiry_dates.pop(instrument_code, None)
+        self._roll_parameters.pop(instrument_code, None)
+        self._roll_states.pop(instrument_code, None)
+        self._read_times.pop(instrument_code, None)
+
+    def _contracts_for_instrument(self, instrument_code: str) -> dict:
+        self._read_instrument_if_required(instrument_code)
+
+        return self._contracts[instrument_code]
+
+    def _expiry_dates_for_instrument(self, instrument_code: str) -> dict:
+        self._read_instrument_if_required(instrument_code)
+
+        return self._expiry_dates[instrument_code]
+
+    def _read_instrument_if_required(self, instrument_code: str):
+        read_time = self._read_times.get(instrument_code, None)
+        if read_time is not None:
+            if datetime.datetime.now() - read_time < MAX_AGE_OF_CONTRACT_CACHE:
+                return
+
+        self.clear(instrument_code)
+        list_of_contracts = self.data.db_futures_contract.get_all_contract_objects_for_instrument_code(
+            instrument_code)
+        self._contracts[instrument_code] = dict(
+            [(contract.date_str, contract) for contract in list_of_contracts])
+        self._expiry_dates[instrument_code] = dict(
+            [(contract.date_str, contract.expiry_date) for contract in list_of_contracts])
+        self._read_times[instrument_code] = datetime.datetime.now()
+
 
 class diagContracts(object):
     def __init__(self, data=arg_not_supplied):
@@ -31,16 +156,18 @@ class diagContracts(object):
         )
         self.data = data
 
+    @property
+    def contract_cache(self) -> futuresContractCache:
+        return get_futures_contract_cache(self.data)
+
     def is_contract_in_data(self, instrument_code, contract_date):
-        return self.data.db_futures_contract.is_contract_in_data(
+        return self.contract_cache.is_contract_in_data(
             instrument_code, contract_date
         )
 
     def get_all_contract_objects_for_instrument_code(self, instrument_code):
-        return (
-            self.data.db_futures_contract.get_all_contract_objects_for_instrument_code(
-                instrument_code
-            )
+        return self.contract_cache.get_all_contract_objects_for_instrument_code(
+            instrument_code
         )
 
 
@@ -136,7 +263,7 @@ class diagContracts(object):
         return unique_all_contract_dates
 
     def get_roll_parameters(self, instrument_code):
-        roll_parameters = self.data.db_roll_parameters.get_roll_parameters(
+        roll_parameters = self.contract_cache.get_roll_parameters(
             instrument_code
         )
         return roll_parameters
@@ -144,18 +271,16 @@ class diagContracts(object):
 
     def get_contract_object(self, instrument_code, contract_id):
 
-        contract_object = self.data.db_futures_contract.get_contract_object(
+        contract_object = self.contract_cache.get_contract_object(
             instrument_code, contract_id
         )
 
         return contract_object
 
     def get_actual_expiry(self, instrument_code, contract_id):
-        contract_object = self.get_contract_object(
+        expiry_date = self.contract_cache.get_expiry_date(
             instrument_code, contract_id)
 
-        expiry_date = contract_object.expiry_date
-
         return expiry_date
 
     def get_priced_contract_id(self, instrument_code):
@@ -299,6 +424,9 @@ class updateContracts(object):
         self.data = data
 
     def add_contract_data(self, contract, ignore_duplication=False):
-        return self.data.db_futures_contract.add_contract_data(
+        result = self.data.db_futures_contract.add_contract_data(
             contract, ignore_duplication=ignore_duplication
         )
+        get_futures_contract_cache(self.data).clear(contract.instrument_code)
+
+        return result
@@ -5,14 +5,18 @@ from syscore.dateutils import SECONDS_PER_HOUR
 from syscore.genutils import str2Bool
 from sysdata.data_blob import dataBlob
 from sysdata.mongodb.mongo_process_control import mongoControlProcessData
+from sysobjects.production.process_control import controlProcess, dictOfControlProcesses
 
-import yaml
 from syscore.fileutils import get_filename_for_package
+from syscore.yamlutils import get_cached_yaml_file
 from syscore.objects import missing_data, arg_not_supplied
 
 PRIVATE_CONTROL_CONFIG_FILE = get_filename_for_package("private.private_control_config.yaml")
 PUBLIC_CONTROL_CONFIG_FILE = get_filename_for_package("syscontrol.control_config.yaml")
 
+# used if there is nothing in the control config
+DEFAULT_POLL_INTERVAL_SECONDS = 30
+
 
 
 
@@ -118,10 +122,12 @@ class diagControlProcess:
 
         return result_dict
 
-    def get_process_status_dict(self, process_name: str) -> dict:
+    def get_process_status_dict(self, process_name: str,
+                                dict_of_control_processes: dictOfControlProcesses = arg_not_supplied) -> dict:
         time_to_stop = self.is_it_time_to_stop(process_name)
         time_to_start = self.is_it_time_to_run(process_name)
-        prev_process = self.has_previous_process_finished_in_last_day(process_name)
+        prev_process = self.has_previous_process_finished_in_last_day(
+            process_name, dict_of_control_processes=dict_of_control_processes)
         right_machine = self.is_this_correct_machine(process_name)
 
         result_dict = dict(
@@ -133,10 +139,16 @@ class diagControlProcess:
 
         return result_dict
 
-    def has_previous_process_finished_in_last_day(self, process_name):
+    def has_previous_process_finished_in_last_day(self, process_name,
+                                                  dict_of_control_processes: dictOfControlProcesses = arg_not_supplied):
         previous_process = self.previous_process_name(process_name)
         if previous_process is None:
             return True
+        if dict_of_control_processes is not arg_not_supplied:
+            # already read, so we don't need to read it again
+            previous_control = dict_of_control_processes.get(previous_process, controlProcess())
+            return previous_control.has_process_finished_in_last_day()
+
         control_process = dataControlProcess(self.data)
         result = control_process.has_process_finished_in_last_day(
             previous_process)
@@ -310,6 +322,21 @@ class diagControlProcess:
 
         return result
 
+    def get_poll_interval_seconds(self, process_name) -> float:
+        """
+        How often a running process checks process control and its stop time
+
+        :param process_name:
+        :return: float
+        """
+        result = self.get_configuration_item_for_process_name(
+            process_name, "poll_interval_seconds", default=None, use_config_default=True
+        )
+        if result is None:
+            result = DEFAULT_POLL_INTERVAL_SECONDS
+
+        return float(result)
+
     def required_machine_name(self, process_name):
         """
 
@@ -391,8 +418,7 @@ def get_config_dict() -> dict:
 
 def get_public_control_config():
     try:
-        with open(PUBLIC_CONTROL_CONFIG_FILE) as file_to_parse:
-            config_dict = yaml.load(file_to_parse, Loader=yaml.FullLoader)
+        config_dict = get_cached_yaml_file(PUBLIC_CONTROL_CONFIG_FILE).contents()
     except BaseException:
         config_dict = missing_data
 
@@ -400,8 +426,7 @@ def get_public_control_config():
 
 def get_private_control_config():
     try:
-        with open(PRIVATE_CONTROL_CONFIG_FILE) as file_to_parse:
-            config_dict = yaml.load(file_to_parse, Loader=yaml.FullLoader)
+        config_dict = get_cached_yaml_file(PRIVATE_CONTROL_CONFIG_FILE).contents()
     except BaseException:
         config_dict = missing_data
 
@@ -83,6 +83,9 @@ class dataCurrency(object):
     def get_fx_prices(self, fx_code: str) -> fxPrices:
         return self.data.db_fx_prices.get_fx_prices(fx_code)
 
+    def get_last_date_of_fx_prices(self, fx_code: str):
+        return self.data.db_fx_prices.get_last_date_of_fx_prices(fx_code)
+
     def get_list_of_fxcodes(self) -> list:
         return self.data.db_fx_prices.get_list_of_fxcodes()
 
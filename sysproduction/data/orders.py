@@ -1,4 +1,7 @@
 import datetime
+
+import pandas as pd
+
 from syscore.objects import (
     arg_not_supplied,
     missing_data,
@@ -104,6 +107,60 @@ class dataOrders(object):
             period_start, period_end
         )
 
+    def get_historic_instrument_orders_in_date_range_as_df(
+            self, period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied) -> pd.DataFrame:
+        return self.data.db_strategy_historic_orders.get_orders_in_date_range_as_df(
+            period_start, period_end=period_end)
+
+    def get_historic_contract_orders_in_date_range_as_df(
+            self, period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied) -> pd.DataFrame:
+        return self.data.db_contract_historic_orders.get_orders_in_date_range_as_df(
+            period_start, period_end=period_end)
+
+    def get_historic_broker_orders_in_date_range_as_df(
+            self, period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied) -> pd.DataFrame:
+        return self.data.db_broker_historic_orders.get_orders_in_date_range_as_df(
+            period_start, period_end=period_end)
+
+    def get_list_of_historic_broker_orders_in_date_range(
+            self, period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied) -> listOfOrders:
+        return self.data.db_broker_historic_orders.get_list_of_orders_in_date_range(
+            period_start, period_end=period_end)
+
+    def get_list_of_historic_broker_orders_in_date_range_with_execution_data(
+            self, period_start: datetime.datetime,
+            period_end: datetime.datetime=arg_not_supplied) -> listOfOrders:
+        """
+        As get_historic_broker_order_from_order_id_with_execution_data, but reading all the broker orders,
+        and then all their parent contract and instrument orders, with one query each
+        """
+        list_of_broker_orders = self.get_list_of_historic_broker_orders_in_date_range(
+            period_start, period_end=period_end)
+
+        contract_orders_by_id = _orders_by_id(self.data.db_contract_historic_orders.get_list_of_orders_with_orderids(
+            _list_of_parent_ids(list_of_broker_orders)))
+        instrument_orders_by_id = _orders_by_id(
+            self.data.db_strategy_historic_orders.get_list_of_orders_with_orderids(
+                _list_of_parent_ids(contract_orders_by_id.values())))
+
+        list_of_augmented_orders = []
+        for broker_order in list_of_broker_orders:
+            contract_order = contract_orders_by_id.get(broker_order.parent, missing_order)
+            if contract_order is missing_order:
+                instrument_order = missing_order
+            else:
+                instrument_order = instrument_orders_by_id.get(contract_order.parent, missing_order)
+
+            augmented_order = brokerOrderWithParentInformation.create_augemented_order(
+                broker_order, contract_order=contract_order, instrument_order=instrument_order)
+            list_of_augmented_orders.append(augmented_order)
+
+        return listOfOrders(list_of_augmented_orders)
+
     def get_historic_instrument_order_from_order_id(self, order_id: int) -> instrumentOrder:
         return self.data.db_strategy_historic_orders.get_order_with_orderid(
             order_id)
@@ -123,6 +180,10 @@ class dataOrders(object):
         ## We get this from broker fills, as they have leg by leg information
         return self.data.db_broker_historic_orders.get_fills_history_for_contract(futures_contract)
 
+    def get_dict_of_fills_history_for_instrument(self, instrument_code: str) -> dict:
+        ## keys are contract_str, values are listOfFills
+        return self.data.db_broker_historic_orders.get_dict_of_fills_history_for_instrument(instrument_code)
+
     def get_fills_history_for_instrument_strategy(
         self, instrument_strategy: instrumentStrategy
     ) -> listOfFills:
@@ -177,3 +238,13 @@ class dataOrders(object):
         )
 
         return instrument_order
+
+
+def _list_of_parent_ids(list_of_orders) -> list:
+    list_of_parent_ids = [order.parent for order in list_of_orders if order.parent is not no_parent]
+
+    return list(set(list_of_parent_ids))
+
+
+def _orders_by_id(list_of_orders: listOfOrders) -> dict:
+    return dict([(order.order_id, order) for order in list_of_orders])
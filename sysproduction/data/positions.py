@@ -21,10 +21,11 @@ from sysexecution.orders.contract_orders import contractOrder
 
 from sysobjects.production.tradeable_object import listOfInstrumentStrategies, instrumentStrategy
 from sysobjects.production.optimal_positions import simpleOptimalPosition
-from sysobjects.production.roll_state import RollState, is_forced_roll_state, is_type_of_active_rolling_roll_state
+from sysobjects.production.roll_state import RollState, is_forced_roll_state, is_type_of_active_rolling_roll_state, \
+    name_of_roll_state
 from sysobjects.contracts import futuresContract
 
-from sysproduction.data.contracts import missing_contract
+from sysproduction.data.contracts import missing_contract, get_futures_contract_cache
 
 
 class diagPositions(object):
@@ -63,12 +64,18 @@ class diagPositions(object):
         roll_state = self.get_roll_state(instrument_code)
         return is_type_of_active_rolling_roll_state(roll_state)
 
-    def get_name_of_roll_state(self, instrument_code: str) -> RollState:
+    def get_name_of_roll_state(self, instrument_code: str) -> str:
         return self.data.db_roll_state.get_name_of_roll_state(instrument_code)
 
     def get_roll_state(self, instrument_code: str) -> RollState:
+        # always fresh, as the stack handler trades on this and it can be changed by another process
         return self.data.db_roll_state.get_roll_state(instrument_code)
 
+    def get_name_of_cached_roll_state(self, instrument_code: str) -> str:
+        # for reports only; may be out of date if another process has changed it
+        roll_state = get_futures_contract_cache(self.data).get_roll_state(instrument_code)
+        return name_of_roll_state(roll_state)
+
     def get_dict_of_actual_positions_for_strategy(self, strategy_name: str) -> dict:
         list_of_instruments = (
             self.get_list_of_instruments_for_strategy_with_position(
@@ -103,6 +110,14 @@ class diagPositions(object):
 
         return self.data.db_contract_position.get_position_as_df_for_contract_object(contract)
 
+    def get_dict_of_position_df_for_all_contracts(self) -> dict:
+        ## keys are contract keys
+        return self.data.db_contract_position.get_dict_of_position_df_for_all_contracts()
+
+    def get_dict_of_position_df_for_all_instrument_strategies(self) -> dict:
+        ## keys are instrumentStrategy
+        return self.data.db_strategy_position.get_dict_of_position_df_for_all_instrument_strategies()
+
     def get_position_df_for_strategy_and_instrument(
         self, strategy_name:str, instrument_code:str
     ):
@@ -336,9 +351,12 @@ class updatePositions(object):
         return diagPositions(self.data)
 
     def set_roll_state(self, instrument_code: str, roll_state_required: RollState):
-        return self.data.db_roll_state.set_roll_state(
+        result = self.data.db_roll_state.set_roll_state(
             instrument_code, roll_state_required
         )
+        get_futures_contract_cache(self.data).clear(instrument_code)
+
+        return result
 
     def update_strategy_position_table_with_instrument_order(
         self, instrument_order, new_fill
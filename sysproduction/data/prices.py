@@ -3,7 +3,7 @@ import numpy as np
 
 from syscore.objects import missing_contract, arg_not_supplied, missing_data
 
-from sysobjects.contracts import futuresContract
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
 from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractPrices
 from sysdata.config.private_config import get_private_then_default_key_value
 from sysdata.arctic.arctic_futures_per_contract_prices import arcticFuturesContractPriceData, futuresContractPrices
@@ -39,6 +39,10 @@ class diagPrices(object):
         return self.data.db_futures_adjusted_prices.get_adjusted_prices(
             instrument_code)
 
+    def get_last_date_of_adjusted_prices(self, instrument_code: str):
+        return self.data.db_futures_adjusted_prices.get_last_date_of_adjusted_prices(
+            instrument_code)
+
     def get_list_of_instruments_in_multiple_prices(self) -> list:
         return self.data.db_futures_multiple_prices.get_list_of_instruments()
 
@@ -50,6 +54,11 @@ class diagPrices(object):
         return self.data.db_futures_contract_price.get_prices_for_contract_object(
             contract_object)
 
+    def get_dict_of_prices_for_list_of_contracts(self, list_of_contracts: listOfFuturesContracts) -> dict:
+        ## keys are contract keys
+        return self.data.db_futures_contract_price.get_dict_of_prices_for_list_of_contracts(
+            list_of_contracts)
+
     def get_current_contract_prices_for_instrument(self, instrument_code):
         multiple_prices = self.get_multiple_prices(instrument_code)
         return multiple_prices[price_name]
@@ -1,15 +1,18 @@
 import datetime
 import pandas as pd
 import numpy as np
-import types
 
 from collections import namedtuple
 
-from syscore.objects import header, table, body_text, arg_not_supplied, missing_data
+from syscore.objects import header, table, body_text, arg_not_supplied
 
-from sysobjects.contracts import futuresContract
+from sysobjects.contracts import futuresContract, listOfFuturesContracts, get_code_and_id_from_contract_key
 from sysobjects.production.tradeable_object import instrumentStrategy
 
+from sysexecution.fills import listOfFills
+
+from sysdata.production.historic_positions import any_positions_since_start_date
+
 from sysproduction.data.capital import dataCapital
 
 from sysproduction.data.currency_data import dataCurrency
@@ -78,25 +81,19 @@ def get_pandl_report_data(data, start_date, end_date):
     :param calendar_days_back:
     :return: named tuple object containing p&l data
     """
-    # to save double calculation
-    data.temp_pandl_read = types.MethodType(temp_pandl_read, data)
-    data.temp_pandl_write = types.MethodType(temp_pandl_write, data)
+    pandl_attribution = get_pandl_attribution(data, start_date, end_date)
 
-    total_capital_pandl = (
-        get_total_capital_pandl(data, start_date, end_date=end_date) * 100
-    )
+    total_capital_pandl = pandl_attribution.total_capital_pandl() * 100
     pandl_for_instruments_across_strategies = (
-        get_ranked_list_of_pandl_by_instrument_all_strategies_in_date_range(
-            data, start_date, end_date
-        )
+        pandl_attribution.ranked_pandl_by_instrument()
     )
     pandl_for_instruments_across_strategies.pandl = (
         pandl_for_instruments_across_strategies.pandl * 100
     )
     total_for_futures = pandl_for_instruments_across_strategies.pandl.sum()
     residual = total_capital_pandl - total_for_futures
-    strategies = get_strategy_pandl_and_residual(data, start_date, end_date)
-    sector_pandl = get_sector_pandl(data, start_date, end_date)
+    strategies = pandl_attribution.strategy_pandl_and_residual()
+    sector_pandl = pandl_attribution.ranked_pandl_by_sector()
 
     results_object = pandlResults(
         total_capital_pandl,
@@ -112,19 +109,329 @@ def get_pandl_report_data(data, start_date, end_date):
     return results_object
 
 
-def temp_pandl_write(self, instrument_code, pandl_data):
-    meta_data = getattr(self, "meta_data", None)
-    if meta_data is None:
-        self.meta_data = {}
-    self.meta_data[instrument_code] = pandl_data
+def get_pandl_attribution(data, start_date, end_date):
+    """
+    Returns a pandlAttribution for the date range, reusing the one stored on the data blob
+    only if it was built for exactly the same start and end datetimes
+
+    pandl_info defaults end_date to now(), so in practice that is only within one report build;
+    the sections of a report share the one pandlAttribution it creates
+
+    :param data: data Blob
+    :return: pandlAttribution
+    """
+    pandl_attribution = getattr(data, "pandl_attribution", None)
+    if pandl_attribution is not None:
+        if pandl_attribution.is_for_date_range(start_date, end_date):
+            return pandl_attribution
+
+    pandl_attribution = pandlAttribution(data, start_date, end_date)
+    data.pandl_attribution = pandl_attribution
+
+    return pandl_attribution
+
+
+class pandlAttribution(object):
+    """
+    Works out p&l by contract, instrument, strategy and sector for a date range
+
+    Inputs (capital, FX, instrument meta data, prices, positions and fills) are each read
+    once and stored, and all the breakdowns are aggregated from a single table of contract
+    p&l, rather than going back to the database for every row of every report table
+
+    Positions are read for all contracts at once, and the p&l for every contract is worked out
+    together in one frame aligned on the union of their dates
+    """
+
+    def __init__(self, data, start_date, end_date):
+        self._data = data
+        self._start_date = start_date
+        self._end_date = end_date
+
+        self._fx_series_by_currency = {}
+        self._meta_data_by_instrument = {}
+        self._fills_by_instrument = {}
+        self._current_contract_prices_by_instrument = {}
+        self._contract_pandl = None
+        self._strategy_pandl = None
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def start_date(self):
+        return self._start_date
+
+    @property
+    def end_date(self):
+        return self._end_date
+
+    def is_for_date_range(self, start_date, end_date) -> bool:
+        return start_date == self.start_date and end_date == self.end_date
+
+    def total_capital_pandl(self) -> float:
+        relevant_pandl = self.daily_perc_pandl[self.start_date:self.end_date]
+
+        return relevant_pandl.sum()
+
+    def ranked_pandl_by_instrument(self) -> pd.DataFrame:
+        instrument_pandl = self.pandl_by_instrument()
+
+        return _ranked_pandl_df_excluding_zeros(instrument_pandl)
+
+    def ranked_pandl_by_sector(self) -> pd.DataFrame:
+        sector_pandl = self.pandl_by_sector() * 100
+
+        return _ranked_pandl_df_excluding_zeros(sector_pandl)
+
+    def strategy_pandl_and_residual(self) -> pd.DataFrame:
+        strategies_pandl = self.pandl_by_strategy().sort_values()
+        strategies_pandl = _pandl_series_to_df(strategies_pandl)
+        residual_pandl = self.total_capital_pandl() - strategies_pandl.pandl.sum()
+        residual_dfrow = pd.DataFrame(
+            dict(codes=["residual"], pandl=residual_pandl))
+        strategies_pandl = strategies_pandl.append(residual_dfrow)
+        strategies_pandl.pandl = strategies_pandl.pandl * 100
+
+        return strategies_pandl
+
+    def pandl_by_instrument(self) -> pd.Series:
+        contract_pandl = self.contract_pandl
+
+        return contract_pandl.groupby("instrument_code", sort=False).pandl.sum()
+
+    def pandl_by_sector(self) -> pd.Series:
+        contract_pandl = self.contract_pandl
+
+        return contract_pandl.groupby("asset_class", sort=False).pandl.sum()
+
+    def pandl_by_strategy(self) -> pd.Series:
+        strategy_pandl = self.strategy_pandl
+        pandl_by_strategy = strategy_pandl.groupby("strategy_name", sort=False).pandl.sum()
+
+        # strategies without any instruments held still get a (zero) row
+        diag_positions = diagPositions(self.data)
+        strategy_list = diag_positions.get_list_of_strategies_with_positions()
+
+        return pandl_by_strategy.reindex(strategy_list, fill_value=0.0)
+
+    @property
+    def contract_pandl(self) -> pd.DataFrame:
+        """
+        One row per contract held in the date range, columns instrument_code, contract_id,
+        asset_class and pandl (% of capital, summed over the date range)
+        """
+        contract_pandl = self._contract_pandl
+        if contract_pandl is None:
+            contract_pandl = self._calculate_contract_pandl()
+            self._contract_pandl = contract_pandl
+
+        return contract_pandl
+
+    @property
+    def strategy_pandl(self) -> pd.DataFrame:
+        """
+        One row per strategy and instrument held, columns strategy_name, instrument_code
+        and pandl (% of capital, summed over the date range)
+        """
+        strategy_pandl = self._strategy_pandl
+        if strategy_pandl is None:
+            strategy_pandl = self._calculate_strategy_pandl()
+            self._strategy_pandl = strategy_pandl
+
+        return strategy_pandl
+
+    def _calculate_contract_pandl(self) -> pd.DataFrame:
+        dict_of_position_df = self._dict_of_position_df_for_contracts_held_in_date_range()
+        list_of_contracts = listOfFuturesContracts([
+            futuresContract(*get_code_and_id_from_contract_key(contract_key))
+            for contract_key in dict_of_position_df.keys()])
+
+        diag_prices = diagPrices(self.data)
+        dict_of_prices = diag_prices.get_dict_of_prices_for_list_of_contracts(list_of_contracts)
+
+        list_of_price_series = [
+            dict_of_prices[contract.key].return_final_prices()
+            for contract in list_of_contracts]
+        list_of_trade_df = [
+            unique_trades_df(self._trade_df_for_contract(contract.instrument_code, contract.date_str))
+            for contract in list_of_contracts]
+        list_of_pos_series = [
+            pd.Series(dict_of_position_df[contract.key].position)
+            for contract in list_of_contracts]
+        list_of_instrument_codes = [contract.instrument_code for contract in list_of_contracts]
+
+        period_perc_pandl = self._period_perc_pandl_for_panel(
+            list_of_instrument_codes, list_of_price_series, list_of_trade_df, list_of_pos_series,
+            capital=self.total_capital_series)
+
+        return pd.DataFrame(dict(
+            instrument_code=list_of_instrument_codes,
+            contract_id=[contract.date_str for contract in list_of_contracts],
+            asset_class=[self._asset_class(instrument_code) for instrument_code in list_of_instrument_codes],
+            pandl=period_perc_pandl),
+            columns=["instrument_code", "contract_id", "asset_class", "pandl"])
+
+    def _calculate_strategy_pandl(self) -> pd.DataFrame:
+        diag_positions = diagPositions(self.data)
+        list_of_instrument_strategies = diag_positions.get_list_of_strategies_and_instruments_with_positions()
+        dict_of_position_df = diag_positions.get_dict_of_position_df_for_all_instrument_strategies()
+
+        list_of_instrument_codes = [
+            instrument_strategy.instrument_code for instrument_strategy in list_of_instrument_strategies]
+        list_of_price_series = [
+            self._current_contract_price_series(instrument_code)
+            for instrument_code in list_of_instrument_codes]
+        list_of_trade_df = [
+            unique_trades_df(get_trade_df_for_instrument(
+                self.data, instrument_strategy.instrument_code, instrument_strategy.strategy_name))
+            for instrument_strategy in list_of_instrument_strategies]
+        list_of_pos_series = [
+            pd.Series(dict_of_position_df[instrument_strategy].position)
+            for instrument_strategy in list_of_instrument_strategies]
+
+        period_perc_pandl = self._period_perc_pandl_for_panel(
+            list_of_instrument_codes, list_of_price_series, list_of_trade_df, list_of_pos_series,
+            capital=self.total_capital_series.ffill())
+
+        return pd.DataFrame(dict(
+            strategy_name=[
+                instrument_strategy.strategy_name for instrument_strategy in list_of_instrument_strategies],
+            instrument_code=list_of_instrument_codes,
+            pandl=period_perc_pandl),
+            columns=["strategy_name", "instrument_code", "pandl"])
+
+    def _dict_of_position_df_for_contracts_held_in_date_range(self) -> dict:
+        diag_positions = diagPositions(self.data)
+        dict_of_position_df = diag_positions.get_dict_of_position_df_for_all_contracts()
+
+        return dict([
+            (contract_key, position_df)
+            for contract_key, position_df in dict_of_position_df.items()
+            if any_positions_since_start_date(position_df, self.start_date, self.end_date)])
+
+    def _period_perc_pandl_for_panel(self,
+                                     list_of_instrument_codes: list,
+                                     list_of_price_series: list,
+                                     list_of_trade_df: list,
+                                     list_of_pos_series: list,
+                                     capital: pd.Series) -> np.array:
+        """
+        p&l as % of capital summed over the date range, for each set of prices, trades and positions,
+        all calculated together in one aligned frame
+        """
+        if len(list_of_instrument_codes) == 0:
+            return np.array([])
+
+        list_of_price_series = [
+            _price_series_needed_for_pandl_in_date_range(price_series, self.start_date, self.end_date)
+            for price_series in list_of_price_series]
+
+        pandl_in_points = pandl_points_panel(
+            list_of_price_series, list_of_trade_df, list_of_pos_series)
+        perc_pandl = self._perc_pandl_from_points_panel(
+            list_of_instrument_codes, pandl_in_points, capital=capital)
+
+        return perc_pandl[self.start_date:self.end_date].sum().values
+
+    def _perc_pandl_from_points_panel(self,
+                                      list_of_instrument_codes: list,
+                                      pandl_in_points: pd.DataFrame,
+                                      capital: pd.Series) -> pd.DataFrame:
+        point_size = np.array([
+            self._meta_data(instrument_code).Pointsize for instrument_code in list_of_instrument_codes])
+        pandl_in_local = pandl_in_points * point_size
+
+        # each FX series and capital is aligned once, rather than for every column
+        index = pandl_in_local.index
+        fx_by_currency = {}
+        for instrument_code in list_of_instrument_codes:
+            currency = self._meta_data(instrument_code).Currency
+            if currency not in fx_by_currency:
+                fx_series = self._fx_series_for_instrument(instrument_code)
+                fx_by_currency[currency] = fx_series.reindex(index, method="ffill").values
+        fx_panel = np.column_stack([
+            fx_by_currency[self._meta_data(instrument_code).Currency]
+            for instrument_code in list_of_instrument_codes])
+
+        pandl_in_base = pandl_in_local * fx_panel
+
+        capital = capital.reindex(index, method="ffill")
+
+        return pandl_in_base.div(capital, axis=0)
+
+    def _trade_df_for_contract(self, instrument_code, contract_id) -> pd.DataFrame:
+        dict_of_fills = self._fills_by_instrument.get(instrument_code, None)
+        if dict_of_fills is None:
+            data_orders = dataOrders(self.data)
+            dict_of_fills = data_orders.get_dict_of_fills_history_for_instrument(instrument_code)
+            self._fills_by_instrument[instrument_code] = dict_of_fills
+
+        contract_str = futuresContract(instrument_code, contract_id).date_str
+        list_of_trades = dict_of_fills.get(contract_str, listOfFills([]))
+
+        return list_of_trades.as_pd_df()
+
+    def _current_contract_price_series(self, instrument_code) -> pd.Series:
+        price_series = self._current_contract_prices_by_instrument.get(instrument_code, None)
+        if price_series is None:
+            price_series = get_current_contract_price_series_for_instrument(
+                self.data, instrument_code)
+            self._current_contract_prices_by_instrument[instrument_code] = price_series
+
+        return price_series
+
+    def _fx_series_for_instrument(self, instrument_code) -> pd.Series:
+        currency = self._meta_data(instrument_code).Currency
+        fx_series = self._fx_series_by_currency.get(currency, None)
+        if fx_series is None:
+            currency_data = dataCurrency(self.data)
+            fx_series = currency_data.get_fx_prices_to_base(currency)
+            self._fx_series_by_currency[currency] = fx_series
+
+        return fx_series
+
+    def _asset_class(self, instrument_code) -> str:
+        return self._meta_data(instrument_code).AssetClass
+
+    def _meta_data(self, instrument_code):
+        meta_data = self._meta_data_by_instrument.get(instrument_code, None)
+        if meta_data is None:
+            diag_instruments = diagInstruments(self.data)
+            meta_data = diag_instruments.get_meta_data(instrument_code)
+            self._meta_data_by_instrument[instrument_code] = meta_data
+
+        return meta_data
+
+    @property
+    def total_capital_series(self) -> pd.Series:
+        total_capital_series = getattr(self, "_total_capital_series", None)
+        if total_capital_series is None:
+            total_capital_series = get_total_capital_series(self.data)
+            self._total_capital_series = total_capital_series
+
+        return total_capital_series
+
+    @property
+    def daily_perc_pandl(self) -> pd.Series:
+        daily_perc_pandl = getattr(self, "_daily_perc_pandl", None)
+        if daily_perc_pandl is None:
+            daily_perc_pandl = get_daily_perc_pandl(self.data)
+            self._daily_perc_pandl = daily_perc_pandl
+
+        return daily_perc_pandl
+
+
+def _ranked_pandl_df_excluding_zeros(pandl: pd.Series) -> pd.DataFrame:
+    pandl = pandl[pandl != 0]
+    pandl = pandl.sort_values()
 
+    return _pandl_series_to_df(pandl)
 
-def temp_pandl_read(self, instrument_code):
-    meta_data = getattr(self, "meta_data", None)
-    if meta_data is None:
-        return None
-    data = meta_data.get(instrument_code, None)
-    return data
+
+def _pandl_series_to_df(pandl: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame(dict(codes=list(pandl.index), pandl=list(pandl.values)))
 
 
 def get_total_capital_series(data):
@@ -170,390 +477,6 @@ def get_total_capital_pandl(data, start_date, end_date=arg_not_supplied):
     return pandl_in_period
 
 
-def get_strategy_pandl_and_residual(data, start_date, end_date):
-    strategies_pandl = get_ranked_list_of_pandl_by_strategy_in_date_range(
-        data, start_date, end_date
-    )
-    total_pandl_strategies = strategies_pandl.pandl.sum()
-    total_pandl = get_total_capital_pandl(data, start_date, end_date)
-    residual_pandl = total_pandl - total_pandl_strategies
-    residual_dfrow = pd.DataFrame(
-        dict(codes=["residual"], pandl=residual_pandl))
-    strategies_pandl = strategies_pandl.append(residual_dfrow)
-    strategies_pandl.pandl = strategies_pandl.pandl * 100
-
-    return strategies_pandl
-
-
-def get_ranked_list_of_pandl_by_instrument_all_strategies_in_date_range(
-    data, start_date, end_date
-):
-    list_pandl = get_period_perc_pandl_for_all_instruments_all_strategies_in_date_range(
-        data, start_date, end_date)
-    list_pandl = [pandl for pandl in list_pandl if pandl.pandl != 0]
-    list_pandl.sort(key=lambda r: r.pandl)
-
-    pandl_as_df = list_pandl_to_df(list_pandl)
-
-    return pandl_as_df
-
-
-def get_sector_pandl(data, start_date, end_date):
-    list_pandl = get_period_perc_pandl_for_all_sectors_in_date_range(
-        data, start_date, end_date
-    )
-    list_pandl = [pandl for pandl in list_pandl if pandl.pandl != 0]
-    list_pandl.sort(key=lambda r: r.pandl)
-
-    pandl_as_df = list_pandl_to_df(list_pandl)
-
-    return pandl_as_df
-
-
-def get_ranked_list_of_pandl_by_strategy_in_date_range(
-        data, start_date, end_date):
-    list_pandl = get_period_perc_pandl_for_all_strategies_in_date_range(
-        data, start_date, end_date
-    )
-    list_pandl.sort(key=lambda r: r.pandl)
-
-    pandl_as_df = list_pandl_to_df(list_pandl)
-
-    return pandl_as_df
-
-
-PandL = namedtuple("PandL", ["code", "pandl"])
-
-
-def list_pandl_to_df(list_pandl):
-    code_list = [pandl.code for pandl in list_pandl]
-    pandl_list = [pandl.pandl for pandl in list_pandl]
-
-    return pd.DataFrame(dict(codes=code_list, pandl=pandl_list))
-
-
-def get_period_perc_pandl_for_all_instruments_all_strategies_in_date_range(
-    data, start_date, end_date
-):
-    diag_positions = diagPositions(data)
-    instrument_list = diag_positions.get_list_of_instruments_with_any_position()
-
-    list_pandl = [
-        PandL(
-            instrument_code,
-            get_period_perc_pandl_for_instrument_all_strategies_in_date_range(
-                data, instrument_code, start_date, end_date
-            ),
-        )
-        for instrument_code in instrument_list
-    ]
-
-    return list_pandl
-
-
-def get_period_perc_pandl_for_all_sectors_in_date_range(
-        data, start_date, end_date):
-    diag_instruments = diagInstruments(data)
-    asset_classes = diag_instruments.get_all_asset_classes()
-    list_pandl = [
-        PandL(
-            asset_class,
-            get_period_perc_pandl_for_sector_in_date_range(
-                asset_class, data, start_date, end_date
-            ),
-        )
-        for asset_class in asset_classes
-    ]
-
-    return list_pandl
-
-
-def get_period_perc_pandl_for_all_strategies_in_date_range(
-        data, start_date, end_date):
-    strategy_list = get_list_of_strategies(data)
-    list_pandl = [
-        PandL(
-            strategy_name,
-            get_period_perc_pandl_for_strategy_in_date_range(
-                data, strategy_name, start_date, end_date
-            ),
-        )
-        for strategy_name in strategy_list
-    ]
-
-    return list_pandl
-
-
-def get_period_perc_pandl_for_sector_in_date_range(
-    asset_class, data, start_date, end_date
-):
-    print("Getting data for %s" % asset_class)
-    diag_instruments = diagInstruments(data)
-    list_of_instruments = diag_instruments.get_all_instruments_in_asset_class(
-        asset_class
-    )
-    instrument_pandl = [
-        get_period_perc_pandl_for_instrument_all_strategies_in_date_range(
-            data, instrument_code, start_date, end_date
-        )
-        for instrument_code in list_of_instruments
-    ]
-    asset_class_pandl = sum(instrument_pandl)
-
-    return asset_class_pandl * 100
-
-
-def get_period_perc_pandl_for_instrument_all_strategies_in_date_range(
-    data, instrument_code, start_date, end_date
-):
-    print("Getting p&l for %s" % instrument_code)
-
-    pandl_series = data.temp_pandl_read(instrument_code)
-    if pandl_series is None:
-        pandl_df = get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-            data, instrument_code, start_date, end_date)
-
-        if pandl_df is missing_data:
-            return 0.0
-
-        pandl_series = pandl_df.sum(axis=1)
-        pandl_series = pandl_series[start_date:end_date]
-
-        data.temp_pandl_write(instrument_code, pandl_series)
-
-    return pandl_series.sum()
-
-
-def get_period_perc_pandl_for_strategy_in_date_range(
-    data, strategy_name, start_date, end_date
-):
-    print("Getting p&l for %s" % strategy_name)
-    pandl_df = get_df_of_perc_pandl_series_for_strategy_all_instruments(
-        data, strategy_name
-    )
-
-    if pandl_df is missing_data:
-        return 0.0
-
-    pandl_df = pandl_df[start_date:end_date]
-    pandl_series = pandl_df.sum(axis=1, skipna=True)
-    pandl_series = pandl_series.dropna()
-
-    return pandl_series.sum()
-
-
-def get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-        data, instrument_code, start_date, end_date):
-    (
-        contract_list,
-        pandl_list,
-    ) = get_list_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-        data, instrument_code, start_date, end_date
-    )
-
-    if contract_list is missing_data:
-        return missing_data
-
-    pandl_df = pd.concat(pandl_list, axis=1)
-    pandl_df.columns = contract_list
-
-    return pandl_df
-
-
-def get_df_of_perc_pandl_series_for_strategy_all_instruments(
-        data,
-        strategy_name):
-    (instrument_list,
-     pandl_list,
-     ) = get_list_of_perc_pandl_series_for_strategy_all_instruments(data,
-                                                                    strategy_name)
-
-    if instrument_list is missing_data:
-        return missing_data
-
-    pandl_df = pd.concat(pandl_list, axis=1)
-    pandl_df.columns = instrument_list
-
-    return pandl_df
-
-
-def get_list_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-        data, instrument_code, start_date, end_date):
-    contract_list = get_list_of_contracts_held_for_an_instrument_in_date_range(
-        data, instrument_code, start_date, end_date
-    )
-    if len(contract_list) == 0:
-        return missing_data, missing_data
-
-    pandl_list = [
-        get_perc_pandl_series_for_contract(data, instrument_code, contract_id)
-        for contract_id in contract_list
-    ]
-
-    return contract_list, pandl_list
-
-
-def get_list_of_perc_pandl_series_for_strategy_all_instruments(
-        data,
-        strategy_name):
-    instrument_list = get_list_of_instruments_held_for_a_strategy(
-        data, strategy_name)
-    if len(instrument_list) == 0:
-        return missing_data, missing_data
-
-    pandl_list = [
-        get_perc_pandl_series_for_strategy_vs_total_capital(
-            data, strategy_name, instrument_code
-        )
-        for instrument_code in instrument_list
-    ]
-
-    return instrument_list, pandl_list
-
-
-def get_list_of_contracts_held_for_an_instrument_in_date_range(
-    data, instrument_code, start_date, end_date
-):
-    diag_positions = diagPositions(data)
-
-    contract_list = diag_positions.get_list_of_contracts_with_any_contract_position_for_instrument_in_date_range(
-        instrument_code, start_date, end_date)
-
-    return contract_list
-
-
-def get_list_of_instruments_held_for_a_strategy(data, strategy_name):
-    diag_positions = diagPositions(data)
-    instrument_list = diag_positions.get_list_of_instruments_for_strategy_with_position(
-        strategy_name)
-
-    return instrument_list
-
-
-def get_perc_pandl_series_for_contract(data, instrument_code, contract_id):
-    pandl_in_base = get_pandl_series_in_base_ccy_for_contract(
-        data, instrument_code, contract_id
-    )
-    capital = get_total_capital_series(data)
-    capital = capital.reindex(pandl_in_base.index, method="ffill")
-
-    perc_pandl = pandl_in_base / capital
-
-    return perc_pandl
-
-
-def get_perc_pandl_series_for_strategy_vs_total_capital(
-    data, strategy_name, instrument_code
-):
-    print("Data for %s %s" % (strategy_name, instrument_code))
-    pandl_in_base = get_pandl_series_in_base_ccy_for_strategy_instrument(
-        data, strategy_name, instrument_code
-    )
-    capital = get_total_capital_series(data).ffill()
-    capital = capital.reindex(pandl_in_base.index, method="ffill")
-
-    perc_pandl = pandl_in_base / capital
-
-    return perc_pandl
-
-
-def get_pandl_series_in_base_ccy_for_contract(
-        data, instrument_code, contract_id):
-    pandl_in_local = get_pandl_series_in_local_ccy_for_contract(
-        data, instrument_code, contract_id
-    )
-    fx_series = get_fx_series_for_instrument(data, instrument_code)
-    fx_series = fx_series.reindex(pandl_in_local.index).ffill()
-
-    pandl_in_base = fx_series * pandl_in_local
-
-    return pandl_in_base
-
-
-def get_pandl_series_in_base_ccy_for_strategy_instrument(
-    data, strategy_name, instrument_code
-):
-    pandl_in_local = get_pandl_series_in_local_ccy_for_strategy_instrument(
-        data, strategy_name, instrument_code
-    )
-    fx_series = get_fx_series_for_instrument(data, instrument_code)
-    fx_series = fx_series.reindex(pandl_in_local.index).ffill()
-
-    pandl_in_base = fx_series * pandl_in_local
-
-    return pandl_in_base
-
-
-def get_fx_series_for_instrument(data, instrument_code):
-    diag_instruments = diagInstruments(data)
-    currency = diag_instruments.get_currency(instrument_code)
-    currency_data = dataCurrency(data)
-    fx_series = currency_data.get_fx_prices_to_base(currency)
-
-    return fx_series
-
-
-def get_pandl_series_in_local_ccy_for_contract(
-        data, instrument_code, contract_id):
-    diag_instruments = diagInstruments(data)
-
-    pandl_in_points = get_pandl_series_in_points_for_contract(
-        data, instrument_code, contract_id
-    )
-    point_size = diag_instruments.get_point_size(instrument_code)
-    pandl_in_local = point_size * pandl_in_points
-
-    return pandl_in_local
-
-
-def get_pandl_series_in_local_ccy_for_strategy_instrument(
-    data, strategy_name, instrument_code
-):
-    diag_instruments = diagInstruments(data)
-
-    pandl_in_points = get_pandl_series_in_points_for_instrument_strategy(
-        data, instrument_code, strategy_name
-    )
-    point_size = diag_instruments.get_point_size(instrument_code)
-    pandl_in_local = point_size * pandl_in_points
-
-    return pandl_in_local
-
-
-def get_pandl_series_in_points_for_contract(
-        data, instrument_code, contract_id):
-    print(instrument_code)
-    print(contract_id)
-    pos_series = get_position_series_for_contract(
-        data, instrument_code, contract_id)
-    price_series = get_price_series_for_contract(
-        data, instrument_code, contract_id)
-    trade_df = get_trade_df_for_contract(data, instrument_code, contract_id)
-
-    trade_df = unique_trades_df(trade_df)
-
-    returns = pandl_points(price_series, trade_df, pos_series)
-
-    return returns
-
-
-def get_pandl_series_in_points_for_instrument_strategy(
-    data, instrument_code, strategy_name
-):
-    pos_series = get_position_series_for_instrument_strategy(
-        data, instrument_code, strategy_name
-    )
-    price_series = get_current_contract_price_series_for_instrument(data, instrument_code)
-    trade_df = get_trade_df_for_instrument(
-        data, instrument_code, strategy_name)
-
-    trade_df = unique_trades_df(trade_df)
-
-    returns = pandl_points(price_series, trade_df, pos_series)
-
-    return returns
-
-
 def unique_trades_df(trade_df):
     cash_flow = trade_df.qty * trade_df.price
     trade_df["cash_flow"] = cash_flow
@@ -605,41 +528,67 @@ def pandl_points(price_series, trade_df, pos_series):
     return returns
 
 
-def get_price_series_for_contract(data, instrument_code, contract_id):
-    diag_prices = diagPrices(data)
-    contract = futuresContract(instrument_code, contract_id)
-    all_prices = diag_prices.get_prices_for_contract_object(contract)
-    price_series = all_prices.return_final_prices()
+def pandl_points_panel(list_of_price_series: list, list_of_trade_df: list, list_of_pos_series: list) -> pd.DataFrame:
+    """
+    Same as pandl_points, for several positions at once, aligned on the union of all their dates
 
-    return price_series
+    :returns: pd.DataFrame, one column for each position, NaN on dates which have no price for that position
+    """
+    price_panel = _panel_from_list_of_series(list_of_price_series)
+    trade_price_panel = _panel_from_list_of_series(
+        [trade_df.price for trade_df in list_of_trade_df])
+    index = price_panel.index.union(trade_price_panel.index)
 
+    # Where no fill price available, use price
+    prices_to_use = trade_price_panel.reindex(index).fillna(price_panel.reindex(index))
+    prices_to_use = prices_to_use.replace([np.inf, -np.inf], np.nan)
+    has_price = prices_to_use.notna()
 
-def get_current_contract_price_series_for_instrument(data, instrument_code):
-    diag_prices = diagPrices(data)
-    price_series = diag_prices.get_current_contract_prices_for_instrument(instrument_code)
+    price_returns = prices_to_use.ffill().diff().where(has_price)
 
-    return price_series
+    pos_panel = _panel_from_list_of_series(
+        [pos_series.groupby(pos_series.index).last() for pos_series in list_of_pos_series])
+    pos_panel = pos_panel.reindex(pos_panel.index.union(index)).ffill().reindex(index)
 
+    # the position held at the previous price
+    previous_pos_panel = pos_panel.where(has_price).ffill().shift(1)
 
-def get_position_series_for_instrument_strategy(
-        data, instrument_code, strategy_name):
-    diag_positions = diagPositions(data)
-    pos_series = diag_positions.get_position_df_for_strategy_and_instrument(
-        strategy_name, instrument_code
-    )
-    if pos_series is missing_data:
-        return pd.Series()
+    returns = previous_pos_panel * price_returns
 
-    return pd.Series(pos_series.position)
+    return returns
 
 
-def get_trade_df_for_contract(data, instrument_code, contract_id):
-    data_orders = dataOrders(data)
-    contract  = futuresContract(instrument_code, contract_id)
-    list_of_trades = data_orders.get_fills_history_for_contract(contract)
-    list_of_trades_as_pd_df = list_of_trades.as_pd_df()
+def _panel_from_list_of_series(list_of_series: list) -> pd.DataFrame:
+    columns = range(len(list_of_series))
+    dict_of_series = dict([
+        (column, series.astype(float))
+        for column, series in zip(columns, list_of_series)
+        if len(series) > 0])
 
-    return list_of_trades_as_pd_df
+    if len(dict_of_series) == 0:
+        return pd.DataFrame(index=pd.DatetimeIndex([]), columns=columns, dtype=float)
+
+    panel = pd.concat(dict_of_series, axis=1)
+
+    return panel.reindex(columns=columns)
+
+
+def _price_series_needed_for_pandl_in_date_range(price_series: pd.Series,
+                                                 start_date: datetime.datetime,
+                                                 end_date: datetime.datetime) -> pd.Series:
+    ## p&l in the date range only needs the last price before it, not the whole history
+    price_series = price_series.replace([np.inf, -np.inf], np.nan).dropna()
+    price_series = price_series[:end_date]
+    first_row = max(price_series.index.searchsorted(start_date) - 1, 0)
+
+    return price_series.iloc[first_row:]
+
+
+def get_current_contract_price_series_for_instrument(data, instrument_code):
+    diag_prices = diagPrices(data)
+    price_series = diag_prices.get_current_contract_prices_for_instrument(instrument_code)
+
+    return price_series
 
 
 def get_trade_df_for_instrument(data, instrument_code, strategy_name):
@@ -652,17 +601,6 @@ def get_trade_df_for_instrument(data, instrument_code, strategy_name):
     return list_of_trades_as_pd_df
 
 
-def get_position_series_for_contract(data, instrument_code, contract_id):
-    diag_positions = diagPositions(data)
-    pos_series = diag_positions.get_position_df_for_instrument_and_contract_id(
-        instrument_code, contract_id
-    )
-    if pos_series is missing_data:
-        return pd.Series()
-
-    return pd.Series(pos_series.position)
-
-
 def format_pandl_data(results_object):
     """
     Put the results into a printable format
@@ -721,8 +659,3 @@ def format_pandl_data(results_object):
     formatted_output.append(header("END OF P&L REPORT"))
 
     return formatted_output
-
-
-def get_list_of_strategies(data):
-    diag_positions = diagPositions(data)
-    return diag_positions.get_list_of_strategies_with_positions()
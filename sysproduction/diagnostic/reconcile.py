@@ -8,11 +8,14 @@ from collections import namedtuple
 
 import datetime
 
+import pandas as pd
+
 from syscore.genutils import transfer_object_attributes
 from syscore.pdutils import make_df_from_list_of_named_tuple
 from syscore.objects import header, table, body_text, arg_not_supplied, missing_data
 
 from sysdata.data_blob import dataBlob
+from sysobjects.production.positions import listOfInstrumentStrategyPositions, listOfContractPositions
 from sysproduction.data.orders import dataOrders
 from sysproduction.data.positions import diagPositions
 from sysproduction.data.broker import dataBroker
@@ -36,11 +39,12 @@ def reconcile_info(data=arg_not_supplied):
 
 
 def get_reconcile_report_data(data):
+    positions_to_reconcile = positionsToReconcile(data)
 
-    positions_optimal = get_optimal_positions(data)
-    positions_mine = get_my_positions(data)
-    positions_ib = get_broker_positions(data)
-    position_breaks = get_position_breaks(data)
+    positions_optimal = get_optimal_positions(data, positions_to_reconcile)
+    positions_mine = get_my_positions(data, positions_to_reconcile)
+    positions_ib = get_broker_positions(data, positions_to_reconcile)
+    position_breaks = get_position_breaks(data, positions_to_reconcile)
     trades_mine = get_recent_trades_from_db(data)
     trades_ib = get_broker_trades(data)
 
@@ -55,6 +59,67 @@ def get_reconcile_report_data(data):
     return results_object
 
 
+class positionsToReconcile(object):
+    """
+    Each source of positions (optimal, strategy, contract and broker) is read once with a single bulk read,
+    and then shared by all the tables and breaks in the report
+    """
+
+    def __init__(self, data: dataBlob):
+        self.data = data
+
+    @property
+    def optimal_and_current_positions(self) -> pd.DataFrame:
+        return self._get_or_read("_optimal_and_current_positions",
+                                 self._read_optimal_and_current_positions)
+
+    @property
+    def strategy_positions(self) -> listOfInstrumentStrategyPositions:
+        return self._get_or_read("_strategy_positions",
+                                 diagPositions(self.data).get_all_current_strategy_instrument_positions)
+
+    @property
+    def db_contract_positions(self) -> listOfContractPositions:
+        # with the expiries the broker uses, so they line up with the broker positions
+        return self._get_or_read("_db_contract_positions",
+                                 dataBroker(self.data).get_db_contract_positions_with_IB_expiries)
+
+    @property
+    def broker_contract_positions(self) -> listOfContractPositions:
+        return self._get_or_read("_broker_contract_positions",
+                                 dataBroker(self.data).get_all_current_contract_positions)
+
+    def list_of_optimal_position_breaks(self) -> list:
+        optimal_and_current = self.optimal_and_current_positions
+
+        return list(optimal_and_current.index[optimal_and_current.breaks.astype(bool)])
+
+    def list_of_breaks_between_contract_and_strategy_positions(self) -> list:
+        instrument_positions_from_contract = self.db_contract_positions.sum_for_instrument()
+        instrument_positions_from_strategies = self.strategy_positions.sum_for_instrument()
+
+        return instrument_positions_from_contract.return_list_of_breaks(
+            instrument_positions_from_strategies)
+
+    def list_of_breaks_between_broker_and_db_contract_positions(self) -> list:
+        return self.db_contract_positions.return_list_of_breaks(
+            self.broker_contract_positions)
+
+    def _read_optimal_and_current_positions(self) -> pd.DataFrame:
+        optimal_positions = dataOptimalPositions(self.data).get_list_of_optimal_positions()
+        optimal_and_current = optimal_positions.add_positions(self.strategy_positions)
+
+        return optimal_and_current.as_pd_with_breaks()
+
+    def _get_or_read(self, attr_name: str, read_function):
+        stored_value = getattr(self, attr_name, None)
+        if stored_value is None:
+            stored_value = read_function()
+            setattr(self, attr_name, stored_value)
+
+        return stored_value
+
+
 def format_reconcile_data(results_object):
     """
     Put the results into a printable format
@@ -99,42 +164,44 @@ def format_reconcile_data(results_object):
     return formatted_output
 
 
-def get_optimal_positions(data):
-    data_optimal = dataOptimalPositions(data)
-    opt_positions = data_optimal.get_pd_of_position_breaks()
+def get_optimal_positions(data, positions_to_reconcile: positionsToReconcile = arg_not_supplied):
+    if positions_to_reconcile is arg_not_supplied:
+        positions_to_reconcile = positionsToReconcile(data)
+    opt_positions = positions_to_reconcile.optimal_and_current_positions
 
     return opt_positions
 
 
-def get_my_positions(data):
-    data_broker = dataBroker(data)
-    my_positions = data_broker.get_db_contract_positions_with_IB_expiries().as_pd_df()
+def get_my_positions(data, positions_to_reconcile: positionsToReconcile = arg_not_supplied):
+    if positions_to_reconcile is arg_not_supplied:
+        positions_to_reconcile = positionsToReconcile(data)
+    my_positions = positions_to_reconcile.db_contract_positions.as_pd_df()
     my_positions = my_positions.sort_values("instrument_code")
 
     return my_positions
 
 
-def get_broker_positions(data):
-    data_broker = dataBroker(data)
-    broker_positions = data_broker.get_all_current_contract_positions().as_pd_df()
+def get_broker_positions(data, positions_to_reconcile: positionsToReconcile = arg_not_supplied):
+    if positions_to_reconcile is arg_not_supplied:
+        positions_to_reconcile = positionsToReconcile(data)
+    broker_positions = positions_to_reconcile.broker_contract_positions.as_pd_df()
     broker_positions = broker_positions.sort_values("instrument_code")
     return broker_positions
 
 
-def get_position_breaks(data):
+def get_position_breaks(data, positions_to_reconcile: positionsToReconcile = arg_not_supplied):
+    if positions_to_reconcile is arg_not_supplied:
+        positions_to_reconcile = positionsToReconcile(data)
 
-    data_optimal = dataOptimalPositions(data)
     breaks_str0 = "Breaks Optimal vs actual %s" % str(
-        data_optimal.get_list_of_optimal_position_breaks()
+        positions_to_reconcile.list_of_optimal_position_breaks()
     )
 
-    diag_positions = diagPositions(data)
     breaks_str1 = "Breaks Instrument vs Contract %s" % str(
-        diag_positions.get_list_of_breaks_between_contract_and_strategy_positions())
+        positions_to_reconcile.list_of_breaks_between_contract_and_strategy_positions())
 
-    data_broker = dataBroker(data)
     breaks_str2 = "Breaks Broker vs Contract %s" % str(
-        data_broker.get_list_of_breaks_between_broker_and_db_contract_positions())
+        positions_to_reconcile.list_of_breaks_between_broker_and_db_contract_positions())
 
     return breaks_str0 + "\n " + breaks_str1 + "\n " + breaks_str2
 
@@ -155,23 +222,15 @@ tradesData = namedtuple(
 def get_recent_trades_from_db(data):
     data_orders = dataOrders(data)
     start_date = datetime.datetime.now() - datetime.timedelta(days=1)
-    order_id_list = data_orders.get_historic_broker_orders_in_date_range(
+    list_of_orders = data_orders.get_list_of_historic_broker_orders_in_date_range(
         start_date)
-    orders_as_list = [get_tuple_object_from_order_id(
-        data, order_id) for order_id in order_id_list]
+    orders_as_list = [transfer_object_attributes(
+        tradesData, order) for order in list_of_orders]
     pdf = make_df_from_list_of_named_tuple(tradesData, orders_as_list)
 
     return pdf
 
 
-def get_tuple_object_from_order_id(data, order_id):
-    data_orders = dataOrders(data)
-    order = data_orders.get_historic_broker_order_from_order_id(order_id)
-    tuple_object = transfer_object_attributes(tradesData, order)
-
-    return tuple_object
-
-
 def get_broker_trades(data):
     data_broker = dataBroker(data)
     list_of_orders = data_broker.get_list_of_orders()
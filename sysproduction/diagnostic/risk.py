@@ -12,10 +12,11 @@ from sysproduction.data.capital import dataCapital
 from sysproduction.data.instruments import diagInstruments
 from sysproduction.data.prices import diagPrices
 
+from sysproduction.data.currency_data import dataCurrency
 
+# A snapshot older than this is rebuilt, so intraday reports pick up new prices and positions
+MAX_AGE_OF_RISK_SNAPSHOT = datetime.timedelta(minutes=30)
 
-# FIX ME A VERY INEFFICIENT REPORT THAT COULD REALLY DO WITH SOME CACHING...
-# BUT THEN MAYBE CACHING SHOULD BE INTRODUCED MORE GENERALLY AT SYSPRODUCTION_DATA LEVEL?
 # ALSO, WHY DO WE GET POSITIONS FOR WHICH THE CURRENT POSITION IS ZERO?
 
 def risk_report(data):
@@ -80,120 +81,367 @@ def format_risk_report(results_dict):
     return formatted_output
 
 
-def get_instrument_risk_table(data):
-    ## INSTRUMENT RISK (daily %, annual %, return space daily and annual, base currency per contract daily and annual, positions)
-    instrument_list = get_instruments_with_positions_all_strategies(data)
-    risk_data_list = dict([(instrument_code, get_risk_data_for_instrument(data, instrument_code))
-                           for instrument_code in instrument_list])
-    risk_df = pd.DataFrame(risk_data_list)
-    risk_df = sorted_clean_df(risk_df, 'annual_risk_perc_capital')
+def get_risk_snapshot(data):
+    """
+    Returns a riskSnapshot, reusing the one stored on the data blob unless it is stale
 
-    return risk_df
+    :param data: data Blob
+    :return: riskSnapshot
+    """
+    risk_snapshot = getattr(data, "risk_snapshot", None)
+    if risk_snapshot is not None:
+        if risk_snapshot.age < MAX_AGE_OF_RISK_SNAPSHOT:
+            return risk_snapshot
 
-def get_risk_data_for_instrument(data, instrument_code):
-    daily_price_stdev = get_current_daily_stdev_for_instrument(data, instrument_code)
-    annual_price_stdev= daily_price_stdev * ROOT_BDAYS_INYEAR
-    price = get_current_price_of_instrument(data, instrument_code)
-    daily_perc_stdev = 100* daily_price_stdev / price
-    annual_perc_stdev = 100* annual_price_stdev / price
-    point_size_base = get_base_currency_point_size_per_contract(data, instrument_code)
-    contract_exposure = point_size_base * price
-    daily_risk_per_contract = daily_price_stdev * point_size_base
-    annual_risk_per_contract = annual_price_stdev * point_size_base
-    position = get_current_position_for_instrument_code_across_strategies(data, instrument_code)
-    capital = total_capital(data)
-    exposure_held_perc_capital = 100* position * contract_exposure / capital
-    annual_risk_perc_capital = 100* annual_risk_per_contract * position / capital
-
-    return dict(daily_price_stdev = daily_price_stdev,
+    risk_snapshot = riskSnapshot(data)
+    data.risk_snapshot = risk_snapshot
+
+    return risk_snapshot
+
+
+class riskSnapshot(object):
+    """
+    Current prices, volatilities, correlations, exposures and risk
+
+    Positions and capital are read once, adjusted prices and FX rates once per instrument
+    and currency, and everything else is calculated across instruments at once from the
+    resulting price panel
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._timestamp = datetime.datetime.now()
+
+        self._price_series = {}
+        self._daily_price_series = {}
+        self._current_daily_stdev = {}
+        self._point_size_base = {}
+        self._fx_rate_to_base = {}
+        self._capital_for_strategy = {}
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def age(self) -> datetime.timedelta:
+        return datetime.datetime.now() - self._timestamp
+
+    def instrument_risk_table(self) -> pd.DataFrame:
+        instrument_list = self.instrument_list
+        daily_price_stdev = self.current_daily_stdev(instrument_list)
+        annual_price_stdev = daily_price_stdev * ROOT_BDAYS_INYEAR
+        price = self.current_price(instrument_list)
+        point_size_base = self.point_size_base(instrument_list)
+        contract_exposure = point_size_base * price
+        annual_risk_per_contract = annual_price_stdev * point_size_base
+        position = self.position_across_strategies(instrument_list)
+        capital = self.total_capital
+
+        risk_df = pd.DataFrame(dict(daily_price_stdev = daily_price_stdev,
                 annual_price_stdev = annual_price_stdev,
                 price = price,
-                daily_perc_stdev = daily_perc_stdev,
-                annual_perc_stdev = annual_perc_stdev,
+                daily_perc_stdev = 100 * daily_price_stdev / price,
+                annual_perc_stdev = 100 * annual_price_stdev / price,
                 point_size_base = point_size_base,
                 contract_exposure = contract_exposure,
-                daily_risk_per_contract= daily_risk_per_contract,
+                daily_risk_per_contract = daily_price_stdev * point_size_base,
                 annual_risk_per_contract = annual_risk_per_contract,
                 position = position,
                 capital = capital,
-                exposure_held_perc_capital = exposure_held_perc_capital,
-                annual_risk_perc_capital = annual_risk_perc_capital)
+                exposure_held_perc_capital = 100 * position * contract_exposure / capital,
+                annual_risk_perc_capital = 100 * annual_risk_per_contract * position / capital),
+                               index = instrument_list)
+
+        risk_df = risk_df.dropna()
+        risk_df = risk_df.sort_values('annual_risk_perc_capital')
+
+        return risk_df
+
+    def risk_data_for_instrument(self, instrument_code: str) -> dict:
+        daily_price_stdev = self.current_daily_stdev([instrument_code])[instrument_code]
+        annual_price_stdev= daily_price_stdev * ROOT_BDAYS_INYEAR
+        price = self.current_price([instrument_code])[instrument_code]
+        point_size_base = self.point_size_base([instrument_code])[instrument_code]
+        contract_exposure = point_size_base * price
+        annual_risk_per_contract = annual_price_stdev * point_size_base
+        position = self.position_across_strategies([instrument_code])[instrument_code]
+        capital = self.total_capital
+
+        return dict(daily_price_stdev = daily_price_stdev,
+                    annual_price_stdev = annual_price_stdev,
+                    price = price,
+                    daily_perc_stdev = 100* daily_price_stdev / price,
+                    annual_perc_stdev = 100* annual_price_stdev / price,
+                    point_size_base = point_size_base,
+                    contract_exposure = contract_exposure,
+                    daily_risk_per_contract = daily_price_stdev * point_size_base,
+                    annual_risk_per_contract = annual_risk_per_contract,
+                    position = position,
+                    capital = capital,
+                    exposure_held_perc_capital = 100* position * contract_exposure / capital,
+                    annual_risk_perc_capital = 100* annual_risk_per_contract * position / capital)
+
+    def portfolio_risk_for_all_strategies(self) -> float:
+        instrument_list = self.instrument_list
+        weights = self.exposure_per_contract(instrument_list) * \
+            self.position_across_strategies(instrument_list) / self.total_capital
+
+        return self.portfolio_risk_given_weights(weights)
+
+    def portfolio_risk_for_strategy(self, strategy_name: str) -> float:
+        instrument_list = self.instruments_for_strategy(strategy_name)
+        weights = self.exposure_per_contract(instrument_list) * \
+            self.positions[strategy_name].reindex(instrument_list) / \
+            self.capital_for_strategy(strategy_name)
+
+        return self.portfolio_risk_given_weights(weights)
+
+    def portfolio_risk_across_strategies(self) -> pd.DataFrame:
+        risk_across_strategies = pd.Series(
+            [self.portfolio_risk_for_strategy(strategy_name)
+             for strategy_name in self.strategy_list],
+            index=self.strategy_list)
+
+        df_of_capital_risk = pd.DataFrame(dict(risk = risk_across_strategies))
+        df_of_capital_risk = df_of_capital_risk.dropna()
+        df_of_capital_risk = df_of_capital_risk.sort_values('risk')
+
+        return df_of_capital_risk
+
+    def annualised_perc_of_capital_risk_across_strategies(self) -> pd.DataFrame:
+        instrument_list = self.instrument_list
+        perc_of_capital_risk = self.exposure_per_contract(instrument_list) * \
+            self.annualised_perc_stdev(instrument_list) * \
+            self.position_across_strategies(instrument_list) / self.total_capital
+
+        df_of_capital_risk = pd.DataFrame(dict(risk = perc_of_capital_risk))
+        df_of_capital_risk = df_of_capital_risk.dropna()
+        df_of_capital_risk = df_of_capital_risk.sort_values('risk')
+
+        return df_of_capital_risk
+
+    def portfolio_risk_given_weights(self, weights: pd.Series) -> float:
+        instrument_list = list(weights.index)
+        cmatrix = self.correlation_matrix(instrument_list)
+        std_dev = self.annualised_perc_stdev(instrument_list)
+
+        return get_annualised_risk_given_inputs(std_dev.values, cmatrix.values, weights.values)
+
+    def correlation_matrix(self, instrument_list: list) -> pd.DataFrame:
+        perc_returns = self.daily_perc_returns_panel(instrument_list)
+
+        # daily use last 6 months
+        perc_returns = perc_returns[-128:]
+        price_corr = perc_returns.corr()
+
+        return price_corr
+
+    def annualised_perc_stdev(self, instrument_list: list) -> pd.Series:
+        return self.current_daily_stdev(instrument_list) * ROOT_BDAYS_INYEAR / \
+            self.current_price(instrument_list)
+
+    def current_daily_stdev(self, instrument_list: list) -> pd.Series:
+        missing_instruments = [instrument_code for instrument_code in instrument_list
+                               if instrument_code not in self._current_daily_stdev]
+        if len(missing_instruments)>0:
+            self._current_daily_stdev.update(
+                self._calculate_current_daily_stdev(missing_instruments).to_dict())
+
+        return pd.Series([self._current_daily_stdev[instrument_code]
+                          for instrument_code in instrument_list],
+                         index=instrument_list, dtype=float)
+
+    def _calculate_current_daily_stdev(self, instrument_list: list) -> pd.Series:
+        daily_prices = self.daily_price_panel(instrument_list)
+        daily_std = daily_prices.diff().rolling(30, min_periods=2).std()
+
+        # each instrument's latest value, ignoring dates after its own last price
+        before_last_price = daily_prices.bfill().notna()
+        daily_std = daily_std.where(before_last_price).ffill()
+        if len(daily_std) == 0:
+            return pd.Series(np.nan, index=instrument_list)
+
+        return daily_std.iloc[-1]
+
+    def daily_perc_returns_panel(self, instrument_list: list) -> pd.DataFrame:
+        daily_prices = self.daily_price_panel(instrument_list)
+
+        return daily_prices.diff() / daily_prices
+
+    def daily_price_panel(self, instrument_list: list) -> pd.DataFrame:
+        daily_prices = dict([(instrument_code, self.daily_price_series(instrument_code))
+                             for instrument_code in instrument_list])
+        daily_prices = dict([(instrument_code, price_series)
+                             for instrument_code, price_series in daily_prices.items()
+                             if len(price_series)>0])
+        daily_price_panel = pd.DataFrame(daily_prices, columns=instrument_list, dtype=float)
 
-def get_portfolio_risk_for_all_strategies(data):
-    ## TOTAL PORTFOLIO RISK
-    instrument_list = get_instruments_with_positions_all_strategies(data)
-    weights = [
-        get_perc_of_capital_position_size_for_instrument_across_strategies(data, instrument_code)
-        for instrument_code in instrument_list]
-
-    cmatrix = get_correlation_matrix(data, instrument_list)
-    std_dev = get_list_of_annualised_stdev_of_instruments(data, instrument_list)
+        return daily_price_panel
 
-    risk = get_annualised_risk_given_inputs(std_dev, cmatrix, weights)
+    def daily_price_series(self, instrument_code: str) -> pd.Series:
+        daily_prices = self._daily_price_series.get(instrument_code, None)
+        if daily_prices is None:
+            price_series = self.price_series(instrument_code)
+            if len(price_series)==0:
+                daily_prices = price_series
+            else:
+                daily_prices = price_series.resample("1B").last()
+            self._daily_price_series[instrument_code] = daily_prices
 
-    return risk
+        return daily_prices
 
-def get_portfolio_risk_across_strategies(data):
-    ## PORTFOLIO RISK PER STRATEGY
-    diag_positions = diagPositions(data)
-    strategy_list = diag_positions.get_list_of_strategies_with_positions()
-    risk_across_strategies = dict([(strategy_name, get_portfolio_risk_for_strategy(data, strategy_name))
-                  for strategy_name in strategy_list])
+    def current_price(self, instrument_list: list) -> pd.Series:
+        current_price = [_last_value_or_nan(self.price_series(instrument_code))
+                         for instrument_code in instrument_list]
 
-    df_of_capital_risk = pd.DataFrame(risk_across_strategies, index=['risk'])
+        return pd.Series(current_price, index=instrument_list, dtype=float)
 
-    df_of_capital_risk = sorted_clean_df(df_of_capital_risk, sortby='risk')
+    def price_series(self, instrument_code: str) -> pd.Series:
+        price_series = self._price_series.get(instrument_code, None)
+        if price_series is None:
+            price_series = get_price_series(self.data, instrument_code)
+            self._price_series[instrument_code] = price_series
 
-    return df_of_capital_risk
+        return price_series
 
+    def exposure_per_contract(self, instrument_list: list) -> pd.Series:
+        return self.point_size_base(instrument_list) * self.current_price(instrument_list)
+
+    def point_size_base(self, instrument_list: list) -> pd.Series:
+        point_size_base = [self._point_size_base_for_instrument(instrument_code)
+                           for instrument_code in instrument_list]
+
+        return pd.Series(point_size_base, index=instrument_list, dtype=float)
+
+    def _point_size_base_for_instrument(self, instrument_code: str) -> float:
+        point_size_base = self._point_size_base.get(instrument_code, None)
+        if point_size_base is None:
+            diag_instruments = diagInstruments(self.data)
+            meta_data = diag_instruments.get_meta_data(instrument_code)
+            point_size_base = meta_data.Pointsize * self._fx_rate_for_currency(meta_data.Currency)
+            self._point_size_base[instrument_code] = point_size_base
+
+        return point_size_base
+
+    def _fx_rate_for_currency(self, currency: str) -> float:
+        fx_rate = self._fx_rate_to_base.get(currency, None)
+        if fx_rate is None:
+            currency_data = dataCurrency(self.data)
+            fx_rate = currency_data.get_last_fx_rate_to_base(currency)
+            self._fx_rate_to_base[currency] = fx_rate
+
+        return fx_rate
+
+    def position_across_strategies(self, instrument_list: list) -> pd.Series:
+        positions = self.positions.sum(axis=1)
+
+        return positions.reindex(instrument_list, fill_value=0)
+
+    def instruments_for_strategy(self, strategy_name: str) -> list:
+        positions = self.positions[strategy_name]
+
+        return list(positions[positions != 0].index)
+
+    @property
+    def strategy_list(self) -> list:
+        return list(self.positions.columns)
+
+    @property
+    def positions(self) -> pd.DataFrame:
+        """
+        Current non zero positions, index instrument codes, columns strategy names
+        """
+        positions = getattr(self, "_positions", None)
+        if positions is None:
+            diag_positions = diagPositions(self.data)
+            all_positions = diag_positions.get_all_current_strategy_instrument_positions()
+            positions = all_positions.as_pd_df()
+            if len(positions) == 0:
+                positions = pd.DataFrame()
+            else:
+                positions = positions.pivot_table(index="instrument_code",
+                                                  columns="strategy_name",
+                                                  values="position",
+                                                  aggfunc="sum",
+                                                  fill_value=0)
+            self._positions = positions
+
+        return positions
+
+    @property
+    def instrument_list(self) -> list:
+        instrument_list = getattr(self, "_instrument_list", None)
+        if instrument_list is None:
+            diag_positions = diagPositions(self.data)
+            instrument_list = diag_positions.get_list_of_instruments_with_current_positions()
+            self._instrument_list = instrument_list
+
+        return instrument_list
+
+    @property
+    def total_capital(self) -> float:
+        total_capital = getattr(self, "_total_capital", None)
+        if total_capital is None:
+            data_capital = dataCapital(self.data)
+            total_capital = data_capital.get_current_total_capital()
+            self._total_capital = total_capital
+
+        return total_capital
+
+    def capital_for_strategy(self, strategy_name: str) -> float:
+        capital = self._capital_for_strategy.get(strategy_name, None)
+        if capital is None:
+            data_capital = dataCapital(self.data)
+            capital = data_capital.get_capital_for_strategy(
+                strategy_name)
+            if capital is missing_data:
+                capital = 0.00001
+            self._capital_for_strategy[strategy_name] = capital
+
+        return capital
+
+
+def _last_value_or_nan(price_series: pd.Series) -> float:
+    if len(price_series)==0:
+        return np.nan
 
-def get_df_annualised_risk_as_perc_of_capital_per_instrument_across_strategies(data):
-    ## RISK PER INSTRUMENT
-    ## EQUAL TO ANNUALISED INSTRUMENT RISK PER CONTRACT IN BASE CCY MULTIPLIED BY POSITIONS HELD / CAPITAL
-    instrument_list = get_instruments_with_positions_all_strategies(data)
+    return price_series.values[-1]
 
-    perc_of_capital_risk_of_positions_held = dict([(instrument_code,
-                get_annualised_perc_of_capital_risk_of_positions_held_for_instruments_across_strategies(data, instrument_code))
-        for instrument_code in instrument_list
-                ])
 
-    df_of_capital_risk = pd.DataFrame(perc_of_capital_risk_of_positions_held, index=['risk'])
-    df_of_capital_risk = sorted_clean_df(df_of_capital_risk, sortby='risk')
+def get_instrument_risk_table(data):
+    ## INSTRUMENT RISK (daily %, annual %, return space daily and annual, base currency per contract daily and annual, positions)
+    return get_risk_snapshot(data).instrument_risk_table()
 
-    return df_of_capital_risk
 
-def sorted_clean_df(df_of_risk, sortby='risk'):
-    df_of_risk = df_of_risk.transpose()
-    df_of_risk = df_of_risk.dropna()
-    df_of_risk = df_of_risk.sort_values(sortby)
+def get_risk_data_for_instrument(data, instrument_code):
+    return get_risk_snapshot(data).risk_data_for_instrument(instrument_code)
 
-    return df_of_risk
 
-def get_annualised_perc_of_capital_risk_of_positions_held_for_instruments_across_strategies(data, instrument_code):
-    capital_base_fx = total_capital(data)
-    base_currency_risk = get_base_currency_risk_held_for_instrument_across_strategies(data, instrument_code)
+def get_portfolio_risk_for_all_strategies(data):
+    ## TOTAL PORTFOLIO RISK
+    return get_risk_snapshot(data).portfolio_risk_for_all_strategies()
 
-    perc_of_capital_risk = base_currency_risk / capital_base_fx
 
-    return perc_of_capital_risk
+def get_portfolio_risk_across_strategies(data):
+    ## PORTFOLIO RISK PER STRATEGY
+    return get_risk_snapshot(data).portfolio_risk_across_strategies()
 
 
-def get_portfolio_risk_for_strategy(data, strategy_name):
-    instrument_list = get_instruments_with_positions(data, strategy_name)
-    weights = [
-        get_perc_of_capital_position_size_for_instrument(data, strategy_name, instrument_code)
-        for instrument_code in instrument_list]
+def get_df_annualised_risk_as_perc_of_capital_per_instrument_across_strategies(data):
+    ## RISK PER INSTRUMENT
+    ## EQUAL TO ANNUALISED INSTRUMENT RISK PER CONTRACT IN BASE CCY MULTIPLIED BY POSITIONS HELD / CAPITAL
+    return get_risk_snapshot(data).annualised_perc_of_capital_risk_across_strategies()
 
-    cmatrix = get_correlation_matrix(data, instrument_list)
-    std_dev = get_list_of_annualised_stdev_of_instruments(data, instrument_list)
 
-    risk = get_annualised_risk_given_inputs(std_dev, cmatrix, weights)
+def get_portfolio_risk_for_strategy(data, strategy_name):
+    return get_risk_snapshot(data).portfolio_risk_for_strategy(strategy_name)
 
-    return risk
 
 def get_annualised_risk_given_inputs(std_dev, cmatrix, weights):
-    weights = np.array(weights)
-    std_dev = np.array(std_dev)
+    weights = np.array(weights, dtype=float)
+    std_dev = np.array(std_dev, dtype=float)
+    cmatrix = np.array(cmatrix, dtype=float)
     std_dev, cmatrix, weights = clean_values(std_dev, cmatrix, weights)
     sigma = sigma_from_corr_and_std(std_dev, cmatrix)
 
@@ -210,44 +458,19 @@ def clean_values(std_dev, cmatrix, weights):
     return std_dev, cmatrix, weights
 
 def get_correlation_matrix_all_instruments(data):
-    instrument_list = get_instruments_with_positions_all_strategies(data)
-    cmatrix = get_correlation_matrix(data, instrument_list)
+    risk_snapshot = get_risk_snapshot(data)
 
-    return cmatrix
+    return risk_snapshot.correlation_matrix(risk_snapshot.instrument_list)
 
 def get_correlation_matrix(data, instrument_list):
-    perc_returns = dict([(instrument_code, get_daily_perc_returns(data, instrument_code))
-                for instrument_code in instrument_list])
-    price_df = pd.DataFrame(perc_returns)
-
-    # daily use last 6 months
-    price_df = price_df[-128:]
-    price_corr = price_df.corr()
-
-    return price_corr
+    return get_risk_snapshot(data).correlation_matrix(instrument_list)
 
 
-def get_list_of_annualised_stdev_of_instruments(data, instrument_list):
-    stdev_list = [get_current_annualised_perc_stdev_for_instrument(data, instrument_code)
-                  for instrument_code in instrument_list]
-    return stdev_list
-
 def get_current_annualised_perc_stdev_for_instrument(data, instrument_code):
-    price = get_current_price_of_instrument(data, instrument_code)
-    stdev_price = get_current_annualised_stdev_for_instrument(data, instrument_code)
-
-    return stdev_price / price
+    return get_risk_snapshot(data).annualised_perc_stdev([instrument_code])[instrument_code]
 
 def get_current_daily_stdev_for_instrument(data, instrument_code):
-    rolling_daily_vol = get_daily_ts_stdev_of_adjusted_prices(data,
-        instrument_code
-    )
-    if len(rolling_daily_vol) == 0:
-        last_daily_vol = np.nan
-    else:
-        last_daily_vol = rolling_daily_vol.ffill().values[-1]
-
-    return last_daily_vol
+    return get_risk_snapshot(data).current_daily_stdev([instrument_code])[instrument_code]
 
 def get_current_annualised_stdev_for_instrument(data, instrument_code):
     last_daily_vol = get_current_daily_stdev_for_instrument(data, instrument_code)
@@ -256,163 +479,8 @@ def get_current_annualised_stdev_for_instrument(data, instrument_code):
     return last_annual_vol
 
 
-def get_daily_ts_stdev_of_adjusted_prices(data, instrument_code):
-    daily_returns = get_daily_returns(data, instrument_code)
-    daily_std = daily_returns.rolling(30, min_periods=2).std()
-
-    return daily_std
-
-
-def get_list_of_positions_for_strategy_as_perc_of_capital(data, strategy_name):
-    instrument_list = get_instruments_with_positions(data, strategy_name)
-    positions_as_perc_of_capital = [
-        get_perc_of_capital_position_size_for_instrument(data, strategy_name, instrument_code)
-        for instrument_code in instrument_list]
-    for instrument_code in instrument_list:
-        get_perc_of_capital_position_size_for_instrument(data, strategy_name, instrument_code)
-
-    return positions_as_perc_of_capital
-
-def get_instruments_with_positions(data, strategy_name):
-    diag_positions = diagPositions(data)
-    instrument_list = diag_positions.get_list_of_instruments_for_strategy_with_position(strategy_name)
-
-    return instrument_list
-
-def get_instruments_with_positions_all_strategies(data):
-    diag_positions = diagPositions(data)
-    instrument_list = diag_positions.get_list_of_instruments_with_current_positions()
-    return instrument_list
-
-def get_perc_of_capital_position_size_for_instrument(
-    data, strategy_name, instrument_code
-):
-    capital_base_fx = capital_for_strategy(data, strategy_name)
-    exposure_base_fx = get_notional_exposure_in_base_currency_for_instrument(data, strategy_name, instrument_code)
-
-    return exposure_base_fx / capital_base_fx
-
-def get_perc_of_capital_position_size_for_instrument_across_strategies(
-    data,  instrument_code
-):
-    capital_base_fx = total_capital(data)
-    exposure_base_fx = get_notional_exposure_in_base_currency_for_instrument_across_strategies(data, instrument_code)
-
-    return exposure_base_fx / capital_base_fx
-
-
-def capital_for_strategy(data, strategy_name):
-    data_capital = dataCapital(data)
-    capital = data_capital.get_capital_for_strategy(
-        strategy_name)
-    if capital is missing_data:
-        return 0.00001
-
-    return capital
-
-def total_capital(data):
-    data_capital = dataCapital(data)
-    total_capital = data_capital.get_current_total_capital()
-
-    return total_capital
-
-def get_notional_exposure_in_base_currency_for_instrument(
-    data, strategy_name, instrument_code
-):
-
-    exposure_per_contract = get_exposure_per_contract_base_currency(
-        data, instrument_code)
-    position = get_current_position_for_instrument_code(
-        data, strategy_name, instrument_code
-    )
-
-    return exposure_per_contract * position
-
-def get_notional_exposure_in_base_currency_for_instrument_across_strategies(
-    data, instrument_code
-):
-
-    exposure_per_contract = get_exposure_per_contract_base_currency(
-        data, instrument_code)
-    position = get_current_position_for_instrument_code_across_strategies(
-        data, instrument_code
-    )
-
-    return exposure_per_contract * position
-
-def get_base_currency_risk_held_for_instrument_across_strategies(data, instrument_code):
-    risk = get_base_currency_risk_per_lot_for_instrument(data, instrument_code)
-    position = get_current_position_for_instrument_code_across_strategies(data, instrument_code)
-
-    return risk*position
-
-def get_base_currency_risk_per_lot_for_instrument(data, instrument_code):
-    exposure_per_lot = get_exposure_per_contract_base_currency(data, instrument_code)
-    annual_perc_stdev = get_current_annualised_perc_stdev_for_instrument(data, instrument_code)
-
-    annual_base_currency_risk = exposure_per_lot * annual_perc_stdev
-
-    return annual_base_currency_risk
-
-def get_current_position_for_instrument_code(
-        data, strategy_name, instrument_code):
-    diag_positions = diagPositions(data)
-    current_position = diag_positions.get_current_position_for_strategy_and_instrument(
-        strategy_name, instrument_code
-    )
-
-    return current_position
-
-def get_current_position_for_instrument_code_across_strategies(data, instrument_code):
-    diag_positions = diagPositions(data)
-    position = diag_positions.get_current_instrument_position_across_strategies(instrument_code)
-
-    return position
-
-def get_exposure_per_contract_base_currency(data, instrument_code):
-    point_size_base_currency = get_base_currency_point_size_per_contract(data, instrument_code)
-    price = get_current_price_of_instrument(data, instrument_code)
-
-    return point_size_base_currency * price
-
-def get_base_currency_point_size_per_contract(data, instrument_code):
-    diag_instruments = diagInstruments(data)
-    point_size_base_currency = diag_instruments.get_point_size_base_currency(instrument_code)
-
-    return point_size_base_currency
-
-def get_current_price_of_instrument(data, instrument_code):
-    price_series = get_price_series(data, instrument_code)
-    if len(price_series)==0:
-        return np.nan
-
-    current_price = price_series.values[-1]
-
-    return current_price
-
-def get_daily_perc_returns(data, instrument_code):
-    daily_returns = get_daily_returns(data, instrument_code)
-    daily_prices = get_daily_price_series(data, instrument_code)
-
-    return daily_returns / daily_prices
-
-def get_daily_returns(data, instrument_code):
-    daily_prices = get_daily_price_series(data, instrument_code)
-    daily_returns = daily_prices.diff()
-
-    return daily_returns
-
-def get_daily_price_series(data, instrument_code):
-    price_series = get_price_series(data, instrument_code)
-    if len(price_series)==0:
-        return price_series
-
-    daily_prices = price_series.resample("1B").last()
-
-    return daily_prices
-
 def get_price_series(data, instrument_code):
     diag_prices = diagPrices(data)
     price_series = diag_prices.get_adjusted_prices(instrument_code)
 
-    return price_series
\ No newline at end of file
+    return price_series
@@ -27,6 +27,7 @@ from sysproduction.data.prices import get_list_of_instruments
 from sysproduction.data.currency_data import get_list_of_fxcodes, dataCurrency
 from sysproduction.data.prices import diagPrices
 from sysproduction.data.positions import  dataOptimalPositions
+from sysobjects.production.process_control import controlProcess, dictOfControlProcesses
 
 
 
@@ -47,12 +48,13 @@ def system_status(data=arg_not_supplied):
 
 
 def get_status_report_data(data):
+    snapshot = systemStatusSnapshot(data)
 
     process = get_control_config_list_for_all_processes_as_df(data)
-    process2 = get_control_status_list_for_all_processes_as_df(data)
-    process3 = get_process_status_list_for_all_processes_as_df(data)
+    process2 = get_control_status_list_for_all_processes_as_df(data, snapshot)
+    process3 = get_process_status_list_for_all_processes_as_df(data, snapshot)
 
-    method = get_control_data_list_for_all_methods_as_df(data)
+    method = get_control_data_list_for_all_methods_as_df(data, snapshot)
     price = get_last_price_updates_as_df(data)
     position = get_last_optimal_position_updates_as_df(data)
     limits = get_trade_limits_as_df(data)
@@ -76,6 +78,27 @@ def get_status_report_data(data):
     return results_object
 
 
+class systemStatusSnapshot(object):
+    """
+    All the process controls, read once and shared by every process and method in the report
+    """
+
+    def __init__(self, data: dataBlob):
+        self.data = data
+
+    @property
+    def dict_of_control_processes(self) -> dictOfControlProcesses:
+        dict_of_control_processes = getattr(self, "_dict_of_control_processes", None)
+        if dict_of_control_processes is None:
+            dict_of_control_processes = dataControlProcess(self.data).get_dict_of_control_processes()
+            self._dict_of_control_processes = dict_of_control_processes
+
+        return dict_of_control_processes
+
+    def get_control_for_process_name(self, process_name: str) -> controlProcess:
+        return self.dict_of_control_processes.get(process_name, controlProcess())
+
+
 def format_status_data(results_object):
     """
     Put the results into a printable format
@@ -214,8 +237,8 @@ def get_trade_limit_tuple(element):
     return tuple_object
 
 
-def get_process_status_list_for_all_processes_as_df(data):
-    all_processes, cd_list = get_process_status_list_for_all_processes(data)
+def get_process_status_list_for_all_processes_as_df(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    all_processes, cd_list = get_process_status_list_for_all_processes(data, snapshot)
     pdf = pd.DataFrame(cd_list)
     pdf.index = all_processes
 
@@ -228,22 +251,23 @@ def get_control_config_list_for_all_processes_as_df(data):
 
     return pdf
 
-def get_control_status_list_for_all_processes_as_df(data):
-    dc = dataControlProcess(data)
-    dict_of_controls = dc.get_dict_of_control_processes()
+def get_control_status_list_for_all_processes_as_df(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    if snapshot is arg_not_supplied:
+        snapshot = systemStatusSnapshot(data)
+    dict_of_controls = snapshot.dict_of_control_processes
     pdf = dict_of_controls.as_pd_df()
 
     return pdf
 
 
-def get_control_data_list_for_all_methods_as_df(data):
-    cd_list = get_control_data_list_for_all_methods(data)
+def get_control_data_list_for_all_methods_as_df(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    cd_list = get_control_data_list_for_all_methods(data, snapshot)
     pdf = make_df_from_list_of_named_tuple(dataForMethod, cd_list)
     pdf = pdf.sort_values("last_start")
     return pdf
 
-def get_control_status_list_for_all_methods_as_df(data):
-    cd_list = get_control_data_list_for_all_methods(data)
+def get_control_status_list_for_all_methods_as_df(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    cd_list = get_control_data_list_for_all_methods(data, snapshot)
     pdf = make_df_from_list_of_named_tuple(dataForMethod, cd_list)
     pdf = pdf.sort_values("last_start")
     return pdf
@@ -279,13 +303,16 @@ def get_list_of_last_futures_price_updates(data):
         get_last_futures_price_update_for_instrument(data, instrument_code)
         for instrument_code in list_of_instruments
     ]
+    updates = [update for update in updates if update is not None]
+
     return updates
 
 
 def get_last_futures_price_update_for_instrument(data, instrument_code):
     diag_prices = diagPrices(data)
-    px = diag_prices.get_adjusted_prices(instrument_code)
-    last_timestamp = px.index[-1]
+    last_timestamp = diag_prices.get_last_date_of_adjusted_prices(instrument_code)
+    if last_timestamp is missing_data:
+        return None
     update = genericUpdate(instrument_code, last_timestamp)
 
     return update
@@ -295,13 +322,16 @@ def get_list_of_last_fx_price_updates(data):
     list_of_codes = get_list_of_fxcodes(data)
     updates = [get_last_fx_price_update_for_code(
         data, fx_code) for fx_code in list_of_codes]
+    updates = [update for update in updates if update is not None]
+
     return updates
 
 
 def get_last_fx_price_update_for_code(data, fx_code):
     data_fx = dataCurrency(data)
-    px = data_fx.get_fx_prices(fx_code)
-    last_timestamp = px.index[-1]
+    last_timestamp = data_fx.get_last_date_of_fx_prices(fx_code)
+    if last_timestamp is missing_data:
+        return None
 
     update = genericUpdate(fx_code, last_timestamp)
 
@@ -309,47 +339,26 @@ def get_last_fx_price_update_for_code(data, fx_code):
 
 
 def get_list_of_last_position_updates(data):
+    # the date of the current optimal position is when it was last updated, so one bulk read does everything
     strategy_list = get_list_of_strategies(data)
-    list_of_updates = []
-    for strategy_name in strategy_list:
-        updates_for_strategy = get_list_of_position_updates_for_strategy(
-            data, strategy_name
-        )
-        list_of_updates = list_of_updates + updates_for_strategy
-
-    return list_of_updates
-
-
-def get_list_of_position_updates_for_strategy(data, strategy_name):
     instrument_list = get_list_of_instruments(data)
-    list_of_updates = [
-        get_last_position_update_for_strategy_instrument(
-            data, strategy_name, instrument_code
-        )
-        for instrument_code in instrument_list
-    ]
+    data_optimal = dataOptimalPositions(data)
+    list_of_optimal_positions = data_optimal.get_list_of_optimal_positions()
 
     list_of_updates = [
-        update for update in list_of_updates if update is not None]
+        genericUpdate(
+            "%s/%s" % (optimal_position.instrument_strategy.strategy_name,
+                       optimal_position.instrument_strategy.instrument_code),
+            optimal_position.optimal_position.date)
+        for optimal_position in list_of_optimal_positions
+        if optimal_position.instrument_strategy.strategy_name in strategy_list
+        and optimal_position.instrument_strategy.instrument_code in instrument_list
+        and optimal_position.optimal_position is not missing_data
+    ]
 
     return list_of_updates
 
 
-def get_last_position_update_for_strategy_instrument(
-    data, strategy_name, instrument_code
-):
-    op = dataOptimalPositions(data)
-    pos_data = op.get_optimal_position_as_df_for_strategy_and_instrument(
-        strategy_name, instrument_code
-    )
-    if pos_data is missing_data:
-        return None
-    last_update = pos_data.index[-1]
-    key = "%s/%s" % (strategy_name, instrument_code)
-
-    return genericUpdate(key, last_update)
-
-
 def get_control_config_list_for_all_processes(data):
     all_processes = get_list_of_all_processes(data)
     list_of_control_data = [
@@ -359,10 +368,12 @@ def get_control_config_list_for_all_processes(data):
 
     return all_processes, list_of_control_data
 
-def get_process_status_list_for_all_processes(data):
+def get_process_status_list_for_all_processes(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    if snapshot is arg_not_supplied:
+        snapshot = systemStatusSnapshot(data)
     all_processes = get_list_of_all_processes(data)
     list_of_control_data = [
-        get_process_status_dict_for_process_name(data, process_name)
+        get_process_status_dict_for_process_name(data, process_name, snapshot)
         for process_name in all_processes
     ]
 
@@ -376,35 +387,44 @@ def get_control_config_dict_for_process_name(data, process_name):
 
     return data_for_process
 
-def get_process_status_dict_for_process_name(data, process_name):
+def get_process_status_dict_for_process_name(data, process_name,
+                                             snapshot: systemStatusSnapshot = arg_not_supplied):
+    if snapshot is arg_not_supplied:
+        snapshot = systemStatusSnapshot(data)
     diag_process_config = diagControlProcess(data)
 
-    data_for_process = diag_process_config.get_process_status_dict(process_name)
+    data_for_process = diag_process_config.get_process_status_dict(
+        process_name, dict_of_control_processes=snapshot.dict_of_control_processes)
 
     return data_for_process
 
 
-def get_control_data_list_for_all_methods(data):
+def get_control_data_list_for_all_methods(data, snapshot: systemStatusSnapshot = arg_not_supplied):
+    if snapshot is arg_not_supplied:
+        snapshot = systemStatusSnapshot(data)
     all_methods_and_processes = get_method_names_and_process_names(data)
     list_of_controls = [
-        get_control_data_for_single_ordinary_method(data, method_name_and_process)
+        get_control_data_for_single_ordinary_method(data, method_name_and_process, snapshot)
         for method_name_and_process in all_methods_and_processes
     ]
     return list_of_controls
 
 
 
-def get_control_data_for_single_ordinary_method(data, method_name_and_process):
+def get_control_data_for_single_ordinary_method(data, method_name_and_process,
+                                                snapshot: systemStatusSnapshot = arg_not_supplied):
+    if snapshot is arg_not_supplied:
+        snapshot = systemStatusSnapshot(data)
     method, process_name = method_name_and_process
-    data_control = diagControlProcess(data)
+    control_process = snapshot.get_control_for_process_name(process_name)
 
-    last_start = data_control.when_method_last_started(process_name, method)
+    last_start = control_process.when_method_last_started(method)
     last_start_as_str = last_run_or_heartbeat_from_date_or_none(last_start)
 
-    last_end = data_control.when_method_last_ended(process_name, method)
+    last_end = control_process.when_method_last_ended(method)
     last_end_as_str = last_run_or_heartbeat_from_date_or_none(last_end)
 
-    currently_running = data_control.method_currently_running(process_name, method)
+    currently_running = control_process.method_currently_running(method)
 
     data_for_method = dataForMethod(
         method_or_strategy=method,
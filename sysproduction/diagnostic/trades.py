@@ -199,25 +199,16 @@ data = dataBlob()
 
 def get_recent_broker_orders(data, start_date, end_date):
     data_orders = dataOrders(data)
-    order_id_list = data_orders.get_historic_broker_orders_in_date_range(
+    list_of_orders = data_orders.get_list_of_historic_broker_orders_in_date_range_with_execution_data(
         start_date, end_date
     )
-    orders_as_list = [get_tuple_object_from_order_id(
-        data, order_id) for order_id in order_id_list]
+    orders_as_list = [transfer_object_attributes(
+        tradesData, order) for order in list_of_orders]
     pdf = make_df_from_list_of_named_tuple(tradesData, orders_as_list)
 
     return pdf
 
 
-def get_tuple_object_from_order_id(data, order_id):
-    data_orders = dataOrders(data)
-    order = data_orders.get_historic_broker_order_from_order_id_with_execution_data(
-        order_id)
-    tuple_object = transfer_object_attributes(tradesData, order)
-
-    return tuple_object
-
-
 def create_delay_df(broker_orders):
     delay_data_as_list = [
         delay_row(
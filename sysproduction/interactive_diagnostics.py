@@ -7,7 +7,6 @@ from syscore.genutils import (
 )
 from syscore.pdutils import set_pd_print_options
 from syscore.objects import user_exit, arg_not_supplied
-from sysexecution.orders.list_of_orders import listOfOrders
 
 from sysdata.data_blob import dataBlob
 
@@ -441,8 +440,7 @@ def actual_contract_position(data):
 def list_of_instrument_orders(data):
     order_pd = get_order_pd(
         data,
-        list_method="get_historic_instrument_orders_in_date_range",
-        getter_method="get_historic_instrument_order_from_order_id",
+        df_method="get_historic_instrument_orders_in_date_range_as_df",
     )
     print(order_pd)
     return None
@@ -450,20 +448,15 @@ def list_of_instrument_orders(data):
 
 def get_order_pd(
     data,
-    list_method="get_historic_instrument_orders_in_date_range",
-    getter_method="get_historic_instrument_order_from_order_id",
+    df_method="get_historic_instrument_orders_in_date_range_as_df",
 ):
     start_date = get_datetime_input("Start Date", allow_default=True)
     end_date = get_datetime_input("End Date", allow_default=True)
 
     data_orders = dataOrders(data)
-    list_func = getattr(data_orders, list_method)
-    getter_func = getattr(data_orders, getter_method)
+    df_func = getattr(data_orders, df_method)
 
-    order_id_list = list_func(start_date, end_date)
-    order_list = [getter_func(id) for id in order_id_list]
-    order_list_object = listOfOrders(order_list)
-    order_pd = order_list_object.as_pd()
+    order_pd = df_func(start_date, end_date)
 
     return order_pd
 
@@ -471,8 +464,7 @@ def get_order_pd(
 def list_of_contract_orders(data):
     order_pd = get_order_pd(
         data,
-        list_method="get_historic_contract_orders_in_date_range",
-        getter_method="get_historic_contract_order_from_order_id",
+        df_method="get_historic_contract_orders_in_date_range_as_df",
     )
     print(order_pd)
     return None
@@ -481,8 +473,7 @@ def list_of_contract_orders(data):
 def list_of_broker_orders(data):
     order_pd = get_order_pd(
         data,
-        list_method="get_historic_broker_orders_in_date_range",
-        getter_method="get_historic_broker_order_from_order_id",
+        df_method="get_historic_broker_orders_in_date_range_as_df",
     )
     print(order_pd)
     return None
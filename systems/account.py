@@ -2,7 +2,12 @@ from copy import copy
 import pandas as pd
 import numpy as np
 
-from syscore.accounting import accountCurve, accountCurveGroup, weighted
+from syscore.accounting import (
+    accountCurve,
+    accountCurveGroup,
+    weighted,
+    account_curves_from_panel,
+)
 from systems.basesystem import ALL_KEYNAME
 from systems.defaults import get_default_config_key_value
 from systems.system_cache import input, dont_cache, diagnostic, output
@@ -11,7 +16,7 @@ from systems.accounts_inputs import _AccountInput
 from syscore.algos import apply_buffer
 from syscore.genutils import  str2Bool
 from syscore.dateutils import ROOT_BDAYS_INYEAR
-from syscore.pdutils import turnover
+from syscore.pdutils import turnover, index_is_contiguous_slice_of
 from syscore.objects import resolve_function
 
 
@@ -19,6 +24,13 @@ from syscore.objects import resolve_function
 ARBITRARY_FORECAST_CAPITAL = 100.0
 
 
+def _repeat_series_as_panel(pd_series, column_names):
+    panel = pd.concat([pd_series] * len(column_names), axis=1)
+    panel.columns = column_names
+
+    return panel
+
+
 class _AccountCosts(_AccountInput):
     """
     Partial SystemStage for accounting
@@ -406,6 +418,13 @@ class _AccountInstrumentForecast(_AccountCosts):
 
         """
 
+        if rule_variation_name in self.get_trading_rule_list(instrument_code):
+            # calculated for all rules at once, much quicker
+            all_pandl_fcast = self._pandl_for_all_instrument_forecasts(
+                instrument_code, delayfill=delayfill
+            )
+            return all_pandl_fcast[rule_variation_name]
+
         self.log.msg(
             "Calculating pandl for instrument forecast for %s %s"
             % (instrument_code, rule_variation_name),
@@ -442,6 +461,77 @@ class _AccountInstrumentForecast(_AccountCosts):
 
         return pandl_fcast
 
+    @diagnostic(not_pickable=True)
+    def _pandl_for_all_instrument_forecasts(
+            self, instrument_code, delayfill=True):
+        """
+        Get the p&l for one instrument and all its forecasts, in one
+        vectorised pass; as % of arbitrary capital
+
+        :param instrument_code: instrument to get values for
+        :type instrument_code: str
+
+        :param delayfill: Lag fills by one day
+        :type delayfill: bool
+
+        :returns: dict of accountCurve, keys are rule variation names
+        """
+
+        self.log.msg(
+            "Calculating pandl for all forecasts for %s" % instrument_code,
+            instrument_code=instrument_code,
+        )
+
+        rule_list = self.get_trading_rule_list(instrument_code)
+
+        # by construction all these things are aligned
+        price = self.get_daily_price(instrument_code)
+        get_daily_returns_volatility = self.get_daily_returns_volatility(
+            instrument_code
+        ).reindex(price.index)
+
+        forecasts = pd.concat(
+            [
+                self.get_aligned_forecast(instrument_code, rule_variation_name)
+                for rule_variation_name in rule_list
+            ],
+            axis=1,
+        )
+        forecasts.columns = rule_list
+
+        price_panel = _repeat_series_as_panel(price, rule_list)
+        vol_panel = _repeat_series_as_panel(
+            get_daily_returns_volatility, rule_list)
+
+        # We NEVER use cash costs for forecasts ...
+        SR_cost = dict(
+            [
+                (
+                    rule_variation_name,
+                    self.get_SR_cost_for_instrument_forecast(
+                        instrument_code, rule_variation_name
+                    ),
+                )
+                for rule_variation_name in rule_list
+            ]
+        )
+
+        # We use percentage returns (as no 'capital') and don't round
+        # positions
+        all_pandl_fcast = account_curves_from_panel(
+            price_panel,
+            forecast=forecasts,
+            get_daily_returns_volatility=vol_panel,
+            delayfill=delayfill,
+            roundpositions=False,
+            value_of_price_point=1.0,
+            capital=ARBITRARY_FORECAST_CAPITAL,
+            SR_cost=SR_cost,
+            cash_costs=None,
+        )
+
+        return all_pandl_fcast
+
     @diagnostic(not_pickable=True)
     def pandl_for_instrument_forecast_weighted(
         self, instrument_code, rule_variation_name, delayfill=True
@@ -588,6 +678,12 @@ class _AccountInstruments(_AccountInstrumentForecast):
         capital = self.get_notional_capital()
 
         instruments = self.get_instrument_list()
+
+        # do as many as possible in one go, which then go into the cache
+        self._calculate_pandl_for_subsystems_as_panel(
+            delayfill=delayfill, roundpositions=roundpositions
+        )
+
         pandl_across_subsys = [
             self.pandl_for_subsystem(
                 instrument_code, delayfill=delayfill, roundpositions=roundpositions
@@ -603,6 +699,123 @@ class _AccountInstruments(_AccountInstrumentForecast):
 
         return pandl
 
+    def _calculate_pandl_for_subsystems_as_panel(
+        self, delayfill=True, roundpositions=False
+    ):
+        """
+        Work out subsystem p&l for all instruments in one vectorised pass, and
+        put the results in the cache for pandl_for_subsystem
+
+        Instruments with gaps in their price index relative to the others are
+        left for pandl_for_subsystem to do one at a time
+
+        :param delayfill: Lag fills by one day
+        :type delayfill: bool
+
+        :param roundpositions: Round positions to whole contracts
+        :type roundpositions: bool
+
+        :returns: None
+        """
+        self.log.msg("Calculating pandl for all subsystems")
+
+        instruments = self.get_instrument_list()
+        all_prices = dict(
+            [
+                (instrument_code, self.get_daily_price(instrument_code))
+                for instrument_code in instruments
+            ]
+        )
+        price_panel = pd.concat(
+            [all_prices[instrument_code] for instrument_code in instruments],
+            axis=1)
+        price_panel.columns = instruments
+
+        instruments = [
+            instrument_code
+            for instrument_code in instruments
+            if index_is_contiguous_slice_of(
+                all_prices[instrument_code].index, price_panel.index
+            )
+        ]
+        if len(instruments) == 0:
+            return None
+
+        price_panel = price_panel[instruments]
+        index_dict = dict(
+            [
+                (instrument_code, all_prices[instrument_code].index)
+                for instrument_code in instruments
+            ]
+        )
+
+        positions_panel = pd.concat(
+            [
+                self.get_aligned_subsystem_position(instrument_code)
+                for instrument_code in instruments
+            ],
+            axis=1,
+        )
+        positions_panel.columns = instruments
+
+        fx_panel = pd.concat(
+            [
+                self.get_fx_rate(instrument_code).reindex(
+                    all_prices[instrument_code].index, method="ffill"
+                )
+                for instrument_code in instruments
+            ],
+            axis=1,
+        )
+        fx_panel.columns = instruments
+        fx_panel = fx_panel.reindex(price_panel.index)
+
+        value_of_price_point = pd.Series(
+            [
+                self.get_value_of_price_move(instrument_code)
+                for instrument_code in instruments
+            ],
+            index=instruments,
+        )
+
+        SR_cost = {}
+        cash_costs = {}
+        for instrument_code in instruments:
+            (instrument_SR_cost, instrument_cash_costs) = self.get_costs(
+                instrument_code
+            )
+            if instrument_SR_cost is not None:
+                instrument_SR_cost = instrument_SR_cost * self.subsystem_turnover(
+                    instrument_code
+                )
+            SR_cost[instrument_code] = instrument_SR_cost
+            cash_costs[instrument_code] = instrument_cash_costs
+
+        all_pandl = account_curves_from_panel(
+            price_panel,
+            positions=positions_panel,
+            fx=fx_panel,
+            value_of_price_point=value_of_price_point,
+            SR_cost=SR_cost,
+            cash_costs=cash_costs,
+            capital=self.get_notional_capital(),
+            ann_risk_target=self.get_ann_risk_target(),
+            delayfill=delayfill,
+            roundpositions=roundpositions,
+            index_dict=index_dict,
+        )
+
+        for instrument_code in instruments:
+            self.parent.cache.set_item_in_cache_for_call(
+                all_pandl[instrument_code],
+                self.pandl_for_subsystem,
+                self,
+                instrument_code,
+                not_pickable=True,
+                delayfill=delayfill,
+                roundpositions=roundpositions,
+            )
+
     @diagnostic(not_pickable=True)
     def pandl_for_instrument(
         self, instrument_code, delayfill=True, roundpositions=True
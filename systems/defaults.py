@@ -8,7 +8,7 @@ Order of preferences is - passed in command line to calculation method,
 """
 from syscore.fileutils import get_filename_for_package
 from syscore.objects import missing_data, arg_not_supplied
-import yaml
+from syscore.yamlutils import get_cached_yaml_file, read_yaml_file
 
 DEFAULT_FILENAME = "systems.provided.defaults.yaml"
 
@@ -19,8 +19,7 @@ def get_system_defaults():
     10.0
     """
     default_file = get_filename_for_package(DEFAULT_FILENAME)
-    with open(default_file) as file_to_parse:
-        default_dict = yaml.load(file_to_parse, Loader=yaml.FullLoader)
+    default_dict = read_yaml_file(default_file)
 
     return default_dict
 
@@ -28,15 +27,21 @@ def get_system_defaults():
 def get_default_config_key_value(key_name,
                                  system_defaults_dict=arg_not_supplied):
     if system_defaults_dict is arg_not_supplied:
-        default_config_dict = get_system_defaults()
-    else:
-        default_config_dict = system_defaults_dict
+        # avoids copying the whole dict just to get one value
+        default_file = get_filename_for_package(DEFAULT_FILENAME)
+        return get_cached_yaml_file(default_file).get(key_name, missing_data)
 
-    key_value = default_config_dict.get(key_name, missing_data)
+    key_value = system_defaults_dict.get(key_name, missing_data)
 
     return key_value
 
 
+def get_list_of_default_config_keys() -> list:
+    default_file = get_filename_for_package(DEFAULT_FILENAME)
+
+    return get_cached_yaml_file(default_file).keys()
+
+
 system_defaults = get_system_defaults()
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 from copy import copy
+from functools import partial
 
 import numpy as np
 import pandas as pd
 
-from syscore.genutils import str2Bool
+from syscore.genutils import str2Bool, map_in_process_pool
 from syscore.objects import resolve_function, update_recalc, missing_data
 from syscore.pdutils import dataframe_pad, fix_weights_vs_pdm, from_dict_of_values_to_df
 from syscore.algos import map_forecast_value
@@ -24,6 +25,12 @@ class _ForecastCombinePreCalculate(SystemStage):
     def _use_estimated_weights(self):
         return str2Bool(self.parent.config.use_forecast_weight_estimates)
 
+    @dont_cache
+    def _use_parallel_estimates(self):
+        # only worth doing in bulk if we can put the results in the cache
+        return (str2Bool(self.parent.config.parallel_forecast_estimates)
+                and self.parent.cache.are_we_caching())
+
     @input
     def get_forecast_cap(self):
         """
@@ -270,6 +277,12 @@ class _ForecastCombinePreCalculate(SystemStage):
         return forecasts
 
 
+def _optimise_weighting_function(weight_func):
+    # module level, so it can be sent to another process by _precalc_estimated_forecast_weights_and_cache
+    weight_func.optimise()
+    return weight_func
+
+
 class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
     """
     Don't use - forms part of ForecastCombine
@@ -495,11 +508,32 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
             "Calculating raw forecast weights for %s" %
             instrument_code)
 
+        weight_func = self._get_forecast_weighting_function(instrument_code)
+        weight_func.optimise()
+
+        return weight_func
+
+    @dont_cache
+    def _get_forecast_weighting_params(self):
         # Get some useful stuff from the config
         weighting_params = copy(self.parent.config.forecast_weight_estimate)
         cost_param = copy(self.parent.config.forecast_cost_estimates)
         weighting_params.update(cost_param)
 
+        return weighting_params
+
+    @dont_cache
+    def _get_forecast_weighting_function(self, instrument_code):
+        """
+        Set up the object which will estimate the forecast weights for this instrument, without optimising
+
+        :param instrument_code:
+        :type str:
+
+        :returns: object with an optimise() method, eg syscore.optimisation.GenericOptimiser
+        """
+        weighting_params = self._get_forecast_weighting_params()
+
         # which function to use for calculation
         weighting_func = resolve_function(weighting_params.pop("func"))
 
@@ -520,10 +554,82 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
             parent=self,
             **weighting_params)
 
-        weight_func.optimise()
-
         return weight_func
 
+    @dont_cache
+    def _forecast_weight_estimation_key(self, instrument_code):
+        """
+        Instruments with the same key will get the same forecast weights
+
+        That's only true if both gross returns and costs are pooled, in which case it's the set of
+         instruments with the same cheap rules; otherwise each instrument is different
+
+        :returns: str or tuple
+        """
+        weighting_params = self._get_forecast_weighting_params()
+        pool_gross_returns = str2Bool(weighting_params.get("pool_gross_returns", False))
+        use_pooled_costs = str2Bool(weighting_params.get("use_pooled_costs", False))
+
+        if pool_gross_returns and use_pooled_costs:
+            return tuple(self.has_same_cheap_rules_as_code(instrument_code))
+
+        return instrument_code
+
+    @dont_cache
+    def _precalc_estimated_forecast_weights_and_cache(self):
+        """
+        Estimate forecast weights for all instruments that aren't in the cache, running the optimisations
+         in parallel, and put the results in the cache for calculation_of_raw_estimated_forecast_weights
+
+        We only optimise once for instruments with the same _forecast_weight_estimation_key
+
+        :returns: None
+        """
+        system = self.parent
+        instruments_to_estimate = [
+            instrument_code
+            for instrument_code in system.get_instrument_list()
+            if not system.cache.item_in_cache_for_call(
+                self.calculation_of_raw_estimated_forecast_weights,
+                self,
+                instrument_code)
+        ]
+        if len(instruments_to_estimate) == 0:
+            return None
+
+        # returns are got here, in this process, as they need the rest of the system
+        weight_funcs_by_key = {}
+        estimation_keys = {}
+        for instrument_code in instruments_to_estimate:
+            estimation_key = self._forecast_weight_estimation_key(instrument_code)
+            estimation_keys[instrument_code] = estimation_key
+            if estimation_key not in weight_funcs_by_key:
+                weight_funcs_by_key[estimation_key] = self._get_forecast_weighting_function(
+                    instrument_code)
+
+        self.log.terse(
+            "Calculating raw forecast weights for %s with %d optimisations in parallel"
+            % (", ".join(instruments_to_estimate), len(weight_funcs_by_key)))
+
+        optimised_weight_funcs = map_in_process_pool(
+            _optimise_weighting_function,
+            list(weight_funcs_by_key.values()),
+            max_workers=system.process_pool_max_workers,
+        )
+        optimised_by_key = dict(
+            zip(weight_funcs_by_key.keys(), optimised_weight_funcs))
+
+        for instrument_code in instruments_to_estimate:
+            weight_func = optimised_by_key[estimation_keys[instrument_code]]
+            # the copy that came back has a copy of the log
+            weight_func.log = self.log
+            system.cache.set_item_in_cache_for_call(
+                weight_func,
+                self.calculation_of_raw_estimated_forecast_weights,
+                self,
+                instrument_code,
+            )
+
     def get_raw_forecast_weights_estimated(self, instrument_code):
         """
         Estimate the forecast weights for this instrument
@@ -558,6 +664,9 @@ class _ForecastCombineCalculateWeights(_ForecastCombinePreCalculate):
         2015-06-01  0.464240  0.192962  0.342798
         2015-12-12  0.464240  0.192962  0.342798
         """
+        if self._use_parallel_estimates():
+            self._precalc_estimated_forecast_weights_and_cache()
+
         return self.calculation_of_raw_estimated_forecast_weights(
             instrument_code
         ).weights
@@ -757,19 +866,30 @@ class _ForecastCombineCalculateDivMult(_ForecastCombinePreCalculate):
         ['carry', 'ewmac16', 'ewmac8']
         """
 
+        self.log.terse(
+            "Calculating forecast correlations over %s" %
+            ", ".join(codes_to_use))
+
+        corr_func = self._get_forecast_correlation_function()
+        forecast_data = self._get_forecast_data_for_correlation(codes_to_use)
+
+        return corr_func(forecast_data)
+
+    @dont_cache
+    def _get_forecast_correlation_function(self):
         # Get some useful stuff from the config
         corr_params = copy(self.parent.config.forecast_correlation_estimate)
 
-        # do we pool our estimation?
-        pooling = str2Bool(corr_params.pop("pool_instruments"))
+        # pooling is dealt with when we choose codes_to_use
+        corr_params.pop("pool_instruments")
 
         # which function to use for calculation
         corr_func = resolve_function(corr_params.pop("func"))
 
-        self.log.terse(
-            "Calculating forecast correlations over %s" %
-            ", ".join(codes_to_use))
+        return partial(corr_func, **corr_params)
 
+    @dont_cache
+    def _get_forecast_data_for_correlation(self, codes_to_use):
         forecast_data = [
             self.get_all_forecasts(instr_code, self.get_trading_rule_list(instr_code))
             for instr_code in codes_to_use
@@ -778,7 +898,7 @@ class _ForecastCombineCalculateDivMult(_ForecastCombinePreCalculate):
         # if we're not pooling passes a list of one
         forecast_data = [forecast_ts.ffill() for forecast_ts in forecast_data]
 
-        return corr_func(forecast_data, **corr_params)
+        return forecast_data
 
     @diagnostic(protected=True, not_pickable=True)
     def get_forecast_correlation_matrices(self, instrument_code):
@@ -803,11 +923,19 @@ class _ForecastCombineCalculateDivMult(_ForecastCombinePreCalculate):
         ['carry', 'ewmac16', 'ewmac8']
         """
 
-        # Get some useful stuff from the config
-        corr_params = copy(self.parent.config.forecast_correlation_estimate)
+        codes_to_use = self._get_codes_to_use_for_forecast_correlation(
+            instrument_code)
 
+        forecast_corr_list = self.get_forecast_correlation_matrices_from_code_list(
+            codes_to_use)
+
+        return forecast_corr_list
+
+    @dont_cache
+    def _get_codes_to_use_for_forecast_correlation(self, instrument_code):
         # do we pool our estimation?
-        pooling = str2Bool(corr_params.pop("pool_instruments"))
+        pooling = str2Bool(
+            self.parent.config.forecast_correlation_estimate["pool_instruments"])
 
         if pooling:
             # find set of instruments with same trading rules as I have
@@ -819,10 +947,57 @@ class _ForecastCombineCalculateDivMult(_ForecastCombinePreCalculate):
         else:
             codes_to_use = [instrument_code]
 
-        forecast_corr_list = self.get_forecast_correlation_matrices_from_code_list(
-            codes_to_use)
+        return codes_to_use
 
-        return forecast_corr_list
+    @dont_cache
+    def _precalc_forecast_correlation_matrices_and_cache(self):
+        """
+        Estimate forecast correlations for every distinct set of instruments we need, in parallel, and
+         put the results in the cache for get_forecast_correlation_matrices_from_code_list
+
+        :returns: None
+        """
+        system = self.parent
+        list_of_codes_to_use = []
+        for instrument_code in system.get_instrument_list():
+            codes_to_use = self._get_codes_to_use_for_forecast_correlation(
+                instrument_code)
+            if codes_to_use in list_of_codes_to_use:
+                continue
+            if system.cache.item_in_cache_for_call(
+                    self.get_forecast_correlation_matrices_from_code_list,
+                    self,
+                    codes_to_use):
+                continue
+            list_of_codes_to_use.append(codes_to_use)
+
+        if len(list_of_codes_to_use) == 0:
+            return None
+
+        self.log.terse(
+            "Calculating forecast correlations over %d sets of instruments in parallel"
+            % len(list_of_codes_to_use))
+
+        forecast_data_list = [
+            self._get_forecast_data_for_correlation(codes_to_use)
+            for codes_to_use in list_of_codes_to_use
+        ]
+        forecast_corr_lists = map_in_process_pool(
+            self._get_forecast_correlation_function(),
+            forecast_data_list,
+            max_workers=system.process_pool_max_workers,
+        )
+
+        for codes_to_use, forecast_corr_list in zip(
+                list_of_codes_to_use, forecast_corr_lists):
+            system.cache.set_item_in_cache_for_call(
+                forecast_corr_list,
+                self.get_forecast_correlation_matrices_from_code_list,
+                self,
+                codes_to_use,
+                protected=True,
+                not_pickable=True,
+            )
 
     @diagnostic(protected=True)
     def get_forecast_diversification_multiplier_estimated(
@@ -899,6 +1074,8 @@ class _ForecastCombineCalculateDivMult(_ForecastCombinePreCalculate):
     @dont_cache
     def get_forecast_diversification_multiplier(self, instrument_code):
         if self.use_estimated_div_mult():
+            if self._use_parallel_estimates():
+                self._precalc_forecast_correlation_matrices_and_cache()
             return self.get_forecast_diversification_multiplier_estimated(
                 instrument_code
             )
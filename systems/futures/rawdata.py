@@ -4,6 +4,7 @@ import pandas as pd
 from systems.rawdata import RawData
 from syscore.dateutils import fraction_of_year_between_price_and_carry_expiries
 from syscore.pdutils import uniquets
+from syscore.algos import rolling_skew_and_kurtosis
 from systems.system_cache import input, diagnostic, output
 from syscore.dateutils import ROOT_BDAYS_INYEAR, BUSINESS_DAYS_IN_YEAR
 
@@ -213,6 +214,10 @@ class FuturesRawData(RawData):
         :param asset_class:
         :return:
         """
+        if self.use_panel_calculation():
+            median_carry_by_asset_class = self._median_carry_by_asset_class()
+            if asset_class in median_carry_by_asset_class:
+                return median_carry_by_asset_class[asset_class]
 
         instruments_in_asset_class = self.parent.data.all_instruments_in_asset_class(
             asset_class)
@@ -232,6 +237,21 @@ class FuturesRawData(RawData):
 
         return median_carry
 
+    @diagnostic()
+    def _median_carry_by_asset_class(self):
+        """
+        Median smoothed carry for every asset class, from one grouping of the carry panel
+
+        :return: dict, keys are asset classes, values pd.Series
+        """
+        smoothed_carry_panel, in_own_index = self._panel_over_instruments_in_asset_classes(
+            "smoothed_carry"
+        )
+
+        return self._average_panel_over_asset_classes(
+            smoothed_carry_panel, in_own_index, average_method="median"
+        )
+
     @output()
     def median_carry_for_asset_class(self, instrument_code):
         """
@@ -242,7 +262,7 @@ class FuturesRawData(RawData):
         :return: pd.Series
         """
 
-        asset_class = self.parent.data.asset_class_for_instrument(
+        asset_class = self._asset_class_for_instrument(
             instrument_code)
         median_carry = self._by_asset_class_median_carry_for_asset_class(
             asset_class)
@@ -293,6 +313,11 @@ class FuturesRawData(RawData):
         :param lookback_days: int
         :return: rolling estimator of skew
         """
+        if self._use_factor_panel_for_instrument(instrument_code):
+            return self._get_factor_series_from_panel(
+                self.skew_panel(lookback_days=lookback_days), instrument_code
+            )
+
         lookback = "%dD" % lookback_days
         perc_returns = self.get_percentage_returns(instrument_code)
         skew = perc_returns.rolling(lookback).skew()
@@ -323,6 +348,10 @@ class FuturesRawData(RawData):
         :param lookback_days: int
         :return: rolling estimator of kurtosis
         """
+        if self._use_factor_panel_for_instrument(instrument_code):
+            return self._get_factor_series_from_panel(
+                self.kurtosis_panel(lookback_days=lookback_days), instrument_code
+            )
 
         lookback = "%dD" % lookback_days
         perc_returns = self.get_percentage_returns(instrument_code)
@@ -330,6 +359,93 @@ class FuturesRawData(RawData):
 
         return kurtosis
 
+    @diagnostic()
+    def _percentage_returns_panel(self):
+        """
+        Percentage returns for the instruments in this system, and everything else in
+        their asset classes
+
+        :return: tuple: TxN pd.DataFrame, and TxN pd.DataFrame of bool showing the dates
+           in each instrument's own index
+        """
+        return self._panel_over_instruments_in_asset_classes("get_percentage_returns")
+
+    @diagnostic()
+    def _rolling_skew_and_kurtosis_panels(self, lookback_days=365):
+        """
+        Rolling skew and kurtosis for all instruments at once, from one set of moment sums
+
+        :param lookback_days: int
+        :return: tuple of TxN pd.DataFrame: skew, kurtosis
+        """
+        self.log.msg("Calculating skew and kurtosis for all instruments")
+        returns_panel, in_own_index = self._percentage_returns_panel()
+        skew_panel, kurtosis_panel = rolling_skew_and_kurtosis(
+            returns_panel, lookback_days=lookback_days
+        )
+
+        # only on each instrument's own dates, as the per instrument estimators
+        return skew_panel.where(in_own_index), kurtosis_panel.where(in_own_index)
+
+    @diagnostic()
+    def skew_panel(self, lookback_days=365):
+        """
+        Skew for all instruments in one pass
+
+        :param lookback_days: int
+        :return: TxN pd.DataFrame, one column per instrument in this system or its
+           asset classes
+        """
+        return self._rolling_skew_and_kurtosis_panels(lookback_days=lookback_days)[0]
+
+    @diagnostic()
+    def neg_skew_panel(self, lookback_days=365):
+        """
+        Negative skew for all instruments in one pass
+
+        :param lookback_days: int
+        :return: TxN pd.DataFrame, one column per instrument in this system or its
+           asset classes
+        """
+        return -self.skew_panel(lookback_days=lookback_days)
+
+    @diagnostic()
+    def kurtosis_panel(self, lookback_days=365):
+        """
+        Kurtosis for all instruments in one pass
+
+        :param lookback_days: int
+        :return: TxN pd.DataFrame, one column per instrument in this system or its
+           asset classes
+        """
+        return self._rolling_skew_and_kurtosis_panels(lookback_days=lookback_days)[1]
+
+    def _factor_has_panel(self, factor_name):
+        """
+        Can we get the factor values for all instruments at once?
+
+        Only if we're calculating in panels, and there is a method factor_name_panel
+
+        :param factor_name: str
+        :return: bool
+        """
+        if not self.use_panel_calculation():
+            return False
+
+        return hasattr(self, "%s_panel" % factor_name)
+
+    def _use_factor_panel_for_instrument(self, instrument_code):
+        if not self.use_panel_calculation():
+            return False
+
+        return instrument_code in self._percentage_returns_panel()[0].columns
+
+    def _get_factor_series_from_panel(self, panel, instrument_code):
+        perc_returns = self.get_percentage_returns(instrument_code)
+        series_for_instrument = panel[instrument_code].reindex(perc_returns.index)
+
+        return series_for_instrument.rename(perc_returns.name)
+
     @output()
     def get_factor_value_for_instrument(
         self, instrument_code, factor_name="skew", **kwargs
@@ -388,6 +504,17 @@ class FuturesRawData(RawData):
 
         :return: pd.DataFrame
         """
+        if self._factor_has_panel(factor_name) and all(
+            [
+                self._use_factor_panel_for_instrument(instrument_code)
+                for instrument_code in instrument_list
+            ]
+        ):
+            factor_panel = getattr(self, "%s_panel" % factor_name)(**kwargs)
+            in_own_index = self._percentage_returns_panel()[1][instrument_list]
+
+            # only the dates we'd get putting the instruments together
+            return factor_panel[instrument_list][in_own_index.any(axis=1)]
 
         all_factor_values = [
             self.get_factor_value_for_instrument(
@@ -496,6 +623,11 @@ class FuturesRawData(RawData):
         :param **kwargs: passed to factor_name method
         :return: pd.Series
         """
+        if self._factor_has_panel(factor_name):
+            averages_by_asset_class = self._current_average_factor_values_by_asset_class(
+                factor_name=factor_name, **kwargs)
+            if asset_class in averages_by_asset_class:
+                return averages_by_asset_class[asset_class]
 
         all_factor_values = self.factor_values_over_asset_class(
             asset_class, factor_name=factor_name, **kwargs
@@ -504,6 +636,25 @@ class FuturesRawData(RawData):
 
         return cs_average_all_factors
 
+    @diagnostic()
+    def _current_average_factor_values_by_asset_class(
+        self, factor_name="skew", **kwargs
+    ):
+        """
+        Current average of a factor value for every asset class, from one grouping of
+        the factor panel
+
+        :param factor_name: str, must have a factor_name_panel method in rawdata
+        :param **kwargs: passed to factor panel method
+        :return: dict, keys are asset classes, values pd.Series
+        """
+        factor_panel = getattr(self, "%s_panel" % factor_name)(**kwargs)
+        in_own_index = self._percentage_returns_panel()[1]
+
+        return self._average_panel_over_asset_classes(
+            factor_panel.ffill(), in_own_index, average_method="mean"
+        )
+
     @diagnostic()
     def average_factor_value_in_asset_class_for_instrument(
         self, instrument_code, factor_name="skew", **kwargs
@@ -518,7 +669,7 @@ class FuturesRawData(RawData):
         :return: pd.Series
         """
 
-        asset_class = self.parent.data.asset_class_for_instrument(
+        asset_class = self._asset_class_for_instrument(
             instrument_code)
         current_avg = self.current_average_factor_value_over_asset_class(
             asset_class, factor_name=factor_name, **kwargs
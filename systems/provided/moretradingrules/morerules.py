@@ -90,9 +90,9 @@ def relative_carry(
     Relative carry rule
     Suggested inputs: rawdata.smoothed_carry, rawdata.median_carry_for_asset_class
 
-    :param smoothed_carry_this_instrument: pd.Series
-    :param median_carry_for_asset_class: pd.Series aligned to smoothed_carry_this_instrument
-    :return: forecast pd.Series
+    :param smoothed_carry_this_instrument: pd.Series, or TxN pd.DataFrame for many instruments at once
+    :param median_carry_for_asset_class: pd.Series aligned to smoothed_carry_this_instrument, or TxN pd.DataFrame
+    :return: forecast pd.Series, or TxN pd.DataFrame
     """
 
     # should already be aligned
@@ -112,9 +112,12 @@ def cross_sectional_mean_reversion(
     """
     Cross sectional mean reversion within asset class
 
-    :param normalised_price_this_instrument: pd.Series
-    :param normalised_price_for_asset_class: pd.Series
-    :return: pd.Series
+    :param normalised_price_this_instrument: pd.Series, or TxN pd.DataFrame for many instruments at once
+    :param normalised_price_for_asset_class: pd.Series, or TxN pd.DataFrame aligned to normalised_price_this_instrument
+    :return: pd.Series, or TxN pd.DataFrame
+
+    Everything is done column by column, so passing whole panels gives the same answer
+    as calling once for each instrument
     """
 
     if ewma_span is None:
@@ -1,9 +1,12 @@
 from copy import copy
 
+import numpy as np
 import pandas as pd
 
 from systems.stage import SystemStage
 from syscore.objects import resolve_function
+from syscore.genutils import str2Bool
+from syscore.pdutils import index_is_contiguous_slice_of
 from systems.system_cache import input, diagnostic, output
 
 
@@ -94,7 +97,13 @@ class RawData(SystemStage):
         2015-12-11  0.1075
         """
         instrdailyprice = self.get_daily_prices(instrument_code)
-        dailyreturns = instrdailyprice.diff()
+        if self._use_panel_for_instrument(instrument_code):
+            dailyreturns = self._get_series_from_panel(
+                self.daily_returns_panel(), instrument_code
+            ).rename(instrdailyprice.name)
+        else:
+            dailyreturns = instrdailyprice.diff()
+
         return dailyreturns
 
     @output()
@@ -147,8 +156,18 @@ class RawData(SystemStage):
             instrument_code=instrument_code,
         )
 
-        system = self.parent
+        if self._use_panel_for_instrument(instrument_code):
+            return self._get_series_from_panel(
+                self.daily_returns_volatility_panel(), instrument_code
+            )
+
         dailyreturns = self.daily_returns(instrument_code)
+        vol = self._calculate_vol_from_returns(dailyreturns)
+
+        return vol
+
+    def _calculate_vol_from_returns(self, dailyreturns):
+        system = self.parent
         volconfig = copy(system.config.volatility_calculation)
 
         # volconfig contains 'func' and some other arguments
@@ -202,6 +221,11 @@ class RawData(SystemStage):
         2015-12-10  0.055281
         2015-12-11  0.059789
         """
+        if self._use_panel_for_instrument(instrument_code):
+            return self._get_series_from_panel(
+                self.get_daily_percentage_volatility_panel(), instrument_code
+            )
+
         denom_price = self.daily_denominator_price(instrument_code)
         return_vol = self.daily_returns_volatility(instrument_code)
         (denom_price, return_vol) = denom_price.align(return_vol, join="right")
@@ -237,11 +261,163 @@ class RawData(SystemStage):
             instrument_code=instrument_code,
         )
 
+        if self._use_panel_for_instrument(instrument_code):
+            return self._get_series_from_panel(
+                self.norm_returns_panel(), instrument_code
+            )
+
         returnvol = self.daily_returns_volatility(instrument_code).shift(1)
         dailyreturns = self.daily_returns(instrument_code)
         norm_return = dailyreturns / returnvol
         return norm_return
 
+    def use_panel_calculation(self):
+        """
+        Do we calculate returns and volatility for all instruments at once?
+
+        :return: bool
+        """
+        return str2Bool(self.parent.config.use_rawdata_panel)
+
+    def _use_panel_for_instrument(self, instrument_code):
+        if not self.use_panel_calculation():
+            return False
+
+        return instrument_code in self._instruments_in_panel()
+
+    @diagnostic()
+    def daily_prices_panel(self):
+        """
+        Daily prices for all instruments, aligned in a single frame
+
+        :returns: TxN pd.DataFrame, one column per instrument
+        """
+        instrument_list = self.parent.get_instrument_list()
+        all_prices = [
+            self.get_daily_prices(instrument_code)
+            for instrument_code in instrument_list
+        ]
+        all_prices = pd.concat(all_prices, axis=1)
+        all_prices.columns = instrument_list
+
+        return all_prices
+
+    @diagnostic()
+    def _instruments_in_panel(self):
+        """
+        Instruments whose daily price index is a contiguous slice of the panel
+        index. Only for these will the panel calculations be identical to
+        the per instrument ones; anything else is calculated individually.
+
+        :return: list of str
+        """
+        price_panel = self.daily_prices_panel()
+        instrument_list = [
+            instrument_code
+            for instrument_code in price_panel.columns
+            if index_is_contiguous_slice_of(
+                self.get_daily_prices(instrument_code).index, price_panel.index
+            )
+        ]
+
+        return instrument_list
+
+    def _get_series_from_panel(self, panel, instrument_code):
+        own_index = self.get_daily_prices(instrument_code).index
+        series_for_instrument = panel[instrument_code].reindex(own_index)
+
+        return series_for_instrument.rename(None)
+
+    def _mask_panel_outside_instrument_dates(self, panel):
+        """
+        Set values to nan before each instrument starts trading, and after it
+        stops, so that ffill doesn't pick up values the per instrument
+        calculation wouldn't see
+
+        :param panel: TxN pd.DataFrame, columns are instrument codes
+        :return: TxN pd.DataFrame
+        """
+        dates = panel.index.values[:, np.newaxis]
+        own_indices = [
+            self.get_daily_prices(instrument_code).index
+            for instrument_code in panel.columns
+        ]
+        first_dates = np.array(
+            [own_index[0] for own_index in own_indices], dtype=dates.dtype
+        )
+        last_dates = np.array(
+            [own_index[-1] for own_index in own_indices], dtype=dates.dtype
+        )
+        in_range = (dates >= first_dates) & (dates <= last_dates)
+
+        return panel.where(in_range)
+
+    @diagnostic()
+    def daily_returns_panel(self):
+        """
+        Daily returns (not % returns) for all instruments in one pass
+
+        :returns: TxN pd.DataFrame, one column per instrument
+        """
+        self.log.msg("Calculating daily returns for all instruments")
+        price_panel = self.daily_prices_panel()
+        returns_panel = price_panel.diff()
+
+        return returns_panel
+
+    @diagnostic()
+    def daily_returns_volatility_panel(self):
+        """
+        Volatility of daily returns for all instruments in one pass
+
+        The configured vol function is called once, with a TxN DataFrame
+
+        :returns: TxN pd.DataFrame, one column per instrument
+        """
+        self.log.msg("Calculating daily volatility for all instruments")
+        returns_panel = self.daily_returns_panel()
+        vol_panel = self._calculate_vol_from_returns(returns_panel)
+
+        return vol_panel
+
+    @diagnostic()
+    def get_daily_percentage_volatility_panel(self):
+        """
+        Percentage volatility for all instruments in one pass
+
+        :returns: TxN pd.DataFrame, one column per instrument
+        """
+        instrument_list = list(self.daily_prices_panel().columns)
+        denom_price_panel = [
+            self.daily_denominator_price(instrument_code)
+            for instrument_code in instrument_list
+        ]
+        denom_price_panel = pd.concat(denom_price_panel, axis=1)
+        denom_price_panel.columns = instrument_list
+
+        return_vol_panel = self.daily_returns_volatility_panel()
+        denom_price_panel = denom_price_panel.reindex(return_vol_panel.index)
+        denom_price_panel = self._mask_panel_outside_instrument_dates(
+            denom_price_panel
+        )
+        perc_vol_panel = 100.0 * (return_vol_panel / denom_price_panel.ffill())
+
+        return perc_vol_panel
+
+    @diagnostic()
+    def norm_returns_panel(self):
+        """
+        Returns normalised by recent vol for all instruments in one pass
+
+        :returns: TxN pd.DataFrame, one column per instrument
+        """
+        self.log.msg("Calculating normalised returns for all instruments")
+        returnvol_panel = self.daily_returns_volatility_panel().shift(1)
+        returns_panel = self.daily_returns_panel()
+        norm_returns_panel = returns_panel / returnvol_panel
+
+        return norm_returns_panel
+
     @diagnostic()
     def cumulative_norm_return(self, instrument_code):
         """
@@ -270,6 +446,10 @@ class RawData(SystemStage):
         :param asset_class: str
         :return: pd.Series
         """
+        if self.use_panel_calculation():
+            median_returns_by_asset_class = self._median_normalised_returns_by_asset_class()
+            if asset_class in median_returns_by_asset_class:
+                return median_returns_by_asset_class[asset_class]
 
         instruments_in_asset_class = self.parent.data.all_instruments_in_asset_class(
             asset_class)
@@ -289,6 +469,158 @@ class RawData(SystemStage):
 
         return median_returns
 
+    @diagnostic()
+    def _median_normalised_returns_by_asset_class(self):
+        """
+        Median normalised returns for every asset class, from one grouping of the
+        normalised returns panel
+
+        :return: dict, keys are asset classes, values pd.Series
+        """
+        norm_returns_panel, in_own_index = self._panel_over_instruments_in_asset_classes(
+            "norm_returns"
+        )
+
+        return self._average_panel_over_asset_classes(
+            norm_returns_panel, in_own_index, average_method="median"
+        )
+
+    @diagnostic()
+    def _asset_class_for_each_instrument_in_asset_classes(self):
+        """
+        Every instrument in the asset classes of the instruments in this system, with
+        its asset class
+
+        :return: dict, keys are instrument codes
+        """
+        asset_class_data = self.parent.data.get_instrument_asset_classes()
+        instruments_with_data = self.parent.data.get_instrument_list()
+        asset_classes = sorted(
+            set(
+                asset_class_data[instrument_code]
+                for instrument_code in self.parent.get_instrument_list()
+            )
+        )
+
+        asset_class_for_each_instrument = dict(
+            (instrument_code, asset_class)
+            for asset_class in asset_classes
+            for instrument_code in asset_class_data.all_instruments_in_asset_class(
+                asset_class, must_be_in=instruments_with_data
+            )
+        )
+
+        return asset_class_for_each_instrument
+
+    def _asset_class_for_instrument(self, instrument_code):
+        # saves going back to the data every time
+        asset_class_for_each_instrument = (
+            self._asset_class_for_each_instrument_in_asset_classes()
+        )
+        if instrument_code in asset_class_for_each_instrument:
+            return asset_class_for_each_instrument[instrument_code]
+
+        return self.parent.data.asset_class_for_instrument(instrument_code)
+
+    def _panel_over_instruments_in_asset_classes(self, method_name, **kwargs):
+        """
+        Output of some per instrument method side by side, for the instruments in this
+        system and everything else in their asset classes
+
+        If the method fails for an instrument that isn't in this system we leave out the
+        rest of its asset class, which will then be done one instrument at a time as before
+
+        :param method_name: str, method in this stage that takes an instrument_code
+        :param kwargs: passed to method
+        :return: tuple: TxN pd.DataFrame, and TxN pd.DataFrame of bool which is True on
+           the dates in each instrument's own index (the value there can still be nan)
+        """
+        asset_class_for_each_instrument = (
+            self._asset_class_for_each_instrument_in_asset_classes()
+        )
+        instruments_in_system = self.parent.get_instrument_list()
+        method = getattr(self, method_name)
+
+        values_by_instrument = {}
+        asset_classes_left_out = set()
+        for instrument_code, asset_class in asset_class_for_each_instrument.items():
+            if instrument_code in instruments_in_system:
+                values_by_instrument[instrument_code] = method(
+                    instrument_code, **kwargs)
+                continue
+
+            if asset_class in asset_classes_left_out:
+                continue
+            try:
+                values_by_instrument[instrument_code] = method(
+                    instrument_code, **kwargs)
+            except Exception as e:
+                self.log.warn(
+                    "Couldn't get %s for %s (%s), so won't calculate asset class %s in one panel"
+                    % (method_name, instrument_code, str(e), asset_class))
+                asset_classes_left_out.add(asset_class)
+
+        instrument_list = [
+            instrument_code
+            for instrument_code, asset_class in asset_class_for_each_instrument.items()
+            if instrument_code in instruments_in_system
+            or asset_class not in asset_classes_left_out
+        ]
+        all_values = [
+            values_by_instrument[instrument_code] for instrument_code in instrument_list
+        ]
+
+        return _panel_from_list_of_values(all_values, instrument_list)
+
+    def _average_panel_over_asset_classes(
+        self, panel, in_own_index, average_method="median"
+    ):
+        """
+        Cross sectional average of each asset class, by grouping the panel columns
+
+        Each average is only on the dates that some instrument in the asset class has, as
+        if we'd put together the asset class from its own instruments. Asset classes that
+        don't have all their instruments in the panel are left out.
+
+        :param panel: TxN pd.DataFrame, columns are instrument codes
+        :param in_own_index: TxN pd.DataFrame of bool, aligned to panel
+        :param average_method: str, 'median' or 'mean'
+        :return: dict, keys are asset classes, values pd.Series
+        """
+        asset_class_for_each_instrument = (
+            self._asset_class_for_each_instrument_in_asset_classes()
+        )
+        incomplete_asset_classes = set(
+            asset_class
+            for instrument_code, asset_class in asset_class_for_each_instrument.items()
+            if instrument_code not in panel.columns
+        )
+        instrument_list = [
+            instrument_code
+            for instrument_code in panel.columns
+            if asset_class_for_each_instrument[instrument_code]
+            not in incomplete_asset_classes
+        ]
+        asset_class_for_each_column = [
+            asset_class_for_each_instrument[instrument_code]
+            for instrument_code in instrument_list
+        ]
+
+        grouped_panel = panel[instrument_list].groupby(
+            asset_class_for_each_column, axis=1)
+        averages = getattr(grouped_panel, average_method)()
+        asset_class_has_date = in_own_index[instrument_list].groupby(
+            asset_class_for_each_column, axis=1
+        ).any()
+
+        averages_by_asset_class = dict(
+            (asset_class,
+             averages[asset_class][asset_class_has_date[asset_class]].rename(None))
+            for asset_class in averages.columns
+        )
+
+        return averages_by_asset_class
+
     @diagnostic()
     def _by_asset_class_normalised_price_for_asset_class_(self, asset_class):
         """
@@ -312,7 +644,7 @@ class RawData(SystemStage):
         :return:
         """
 
-        asset_class = self.parent.data.asset_class_for_instrument(
+        asset_class = self._asset_class_for_instrument(
             instrument_code)
         normalised_price_for_asset_class = (
             self._by_asset_class_normalised_price_for_asset_class_(asset_class)
@@ -348,6 +680,19 @@ class RawData(SystemStage):
         return perc_returns
 
 
+def _panel_from_list_of_values(all_values, instrument_list):
+    panel = pd.concat(all_values, axis=1)
+    panel.columns = instrument_list
+
+    in_own_index = np.zeros(panel.shape, dtype=bool)
+    for column_number, values in enumerate(all_values):
+        in_own_index[panel.index.get_indexer(values.index), column_number] = True
+    in_own_index = pd.DataFrame(
+        in_own_index, index=panel.index, columns=instrument_list)
+
+    return panel, in_own_index
+
+
 if __name__ == "__main__":
     import doctest
 
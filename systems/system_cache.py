@@ -508,6 +508,47 @@ class systemCache(dict):
             value, protected=protected, not_pickable=not_pickable
         )
 
+    def set_item_in_cache_for_call(
+        self,
+        value,
+        func,
+        this_stage,
+        *args,
+        protected=False,
+        not_pickable=False,
+        **kwargs
+    ):
+        """
+        Set the cache entry that calling func(*args, **kwargs) from this_stage
+        would have created; used when something has been calculated in bulk
+
+        :param value: The value to set to
+        :param func: function (normally a cached stage method)
+        :param this_stage: stage within system that is calling us
+
+        :returns: nothing
+        """
+        if not self.are_we_caching():
+            return None
+
+        cache_ref = self.cache_ref(func, this_stage, *args, **kwargs)
+        self.set_item_in_cache(
+            value, cache_ref, protected=protected, not_pickable=not_pickable
+        )
+
+    def item_in_cache_for_call(self, func, this_stage, *args, **kwargs):
+        """
+        Is there a cache entry for calling func(*args, **kwargs) from this_stage?
+
+        :param func: function (normally a cached stage method)
+        :param this_stage: stage within system that is calling us
+
+        :returns: bool
+        """
+        cache_ref = self.cache_ref(func, this_stage, *args, **kwargs)
+
+        return self._get_item_from_cache(cache_ref) is not MISSING_FROM_CACHE
+
     def _get_item_from_cache(self, cache_ref):
         """
         Get the value of an item from the cache self._cache
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sysdata.config.configdata import Config
+from systems.provided.futures_chapter15.estimatedsystem import futures_system
+
+# EDOLLAR and US10 have the same cheap rules, so share an optimisation when pooling
+INSTRUMENT_LIST = ["EDOLLAR", "US10", "CORN"]
+
+
+def _test_system(parallel_forecast_estimates):
+    config = Config("systems.provided.futures_chapter15.futuresestimateconfig.yaml")
+    config.instruments = INSTRUMENT_LIST
+    config.parallel_forecast_estimates = parallel_forecast_estimates
+    # handcrafting takes far too long for a test
+    config.forecast_weight_estimate = dict(method="shrinkage")
+    system = futures_system(config=config, log_level="on")
+    system.process_pool_max_workers = 2
+
+    return system
+
+
+class Test(unittest.TestCase):
+    def test_parallel_estimates_match_serial(self):
+        serial_system = _test_system(False)
+        parallel_system = _test_system(True)
+
+        for instrument_code in INSTRUMENT_LIST:
+            pd.testing.assert_frame_equal(
+                parallel_system.combForecast.get_raw_forecast_weights(instrument_code),
+                serial_system.combForecast.get_raw_forecast_weights(instrument_code))
+
+            parallel_corr_list = parallel_system.combForecast.get_forecast_correlation_matrices(
+                instrument_code)
+            serial_corr_list = serial_system.combForecast.get_forecast_correlation_matrices(
+                instrument_code)
+            self.assertEqual(len(parallel_corr_list.corr_list), len(serial_corr_list.corr_list))
+            for parallel_corr, serial_corr in zip(
+                    parallel_corr_list.corr_list, serial_corr_list.corr_list):
+                np.testing.assert_array_equal(parallel_corr, serial_corr)
+
+            pd.testing.assert_series_equal(
+                parallel_system.combForecast.get_forecast_diversification_multiplier(instrument_code),
+                serial_system.combForecast.get_forecast_diversification_multiplier(instrument_code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
 import unittest
+
+import pandas as pd
+
 from systems.tests.testdata import get_test_object
+from systems.provided.futures_chapter15.basesystem import futures_system
 from systems.basesystem import System
 
 
@@ -40,5 +44,65 @@ class Test(unittest.TestCase):
         )
 
 
+class TestPanel(unittest.TestCase):
+    def setUp(self):
+        self.system = futures_system(log_level="off")
+        self.panel_system = futures_system(log_level="off")
+        self.panel_system.config.use_rawdata_panel = True
+
+    def test_panel_matches_per_instrument(self):
+        for instrument_code in self.system.get_instrument_list():
+            for method_name in [
+                "daily_returns",
+                "daily_returns_volatility",
+                "get_daily_percentage_volatility",
+                "norm_returns",
+            ]:
+                per_instrument = getattr(self.system.rawdata, method_name)(
+                    instrument_code
+                )
+                from_panel = getattr(self.panel_system.rawdata, method_name)(
+                    instrument_code
+                )
+                pd.testing.assert_series_equal(
+                    per_instrument, from_panel, check_names=False
+                )
+
+    def test_factor_panel_matches_per_instrument(self):
+        # some bond and equity instruments in the test data can't be used, and carry
+        # is slow to work out for whole asset classes, so keep to a couple
+        instrument_list = ["CORN", "V2X"]
+        for system in [self.system, self.panel_system]:
+            del system.config.instrument_weights
+            system.config.instruments = instrument_list
+
+        for instrument_code in instrument_list:
+            for method_name in [
+                "skew",
+                "kurtosis",
+                "median_carry_for_asset_class",
+                "normalised_price_for_asset_class",
+            ]:
+                per_instrument = getattr(self.system.rawdata, method_name)(
+                    instrument_code
+                )
+                from_panel = getattr(self.panel_system.rawdata, method_name)(
+                    instrument_code
+                )
+                pd.testing.assert_series_equal(per_instrument, from_panel)
+
+            for demean_method in [
+                "historic_average_factor_value_all_assets",
+                "average_factor_value_in_asset_class_for_instrument",
+            ]:
+                per_instrument = self.system.rawdata.get_demeanded_factor_value(
+                    instrument_code, factor_name="neg_skew", demean_method=demean_method
+                )
+                from_panel = self.panel_system.rawdata.get_demeanded_factor_value(
+                    instrument_code, factor_name="neg_skew", demean_method=demean_method
+                )
+                pd.testing.assert_series_equal(per_instrument, from_panel)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,267 @@
+"""
+Benchmark the provided backtests, stage by stage, using the .csv data that comes with the repo
+
+Each system is run in a new process, so nothing is shared between them. For each stage we time how long
+it takes to calculate everything for every instrument (using results cached by earlier stages), and record
+the peak memory used by the process so far.
+
+Results are written as .json, and can be compared against an earlier set of results (the baseline):
+
+    python tests/benchmark_backtests.py --output benchmark.json
+    ... upgrade pandas, refactor, etc ...
+    python tests/benchmark_backtests.py --baseline benchmark.json --threshold 0.2
+
+Exits with 1 if any stage is slower than the baseline by more than the threshold, or if a system fails
+to run. Only compare results from the same machine.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+THIS_DIR = os.path.dirname(__file__)
+MOD_DIR = os.path.abspath(os.path.join(THIS_DIR, ".."))
+
+# name: (module, function, config or None for the default)
+BENCHMARK_SYSTEMS = dict(
+    chapter15_fixed=(
+        "systems.provided.futures_chapter15.basesystem", "futures_system", None),
+    chapter15_estimated=(
+        "systems.provided.futures_chapter15.estimatedsystem", "futures_system", None),
+    example_simple=(
+        "systems.provided.example.simplesystem", "simplesystem", None),
+)
+
+STAGE_ORDER = [
+    "rawdata",
+    "rules",
+    "forecastScaleCap",
+    "combForecast",
+    "positionSize",
+    "portfolio",
+    "accounts",
+]
+
+DEFAULT_THRESHOLD = 0.2
+
+# stages quicker than this are too noisy to compare
+MIN_SECONDS_TO_COMPARE = 0.1
+
+
+def run_benchmark_for_system(system_name: str) -> dict:
+    system = _create_system(system_name)
+    instrument_list = system.get_instrument_list()
+
+    stage_seconds = {}
+    stage_peak_memory_mb = {}
+    for stage_name in STAGE_ORDER:
+        if stage_name not in system.stage_names:
+            continue
+
+        start = time.perf_counter()
+        _calculate_stage(system, stage_name, instrument_list)
+        stage_seconds[stage_name] = time.perf_counter() - start
+        stage_peak_memory_mb[stage_name] = _peak_memory_mb()
+
+    return dict(
+        stage_seconds=stage_seconds,
+        total_seconds=sum(stage_seconds.values()),
+        stage_peak_memory_mb=stage_peak_memory_mb,
+        peak_memory_mb=_peak_memory_mb(),
+        instrument_count=len(instrument_list),
+    )
+
+
+def _create_system(system_name: str):
+    module_name, function_name, config = BENCHMARK_SYSTEMS[system_name]
+    module = __import__(module_name, fromlist=[function_name])
+    system_function = getattr(module, function_name)
+
+    return system_function(config=config, log_level="off")
+
+
+def _calculate_stage(system, stage_name: str, instrument_list: list):
+    if stage_name == "accounts":
+        system.accounts.portfolio().sharpe()
+        return
+
+    rule_names = list(system.rules.trading_rules().keys())
+    for instrument_code in instrument_list:
+        if stage_name == "rawdata":
+            system.rawdata.get_daily_percentage_volatility(instrument_code)
+        elif stage_name == "rules":
+            for rule_name in rule_names:
+                system.rules.get_raw_forecast(instrument_code, rule_name)
+        elif stage_name == "forecastScaleCap":
+            for rule_name in rule_names:
+                system.forecastScaleCap.get_capped_forecast(instrument_code, rule_name)
+        elif stage_name == "combForecast":
+            system.combForecast.get_combined_forecast(instrument_code)
+        elif stage_name == "positionSize":
+            system.positionSize.get_subsystem_position(instrument_code)
+        elif stage_name == "portfolio":
+            system.portfolio.get_notional_position(instrument_code)
+
+
+def _peak_memory_mb() -> float:
+    import resource
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # bytes, rather than kilobytes
+        max_rss = max_rss / 1024.0
+
+    return max_rss / 1024.0
+
+
+def run_benchmark_for_system_in_new_process(system_name: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), "--run-one", system_name],
+        cwd=MOD_DIR,
+        env=dict(os.environ, PYTHONPATH=MOD_DIR),
+    )
+    # anything the backtest prints comes first
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def run_benchmarks(system_names: list, repeats: int = 1) -> dict:
+    results = {}
+    failed = {}
+    for system_name in system_names:
+        try:
+            all_runs = [
+                run_benchmark_for_system_in_new_process(system_name)
+                for _ in range(repeats)
+            ]
+        except subprocess.CalledProcessError as e:
+            # carry on with the other systems; the traceback has gone to stderr
+            failed[system_name] = str(e)
+            continue
+
+        results[system_name] = _best_of_runs(all_runs)
+
+    return dict(
+        environment=_environment(),
+        systems=results,
+        failed=failed,
+    )
+
+
+def _best_of_runs(all_runs: list) -> dict:
+    # quickest time and smallest memory are the least noisy
+    best = all_runs[0]
+    for run in all_runs[1:]:
+        for stage_name, seconds in run["stage_seconds"].items():
+            best["stage_seconds"][stage_name] = min(
+                seconds, best["stage_seconds"][stage_name])
+        for stage_name, peak_memory_mb in run["stage_peak_memory_mb"].items():
+            best["stage_peak_memory_mb"][stage_name] = min(
+                peak_memory_mb, best["stage_peak_memory_mb"][stage_name])
+        best["peak_memory_mb"] = min(run["peak_memory_mb"], best["peak_memory_mb"])
+
+    best["total_seconds"] = sum(best["stage_seconds"].values())
+
+    return best
+
+
+def _environment() -> dict:
+    import numpy
+    import pandas
+
+    return dict(
+        datetime=datetime.datetime.now().isoformat(),
+        machine=platform.node(),
+        python=platform.python_version(),
+        pandas=pandas.__version__,
+        numpy=numpy.__version__,
+    )
+
+
+def compare_with_baseline(results: dict, baseline: dict,
+                          threshold: float = DEFAULT_THRESHOLD,
+                          min_seconds: float = MIN_SECONDS_TO_COMPARE) -> list:
+    """
+    :return: list of str describing each regression; empty if none
+    """
+    regressions = []
+    for system_name, system_results in results["systems"].items():
+        baseline_results = baseline["systems"].get(system_name, None)
+        if baseline_results is None:
+            continue
+
+        timings = dict(system_results["stage_seconds"],
+                       total=system_results["total_seconds"])
+        baseline_timings = dict(baseline_results["stage_seconds"],
+                                total=baseline_results["total_seconds"])
+        for stage_name, seconds in timings.items():
+            baseline_seconds = baseline_timings.get(stage_name, None)
+            if baseline_seconds is None or baseline_seconds < min_seconds:
+                continue
+            if seconds > baseline_seconds * (1.0 + threshold):
+                regressions.append(
+                    "%s %s: %.2f seconds, baseline %.2f seconds"
+                    % (system_name, stage_name, seconds, baseline_seconds))
+
+        memory = system_results["peak_memory_mb"]
+        baseline_memory = baseline_results["peak_memory_mb"]
+        if memory > baseline_memory * (1.0 + threshold):
+            regressions.append(
+                "%s peak memory: %.0fMB, baseline %.0fMB"
+                % (system_name, memory, baseline_memory))
+
+    return regressions
+
+
+def _print_results(results: dict):
+    for system_name in results["failed"].keys():
+        print("%s FAILED" % system_name)
+    for system_name, system_results in results["systems"].items():
+        print("%s (%d instruments)" % (system_name, system_results["instrument_count"]))
+        for stage_name, seconds in system_results["stage_seconds"].items():
+            print("    %-18s %8.2f seconds %8.0fMB"
+                  % (stage_name, seconds, system_results["stage_peak_memory_mb"][stage_name]))
+        print("    %-18s %8.2f seconds %8.0fMB"
+              % ("total", system_results["total_seconds"], system_results["peak_memory_mb"]))
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the provided backtests")
+    parser.add_argument("--systems", nargs="+", default=list(BENCHMARK_SYSTEMS.keys()),
+                        choices=list(BENCHMARK_SYSTEMS.keys()))
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--output", help=".json file to write results to")
+    parser.add_argument("--baseline", help=".json file of earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction slower than baseline that counts as a regression")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.run_one is not None:
+        print(json.dumps(run_benchmark_for_system(parsed_args.run_one)))
+        return 0
+
+    results = run_benchmarks(parsed_args.systems, repeats=parsed_args.repeats)
+    _print_results(results)
+
+    if parsed_args.output is not None:
+        with open(parsed_args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if parsed_args.baseline is None:
+        return 0
+
+    with open(parsed_args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare_with_baseline(results, baseline, threshold=parsed_args.threshold)
+    for regression in regressions:
+        print("SLOWER: %s" % regression)
+
+    return 1 if len(regressions) > 0 or len(results["failed"]) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+from benchmark_backtests import compare_with_baseline, _best_of_runs
+
+
+def _results(rules_seconds, accounts_seconds, peak_memory_mb=100.0):
+    stage_seconds = dict(rules=rules_seconds, accounts=accounts_seconds)
+    return dict(
+        systems=dict(
+            chapter15_fixed=dict(
+                stage_seconds=stage_seconds,
+                total_seconds=sum(stage_seconds.values()),
+                peak_memory_mb=peak_memory_mb,
+            )
+        )
+    )
+
+
+def test_compare_with_baseline():
+    baseline = _results(rules_seconds=10.0, accounts_seconds=0.01)
+
+    assert compare_with_baseline(_results(11.0, 0.01), baseline, threshold=0.2) == []
+
+    # tiny stages are ignored, however much slower
+    assert compare_with_baseline(_results(10.0, 1.0), baseline, threshold=0.2) == []
+
+    regressions = compare_with_baseline(
+        _results(13.0, 0.01, peak_memory_mb=200.0), baseline, threshold=0.2)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("chapter15_fixed rules")
+
+
+def _run(rules_seconds, accounts_seconds, rules_memory_mb, accounts_memory_mb):
+    return dict(
+        stage_seconds=dict(rules=rules_seconds, accounts=accounts_seconds),
+        stage_peak_memory_mb=dict(rules=rules_memory_mb, accounts=accounts_memory_mb),
+        peak_memory_mb=accounts_memory_mb,
+        instrument_count=3,
+    )
+
+
+def test_best_of_runs_takes_minimum_of_time_and_memory():
+    best = _best_of_runs([
+        _run(2.0, 1.0, rules_memory_mb=90.0, accounts_memory_mb=120.0),
+        _run(1.0, 3.0, rules_memory_mb=80.0, accounts_memory_mb=130.0),
+    ])
+
+    assert best["stage_seconds"] == dict(rules=1.0, accounts=1.0)
+    assert best["total_seconds"] == 2.0
+    assert best["stage_peak_memory_mb"] == dict(rules=80.0, accounts=120.0)
+    assert best["peak_memory_mb"] == 120.0
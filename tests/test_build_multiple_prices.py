@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysinit.futures.build_multiple_prices_from_raw_data import create_multiple_price_stack_from_raw_data
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
+
+
+def _roll_calendar():
+    return pd.DataFrame(
+        dict(
+            current_contract=[20200300, 20200600, 20200900],
+            next_contract=[20200600, 20200900, 20201200],
+            carry_contract=[20200600, 20200900, 20201200],
+        ),
+        index=pd.to_datetime(["2020-01-01", "2020-01-05", "2020-01-10"]),
+    )
+
+
+def _prices(dates, values):
+    return pd.Series(values, index=pd.to_datetime(dates))
+
+
+def test_prices_are_picked_from_contracts_for_each_roll_period():
+    contract_prices = dictFuturesContractFinalPrices(
+        {
+            "20200300": _prices(["2020-01-02", "2020-01-03"], [1.0, 2.0]),
+            "20200600": _prices(["2020-01-02", "2020-01-04", "2020-01-05", "2020-01-07"],
+                                [10.0, 11.0, 12.0, 13.0]),
+            "20200900": _prices(["2020-01-03", "2020-01-07", "2020-01-10", "2020-01-11"],
+                                [19.0, 20.0, 21.0, 22.0]),
+        }
+    )
+
+    # next and carry are missing in the last row, which is okay
+    all_price_data = create_multiple_price_stack_from_raw_data(
+        _roll_calendar(), contract_prices)
+
+    # first row of the calendar is only used for the start date of the first roll period
+    assert list(all_price_data.index) == list(pd.to_datetime(
+        ["2020-01-02", "2020-01-03", "2020-01-04", "2020-01-05", "2020-01-07", "2020-01-10"]))
+    np.testing.assert_array_equal(
+        all_price_data.PRICE.values, [10.0, np.nan, 11.0, 12.0, 20.0, 21.0])
+    np.testing.assert_array_equal(
+        all_price_data.FORWARD.values, [np.nan, 19.0, np.nan, np.nan, np.nan, np.nan])
+    assert list(all_price_data.PRICE_CONTRACT) == [20200600] * 4 + [20200900] * 2
+    assert list(all_price_data.CARRY_CONTRACT) == [20200900] * 4 + [20201200] * 2
+
+
+def test_missing_contract_in_middle_of_roll_calendar():
+    contract_prices = dictFuturesContractFinalPrices(
+        {
+            "20200600": _prices(["2020-01-02"], [10.0]),
+            "20200900": _prices(["2020-01-07"], [20.0]),
+        }
+    )
+    roll_calendar = _roll_calendar()
+    roll_calendar.loc["2020-01-10", "current_contract"] = 20201200
+
+    with pytest.raises(Exception, match="Missing contracts in middle of roll calendar"):
+        create_multiple_price_stack_from_raw_data(roll_calendar, contract_prices)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from sysinit.futures.build_roll_calendars import adjust_to_price_series
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractFinalPrices
+
+
+def _prices(dates, values=None):
+    if values is None:
+        values = np.arange(len(dates), dtype=float)
+    return pd.Series(values, index=pd.to_datetime(dates))
+
+
+def test_roll_dates_moved_to_closest_date_with_matching_prices():
+    contract_prices = dictFuturesContractFinalPrices(
+        {
+            "20200300": _prices(["2020-02-10", "2020-02-14", "2020-02-20"]),
+            "20200600": _prices(["2020-02-14", "2020-02-20", "2020-05-12", "2020-05-25"]),
+            "20200900": _prices(["2020-02-10", "2020-05-12", "2020-05-25"],
+                                [1.0, np.nan, 2.0]),
+            "20201200": _prices(["2020-05-25"]),
+        }
+    )
+    approx_calendar = pd.DataFrame(
+        dict(
+            current_contract=["20200300", "20200600", "20200900"],
+            next_contract=["20200600", "20200900", "20201200"],
+            # carry after the current contract, so only current and next have to match
+            carry_contract=["20200600", "20200900", "20201200"],
+        ),
+        index=pd.to_datetime(["2020-02-12", "2020-05-15", "2020-08-15"]),
+    )
+
+    roll_calendar = adjust_to_price_series(approx_calendar, contract_prices)
+
+    # the earliest of equally close dates; and a nan price doesn't count as a match
+    assert list(roll_calendar.index) == list(pd.to_datetime(["2020-02-14", "2020-05-25"]))
+    assert list(roll_calendar.current_contract) == ["20200300", "20200600"]
+    assert list(roll_calendar.carry_contract) == ["20200600", "20200900"]
+
+
+def test_roll_date_must_come_after_previous_approximate_roll_date():
+    contract_prices = dictFuturesContractFinalPrices(
+        {
+            "20200300": _prices(["2020-02-10", "2020-02-14"]),
+            "20200600": _prices(["2020-02-10", "2020-02-14", "2020-02-15"]),
+            "20200900": _prices(["2020-02-10", "2020-02-15"]),
+        }
+    )
+    approx_calendar = pd.DataFrame(
+        dict(
+            current_contract=["20200300", "20200600", "20200900"],
+            next_contract=["20200600", "20200900", "20201200"],
+            carry_contract=["20200600", "20200900", "20201200"],
+        ),
+        index=pd.to_datetime(["2020-02-10", "2020-02-12", "2020-02-20"]),
+    )
+
+    roll_calendar = adjust_to_price_series(approx_calendar, contract_prices)
+
+    # 2020-02-10 would be closer for the second row, but is the first approximate roll date
+    assert list(roll_calendar.index) == list(pd.to_datetime(["2020-02-10", "2020-02-15"]))
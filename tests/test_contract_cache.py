@@ -0,0 +1,89 @@
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from sysdata.data_blob import dataBlob
+from sysdata.futures.contracts import ContractNotFound
+from sysdata.mongodb.mongo_connection import mongoDb
+from sysobjects.contracts import futuresContract
+from sysobjects.production.roll_state import RollState
+from sysproduction.data.contracts import get_futures_contract_cache, updateContracts
+from sysproduction.data.positions import diagPositions, updatePositions
+
+
+def _data_with_contracts():
+    data = dataBlob(mongo_db=mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost"))
+    update_contracts = updateContracts(data)
+    for contract_date in ["20230300", "20230600"]:
+        update_contracts.add_contract_data(futuresContract("EDOLLAR", contract_date))
+    update_contracts.add_contract_data(futuresContract("US10", "20230600"))
+
+    return data
+
+
+def test_contracts_read_once_per_instrument():
+    data = _data_with_contracts()
+    contract_cache = get_futures_contract_cache(data)
+
+    assert contract_cache.get_all_contract_objects_for_instrument_code("EDOLLAR").list_of_dates() == \
+        ["20230300", "20230600"]
+
+    # deleted behind the cache's back, so we still see it
+    data.db_futures_contract._delete_contract_data_without_any_warning_be_careful("EDOLLAR", "20230300")
+    assert get_futures_contract_cache(data).is_contract_in_data("EDOLLAR", "20230300")
+    assert not contract_cache.is_contract_in_data("EDOLLAR", "20231200")
+
+
+def test_write_clears_instrument():
+    data = _data_with_contracts()
+    contract_cache = get_futures_contract_cache(data)
+    contract = contract_cache.get_contract_object("EDOLLAR", "20230300")
+    original_expiry = contract_cache.get_expiry_date("EDOLLAR", "20230300")
+
+    # changing what we got back doesn't change the cache
+    contract.sampling_on()
+    assert not contract_cache.get_contract_object("EDOLLAR", "20230300").currently_sampling
+
+    updateContracts(data).add_contract_data(contract, ignore_duplication=True)
+    assert contract_cache.get_contract_object("EDOLLAR", "20230300").currently_sampling
+    assert contract_cache.get_expiry_date("EDOLLAR", "20230300") == original_expiry
+
+
+def test_missing_contract_is_read_again_before_giving_up():
+    data = _data_with_contracts()
+    contract_cache = get_futures_contract_cache(data)
+    contract_cache.get_all_contract_objects_for_instrument_code("US10")
+
+    data.db_futures_contract.add_contract_data(futuresContract("US10", "20230900"))
+    assert contract_cache.get_contract_object("US10", "20230900").date_str == "20230900"
+
+    with pytest.raises(ContractNotFound):
+        contract_cache.get_contract_object("US10", "20231200")
+
+
+def test_roll_state_cached_for_reports_and_cleared_on_write():
+    data = _data_with_contracts()
+    diag_positions = diagPositions(data)
+
+    # nothing stored yet, so we get the default
+    assert diag_positions.get_name_of_cached_roll_state("EDOLLAR") == "No_Roll"
+
+    # changed by another process, so reports still see the old state
+    data.db_roll_state.set_roll_state("EDOLLAR", RollState.Passive)
+    assert diag_positions.get_name_of_cached_roll_state("EDOLLAR") == "No_Roll"
+
+    updatePositions(data).set_roll_state("EDOLLAR", RollState.Force)
+    assert diag_positions.get_name_of_cached_roll_state("EDOLLAR") == "Force"
+
+
+def test_roll_state_for_trading_is_always_fresh():
+    data = _data_with_contracts()
+    diag_positions = diagPositions(data)
+    assert diag_positions.get_name_of_cached_roll_state("EDOLLAR") == "No_Roll"
+
+    # changed by another process, eg interactive_update_roll_status
+    data.db_roll_state.set_roll_state("EDOLLAR", RollState.Passive)
+
+    assert diag_positions.get_roll_state("EDOLLAR") == RollState.Passive
+    assert diag_positions.get_name_of_roll_state("EDOLLAR") == "Passive"
+    assert diag_positions.is_roll_state_passive("EDOLLAR")
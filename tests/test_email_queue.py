@@ -0,0 +1,138 @@
+import datetime
+
+import pytest
+
+from syscore.dateutils import datetime_to_long
+from syslogdiag.email_queue import emailQueue
+from syslogdiag.smtp_sink import localSmtpSink
+
+mongomock = pytest.importorskip("mongomock")
+
+from sysdata.mongodb.mongo_connection import mongoDb
+from syslogdiag.mongo_email_control import mongoEmailControlData
+
+
+@pytest.fixture
+def smtp_sink():
+    sink = localSmtpSink()
+    sink.start()
+    yield sink
+    sink.stop()
+
+
+def _email_control_data() -> mongoEmailControlData:
+    return mongoEmailControlData(
+        mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost"))
+
+
+def _email_queue(email_control_data, smtp_sink) -> emailQueue:
+    email_details = ("127.0.0.1", "me@example.com", "pwd", "you@example.com", smtp_sink.port)
+    return emailQueue(email_control_data, coalesce_seconds=60, email_details=email_details)
+
+
+def _body_of(message) -> str:
+    return message.get_payload()[0].get_payload()
+
+
+def test_same_subject_coalesced_and_sent_over_one_connection(smtp_sink):
+    email_queue = _email_queue(_email_control_data(), smtp_sink)
+
+    email_queue.put("spike in US10", "Price spike")
+    email_queue.put("spike in US5", "Price spike")
+    email_queue.put("daily report", "Status report", email_is_report=True)
+    assert len(email_queue) == 2
+
+    # not yet, still in the coalescing window
+    email_queue.send_emails_that_are_due()
+    assert smtp_sink.messages == []
+
+    email_queue.flush()
+    messages = smtp_sink.messages
+    assert [message["Subject"] for message in messages] == ["Price spike", "Status report"]
+    assert "2 messages with this subject" in _body_of(messages[0])
+    assert "spike in US10" in _body_of(messages[0]) and "spike in US5" in _body_of(messages[0])
+
+    email_queue.put("another report", "Status report", email_is_report=True)
+    email_queue.close()
+    assert len(smtp_sink.messages) == 3
+    assert smtp_sink.connection_count == 1
+
+
+def test_rate_limited_messages_are_stored_with_one_warning(smtp_sink):
+    email_control_data = _email_control_data()
+    email_queue = _email_queue(email_control_data, smtp_sink)
+
+    email_queue.put("first", "*CRITICAL ERROR*")
+    email_queue.flush()
+    email_queue.put("second", "*CRITICAL ERROR*")
+    email_queue.flush()
+    email_queue.put("third", "*CRITICAL ERROR*")
+    email_queue.close()
+
+    bodies = [_body_of(message) for message in smtp_sink.messages]
+    assert len(bodies) == 2
+    assert bodies[0] == "first"
+    assert bodies[1].startswith("To reduce email load")
+
+    stored_bodies = [body for _, _, body in email_control_data.get_stored_messages()]
+    assert stored_bodies == ["second", "third"]
+
+    # all in one entry
+    rate_limit_state = email_control_data.get_rate_limit_state()
+    assert list(rate_limit_state.keys()) == ["*CRITICAL ERROR*"]
+    assert len(email_control_data.mongo_data.get_list_of_result_dicts_for_dict_keys(
+        {"type": "rate_limit_state"})) == 1
+
+
+def test_old_style_rate_limit_entries_are_moved():
+    email_control_data = _email_control_data()
+    last_sent = datetime.datetime(2021, 3, 1, 12)
+    email_control_data.mongo_data.add_data(
+        dict_of_keys={"subject": "Price spike", "type": "last_email_sent"},
+        data_dict={"datetime": datetime_to_long(last_sent)})
+
+    assert email_control_data.get_time_last_email_sent_with_this_subject("Price spike") == last_sent
+    assert email_control_data.mongo_data.get_list_of_result_dicts_for_dict_keys(
+        {"type": "last_email_sent"}) == []
+
+    email_control_data.record_date_of_email_warning_send("Price spike")
+    assert email_control_data.get_time_last_email_sent_with_this_subject("Price spike") == last_sent
+    assert email_control_data.get_time_last_warning_email_sent_with_this_subject(
+        "Price spike") > last_sent
+
+
+def test_queues_sharing_a_database_dont_overwrite_each_others_state(smtp_sink):
+    mongo_client = mongomock.MongoClient()
+    email_control_data_a = mongoEmailControlData(mongoDb(mongo_client=mongo_client, db="test", host="localhost"))
+    email_control_data_b = mongoEmailControlData(mongoDb(mongo_client=mongo_client, db="test", host="localhost"))
+    email_queue_a = _email_queue(email_control_data_a, smtp_sink)
+    email_queue_b = _email_queue(email_control_data_b, smtp_sink)
+
+    email_queue_a.put("from a", "Subject A")
+    email_queue_b.put("from b", "Subject B")
+
+    # b reads the state, then a sends and saves before b is finished
+    get_rate_limit_state = email_control_data_b.get_rate_limit_state
+
+    def get_rate_limit_state_then_let_a_send():
+        rate_limit_state = get_rate_limit_state()
+        email_queue_a.flush()
+        return rate_limit_state
+
+    email_control_data_b.get_rate_limit_state = get_rate_limit_state_then_let_a_send
+    email_queue_b.flush()
+    email_control_data_b.get_rate_limit_state = get_rate_limit_state
+
+    assert sorted(message["Subject"] for message in smtp_sink.messages) == ["Subject A", "Subject B"]
+    for email_control_data in [email_control_data_a, email_control_data_b]:
+        assert sorted(email_control_data.get_rate_limit_state().keys()) == ["Subject A", "Subject B"]
+
+    # an older date from a stale copy doesn't replace a newer one
+    time_a_sent = email_control_data_a.get_time_last_email_sent_with_this_subject("Subject A")
+    stale_rate_limit_state = email_control_data_b.get_rate_limit_state()
+    stale_rate_limit_state.record_email_sent("Subject A", when=time_a_sent - datetime.timedelta(days=2))
+    email_control_data_b.save_rate_limit_state(stale_rate_limit_state)
+    assert email_control_data_a.get_time_last_email_sent_with_this_subject("Subject A") == time_a_sent
+
+    email_queue_a.close()
+    email_queue_b.close()
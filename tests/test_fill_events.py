@@ -0,0 +1,199 @@
+import datetime
+import threading
+
+import pytest
+
+from syscore.objects import missing_order
+from sysexecution.fill_events import fillEvent, fillEventQueue, replayableFillEventSource
+from sysexecution.orders.broker_orders import brokerOrder
+
+
+def test_events_for_same_order_are_coalesced():
+    queue = fillEventQueue()
+    source = replayableFillEventSource()
+    source.subscribe(queue)
+
+    source.publish(fillEvent("DU1/1/10", 0))
+    source.publish(fillEvent("DU1/1/11", 0))
+    source.publish(fillEvent("DU1/1/10", 555))
+
+    assert len(queue) == 2
+    assert queue.drain().list_of_broker_tempids == ["DU1/1/10", "DU1/1/11"]
+    assert len(queue) == 0
+
+    source.replay()
+    assert queue.drain() == [fillEvent("DU1/1/10", 555), fillEvent("DU1/1/11", 0)]
+
+
+def test_events_published_from_another_thread():
+    queue = fillEventQueue()
+    source = replayableFillEventSource()
+    source.subscribe(queue)
+
+    publishers = [
+        threading.Thread(target=lambda thread_number=thread_number: [
+            source.publish(fillEvent("DU1/1/%d" % order_number, thread_number))
+            for order_number in range(100)])
+        for thread_number in range(4)]
+    for publisher in publishers:
+        publisher.start()
+    for publisher in publishers:
+        publisher.join()
+
+    assert sorted(queue.drain().list_of_broker_tempids) == sorted(
+        ["DU1/1/%d" % order_number for order_number in range(100)])
+    assert len(source.recorded_events) == 400
+
+
+def _broker_order(tempid: str, trade: int = 1) -> brokerOrder:
+    return brokerOrder("TEST", "US10", "20210600", [trade], parent=1,
+                       broker_tempid=tempid, broker_account="DU1")
+
+
+def test_broker_orders_found_by_tempid_in_bulk():
+    mongomock = pytest.importorskip("mongomock")
+    from sysdata.mongodb.mongo_connection import mongoDb
+    from sysdata.mongodb.mongo_order_stack import mongoBrokerOrderStackData
+
+    broker_stack = mongoBrokerOrderStackData(
+        mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost"))
+    first_id = broker_stack.put_order_on_stack(_broker_order("DU1/1/10"))
+    second_id = broker_stack.put_order_on_stack(_broker_order("DU1/1/11", trade=-2))
+    third_id = broker_stack.put_order_on_stack(_broker_order("DU1/1/12"))
+    broker_stack.deactivate_order(third_id)
+
+    assert broker_stack.get_list_of_order_ids() == [first_id, second_id]
+    assert sorted(broker_stack.get_list_of_order_ids(exclude_inactive_orders=False)) == \
+        [first_id, second_id, third_id]
+
+    list_of_orders = broker_stack.get_list_of_orders_from_order_id_list([second_id, 99, first_id])
+    assert [order.broker_tempid for order in list_of_orders[::2]] == ["DU1/1/11", "DU1/1/10"]
+    assert list_of_orders[1] is missing_order
+
+    # inactive orders and orders we don't know about are left out
+    list_of_orders = broker_stack.get_list_of_orders_with_broker_tempids(
+        ["DU1/1/11", "DU1/1/12", "DU1/2/10"])
+    assert [order.order_id for order in list_of_orders] == [second_id]
+
+
+def test_events_put_back_until_given_up():
+    queue = fillEventQueue()
+    queue.put(fillEvent("DU1/1/10", 0))
+    queue.put(fillEvent("DU1/1/11", 0))
+
+    # a newer event for the same order arrives while we're processing
+    list_of_fill_events = queue.drain()
+    queue.put(fillEvent("DU1/1/10", 555))
+    assert queue.put_back(list_of_fill_events, max_retries=2) == []
+    assert queue.drain() == [fillEvent("DU1/1/10", 555), fillEvent("DU1/1/11", 0)]
+
+    assert queue.put_back([fillEvent("DU1/1/11", 0)], max_retries=2) == []
+    assert queue.put_back(queue.drain(), max_retries=2) == [fillEvent("DU1/1/11", 0)]
+    assert len(queue) == 0
+
+    # once an event isn't put back it's forgotten, so a later event starts again
+    queue.put(fillEvent("DU1/1/11", 0))
+    assert queue.put_back(queue.drain(), max_retries=2) == []
+
+
+class stubBrokerData(object):
+    """
+    Stands in for dataBroker: the broker's view of our orders, and the fill events it tells us about
+    """
+
+    def __init__(self, fill_event_source: replayableFillEventSource):
+        self.fill_event_queue = fillEventQueue()
+        fill_event_source.subscribe(self.fill_event_queue)
+        self.dict_of_broker_orders = {}
+
+    def get_new_fill_events(self):
+        return self.fill_event_queue.drain()
+
+    def put_back_fill_events(self, list_of_fill_events):
+        return self.fill_event_queue.put_back(list_of_fill_events, max_retries=5)
+
+    def match_list_of_db_broker_orders_to_orders_from_brokers(self, list_of_broker_orders):
+        return [self.dict_of_broker_orders.get(broker_order.broker_tempid, missing_order)
+                for broker_order in list_of_broker_orders]
+
+
+def _broker_order_filled_at_broker(db_broker_order: brokerOrder, fill: int) -> brokerOrder:
+    return brokerOrder("TEST", "US10", "20210600", [2], fill=[fill], filled_price=100.5,
+                       fill_datetime=datetime.datetime(2021, 3, 1, 12),
+                       broker_tempid=db_broker_order.broker_tempid, broker_permid=555,
+                       broker_account="DU1")
+
+
+def test_stack_handler_applies_fill_events_and_tries_again(monkeypatch):
+    mongomock = pytest.importorskip("mongomock")
+    from sysdata.data_blob import dataBlob
+    from sysdata.mongodb.mongo_connection import mongoDb
+    from sysexecution.orders.contract_orders import contractOrder
+    from sysexecution.orders.instrument_orders import instrumentOrder
+    import sysexecution.stack_handler.fills as fills
+    from syslogdiag.log import logtoscreen
+    from sysproduction.data.positions import diagPositions
+    from sysobjects.contracts import futuresContract
+
+    data = dataBlob(mongo_db=mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost"),
+                    log=logtoscreen("test"))
+    fill_event_source = replayableFillEventSource()
+    broker_data = stubBrokerData(fill_event_source)
+    monkeypatch.setattr(fills, "dataBroker", lambda data: broker_data)
+
+    stack_handler = fills.stackHandlerForFills(data)
+    instrument_order_id = stack_handler.instrument_stack.put_order_on_stack(
+        instrumentOrder("TEST", "US10", [2]))
+    contract_order_id = stack_handler.contract_stack.put_order_on_stack(
+        contractOrder("TEST", "US10", "20210600", [2], parent=instrument_order_id))
+    broker_order_id = stack_handler.broker_stack.put_order_on_stack(
+        brokerOrder("TEST", "US10", "20210600", [2], parent=contract_order_id,
+                    broker_tempid="DU1/1/10", broker_account="DU1"))
+    stack_handler.instrument_stack.add_children_to_order_without_existing_children(
+        instrument_order_id, [contract_order_id])
+    stack_handler.contract_stack.add_children_to_order_without_existing_children(
+        contract_order_id, [broker_order_id])
+    db_broker_order = stack_handler.broker_stack.get_order_with_id_from_stack(broker_order_id)
+
+    sweeps = []
+    sweep_fills_across_stack = stack_handler.sweep_fills_across_stack
+
+    def _sweep_fills_across_stack():
+        sweeps.append(len(sweeps))
+        sweep_fills_across_stack()
+
+    stack_handler.sweep_fills_across_stack = _sweep_fills_across_stack
+
+    # we always sweep the first time
+    stack_handler.process_fills_stack()
+    assert len(sweeps) == 1
+
+    # the broker hasn't told us about the order yet, and the other order isn't ours
+    fill_event_source.publish(fillEvent("DU1/1/10", 0))
+    fill_event_source.publish(fillEvent("DU1/1/99", 0))
+    stack_handler.process_fills_stack()
+    assert len(broker_data.fill_event_queue) == 2
+    assert stack_handler.broker_stack.get_order_with_id_from_stack(broker_order_id).fill_equals_zero()
+
+    # a fill that's too big is tried again too
+    broker_data.dict_of_broker_orders["DU1/1/10"] = _broker_order_filled_at_broker(db_broker_order, fill=3)
+    stack_handler.process_fills_stack()
+    assert len(broker_data.fill_event_queue) == 2
+    assert stack_handler.broker_stack.get_order_with_id_from_stack(broker_order_id).fill_equals_zero()
+
+    broker_data.dict_of_broker_orders["DU1/1/10"] = _broker_order_filled_at_broker(db_broker_order, fill=2)
+    stack_handler.process_fills_stack()
+    assert len(broker_data.fill_event_queue) == 1
+    assert stack_handler.contract_stack.get_order_with_id_from_stack(contract_order_id).fill == [2]
+    assert stack_handler.instrument_stack.get_order_with_id_from_stack(instrument_order_id).fill == [2]
+    assert diagPositions(data).get_position_for_contract(futuresContract("US10", "20210600")) == 2
+    assert len(sweeps) == 1
+
+    # we give up on the order that isn't ours, and then sweep in case we missed something
+    for _ in range(3):
+        stack_handler.process_fills_stack()
+    assert len(broker_data.fill_event_queue) == 0
+    assert len(sweeps) == 1
+
+    stack_handler.process_fills_stack()
+    assert len(sweeps) == 2
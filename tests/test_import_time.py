@@ -0,0 +1,69 @@
+"""
+Guard start up time for simulation: importing the backtest entry points shouldn't pull in the broker or
+database stacks, and shouldn't get much slower.
+
+Run as a script to print the import times, eg python tests/test_import_time.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+THIS_DIR = os.path.dirname(__file__)
+MOD_DIR = os.path.abspath(os.path.join(THIS_DIR, ".."))
+
+SIM_ONLY_IMPORTS = [
+    "from sysdata.sim.csv_futures_sim_data import csvFuturesSimData",
+    "from systems.provided.futures_chapter15.basesystem import futures_system",
+]
+BROKER_AND_DATABASE_MODULES = ["ib_insync", "pymongo", "arctic", "sysbrokers.IB.ib_connection"]
+
+# generous, as machines vary; override with PYSYS_MAX_IMPORT_SECONDS
+MAX_IMPORT_SECONDS = float(os.environ.get("PYSYS_MAX_IMPORT_SECONDS", 10.0))
+
+_TIMING_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps(dict(seconds=seconds, modules=sorted(sys.modules.keys()))))
+"""
+
+
+def time_import_in_new_process(import_statement: str) -> dict:
+    output = subprocess.check_output(
+        [sys.executable, "-c", _TIMING_SCRIPT, import_statement],
+        cwd=MOD_DIR,
+        env=dict(os.environ, PYTHONPATH=MOD_DIR),
+        stderr=subprocess.DEVNULL,
+    )
+    # anything printed on import comes first
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def test_sim_imports_dont_load_broker_or_database():
+    for import_statement in SIM_ONLY_IMPORTS:
+        modules_loaded = time_import_in_new_process(import_statement)["modules"]
+        unwanted = [
+            module_name
+            for module_name in BROKER_AND_DATABASE_MODULES
+            if module_name in modules_loaded
+        ]
+        assert unwanted == [], "%s imports %s" % (import_statement, str(unwanted))
+
+
+def test_sim_import_time():
+    for import_statement in SIM_ONLY_IMPORTS:
+        seconds = time_import_in_new_process(import_statement)["seconds"]
+        assert seconds < MAX_IMPORT_SECONDS, "%s took %.2f seconds" % (
+            import_statement,
+            seconds,
+        )
+
+
+if __name__ == "__main__":
+    for import_statement in SIM_ONLY_IMPORTS:
+        print(
+            "%.3f seconds: %s"
+            % (time_import_in_new_process(import_statement)["seconds"], import_statement)
+        )
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from syscore.incremental_backup import incrementalCsvBackup, UNCHANGED, APPENDED, REWRITTEN
+from syscore.pdutils import pd_readcsv
+
+
+def _prices(periods, start="2020-01-01"):
+    index = pd.date_range(start, periods=periods, freq="H")
+    return pd.DataFrame(dict(PRICE=np.arange(periods, dtype=float)), index=index)
+
+
+def _written_prices(csv_backup, key):
+    return pd_readcsv(csv_backup.filename_for_key(key))
+
+
+def _assert_written(csv_backup, key, prices):
+    written = _written_prices(csv_backup, key)
+    np.testing.assert_array_equal(written.PRICE.values, prices.PRICE.values)
+    assert list(written.index) == list(prices.index)
+
+
+def test_only_new_rows_are_appended(tmp_path):
+    csv_backup = incrementalCsvBackup(str(tmp_path))
+    prices = _prices(10)
+
+    assert csv_backup.write("EURUSD", prices.iloc[:6]) == REWRITTEN
+    assert csv_backup.write("EURUSD", prices.iloc[:6]) == UNCHANGED
+    assert csv_backup.write("EURUSD", prices) == APPENDED
+
+    _assert_written(csv_backup, "EURUSD", prices)
+
+
+def test_high_water_mark_is_kept_between_runs(tmp_path):
+    prices = _prices(10)
+    csv_backup = incrementalCsvBackup(str(tmp_path))
+    csv_backup.write("EURUSD", prices.iloc[:6])
+    csv_backup.save_state()
+
+    csv_backup = incrementalCsvBackup(str(tmp_path))
+    assert csv_backup.write("EURUSD", prices) == APPENDED
+    _assert_written(csv_backup, "EURUSD", prices)
+
+
+def test_changed_history_rewrites_file(tmp_path):
+    csv_backup = incrementalCsvBackup(str(tmp_path))
+    prices = _prices(10)
+    csv_backup.write("EURUSD", prices.iloc[:6])
+
+    prices.iloc[2, 0] = 99.0
+    assert csv_backup.write("EURUSD", prices) == REWRITTEN
+    _assert_written(csv_backup, "EURUSD", prices)
+
+
+def test_file_changed_by_something_else_is_rewritten(tmp_path):
+    csv_backup = incrementalCsvBackup(str(tmp_path))
+    prices = _prices(10)
+    csv_backup.write("EURUSD", prices.iloc[:6])
+
+    # eg we failed part way through appending
+    with open(csv_backup.filename_for_key("EURUSD"), "a") as csv_file:
+        csv_file.write("2020-01-01 06:00:00,6")
+
+    assert csv_backup.write("EURUSD", prices) == REWRITTEN
+    _assert_written(csv_backup, "EURUSD", prices)
+    # no temporary files left behind
+    assert sorted(os.listdir(str(tmp_path))) == ["EURUSD.csv"]
@@ -0,0 +1,97 @@
+import datetime
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_connection import mongoDb
+from sysdata.mongodb.mongo_historic_orders import (
+    mongoBrokerHistoricOrdersData,
+    mongoStrategyHistoricOrdersData,
+)
+from sysexecution.orders.broker_orders import brokerOrder
+from sysexecution.orders.contract_orders import contractOrder
+from sysexecution.orders.instrument_orders import instrumentOrder
+from sysobjects.production.tradeable_object import futuresContract, instrumentStrategy
+from sysproduction.data.orders import dataOrders
+
+START = datetime.datetime(2021, 3, 1)
+
+
+def _mongo_db():
+    return mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost")
+
+
+def _broker_order(order_id, key, trade, days, parent=None):
+    order_kwargs = {} if parent is None else dict(parent=parent)
+    return brokerOrder(key, trade, fill=trade, filled_price=100.0, order_id=order_id,
+                       fill_datetime=START + datetime.timedelta(days=days), **order_kwargs)
+
+
+def _add_legacy_order(data, order):
+    # written before we stored instrument and strategy alongside the order
+    data.mongo_data.collection.insert_one(order.as_dict())
+
+
+def test_broker_orders_filtered_in_database():
+    data = mongoBrokerHistoricOrdersData(_mongo_db())
+    data.add_order_to_data(_broker_order(1, "a/US10/20210600", [1], 0))
+    data.add_order_to_data(_broker_order(2, "b/US10/20210600_20210900", [1, -1], 1))
+    data.add_order_to_data(_broker_order(3, "a/EDOLLAR/20230300", [2], 2))
+    _add_legacy_order(data, _broker_order(4, "a/US10/20210900", [3], 3))
+
+    assert data.get_list_of_order_ids_in_date_range(START, START + datetime.timedelta(days=2)) == [1, 2]
+
+    df = data.get_orders_in_date_range_as_df(START, START + datetime.timedelta(days=10),
+                                             instrument_code="US10", strategy_name="a")
+    assert list(df.index) == [1, 4]
+    assert list(df.key) == ["a/US10/20210600", "a/US10/20210900"]
+
+    assert data.get_list_of_order_ids_for_instrument_and_contract_str("US10", "20210900") == [2, 4]
+    assert data.get_fills_history_for_contract(futuresContract("US10", "20210600"))[0].qty == 1
+
+    # the stored instrument and strategy aren't part of the order
+    order = data.get_order_with_orderid(1)
+    assert "instrument_code" not in order.order_info.keys()
+    assert [order.order_id for order in data.get_list_of_orders_with_orderids([3, 1, 99])] == [3, 1]
+
+
+def test_instrument_strategy_orders_with_old_and_new_keys():
+    data = mongoStrategyHistoricOrdersData(_mongo_db())
+    data.add_order_to_data(instrumentOrder("a", "US10", 1, fill=1, order_id=1, fill_datetime=START,
+                                           filled_price=100.0))
+    data.add_order_to_data(instrumentOrder("b", "US10", 1, fill=1, order_id=2, fill_datetime=START,
+                                           filled_price=100.0))
+    old_style_order = instrumentOrder("a", "US10", 2, fill=2, order_id=3, fill_datetime=START,
+                                      filled_price=100.0)
+    old_style_record = old_style_order.as_dict()
+    old_style_record["key"] = "a/US10"
+    data.mongo_data.collection.insert_one(old_style_record)
+
+    instrument_strategy = instrumentStrategy(strategy_name="a", instrument_code="US10")
+    assert sorted(data.get_list_of_order_ids_for_instrument_strategy(instrument_strategy)) == [1, 3]
+    fills = data.get_fills_history_for_instrument_strategy(instrument_strategy)
+    assert sorted(fill.qty for fill in fills) == [1, 2]
+
+
+def test_broker_orders_with_execution_data_from_one_query_per_order_type():
+    mongo_db = _mongo_db()
+    data = dataBlob(mongo_db=mongo_db)
+    data_orders = dataOrders(data)
+
+    data_orders.add_historic_instrument_order_to_data(
+        instrumentOrder("a", "US10", 1, fill=1, order_id=1, fill_datetime=START,
+                        reference_datetime=START - datetime.timedelta(hours=1)))
+    data_orders.add_historic_contract_order_to_data(
+        contractOrder("a", "US10", "20210600", 1, fill=1, order_id=10, parent=1, fill_datetime=START,
+                      reference_price=99.0, limit_price=98.0))
+    data_orders.add_historic_broker_order_to_data(_broker_order(100, "a/US10/20210600", [1], 0, parent=10))
+
+    [order] = data_orders.get_list_of_historic_broker_orders_in_date_range_with_execution_data(
+        START - datetime.timedelta(days=1), START + datetime.timedelta(days=1))
+
+    expected = data_orders.get_historic_broker_order_from_order_id_with_execution_data(100)
+    assert order.parent_reference_price == expected.parent_reference_price == 99.0
+    assert order.parent_limit_price == expected.parent_limit_price == 98.0
+    assert order.parent_reference_datetime == expected.parent_reference_datetime
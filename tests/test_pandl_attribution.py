@@ -0,0 +1,108 @@
+import datetime
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from sysproduction.diagnostic.profits import (
+    pandlAttribution,
+    pandl_points,
+    pandl_points_panel,
+    unique_trades_df,
+)
+
+metaData = namedtuple("metaData", ["Pointsize", "Currency", "AssetClass"])
+
+START_DATE = datetime.datetime(2021, 3, 1)
+END_DATE = datetime.datetime(2021, 3, 20)
+
+
+def _price_series(rng, freq: str, offset_hours: int) -> pd.Series:
+    index = pd.date_range("2021-01-04", "2021-04-01", freq=freq) + pd.Timedelta(hours=offset_hours)
+    prices = pd.Series(100 + np.cumsum(rng.normal(size=len(index))), index=index)
+    prices.iloc[rng.integers(0, len(index), size=5)] = np.nan
+
+    return prices
+
+
+def _trade_df(rng, price_series: pd.Series) -> pd.DataFrame:
+    # some fills on price dates, some in between
+    fill_dates = sorted(rng.choice(price_series.index, size=6, replace=False)
+                        + pd.to_timedelta(rng.integers(0, 3, size=6), unit="h"))
+    trade_df = pd.DataFrame(
+        dict(qty=rng.integers(-3, 4, size=6).astype(float),
+             price=100 + rng.normal(size=6)),
+        index=pd.DatetimeIndex(fill_dates))
+
+    return unique_trades_df(trade_df)
+
+
+def _pos_series(trade_df: pd.DataFrame) -> pd.Series:
+    return trade_df.qty.cumsum()
+
+
+def _inputs():
+    rng = np.random.default_rng(3)
+    list_of_price_series = [
+        _price_series(rng, "B", 23),
+        _price_series(rng, "4H", 1),
+        _price_series(rng, "B", 18),
+    ]
+    list_of_trade_df = [_trade_df(rng, price_series) for price_series in list_of_price_series]
+    list_of_pos_series = [_pos_series(trade_df) for trade_df in list_of_trade_df]
+    # nothing traded at all
+    list_of_trade_df.append(unique_trades_df(pd.DataFrame(dict(qty=[], price=[]))))
+    list_of_pos_series.append(pd.Series(dtype=float))
+    list_of_price_series.append(list_of_price_series[0])
+
+    return list_of_price_series, list_of_trade_df, list_of_pos_series
+
+
+def test_pandl_points_panel_matches_each_position():
+    list_of_price_series, list_of_trade_df, list_of_pos_series = _inputs()
+
+    panel = pandl_points_panel(list_of_price_series, list_of_trade_df, list_of_pos_series)
+
+    for column, (price_series, trade_df, pos_series) in enumerate(
+            zip(list_of_price_series, list_of_trade_df, list_of_pos_series)):
+        expected = pandl_points(price_series, trade_df.copy(), pos_series)
+        expected = expected.astype(float).dropna()
+        pd.testing.assert_series_equal(
+            panel[column].dropna(), expected, check_names=False, check_freq=False)
+
+
+def test_period_perc_pandl_matches_each_position():
+    list_of_price_series, list_of_trade_df, list_of_pos_series = _inputs()
+    list_of_instrument_codes = ["US10", "BUND", "US10", "BUND"]
+    dict_of_meta_data = dict(
+        US10=metaData(Pointsize=1000.0, Currency="USD", AssetClass="Bond"),
+        BUND=metaData(Pointsize=10.0, Currency="EUR", AssetClass="Bond"))
+
+    fx_index = pd.date_range("2021-01-01", "2021-04-01", freq="B") + pd.Timedelta(hours=20)
+    dict_of_fx = dict(
+        USD=pd.Series(np.linspace(0.7, 0.8, len(fx_index)), index=fx_index),
+        EUR=pd.Series(np.linspace(0.85, 0.9, len(fx_index)), index=fx_index))
+    capital = pd.Series(np.linspace(1e6, 1.1e6, len(fx_index)), index=fx_index)
+
+    # the caches are already filled, so we don't need any data
+    pandl_attribution = pandlAttribution(None, START_DATE, END_DATE)
+    pandl_attribution._meta_data_by_instrument = dict_of_meta_data
+    pandl_attribution._fx_series_by_currency = dict_of_fx
+
+    period_perc_pandl = pandl_attribution._period_perc_pandl_for_panel(
+        list_of_instrument_codes, list_of_price_series, list_of_trade_df, list_of_pos_series,
+        capital=capital)
+
+    for column, instrument_code in enumerate(list_of_instrument_codes):
+        meta_data = dict_of_meta_data[instrument_code]
+        pandl_in_points = pandl_points(
+            list_of_price_series[column], list_of_trade_df[column].copy(), list_of_pos_series[column])
+        fx = dict_of_fx[meta_data.Currency].reindex(pandl_in_points.index, method="ffill")
+        aligned_capital = capital.reindex(pandl_in_points.index, method="ffill")
+        perc_pandl = meta_data.Pointsize * pandl_in_points * fx / aligned_capital
+        expected = perc_pandl[START_DATE:END_DATE].sum()
+
+        np.testing.assert_allclose(period_perc_pandl[column], expected, rtol=1e-10, atol=1e-15)
+
+    assert (period_perc_pandl[:3] != 0.0).all()
+    assert period_perc_pandl[3] == 0.0
@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from sysobjects.contracts import futuresContract
+from sysobjects.production.positions import contractPosition, listOfContractPositions, \
+    instrumentStrategyPosition, listOfInstrumentStrategyPositions
+from sysobjects.production.tradeable_object import instrumentStrategy
+
+
+def _contract_positions(positions: dict) -> listOfContractPositions:
+    return listOfContractPositions([
+        contractPosition(position, futuresContract(*key.split("/")))
+        for key, position in positions.items()])
+
+
+def test_breaks_between_contract_positions():
+    db_positions = _contract_positions({"US10/20210600": 2, "EDOLLAR/20230300": -1, "GOLD/20210400": 1})
+    broker_positions = _contract_positions({"US10/20210600": 2, "GOLD/20210400": 3, "V2X/20210300": 4})
+
+    breaks = db_positions.return_list_of_breaks(broker_positions)
+
+    assert breaks == [futuresContract("EDOLLAR", "20230300"),
+                      futuresContract("GOLD", "20210400"),
+                      futuresContract("V2X", "20210300")]
+    assert db_positions.return_list_of_breaks(db_positions) == []
+
+
+def test_sum_for_instrument():
+    positions = listOfInstrumentStrategyPositions([
+        instrumentStrategyPosition(2, instrumentStrategy(strategy_name="a", instrument_code="US10")),
+        instrumentStrategyPosition(-3, instrumentStrategy(strategy_name="b", instrument_code="US10")),
+        instrumentStrategyPosition(1, instrumentStrategy(strategy_name="a", instrument_code="GOLD")),
+    ])
+    contract_positions = _contract_positions({"US10/20210600": -1, "GOLD/20210400": 1})
+
+    summed = positions.sum_for_instrument()
+
+    assert summed.position_for_instrument("US10") == -1
+    assert summed.position_for_instrument("GOLD") == 1
+    assert contract_positions.sum_for_instrument().return_list_of_breaks(summed) == []
+
+
+def test_current_positions_read_in_bulk():
+    mongomock = pytest.importorskip("mongomock")
+    from sysdata.mongodb.mongo_connection import mongoDb
+    from sysdata.mongodb.mongo_position_by_contract import mongoContractPositionData
+
+    data = mongoContractPositionData(
+        mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost"))
+    start = datetime.datetime(2021, 3, 1)
+    us10 = futuresContract("US10", "20210600")
+    gold = futuresContract("GOLD", "20210400")
+    data.update_position_for_contract_object(us10, 2, date=start)
+    data.update_position_for_contract_object(us10, 5, date=start + datetime.timedelta(days=1))
+    data.update_position_for_contract_object(gold, 1, date=start)
+    data.update_position_for_contract_object(gold, 0, date=start + datetime.timedelta(days=1))
+
+    current_positions = data.get_all_current_positions_as_list_with_contract_objects()
+
+    # zero positions are left out
+    assert current_positions == _contract_positions({"US10/20210600": 5})
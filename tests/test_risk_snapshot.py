@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from syscore.dateutils import ROOT_BDAYS_INYEAR
+from sysproduction.diagnostic.risk import riskSnapshot, get_annualised_risk_given_inputs
+
+TOTAL_CAPITAL = 1e6
+CAPITAL_FOR_STRATEGY = dict(medium_speed_TF=6e5, carry=4e5)
+POINT_SIZE_BASE = dict(EDOLLAR=2500.0, US10=800.0, BUND=1100.0, GOLD=75.0)
+
+# instrument: (medium_speed_TF, carry)
+POSITIONS = dict(EDOLLAR=(3.0, -1.0), US10=(-2.0, 0.0), BUND=(0.0, 4.0), GOLD=(1.0, 1.0))
+
+
+def _price_series(rng, start_price: float, last_date: str) -> pd.Series:
+    # intraday prices with gaps, so the daily resample has missing days
+    index = pd.date_range("2020-06-01", last_date, freq="7H")
+    prices = pd.Series(start_price * np.exp(np.cumsum(rng.normal(scale=0.01, size=len(index)))),
+                       index=index)
+    prices = prices.drop(prices.index[rng.integers(0, len(index), size=40)])
+
+    return prices
+
+
+def _dict_of_price_series() -> dict:
+    rng = np.random.default_rng(7)
+
+    return dict(
+        EDOLLAR=_price_series(rng, 99.0, "2021-03-05"),
+        US10=_price_series(rng, 130.0, "2021-03-05"),
+        # stale, so later dates are missing for this one only
+        BUND=_price_series(rng, 170.0, "2021-02-17"),
+        GOLD=_price_series(rng, 1700.0, "2021-03-04"),
+    )
+
+
+def _risk_snapshot(dict_of_price_series: dict) -> riskSnapshot:
+    # everything is already stored, so we don't need any data
+    risk_snapshot = riskSnapshot(None)
+    risk_snapshot._price_series = dict_of_price_series
+    risk_snapshot._point_size_base = POINT_SIZE_BASE
+    risk_snapshot._total_capital = TOTAL_CAPITAL
+    risk_snapshot._capital_for_strategy = CAPITAL_FOR_STRATEGY
+    risk_snapshot._instrument_list = list(POSITIONS.keys())
+    risk_snapshot._positions = pd.DataFrame(
+        POSITIONS, index=list(CAPITAL_FOR_STRATEGY.keys())).transpose()
+
+    return risk_snapshot
+
+
+# the calculations as they were done one instrument at a time before the snapshot
+
+def _old_daily_prices(price_series: pd.Series) -> pd.Series:
+    return price_series.resample("1B").last()
+
+
+def _old_current_price(price_series: pd.Series) -> float:
+    return price_series.values[-1]
+
+
+def _old_current_daily_stdev(price_series: pd.Series) -> float:
+    daily_std = _old_daily_prices(price_series).diff().rolling(30, min_periods=2).std()
+
+    return daily_std.ffill().values[-1]
+
+
+def _old_annualised_perc_stdev(price_series: pd.Series) -> float:
+    return _old_current_daily_stdev(price_series) * ROOT_BDAYS_INYEAR / _old_current_price(price_series)
+
+
+def _old_exposure_per_contract(dict_of_price_series: dict, instrument_code: str) -> float:
+    return POINT_SIZE_BASE[instrument_code] * _old_current_price(dict_of_price_series[instrument_code])
+
+
+def _old_correlation_matrix(dict_of_price_series: dict, instrument_list: list) -> pd.DataFrame:
+    perc_returns = {}
+    for instrument_code in instrument_list:
+        daily_prices = _old_daily_prices(dict_of_price_series[instrument_code])
+        perc_returns[instrument_code] = daily_prices.diff() / daily_prices
+
+    return pd.DataFrame(perc_returns)[-128:].corr()
+
+
+def _old_portfolio_risk(dict_of_price_series: dict, instrument_list: list, positions: list,
+                        capital: float) -> float:
+    weights = [_old_exposure_per_contract(dict_of_price_series, instrument_code) * position / capital
+               for instrument_code, position in zip(instrument_list, positions)]
+    cmatrix = _old_correlation_matrix(dict_of_price_series, instrument_list)
+    std_dev = [_old_annualised_perc_stdev(dict_of_price_series[instrument_code])
+               for instrument_code in instrument_list]
+
+    return get_annualised_risk_given_inputs(std_dev, cmatrix.values, weights)
+
+
+def _old_instrument_risk_table(dict_of_price_series: dict) -> pd.DataFrame:
+    risk_data = {}
+    for instrument_code, strategy_positions in POSITIONS.items():
+        price_series = dict_of_price_series[instrument_code]
+        daily_price_stdev = _old_current_daily_stdev(price_series)
+        annual_price_stdev = daily_price_stdev * ROOT_BDAYS_INYEAR
+        price = _old_current_price(price_series)
+        point_size_base = POINT_SIZE_BASE[instrument_code]
+        annual_risk_per_contract = annual_price_stdev * point_size_base
+        position = sum(strategy_positions)
+        risk_data[instrument_code] = dict(
+            daily_price_stdev=daily_price_stdev,
+            annual_price_stdev=annual_price_stdev,
+            price=price,
+            daily_perc_stdev=100 * daily_price_stdev / price,
+            annual_perc_stdev=100 * annual_price_stdev / price,
+            point_size_base=point_size_base,
+            contract_exposure=point_size_base * price,
+            daily_risk_per_contract=daily_price_stdev * point_size_base,
+            annual_risk_per_contract=annual_risk_per_contract,
+            position=position,
+            capital=TOTAL_CAPITAL,
+            exposure_held_perc_capital=100 * position * point_size_base * price / TOTAL_CAPITAL,
+            annual_risk_perc_capital=100 * annual_risk_per_contract * position / TOTAL_CAPITAL)
+
+    risk_df = pd.DataFrame(risk_data).transpose().dropna()
+
+    return risk_df.sort_values("annual_risk_perc_capital").astype(float)
+
+
+def test_instrument_risk_table_matches_old_calculation():
+    dict_of_price_series = _dict_of_price_series()
+
+    risk_df = _risk_snapshot(dict_of_price_series).instrument_risk_table()
+
+    pd.testing.assert_frame_equal(risk_df, _old_instrument_risk_table(dict_of_price_series),
+                                  rtol=1e-10)
+
+
+def test_correlation_matrix_matches_old_calculation():
+    dict_of_price_series = _dict_of_price_series()
+    instrument_list = list(POSITIONS.keys())
+
+    cmatrix = _risk_snapshot(dict_of_price_series).correlation_matrix(instrument_list)
+
+    pd.testing.assert_frame_equal(
+        cmatrix, _old_correlation_matrix(dict_of_price_series, instrument_list), rtol=1e-10)
+    # the stale instrument still overlaps the others for most of the last 128 days
+    assert not cmatrix.isna().any().any()
+
+
+def test_portfolio_risk_matches_old_calculation():
+    dict_of_price_series = _dict_of_price_series()
+    risk_snapshot = _risk_snapshot(dict_of_price_series)
+    instrument_list = list(POSITIONS.keys())
+
+    expected_all_strategies = _old_portfolio_risk(
+        dict_of_price_series, instrument_list,
+        [sum(strategy_positions) for strategy_positions in POSITIONS.values()], TOTAL_CAPITAL)
+    np.testing.assert_allclose(
+        risk_snapshot.portfolio_risk_for_all_strategies(), expected_all_strategies, rtol=1e-10)
+
+    # only the instruments this strategy holds
+    carry_instruments = [instrument_code for instrument_code, strategy_positions in POSITIONS.items()
+                         if strategy_positions[1] != 0]
+    expected_carry = _old_portfolio_risk(
+        dict_of_price_series, carry_instruments,
+        [POSITIONS[instrument_code][1] for instrument_code in carry_instruments],
+        CAPITAL_FOR_STRATEGY["carry"])
+    assert risk_snapshot.instruments_for_strategy("carry") == carry_instruments
+    np.testing.assert_allclose(
+        risk_snapshot.portfolio_risk_for_strategy("carry"), expected_carry, rtol=1e-10)
+
+    risk_across_strategies = risk_snapshot.portfolio_risk_across_strategies()
+    np.testing.assert_allclose(risk_across_strategies.loc["carry", "risk"], expected_carry, rtol=1e-10)
+    assert expected_all_strategies > 0
@@ -0,0 +1,134 @@
+import datetime
+import threading
+import time
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_connection import mongoDb
+from syscontrol.run_process import processToRun
+from syscontrol.timer_functions import listOfTimerFunctions, timerClassWithFunction
+from syslogdiag.log import logtoscreen
+
+POLL_INTERVAL_SECONDS = 0.05
+
+
+def _data() -> dataBlob:
+    mongo_db = mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost")
+    return dataBlob(mongo_db=mongo_db, log=logtoscreen("test"))
+
+
+def _timer(data, name, list_of_runs, frequency_minutes, minutes_since_last_run):
+    timer = timerClassWithFunction(
+        name,
+        lambda: list_of_runs.append(name),
+        data,
+        process_name="test_process",
+        frequency_minutes=frequency_minutes,
+        max_executions=-1,
+        log=data.log,
+    )
+    timer._last_run = datetime.datetime.now() - datetime.timedelta(minutes=minutes_since_last_run)
+
+    return timer
+
+
+def _process_without_config() -> processToRun:
+    # enough of a process to wait and check for stops, without any process configuration
+    process = processToRun.__new__(processToRun)
+    process._process_name = "test_process"
+    process._logged_wait_messages = False
+    process._wake_up_event = threading.Event()
+    process._time_of_last_stop_check = None
+    process._poll_interval_seconds = POLL_INTERVAL_SECONDS
+
+    return process
+
+
+def test_due_functions_run_in_the_order_they_became_due():
+    data = _data()
+    list_of_runs = []
+    list_of_timer_functions = listOfTimerFunctions([
+        _timer(data, "due_recently", list_of_runs, frequency_minutes=10, minutes_since_last_run=11),
+        _timer(data, "not_due", list_of_runs, frequency_minutes=10, minutes_since_last_run=5),
+        _timer(data, "due_long_ago", list_of_runs, frequency_minutes=10, minutes_since_last_run=30),
+    ])
+
+    list_of_timer_functions.check_and_run()
+    assert list_of_runs == ["due_long_ago", "due_recently"]
+
+    # nothing else due yet, the not due one is next
+    list_of_timer_functions.check_and_run()
+    assert list_of_runs == ["due_long_ago", "due_recently"]
+
+    time_of_next_run = list_of_timer_functions.time_of_next_run()
+    expected_next_run = list_of_timer_functions[1].time_of_next_run()
+    assert time_of_next_run == expected_next_run
+    assert datetime.timedelta(minutes=4) < time_of_next_run - datetime.datetime.now() \
+        <= datetime.timedelta(minutes=5)
+
+
+def test_no_time_of_next_run_when_all_finished():
+    data = _data()
+    timer = timerClassWithFunction(
+        "once", lambda: None, data, process_name="test_process",
+        frequency_minutes=10, max_executions=1, log=data.log)
+    list_of_timer_functions = listOfTimerFunctions([timer])
+
+    list_of_timer_functions.check_and_run()
+
+    assert list_of_timer_functions.all_finished()
+    assert list_of_timer_functions.time_of_next_run() is None
+
+
+def test_waiting_to_start_polls_at_the_interval():
+    process = _process_without_config()
+    start_checks = []
+
+    def _is_okay_to_start():
+        start_checks.append(datetime.datetime.now())
+        return len(start_checks) >= 3
+
+    process._is_okay_to_start = _is_okay_to_start
+    process._is_okay_to_wait_before_starting = lambda: True
+
+    process._start_or_wait()
+
+    assert len(start_checks) == 3
+    gaps = [(later - earlier).total_seconds()
+            for earlier, later in zip(start_checks[:-1], start_checks[1:])]
+    assert all(gap >= POLL_INTERVAL_SECONDS * 0.9 for gap in gaps)
+
+
+def test_stop_checks_are_bounded_by_poll_interval():
+    process = _process_without_config()
+    stop_checks = []
+
+    def _check_for_stop():
+        stop_checks.append(datetime.datetime.now())
+        return False
+
+    process._check_for_stop = _check_for_stop
+    process._check_if_all_methods_finished = lambda: False
+
+    finish_time = time.time() + POLL_INTERVAL_SECONDS * 3.5
+    while time.time() < finish_time:
+        process._check_for_stop_if_due()
+
+    # one at the start, then one every interval
+    assert 3 <= len(stop_checks) <= 5
+
+
+def test_wake_up_interrupts_the_wait():
+    process = _process_without_config()
+    process._time_of_last_stop_check = datetime.datetime.now()
+
+    threading.Timer(POLL_INTERVAL_SECONDS, process.wake_up).start()
+    started = time.time()
+    process._wait_until(datetime.datetime.now() + datetime.timedelta(seconds=10))
+
+    assert time.time() - started < 5
+    # and we check for a stop straight away
+    assert process._time_of_last_stop_check is None
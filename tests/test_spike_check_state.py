@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from syscore.merge_data import (
+    merge_newer_data_no_checks,
+    spike_check_merged_data,
+    spike_in_data,
+    spikeCheckState,
+    no_spike,
+)
+from sysdata.futures.futures_per_contract_prices import futuresContractPriceData
+from sysdata.mongodb.mongo_connection import mongoDb
+from sysdata.mongodb.mongo_spike_check_state import mongoSpikeCheckStateData
+from syslogdiag.log import logtoscreen
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+
+
+class dictFuturesContractPriceDataWithMongoState(futuresContractPriceData):
+    # prices in a dict, spike check state in mongo, as the arctic data does
+    def __init__(self, dict_of_prices: dict, mongo_db):
+        super().__init__(log=logtoscreen("test"))
+        self._dict_of_prices = dict_of_prices
+        self._spike_check_state_data = mongoSpikeCheckStateData(mongo_db=mongo_db)
+
+    def get_contracts_with_price_data(self) -> listOfFuturesContracts:
+        return listOfFuturesContracts(
+            [futuresContract(*key.split("/")) for key in self._dict_of_prices.keys()])
+
+    def _get_prices_for_contract_object_no_checking(self, futures_contract_object):
+        return futuresContractPrices(self._dict_of_prices[futures_contract_object.key].copy())
+
+    def _write_prices_for_contract_object_no_checking(self, futures_contract_object, futures_price_data):
+        self._dict_of_prices[futures_contract_object.key] = pd.DataFrame(futures_price_data)
+
+    def _delete_prices_for_contract_object_with_no_checks_be_careful(self, futures_contract_object):
+        self._dict_of_prices.pop(futures_contract_object.key)
+
+    def _get_spike_check_state_dict_for_contract_object(self, futures_contract_object):
+        return self._spike_check_state_data.get_state_dict_for_contract(futures_contract_object)
+
+    def _write_spike_check_state_dict_for_contract_object(self, futures_contract_object, state_dict):
+        self._spike_check_state_data.write_state_dict_for_contract(futures_contract_object, state_dict)
+
+    def _delete_spike_check_state_dict_for_contract_object(self, futures_contract_object):
+        self._spike_check_state_data.delete_state_dict_for_contract(futures_contract_object)
+
+
+def _final_prices(rows: int) -> pd.Series:
+    rng = np.random.default_rng(2)
+    index = pd.date_range("2018-01-01 23:00", periods=rows, freq="B")
+
+    return pd.Series(100 + np.cumsum(rng.normal(size=rows)), index=index)
+
+
+def _contract_prices(final_prices: pd.Series) -> futuresContractPrices:
+    return futuresContractPrices.create_from_final_prices_only(final_prices)
+
+
+@pytest.fixture
+def mongo_db():
+    return mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost")
+
+
+def test_reloaded_state_gives_same_spike_date_as_full_recalculation(mongo_db):
+    contract = futuresContract("EDOLLAR", "20230300")
+    final_prices = _final_prices(1000)
+    final_prices.iloc[900] = final_prices.iloc[899] + 100.0
+    dict_of_prices = {}
+
+    price_data = dictFuturesContractPriceDataWithMongoState(dict_of_prices, mongo_db)
+    price_data.update_prices_for_contract(contract, _contract_prices(final_prices[:600]))
+    price_data.update_prices_for_contract(contract, _contract_prices(final_prices[:800]))
+
+    # a new process, sharing the same database
+    fresh_price_data = dictFuturesContractPriceDataWithMongoState(dict_of_prices, mongo_db)
+    spike_check_state = fresh_price_data._get_spike_check_state(contract)
+    assert not spike_check_state.empty
+    assert spike_check_state.last_date == final_prices.index[799]
+
+    old_data = final_prices[:800]
+    new_data = final_prices[780:]
+    full = spike_check_merged_data(merge_newer_data_no_checks(old_data, new_data))
+    merged = merge_newer_data_no_checks(old_data, new_data)
+    # only the new rows are checked
+    assert spike_check_state.matches_end_of_old_data(merged.merged_data, len(old_data))
+    from_reloaded_state = spike_check_merged_data(merged, spike_check_state=spike_check_state)
+
+    assert full.date_of_spike == final_prices.index[900]
+    assert from_reloaded_state.date_of_spike == full.date_of_spike
+
+    result = fresh_price_data.update_prices_for_contract(contract, _contract_prices(new_data))
+    assert result is spike_in_data
+
+
+def test_stored_state_matches_full_recalculation_after_update(mongo_db):
+    contract = futuresContract("EDOLLAR", "20230300")
+    final_prices = _final_prices(1000)
+    dict_of_prices = {}
+
+    price_data = dictFuturesContractPriceDataWithMongoState(dict_of_prices, mongo_db)
+    price_data.update_prices_for_contract(contract, _contract_prices(final_prices[:700]))
+
+    fresh_price_data = dictFuturesContractPriceDataWithMongoState(dict_of_prices, mongo_db)
+    rows_added = fresh_price_data.update_prices_for_contract(contract, _contract_prices(final_prices))
+    assert rows_added == 300
+
+    full_state = spikeCheckState()
+    full = merge_newer_data_no_checks(final_prices[:0], final_prices)
+    spike_check_merged_data(full, spike_check_state=full_state)
+    assert full.date_of_spike is no_spike
+
+    stored_state = spikeCheckState.from_dict(
+        mongoSpikeCheckStateData(mongo_db=mongo_db).get_state_dict_for_contract(contract))
+    assert stored_state.last_date == final_prices.index[-1]
+    assert stored_state.avg_abs_change == pytest.approx(full_state.avg_abs_change, rel=1e-12)
+
+    fresh_price_data.delete_prices_for_contract_object(contract, areyousure=True)
+    assert fresh_price_data._get_spike_check_state(contract).empty
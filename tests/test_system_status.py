@@ -0,0 +1,40 @@
+import datetime
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from syscore.dateutils import MISSING_STRING_PATTERN
+from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_connection import mongoDb
+from sysdata.mongodb.mongo_process_control import mongoControlProcessData
+from syslogdiag.log import logtoscreen
+from sysproduction.diagnostic.system_status import systemStatusSnapshot, \
+    get_control_data_for_single_ordinary_method
+
+
+def _data_blob():
+    mongo_db = mongoDb(mongo_client=mongomock.MongoClient(), db="test", host="localhost")
+    return dataBlob(mongo_db=mongo_db, log=logtoscreen("test"))
+
+
+def test_control_processes_read_in_one_go():
+    data = _data_blob()
+    data.add_class_object(mongoControlProcessData)
+    data.db_control_process.change_status_to_stop("run_stack_handler")
+    data.db_control_process.log_start_run_for_method("run_daily_prices_updates", "update_historical_prices")
+
+    snapshot = systemStatusSnapshot(data)
+    dict_of_controls = snapshot.dict_of_control_processes
+
+    assert sorted(dict_of_controls.keys()) == ["run_daily_prices_updates", "run_stack_handler"]
+    assert dict_of_controls["run_stack_handler"].status == "STOP"
+    # not stored, so the default
+    assert snapshot.get_control_for_process_name("run_backups").status == "GO"
+
+    method_data = get_control_data_for_single_ordinary_method(
+        data, ("update_historical_prices", "run_daily_prices_updates"), snapshot)
+    assert method_data.currently_running == "True"
+    assert method_data.last_end == MISSING_STRING_PATTERN
+    assert dict_of_controls["run_daily_prices_updates"].when_method_last_started(
+        "update_historical_prices") <= datetime.datetime.now()
@@ -0,0 +1,117 @@
+import datetime
+from copy import copy
+
+from syscore.objects import missing_data
+from sysdata.production.trade_limits import (
+    tradeLimitData,
+    listOfInstrumentStrategyKeyAndDays,
+    instrumentStrategyKeyAndDays,
+)
+from sysobjects.production.tradeable_object import instrumentStrategy
+
+
+class dictTradeLimitData(tradeLimitData):
+    def __init__(self):
+        super().__init__()
+        self.stored = {}
+        self.read_count = 0
+
+    def _get_trade_limits_as_dicts_for_instrument_strategies(
+            self, list_of_instrument_strategies: list) -> list:
+        self.read_count += 1
+        keys = [instrument_strategy.key for instrument_strategy in list_of_instrument_strategies]
+
+        return [copy(trade_limit_dict) for (key, period_days), trade_limit_dict in self.stored.items()
+                if key in keys]
+
+    def _add_to_stored_trades_since_last_reset_if_possible(
+            self, instrument_strategy: instrumentStrategy, period_days: int, trade: int) -> bool:
+        trade_limit_dict = self.stored[(instrument_strategy.key, period_days)]
+        reset_due = datetime.datetime.now() - trade_limit_dict["last_reset_time"] > \
+            datetime.timedelta(days=period_days)
+        if reset_due or trade_limit_dict["trades_since_last_reset"] + trade < 0:
+            return False
+
+        trade_limit_dict["trades_since_last_reset"] += trade
+
+        return True
+
+    def _get_trade_limit_as_dict_or_missing_data(
+            self, instrument_strategy: instrumentStrategy, period_days: int) -> dict:
+        trade_limit_dict = self.stored.get((instrument_strategy.key, period_days), missing_data)
+        if trade_limit_dict is missing_data:
+            return missing_data
+
+        return copy(trade_limit_dict)
+
+    def _update_trade_limit_as_dict(self, trade_limit_dict: dict):
+        self.stored[(trade_limit_dict["instrument_strategy_key"],
+                     trade_limit_dict["period_days"])] = trade_limit_dict
+
+    def _get_all_limit_keys(self) -> listOfInstrumentStrategyKeyAndDays:
+        return listOfInstrumentStrategyKeyAndDays(
+            [instrumentStrategyKeyAndDays(key, period_days) for key, period_days in self.stored.keys()])
+
+
+INSTRUMENT_STRATEGY = instrumentStrategy(strategy_name="strategy", instrument_code="EDOLLAR")
+
+
+def _trade_limit_data():
+    data = dictTradeLimitData()
+    data.update_instrument_limit_with_new_limit("EDOLLAR", 1, 10)
+    data.update_instrument_strategy_limit_with_new_limit(INSTRUMENT_STRATEGY, 1, 6)
+    data.update_instrument_strategy_limit_with_new_limit(INSTRUMENT_STRATEGY, 5, 20)
+
+    return data
+
+
+def _stored_trades(data, instrument_strategy, period_days):
+    return data.stored[(instrument_strategy.key, period_days)]["trades_since_last_reset"]
+
+
+def test_instrument_and_instrument_strategy_limits_read_in_one_go():
+    data = _trade_limit_data()
+
+    assert data.what_trade_is_possible(INSTRUMENT_STRATEGY, -8) == -6
+    data.add_trade(INSTRUMENT_STRATEGY, 4)
+    assert data.what_trade_is_possible(INSTRUMENT_STRATEGY, 8) == 2
+
+    other_strategy = instrumentStrategy(strategy_name="other", instrument_code="EDOLLAR")
+    assert data.what_trade_is_possible(other_strategy, 8) == 6
+
+    # one read each, fills are applied to the snapshot
+    assert data.read_count == 2
+    instrument_only = instrumentStrategy(strategy_name="", instrument_code="EDOLLAR")
+    assert _stored_trades(data, instrument_only, 1) == 4
+    assert _stored_trades(data, INSTRUMENT_STRATEGY, 1) == 4
+    assert _stored_trades(data, INSTRUMENT_STRATEGY, 5) == 4
+
+
+def test_remove_trade_does_not_go_below_zero():
+    data = _trade_limit_data()
+    data.add_trade(INSTRUMENT_STRATEGY, 2)
+    data.remove_trade(INSTRUMENT_STRATEGY, 3)
+
+    assert _stored_trades(data, INSTRUMENT_STRATEGY, 1) == 0
+    assert data.what_trade_is_possible(INSTRUMENT_STRATEGY, 8) == 6
+
+
+def test_trade_added_after_reset_is_due():
+    data = _trade_limit_data()
+    data.add_trade(INSTRUMENT_STRATEGY, 5)
+    data.stored[(INSTRUMENT_STRATEGY.key, 1)]["last_reset_time"] = \
+        datetime.datetime.now() - datetime.timedelta(days=2)
+
+    data.add_trade(INSTRUMENT_STRATEGY, 1)
+
+    assert _stored_trades(data, INSTRUMENT_STRATEGY, 1) == 1
+    assert _stored_trades(data, INSTRUMENT_STRATEGY, 5) == 6
+
+
+def test_changed_limit_is_used_straight_away():
+    data = _trade_limit_data()
+    assert data.what_trade_is_possible(INSTRUMENT_STRATEGY, 8) == 6
+
+    data.update_instrument_strategy_limit_with_new_limit(INSTRUMENT_STRATEGY, 1, 3)
+
+    assert data.what_trade_is_possible(INSTRUMENT_STRATEGY, 8) == 3
@@ -0,0 +1,84 @@
+import datetime
+import json
+
+from syscore.dateutils import manyTradingStartAndEndDateTimes
+from syscore.objects import missing_data
+from syscore.trading_hours_cache import tradingHoursCache
+
+
+def _hours_for_days(first_day: datetime.datetime, days: int) -> list:
+    return [(first_day + datetime.timedelta(days=day, hours=9),
+             first_day + datetime.timedelta(days=day, hours=17))
+            for day in range(days)]
+
+
+def test_open_and_minutes_to_close():
+    first_day = datetime.datetime(2021, 3, 1)
+    # out of order, as we might get them
+    trading_hours = manyTradingStartAndEndDateTimes(_hours_for_days(first_day, 5)[::-1])
+
+    assert trading_hours.as_list_of_tuples() == _hours_for_days(first_day, 5)
+    assert trading_hours.okay_to_trade_at(datetime.datetime(2021, 3, 3, 9))
+    assert trading_hours.okay_to_trade_at(datetime.datetime(2021, 3, 3, 17))
+    assert not trading_hours.okay_to_trade_at(datetime.datetime(2021, 3, 3, 17, 1))
+    assert not trading_hours.okay_to_trade_at(datetime.datetime(2021, 3, 1, 8))
+    assert not trading_hours.okay_to_trade_at(datetime.datetime(2021, 3, 10, 12))
+
+    assert trading_hours.minutes_to_close(datetime.datetime(2021, 3, 4, 15, 30)) == 90.0
+    assert trading_hours.minutes_to_close(datetime.datetime(2021, 3, 4, 20)) == 0
+
+
+def test_less_than_one_hour_left():
+    now = datetime.datetime.now()
+    closing_soon = manyTradingStartAndEndDateTimes(
+        [(now - datetime.timedelta(hours=2), now + datetime.timedelta(minutes=30))])
+    closing_later = manyTradingStartAndEndDateTimes(
+        [(now - datetime.timedelta(hours=2), now + datetime.timedelta(hours=3))])
+
+    assert closing_soon.less_than_one_hour_left()
+    assert not closing_later.less_than_one_hour_left()
+    assert manyTradingStartAndEndDateTimes([]).less_than_one_hour_left()
+
+
+def test_cached_hours_survive_restart(tmp_path):
+    filename = str(tmp_path / "trading_hours.json")
+    list_of_trading_hours = _hours_for_days(datetime.datetime(2021, 3, 1), 3)
+
+    cache = tradingHoursCache(filename)
+    assert cache.get_trading_hours("US10/20210600") is missing_data
+    cache.add_trading_hours("US10/20210600", list_of_trading_hours)
+
+    restarted_cache = tradingHoursCache(filename)
+    trading_hours = restarted_cache.get_trading_hours("US10/20210600")
+    assert trading_hours.as_list_of_tuples() == list_of_trading_hours
+    assert restarted_cache.get_trading_hours("GOLD/20210400") is missing_data
+
+
+def test_hours_from_another_day_are_ignored(tmp_path):
+    filename = str(tmp_path / "trading_hours.json")
+    tradingHoursCache(filename).add_trading_hours(
+        "US10/20210600", _hours_for_days(datetime.datetime(2021, 3, 1), 3))
+
+    with open(filename, "r") as cache_file:
+        file_contents = json.load(cache_file)
+    file_contents["US10/20210600"]["date"] = "20210301"
+    with open(filename, "w") as cache_file:
+        json.dump(file_contents, cache_file)
+
+    assert tradingHoursCache(filename).get_trading_hours("US10/20210600") is missing_data
+
+
+def test_newer_hours_in_file_replace_older_hours_in_memory(tmp_path):
+    filename = str(tmp_path / "trading_hours.json")
+    old_hours = _hours_for_days(datetime.datetime(2021, 2, 28), 3)
+    new_hours = _hours_for_days(datetime.datetime(2021, 3, 1), 3)
+
+    long_running_cache = tradingHoursCache(filename)
+    long_running_cache._trading_hours_by_key["US10/20210600"] = (
+        "20210228", manyTradingStartAndEndDateTimes(old_hours))
+
+    # another process gets today's hours from the broker
+    tradingHoursCache(filename).add_trading_hours("US10/20210600", new_hours)
+
+    trading_hours = long_running_cache.get_trading_hours("US10/20210600")
+    assert trading_hours.as_list_of_tuples() == new_hours